@@ -8,7 +8,8 @@ Author: Hosein Hadipour
 from argparse import ArgumentParser, RawTextHelpFormatter
 from truncboom import TruncatedBoomerang
 from diff import Diff
-from plotdistinguisher import *
+from trail import Trail
+import json
 
 def main():
 
@@ -59,15 +60,25 @@ def main():
                         help="time limit in seconds")
     parser.add_argument('-ns', '--numofsols', type=int,
                         help="number of solutions (currently disabled)")
+    parser.add_argument('-np', '--no-plot', dest='noplot', action='store_true',
+                        help="do not generate bmd.svg (render it later from the saved artifact)")
+    parser.add_argument('-a', '--artifact', type=str,
+                        help="json file to save the discovered distinguisher (default: bmd_r0_rm_r1.json)")
+    parser.add_argument('-c', '--catalog', type=str,
+                        help="SQLite catalog of differential trails, to reuse the trails found by earlier runs")
 
     # Parse command line arguments and construct parameter list.
     args = parser.parse_args()
     params = loadparameters(args)
     r0, rm, r1 = params["r0"], params["rm"], params["r1"]
     w0, wm, w1 = params["w0"], params["wm"], params["w1"]
+    noplot = params["noplot"]
+    artifact_file_name = params["artifact"]
+    catalog_file_name = params["catalog"]
+    if artifact_file_name == None:
+        artifact_file_name = f"bmd_{r0}_{rm}_{r1}.json"
 
     # assert(rm > 0)
-    tex_content = tex_init()
     ##############################################################################################
     ##############################################################################################
     # Step1- Find a truncated boomerang trail
@@ -88,12 +99,14 @@ def main():
                   "endweight" : 128,
                   "timelimit" : time_limit,
                   "numberoftrails" : 1,
+                  "catalog" : catalog_file_name,
                   "fixedVariables" : {}}
+        upper_activity = Trail.from_dict(upper_trail, cell_size=8).activity()
         for r in range(bm.r0 + 1):
             for bn in range(4):
                 for word in range(4):
                     byten = bn*4 + word
-                    if upper_trail[f"x_{r}"][2*byten:2*(byten + 1)] == "00":
+                    if not upper_activity[r][byten]:
                         for bit in range(8):
                             params["fixedVariables"][f"x_{r}_{bn}_{word}_{bit}"] = "0"
         diff = Diff(params)
@@ -115,12 +128,14 @@ def main():
                   "endweight" : 128,
                   "timelimit" : time_limit,
                   "numberoftrails" : 1,
+                  "catalog" : catalog_file_name,
                   "fixedVariables" : {}}
+        lower_activity = Trail.from_dict(lower_trail, cell_size=8).activity()
         for r in range(bm.r1 + 1):
             for bn in range(4):
                 for word in range(4):
                     byten = 4*bn + word
-                    if lower_trail[f"x_{r + bm.rm}"][2*byten:2*(byten + 1)] == "00":
+                    if not lower_activity[r + bm.rm][byten]:
                         for bit in range(8):
                             params["fixedVariables"][f"x_{r}_{bn}_{word}_{bit}"] = "0"
         diff = Diff(params)
@@ -163,38 +178,23 @@ def main():
 
     ##############################################################################################
     ##############################################################################################
+    # save the discovered distinguisher, so that it can be plotted later
+    bmd = {"r0" : r0, "rm" : rm, "r1" : r1,
+           "w0" : w0, "wm" : wm, "w1" : w1,
+           "upper_trail" : upper_trail,
+           "middle_part" : middle_part,
+           "lower_trail" : lower_trail,
+           "diff_upper_trail" : diff_upper_trail,
+           "diff_lower_trail" : diff_lower_trail,
+           "diff_effect_upper" : diff_effect_upper,
+           "diff_effect_lower" : diff_effect_lower}
+    with open(artifact_file_name, "w") as artifact_file:
+        json.dump(bmd, artifact_file)
     # plot distinguisher
-    # if diff_upper_trail != None:
-    #     active_input_bits = diff.flatten_state([[4*i + j for j in range(4)] for i in range(16) if diff_upper_trail["x_0"][i] != "0"])
-    #     tex_content += tikz_mark_input_bits(active_input_bits, color="red")
-    #     tex_content += tex_diff_trail(trail=diff_upper_trail, markpattern="markupperpath", direction="->")
-    # else:
-    #     active_input_bits = []
-    #     for i in range(16):
-    #         if upper_trail[f"x_{0}"][i] != "0":
-    #             active_input_bits.extend([j for j in range(4*i, 4*(i + 1))])
-    #     tex_content += tikz_mark_input_bits(active_input_bits, color="red")
-
-    # tex_content += tex_middle(upper_trail=upper_trail, midd_trail=middle_part, lower_trail=lower_trail, r0=r0, rm=rm, r1=r1)
-
-    # # tex_content += tex_diff_trail(trail=diff_lower_trail, markpattern="marklowerpath", direction="<-")
-    # if diff_lower_trail != None:
-    #     tex_content += tex_diff_lower_trail(trail=diff_lower_trail, \
-    #                                         upper_crossing_difference=[str(i) for i in range(16) if upper_trail[f"x_{r0 + rm}"][i] != "0"],\
-    #                                         markpattern="marklowerpath",\
-    #                                         direction="<-")
-    #     active_output_bits = diff.flatten_state([[4*i + j for j in range(4)] for i in range(16) if diff_lower_trail[f"x_{r1}"][i] != "0"])
-    #     tex_content += tikz_mark_output_bits(active_output_bits, color="blue")
-    # else:
-    #     active_output_bits = []
-    #     for i in range(16):
-    #         if lower_trail[f"x_{rm + r1}"][i] != "0":
-    #             active_output_bits.extend([j for j in range(4*i, 4*(i + 1))])
-    #     tex_content += tikz_mark_output_bits(active_output_bits, color="blue")
-
-    # tex_content += tex_fin(r0 + rm + r1)
-    # with open("bmd.tex", "w") as texfile:
-    #     texfile.write(tex_content)
+    if not noplot:
+        from svgdistinguisher import svg_distinguisher
+        with open("bmd.svg", "w") as svg_file:
+            svg_distinguisher(bmd, svg_file)
 
 def loadparameters(args):
     """
@@ -210,7 +210,10 @@ def loadparameters(args):
                 "wm" : 2,
                 "w1" : 2,
                 "timelimit" : 3200,
-                "numofsols" : 1}
+                "numofsols" : 1,
+                "noplot" : False,
+                "artifact" : None,
+                "catalog" : None}
 
     # Check if there is an input file specified
     if args.inputfile:
@@ -253,6 +256,15 @@ def loadparameters(args):
     if args.numofsols != None:
         params["numofsols"] = args.numofsols
 
+    if args.noplot:
+        params["noplot"] = True
+
+    if args.artifact != None:
+        params["artifact"] = args.artifact
+
+    if args.catalog != None:
+        params["catalog"] = args.catalog
+
     return params
 
 if __name__ == "__main__":
@@ -11,6 +11,17 @@ import time
 from gurobipy import *
 import math
 import os
+import sys
+import hashlib
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "feistel"))
+from feistelspec import IndicatorSboxEncoding
+from ciphers import clefia_spec
+from modelcompiler import ModelCompiler
+from solutionparser import SolutionParser
+from catalog import TrailCatalog
+from trailpool import TrailPoolWriter
+from trail import Trail
+from validator import TrailValidator
 
 class Diff:
     """
@@ -40,13 +51,16 @@ class Diff:
         self.mode = params['mode']
         self.number_of_trails = params["numberoftrails"]
         self.eps = 1e-3
+        self.solution_parser = None
+        self.catalog = TrailCatalog(params["catalog"]) if params.get("catalog") != None else None
+        self.model_hash = None
+        self.trail_pool_file_name = params.get("trailpool")
+        self.validate = params.get("validate", False)
+        self.validator = None
         self.big_m = 2*8
         self.lp_file_name = f"clefia_nr_{self.nrounds}.lp"
         self.result_file_name = f"result_nr_{self.nrounds}.txt"
 
-        self.binary_variables = []
-        self.integer_variables = []
-
         """
         Encoding differential behavior of S-boxes
         a0, ..., a7 (a0: msb of input difference)
@@ -77,213 +91,6 @@ class Diff:
             with open(os.path.join("ddt-encoding", f"s1_{pr}.txt")) as fileobj:
                 self.sbox_inequalities[1][pr] = fileobj.readlines()
 
-        self.mds0_constraints_template = [
-            'a_00000 + a_01001 + a_10010 + a_11001 + a_11010 + b_00000 - 2 u_00000 = 0',
-            'u_00000 <= 3',
-            'u_00000 >= 0',
-            'a_00001 + a_01010 + a_10011 + a_11010 + a_11011 + b_00001 - 2 u_00001 = 0',
-            'u_00001 <= 3',
-            'u_00001 >= 0',
-            'a_00010 + a_01011 + a_10000 + a_10100 + a_11000 + a_11011 + a_11100 + b_00010 - 2 u_00010 = 0',
-            'u_00010 <= 4',
-            'u_00010 >= 0',
-            'a_00011 + a_01000 + a_01100 + a_10000 + a_10001 + a_10101 + a_11001 + a_11100 + a_11101 + b_00011 - 2 u_00011 = 0',
-            'u_00011 <= 5',
-            'u_00011 >= 0',
-            'a_00100 + a_01000 + a_01101 + a_10000 + a_10001 + a_10110 + a_11001 + a_11101 + a_11110 + b_00100 - 2 u_00100 = 0',
-            'u_00100 <= 5',
-            'u_00100 >= 0',
-            'a_00101 + a_01000 + a_01110 + a_10001 + a_10111 + a_11000 + a_11001 + a_11110 + a_11111 + b_00101 - 2 u_00101 = 0',
-            'u_00101 <= 5',
-            'u_00101 >= 0',
-            'a_00110 + a_01111 + a_10000 + a_11000 + a_11111 + b_00110 - 2 u_00110 = 0',
-            'u_00110 <= 3',
-            'u_00110 >= 0',
-            'a_00111 + a_01000 + a_10001 + a_11000 + a_11001 + b_00111 - 2 u_00111 = 0',
-            'u_00111 <= 3',
-            'u_00111 >= 0',
-            'a_00001 + a_01000 + a_10001 + a_10010 + a_11010 + b_01000 - 2 u_01000 = 0',
-            'u_01000 <= 3',
-            'u_01000 >= 0',
-            'a_00010 + a_01001 + a_10010 + a_10011 + a_11011 + b_01001 - 2 u_01001 = 0',
-            'u_01001 <= 3',
-            'u_01001 >= 0',
-            'a_00011 + a_01010 + a_10000 + a_10011 + a_10100 + a_11000 + a_11100 + b_01010 - 2 u_01010 = 0',
-            'u_01010 <= 4',
-            'u_01010 >= 0',
-            'a_00000 + a_00100 + a_01011 + a_10001 + a_10100 + a_10101 + a_11000 + a_11001 + a_11101 + b_01011 - 2 u_01011 = 0',
-            'u_01011 <= 5',
-            'u_01011 >= 0',
-            'a_00000 + a_00101 + a_01100 + a_10001 + a_10101 + a_10110 + a_11000 + a_11001 + a_11110 + b_01100 - 2 u_01100 = 0',
-            'u_01100 <= 5',
-            'u_01100 >= 0',
-            'a_00000 + a_00110 + a_01101 + a_10000 + a_10001 + a_10110 + a_10111 + a_11001 + a_11111 + b_01101 - 2 u_01101 = 0',
-            'u_01101 <= 5',
-            'u_01101 >= 0',
-            'a_00111 + a_01110 + a_10000 + a_10111 + a_11000 + b_01110 - 2 u_01110 = 0',
-            'u_01110 <= 3',
-            'u_01110 >= 0',
-            'a_00000 + a_01111 + a_10000 + a_10001 + a_11001 + b_01111 - 2 u_01111 = 0',
-            'u_01111 <= 3',
-            'u_01111 >= 0',
-            'a_00010 + a_01001 + a_01010 + a_10000 + a_11001 + b_10000 - 2 u_10000 = 0',
-            'u_10000 <= 3',
-            'u_10000 >= 0',
-            'a_00011 + a_01010 + a_01011 + a_10001 + a_11010 + b_10001 - 2 u_10001 = 0',
-            'u_10001 <= 3',
-            'u_10001 >= 0',
-            'a_00000 + a_00100 + a_01000 + a_01011 + a_01100 + a_10010 + a_11011 + b_10010 - 2 u_10010 = 0',
-            'u_10010 <= 4',
-            'u_10010 >= 0',
-            'a_00000 + a_00001 + a_00101 + a_01001 + a_01100 + a_01101 + a_10011 + a_11000 + a_11100 + b_10011 - 2 u_10011 = 0',
-            'u_10011 <= 5',
-            'u_10011 >= 0',
-            'a_00000 + a_00001 + a_00110 + a_01001 + a_01101 + a_01110 + a_10100 + a_11000 + a_11101 + b_10100 - 2 u_10100 = 0',
-            'u_10100 <= 5',
-            'u_10100 >= 0',
-            'a_00001 + a_00111 + a_01000 + a_01001 + a_01110 + a_01111 + a_10101 + a_11000 + a_11110 + b_10101 - 2 u_10101 = 0',
-            'u_10101 <= 5',
-            'u_10101 >= 0',
-            'a_00000 + a_01000 + a_01111 + a_10110 + a_11111 + b_10110 - 2 u_10110 = 0',
-            'u_10110 <= 3',
-            'u_10110 >= 0',
-            'a_00001 + a_01000 + a_01001 + a_10111 + a_11000 + b_10111 - 2 u_10111 = 0',
-            'u_10111 <= 3',
-            'u_10111 >= 0',
-            'a_00001 + a_00010 + a_01010 + a_10001 + a_11000 + b_11000 - 2 u_11000 = 0',
-            'u_11000 <= 3',
-            'u_11000 >= 0',
-            'a_00010 + a_00011 + a_01011 + a_10010 + a_11001 + b_11001 - 2 u_11001 = 0',
-            'u_11001 <= 3',
-            'u_11001 >= 0',
-            'a_00000 + a_00011 + a_00100 + a_01000 + a_01100 + a_10011 + a_11010 + b_11010 - 2 u_11010 = 0',
-            'u_11010 <= 4',
-            'u_11010 >= 0',
-            'a_00001 + a_00100 + a_00101 + a_01000 + a_01001 + a_01101 + a_10000 + a_10100 + a_11011 + b_11011 - 2 u_11011 = 0',
-            'u_11011 <= 5',
-            'u_11011 >= 0',
-            'a_00001 + a_00101 + a_00110 + a_01000 + a_01001 + a_01110 + a_10000 + a_10101 + a_11100 + b_11100 - 2 u_11100 = 0',
-            'u_11100 <= 5',
-            'u_11100 >= 0',
-            'a_00000 + a_00001 + a_00110 + a_00111 + a_01001 + a_01111 + a_10000 + a_10110 + a_11101 + b_11101 - 2 u_11101 = 0',
-            'u_11101 <= 5',
-            'u_11101 >= 0',
-            'a_00000 + a_00111 + a_01000 + a_10111 + a_11110 + b_11110 - 2 u_11110 = 0',
-            'u_11110 <= 3',
-            'u_11110 >= 0',
-            'a_00000 + a_00001 + a_01001 + a_10000 + a_11111 + b_11111 - 2 u_11111 = 0',
-            'u_11111 <= 3',
-            'u_11111 >= 0']
-
-        self.mds1_constraints_template = [
-            'a_00000 + a_01011 + a_10001 + a_11001 + a_11011 + b_00000 - 2 u_00000 = 0',
-            'u_00000 <= 3',
-            'u_00000 >= 0',
-            'a_00001 + a_01000 + a_01100 + a_10010 + a_11000 + a_11010 + a_11100 + b_00001 - 2 u_00001 = 0',
-            'u_00001 <= 4',
-            'u_00001 >= 0',
-            'a_00010 + a_01000 + a_01001 + a_01101 + a_10011 + a_11000 + a_11001 + a_11011 + a_11101 + b_00010 - 2 u_00010 = 0',
-            'u_00010 <= 5',
-            'u_00010 >= 0',
-            'a_00011 + a_01000 + a_01001 + a_01010 + a_01110 + a_10000 + a_10100 + a_11001 + a_11010 + a_11100 + a_11110 + b_00011 - 2 u_00011 = 0',
-            'u_00011 <= 6',
-            'u_00011 >= 0',
-            'a_00100 + a_01001 + a_01010 + a_01111 + a_10000 + a_10101 + a_11000 + a_11001 + a_11010 + a_11101 + a_11111 + b_00100 - 2 u_00100 = 0',
-            'u_00100 <= 6',
-            'u_00100 >= 0',
-            'a_00101 + a_01000 + a_01010 + a_10000 + a_10110 + a_11010 + a_11110 + b_00101 - 2 u_00101 = 0',
-            'u_00101 <= 4',
-            'u_00101 >= 0',
-            'a_00110 + a_01001 + a_10111 + a_11001 + a_11111 + b_00110 - 2 u_00110 = 0',
-            'u_00110 <= 3',
-            'u_00110 >= 0',
-            'a_00111 + a_01010 + a_10000 + a_11000 + a_11010 + b_00111 - 2 u_00111 = 0',
-            'u_00111 <= 3',
-            'u_00111 >= 0',
-            'a_00011 + a_01000 + a_10001 + a_10011 + a_11001 + b_01000 - 2 u_01000 = 0',
-            'u_01000 <= 3',
-            'u_01000 >= 0',
-            'a_00000 + a_00100 + a_01001 + a_10000 + a_10010 + a_10100 + a_11010 + b_01001 - 2 u_01001 = 0',
-            'u_01001 <= 4',
-            'u_01001 >= 0',
-            'a_00000 + a_00001 + a_00101 + a_01010 + a_10000 + a_10001 + a_10011 + a_10101 + a_11011 + b_01010 - 2 u_01010 = 0',
-            'u_01010 <= 5',
-            'u_01010 >= 0',
-            'a_00000 + a_00001 + a_00010 + a_00110 + a_01011 + a_10001 + a_10010 + a_10100 + a_10110 + a_11000 + a_11100 + b_01011 - 2 u_01011 = 0',
-            'u_01011 <= 6',
-            'u_01011 >= 0',
-            'a_00001 + a_00010 + a_00111 + a_01100 + a_10000 + a_10001 + a_10010 + a_10101 + a_10111 + a_11000 + a_11101 + b_01100 - 2 u_01100 = 0',
-            'u_01100 <= 6',
-            'u_01100 >= 0',
-            'a_00000 + a_00010 + a_01101 + a_10010 + a_10110 + a_11000 + a_11110 + b_01101 - 2 u_01101 = 0',
-            'u_01101 <= 4',
-            'u_01101 >= 0',
-            'a_00001 + a_01110 + a_10001 + a_10111 + a_11111 + b_01110 - 2 u_01110 = 0',
-            'u_01110 <= 3',
-            'u_01110 >= 0',
-            'a_00010 + a_01111 + a_10000 + a_10010 + a_11000 + b_01111 - 2 u_01111 = 0',
-            'u_01111 <= 3',
-            'u_01111 >= 0',
-            'a_00001 + a_01001 + a_01011 + a_10000 + a_11011 + b_10000 - 2 u_10000 = 0',
-            'u_10000 <= 3',
-            'u_10000 >= 0',
-            'a_00010 + a_01000 + a_01010 + a_01100 + a_10001 + a_11000 + a_11100 + b_10001 - 2 u_10001 = 0',
-            'u_10001 <= 4',
-            'u_10001 >= 0',
-            'a_00011 + a_01000 + a_01001 + a_01011 + a_01101 + a_10010 + a_11000 + a_11001 + a_11101 + b_10010 - 2 u_10010 = 0',
-            'u_10010 <= 5',
-            'u_10010 >= 0',
-            'a_00000 + a_00100 + a_01001 + a_01010 + a_01100 + a_01110 + a_10011 + a_11000 + a_11001 + a_11010 + a_11110 + b_10011 - 2 u_10011 = 0',
-            'u_10011 <= 6',
-            'u_10011 >= 0',
-            'a_00000 + a_00101 + a_01000 + a_01001 + a_01010 + a_01101 + a_01111 + a_10100 + a_11001 + a_11010 + a_11111 + b_10100 - 2 u_10100 = 0',
-            'u_10100 <= 6',
-            'u_10100 >= 0',
-            'a_00000 + a_00110 + a_01010 + a_01110 + a_10101 + a_11000 + a_11010 + b_10101 - 2 u_10101 = 0',
-            'u_10101 <= 4',
-            'u_10101 >= 0',
-            'a_00111 + a_01001 + a_01111 + a_10110 + a_11001 + b_10110 - 2 u_10110 = 0',
-            'u_10110 <= 3',
-            'u_10110 >= 0',
-            'a_00000 + a_01000 + a_01010 + a_10111 + a_11010 + b_10111 - 2 u_10111 = 0',
-            'u_10111 <= 3',
-            'u_10111 >= 0',
-            'a_00001 + a_00011 + a_01001 + a_10011 + a_11000 + b_11000 - 2 u_11000 = 0',
-            'u_11000 <= 3',
-            'u_11000 >= 0',
-            'a_00000 + a_00010 + a_00100 + a_01010 + a_10000 + a_10100 + a_11001 + b_11001 - 2 u_11001 = 0',
-            'u_11001 <= 4',
-            'u_11001 >= 0',
-            'a_00000 + a_00001 + a_00011 + a_00101 + a_01011 + a_10000 + a_10001 + a_10101 + a_11010 + b_11010 - 2 u_11010 = 0',
-            'u_11010 <= 5',
-            'u_11010 >= 0',
-            'a_00001 + a_00010 + a_00100 + a_00110 + a_01000 + a_01100 + a_10000 + a_10001 + a_10010 + a_10110 + a_11011 + b_11011 - 2 u_11011 = 0',
-            'u_11011 <= 6',
-            'u_11011 >= 0',
-            'a_00000 + a_00001 + a_00010 + a_00101 + a_00111 + a_01000 + a_01101 + a_10001 + a_10010 + a_10111 + a_11100 + b_11100 - 2 u_11100 = 0',
-            'u_11100 <= 6',
-            'u_11100 >= 0',
-            'a_00010 + a_00110 + a_01000 + a_01110 + a_10000 + a_10010 + a_11101 + b_11101 - 2 u_11101 = 0',
-            'u_11101 <= 4',
-            'u_11101 >= 0',
-            'a_00001 + a_00111 + a_01111 + a_10001 + a_11110 + b_11110 - 2 u_11110 = 0',
-            'u_11110 <= 3',
-            'u_11110 >= 0',
-            'a_00000 + a_00010 + a_01000 + a_10010 + a_11111 + b_11111 - 2 u_11111 = 0',
-            'u_11111 <= 3',
-            'u_11111 >= 0']
-
-    @staticmethod
-    def ordered_set(seq):
-        """
-        This method eliminates duplicated elements in a given list,
-        and returns a list in which each elements appears only once
-        """
-
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if not (x in seen or seen_add(x))]
-
     @staticmethod
     def flatten_state(s):
         """
@@ -306,27 +113,6 @@ class Diff:
                 state[i] = ((int(str_hex[2*byte:2*(byte + 1)], base=16) >> i) & 0x1)
         return state
 
-    def apply_swap(self, state):
-        """
-        Swap two halves of the state array
-        """
-
-        temp = [0 for _ in range(4)]
-        for i in range(4):
-            temp[i] = state[(i + 1) % 4]
-        return temp
-
-    def apply_inv_swap(self, state):
-        """
-        Apply the inverse of swap operation
-        """
-
-        temp = [0 for _ in range(4)]
-        for i in range(4):
-            temp[i] = state[(i + 3) % 4]
-        return temp
-
-
     def generate_round_x_variables(self, rn):
         """
         Generate the input variables of rn'th round
@@ -335,277 +121,18 @@ class Diff:
         """
 
         x = [[[f"x_{rn}_{bn}_{byten}_{bitn}" for bitn in range(8)] for byten in range(4)] for bn in range(4)]
-        self.binary_variables.extend(self.flatten_state(x))
         return x
 
-    def generate_round_yz_variables(self, rn):
-        """
-        Generate the variables representing the activeness at the output of MDS matrix
-
-        :param rn int: round number
-        """
-
-        y = [[[f"y_{rn}_{bn}_{byten}_{bitn}" for bitn in range(8)] for byten in range(4)] for bn in range(2)]
-        z = [[[f"z_{rn}_{bn}_{byten}_{bitn}" for bitn in range(8)] for byten in range(4)] for bn in range(2)]
-        self.binary_variables.extend(self.flatten_state(z))
-        return y, z
-
-    def generate_round_pr_variables(self, rn):
-        """
-        Generate the variables encoding the probability of S-boxes
-        """
-        pr = [[0 for byten in range(4)] for bn in range(2)]
-        for bn in range(2):
-            for byten in range(4):
-                if (bn == 0 and byten % 2 == 0) or (bn == 1 and byten % 2 == 1):
-                    pr[bn][byten] =  [f"q_{rn}_{bn}_{byten}_{qn}" for qn in self.s0_probabilities.keys()]
-                elif (bn == 0 and byten % 2 == 1) or (bn == 1 and byten % 2 == 0):
-                    pr[bn][byten] =  [f"q_{rn}_{bn}_{byten}_{qn}" for qn in self.s1_probabilities.keys()]
-        self.binary_variables.extend(self.flatten_state(pr))
-        return pr
-
-    def constraints_by_equality(self, a, b):
-        """
-        Generate constraints for equality
-        a = b
-        """
-        constraint = f"{a} - {b} = 0\n"
-        return constraint
-
-    def constraint_by_byte_equality(self, a, b):
-        """
-        Generate constraints corresponding
-        to equality of two bytes
-        """
-
-        constraints = ""
-        for bit in range(8):
-            constraints += f"{a[bit]} - {b[bit]} = 0\n"
-        return constraints
-
-    def constraints_by_xor(self, a, b, c):
-        """
-        a + b = c
-        model:
-        - a - b - c >= -2
-          a + b - c >= 0
-          a - b + c >= 0
-        - a + b + c >= 0
-        """
-
-        constraints = f"- {a} - {b} - {c} >= -2\n"
-        constraints += f"{a} + {b} - {c} >= 0\n"
-        constraints += f"{a} - {b} + {c} >= 0\n"
-        constraints += f"- {a} + {b} + {c} >= 0\n"
-        return constraints
-
-    def constraints_by_byte_xor(self, a, b, c):
-        """
-        Generate constraints for XOR of bytes
-        a + b -> c
-        """
-
-        constraints = ""
-        for bit in range(8):
-            constraints += self.constraints_by_xor(a[bit], b[bit], c[bit])
-        return constraints
-
-    def generate_constraints_by_sbox(self, rn, bn, byten, di, do, pr):
-        """
-        Generate constraints modeling the DDT of S-box
-
-        :return constraints encoding the DDT of S-box:
-        :rtype str:
-        """
-
-        constraints = ""
-        indicator_variable = f"Q_{rn}_{bn}_{byten}"
-        pr_indicators = []
-        self.binary_variables.append(indicator_variable)
-        # Link activeness indicator to input/output
-        sum_input = " + ".join(di)
-        sum_output = " + ".join(do)
-        constraints += f"{sum_input} - {indicator_variable} >= 0\n"
-        constraints += f"{sum_output} - {indicator_variable} >= 0\n"
-        for i in range(8):
-            constraints += f"{indicator_variable} - {di[i]} >= 0\n"
-            constraints += f"{indicator_variable} - {do[i]} >= 0\n"
-
-        if (bn == 0 and byten % 2 == 0) or (bn == 1 and byten % 2 == 1):
-            for q in self.s0_probabilities.keys():
-                q_indicator = f"q_{rn}_{bn}_{byten}_{q}"
-                pr_indicators.append(q_indicator)
-                assert(q_indicator in self.binary_variables)
-                for ineq in self.sbox_inequalities[0][q]:
-                    for i in range(8):
-                        ineq = ineq.replace(f"a{i}", di[i])
-                        ineq = ineq.replace(f"b{i}", do[i])
-                    ineq = ineq.split(' >= ')
-                    lhs = f"{ineq[0]} - {self.big_m} {q_indicator}"
-                    rhs = "{}".format(int(ineq[1]) - self.big_m)
-                    ineq = f"{lhs} >= {rhs}\n"
-                    constraints += ineq
-        if (bn == 0 and byten % 2 == 1) or (bn == 1 and byten % 2 == 0):
-            for q in self.s1_probabilities.keys():
-                q_indicator = f"q_{rn}_{bn}_{byten}_{q}"
-                pr_indicators.append(q_indicator)
-                assert(q_indicator in self.binary_variables)
-                for ineq in self.sbox_inequalities[1][q]:
-                    for i in range(8):
-                        ineq = ineq.replace(f"a{i}", di[i])
-                        ineq = ineq.replace(f"b{i}", do[i])
-                    ineq = ineq.split(' >= ')
-                    lhs = f"{ineq[0]} - {self.big_m} {q_indicator}"
-                    rhs = "{}".format(int(ineq[1]) - self.big_m)
-                    ineq = f"{lhs} >= {rhs}\n"
-                    constraints += ineq
-        # Link probability indicators to the activeness indicator
-        sum_pr = " + ".join(pr_indicators)
-        constraints += f"{sum_pr} - {indicator_variable} = 0\n"
-        return constraints
-
-    def generate_constraints_by_mds(self, rn, bn, mi, mo):
-        """
-        Generate constraints encoding the MDS layers
-
-        :param rn int: round number
-        :param bn int: branch number in {0, 1}
-        :param mi list: vector of input variables
-        :param mo list: vector of output variables
-        :rtype: string
-        :return: constraints modeling MDS in string format
-        """
-
-        constraints = ""
-        dummay_variables = [f"mds_{rn}_{bn}_{bitn}" for bitn in range(32)]
-        self.integer_variables.extend(dummay_variables)
-        mi = [mi[byten][bitn] for byten in range(4) for bitn in range(8)]
-        mo = [mo[byten][bitn] for byten in range(4) for bitn in range(8)]
-        if bn == 0:
-            for ineq in self.mds0_constraints_template:
-                for i in range(32):
-                    bin_index = bin(i)[2:].zfill(5)
-                    ineq = ineq.replace(f"a_{bin_index}", mi[i])
-                    ineq = ineq.replace(f"b_{bin_index}", mo[i])
-                    ineq = ineq.replace(f"u_{bin_index}", dummay_variables[i])
-                constraints += ineq + "\n"
-        elif bn == 1:
-            for ineq in self.mds1_constraints_template:
-                for i in range(32):
-                    bin_index = bin(i)[2:].zfill(5)
-                    ineq = ineq.replace(f"a_{bin_index}", mi[i])
-                    ineq = ineq.replace(f"b_{bin_index}", mo[i])
-                    ineq = ineq.replace(f"u_{bin_index}", dummay_variables[i])
-                constraints += ineq + "\n"
-        return constraints
-
-    def generate_objective_function(self):
-        """
-        Generate the objective function of MILP model
-        The objective is minimizing the summation of variables
-        which encode the weight (or probability exponent) the
-        differential trail
-        """
-
-        objective_function = "minimize\n"
-        objective_terms = []
-        for rn in range(self.nrounds):
-            for bn in range(2):
-                for byten in range(4):
-                    if (bn == 0 and byten % 2 == 0) or (bn == 1 and byten % 2 == 1):
-                        for q in self.s0_probabilities.keys():
-                            indicator = f"q_{rn}_{bn}_{byten}_{q}"
-                            objective_terms += [f"{self.s0_probabilities[q]} {indicator}"]
-                    elif (bn == 0 and byten % 2 == 1) or (bn == 1 and byten % 2 == 0):
-                        for q in self.s1_probabilities.keys():
-                            indicator = f"q_{rn}_{bn}_{byten}_{q}"
-                            objective_terms += [f"{self.s1_probabilities[q]} {indicator}"]
-        objective_function += " + ".join(objective_terms) + "\n"
-        return objective_function
-
-    def generate_constraints(self):
-        """
-        Generate the constraints describing the propagation
-        of differential trails through a reduced-round CLEFIA
-        """
-
-        constraints = "subject to\n"
-        for rn in range(self.nrounds):
-            x_in = self.generate_round_x_variables(rn)
-            x_out = self.generate_round_x_variables(rn + 1)
-            x_mid = self.apply_inv_swap(x_out)
-            y, z = self.generate_round_yz_variables(rn)
-            p = self.generate_round_pr_variables(rn)
-            for bn in range(2):
-                for byten in range(4):
-                    constraints += self.generate_constraints_by_sbox(rn, bn, byten, x_in[2*bn][byten], y[bn][byten], p[bn][byten])
-                    constraints += self.constraint_by_byte_equality(x_in[2*bn][byten], x_mid[2*bn][byten])
-                    constraints += self.constraints_by_byte_xor(z[bn][byten], x_in[2*bn + 1][byten], x_mid[2*bn + 1][byten])
-                constraints += self.generate_constraints_by_mds(rn, bn, y[bn], z[bn])
-        return constraints
-
-    def declare_binary_vars(self):
-        """
-        Declare binary variables of MILP model
-        """
-
-        self.binary_variables = self.ordered_set(self.binary_variables)
-        constraints = "Binary\n"
-        constraints += "\n".join(self.binary_variables) + "\n"
-        constraints += "General\n"
-        constraints += "\n".join(self.integer_variables) + "\n"
-        return constraints
-
-    def exclude_trivial_trail(self):
-        """
-        Exclude all-zero solution from the solution space
-        """
-
-        input_diff = self.flatten_state(self.generate_round_x_variables(0))
-        input_diff = " + ".join(input_diff)
-        constraint = f"{input_diff} >= 1\n"
-        return constraint
-
-    def declare_fixed_variables(self):
-        lp_contents = ""
-        for cond in self.fixed_variables.items():
-            var = cond[0]
-            val = cond[1]
-            var = var.split('_')
-            if len(var) == 2:
-                assert(var[0] == "x")
-                state_vars = self.generate_round_x_variables(var[1])
-                state_vars = self.flatten_state(state_vars)
-                state_values = list(bin(int(val, 16))[2:].zfill(128))
-                for i in range(128):
-                    lp_contents += f"{state_vars[i]} = {state_values[i]}\n"
-            elif len(var) == 4:
-                assert(var[0] == "x")
-                state_vars = [f"x_{var[1]}_{var[2]}_{var[3]}_{bit}" for bit in range(8)]
-                state_values = list(bin(int(val, 16))[2:].zfill(8))
-                for i in range(8):
-                    lp_contents += f"{state_vars[i]} = {state_values[i]}\n"
-            elif len(var) == 5:
-                assert(var[0] == "x")
-                state_vars = f"x_{var[1]}_{var[2]}_{var[3]}_{var[4]}"
-                state_values = val
-                lp_contents += f"{state_vars} = {state_values}\n"
-            else:
-                pass
-        return lp_contents
-
     def make_model(self):
         """
         Build the MILP model to find the best differential trail
         """
 
-        lp_contents = "\\ Differential attack on {} rounds of CLEFIA\n".format(self.nrounds)
-        lp_contents += self.generate_objective_function()
-        lp_contents += self.generate_constraints()
-        lp_contents += self.exclude_trivial_trail()
-        lp_contents += self.declare_fixed_variables()
-        lp_contents += self.declare_binary_vars()
-        lp_contents += "end"
+        sbox_encodings = [IndicatorSboxEncoding(self.sbox_inequalities[0], self.s0_probabilities, self.big_m),
+                          IndicatorSboxEncoding(self.sbox_inequalities[1], self.s1_probabilities, self.big_m)]
+        self.spec = clefia_spec(sbox_encodings)
+        lp_contents = ModelCompiler(self.spec).differential(self.nrounds, self.fixed_variables)
+        self.model_hash = hashlib.sha256((lp_contents + f"\\ startweight: {self.start_weight}").encode()).hexdigest()
         with open(self.lp_file_name, "w") as lp_file:
             lp_file.write(lp_contents)
 
@@ -629,6 +156,11 @@ class Diff:
 
     def solve(self):
         output = None
+        if self.mode == 0 and self.catalog != None:
+            output = self.find_characteristic_in_catalog()
+            if output != None:
+                os.remove(self.lp_file_name)
+                return output
         self.milp_model = read(self.lp_file_name)
         os.remove(self.lp_file_name)
         if self.mode == 0:
@@ -642,29 +174,59 @@ class Diff:
             print('Enter a number in [0, 1, 2], for the mode parameter please!')
         return output
 
-    def parse_solver_output(self):
+    def find_characteristic_in_catalog(self):
+        """
+        Look up the solution of the same model (same LP file and start weight) in the catalog of trails
+        """
+
+        trail = self.catalog.solution(self.model_hash)
+        if trail == None:
+            return None
+        self.total_weight = trail.total_weight
+        diff_trail = trail.to_dict()
+        print(f"\nThe probability of the best differential characteristic: 2^-({self.total_weight}) (found in {self.catalog.file_name})")
+        print("\nDifferential trail:\n")
+        self.print_trail(diff_trail=diff_trail)
+        return diff_trail
+
+    def index_solution_variables(self):
+        """
+        Index the variables of the solved model once, and the positions of the
+        state and probability variables in the values of a solution
+        """
+
+        self.solution_parser = SolutionParser(self.milp_model)
+        self.x_positions = self.solution_parser.positions([self.flatten_state(self.generate_round_x_variables(r)) for r in range(self.nrounds + 1)])
+        q_names = []
+        self.q_weights = []
+        for bn in range(2):
+            for byten in range(4):
+                if (bn == 0 and byten % 2 == 0) or (bn == 1 and byten % 2 == 1):
+                    probabilities = self.s0_probabilities
+                else:
+                    probabilities = self.s1_probabilities
+                for q in probabilities:
+                    q_names.append(f"{bn}_{byten}_{q}")
+                    self.q_weights.append(float(probabilities[q]))
+        self.q_positions = self.solution_parser.positions([[f"q_{r}_{q}" for q in q_names] for r in range(self.nrounds)])
+
+    def parse_solver_output(self, solution_number=None):
         """
         Extract the differential characteristic from the solver output
+
+        :param solution_number int: solution of the pool (default: the current value of the SolutionNumber parameter)
         """
 
-        get_bit_value = lambda t: str(int(self.milp_model.getVarByName(t).Xn))
+        if self.solution_parser == None or self.solution_parser.milp_model is not self.milp_model:
+            self.index_solution_variables()
+        self.solution_parser.load(solution_number)
+        x_values = self.solution_parser.hex_strings(self.x_positions)
+        q_values = self.solution_parser.get(self.q_positions)
         characteristic = dict()
         for r in range(self.nrounds + 1):
-            x = self.flatten_state(self.generate_round_x_variables(r))
-            x_value = hex(int("0b" + "".join(list(map(lambda t: str(int(self.milp_model.getVarByName(t).Xn)), x))), 2))[2:].zfill(32)
-            characteristic[f"x_{r}"] = x_value
+            characteristic[f"x_{r}"] = str(x_values[r])
         for r in range(self.nrounds):
-            round_probability = 0
-            for bn in range(2):
-                for byten in range(4):
-                    if (bn == 0 and byten % 2 == 0) or (bn == 1 and byten % 2 == 1):
-                        for q in self.s0_probabilities:
-                            weight = float(self.s0_probabilities[q])*self.milp_model.getVarByName(f"q_{r}_{bn}_{byten}_{q}").Xn
-                            round_probability += weight
-                    elif (bn == 0 and byten % 2 == 1) or (bn == 1 and byten % 2 == 0):
-                        for q in self.s1_probabilities:
-                            weight = float(self.s1_probabilities[q])*self.milp_model.getVarByName(f"q_{r}_{bn}_{byten}_{q}").Xn
-                            round_probability += weight
+            round_probability = sum([weight*int(q) for weight, q in zip(self.q_weights, q_values[r])])
             characteristic[f"pr_{r}"] = f"-{round_probability}"
         characteristic["total_weight"] = "%0.02f" % self.total_weight
         characteristic["nrounds"] = self.nrounds
@@ -723,6 +285,11 @@ class Diff:
             print("\nDifferential trail:\n")
             diff_trail = self.parse_solver_output()
             self.print_trail(diff_trail=diff_trail)
+            if self.catalog != None:
+                self.catalog.insert_solution(self.spec.name, self.model_hash, diff_trail, optimal=self.milp_model.Status == GRB.OPTIMAL,
+                                             source="find_characteristic", cell_size=self.spec.cell_size)
+            if self.validate:
+                self.check_trail(diff_trail)
         # Gurobi syntax: m.Status == 3 represents the model is infeasible. (GRB.Status.INFEASIBLE)
         elif self.milp_model.Status == GRB.INFEASIBLE:
             print("The model is infeasible!")
@@ -757,10 +324,18 @@ class Diff:
                     self.total_weight = self.milp_model.PoolObjVal
                     diff_trail = self.parse_solver_output()
                     self.print_trail(diff_trail=diff_trail)
+                    if self.catalog != None:
+                        self.catalog.insert(self.spec.name, [diff_trail], source="find_multiple_characteristics", cell_size=self.spec.cell_size)
+                    if self.validate:
+                        self.check_trail(diff_trail)
                 elif (self.milp_model.Status == GRB.TIME_LIMIT or self.milp_model.Status == GRB.INTERRUPTED):
                     self.total_weight = self.milp_model.PoolObjVal
                     diff_trail = self.parse_solver_output()
                     self.print_trail(diff_trail=diff_trail)
+                    if self.catalog != None:
+                        self.catalog.insert(self.spec.name, [diff_trail], source="find_multiple_characteristics", cell_size=self.spec.cell_size)
+                    if self.validate:
+                        self.check_trail(diff_trail)
                     break
                 else:
                     break
@@ -783,6 +358,82 @@ class Diff:
         elapsed_time = time.time() - time_start
         print("Total time to find %s differential trails: %0.02f" % (number_of_trails, elapsed_time))
 
+    def open_trail_pool(self):
+        """
+        Open the trail pool file to which the enumerated trails are appended (see trailpool.py)
+
+        :rtype: TrailPoolWriter
+        :return: None if no trail pool was requested
+        """
+
+        if self.trail_pool_file_name == None:
+            return None
+        nwords = self.spec.ncells*self.spec.cell_size//64
+        return TrailPoolWriter(self.trail_pool_file_name, self.nrounds, nwords, self.spec.cell_size, self.spec.name)
+
+    def solution_states(self, solution_numbers=None):
+        """
+        :param solution_numbers list: solutions of the pool (default: the best solution)
+        :rtype: numpy.ndarray
+        :return: packed states of the trails (see trail.py), shape (len(solution_numbers), nrounds + 1, nwords)
+        """
+
+        if self.solution_parser == None or self.solution_parser.milp_model is not self.milp_model:
+            self.index_solution_variables()
+        if solution_numbers == None:
+            values = self.solution_parser.load(0)[None]
+        else:
+            values = self.solution_parser.load_pool(solution_numbers)
+        return self.solution_parser.words(self.x_positions, values)
+
+    def process_solution_pool(self, weight, trail_pool=None, chunk_size=4096):
+        """
+        Append all solutions of the pool to the trail pool and/or validate them, chunk_size solutions at a time
+
+        :param weight float: weight of the solutions
+        :param trail_pool TrailPoolWriter: output of open_trail_pool()
+        """
+
+        number_of_solutions = self.milp_model.SolCount
+        for start in range(0, number_of_solutions, chunk_size):
+            states = self.solution_states(range(start, min(start + chunk_size, number_of_solutions)))
+            if trail_pool != None:
+                trail_pool.append(states, weight)
+            if self.validate:
+                self.check_trails(states, weight)
+
+    def check_trails(self, states, weights):
+        """
+        Check trails found by the solver against the DDTs and the wiring of the cipher (see validator.py)
+
+        :param states numpy.ndarray: packed states of the trails, shape (ntrails, nrounds + 1, nwords)
+        :param weights numpy.ndarray|float: weights reported by the model, of each trail or of each round of each trail
+        :rtype: bool
+        :return: True if all trails are valid
+        """
+
+        if self.validator == None:
+            self.validator = TrailValidator(self.spec)
+        result = self.validator.validate(states, weights)
+        invalid = result.invalid()
+        for n in invalid[:10]:
+            weights = result.reported_weights[n] if result.reported_weights is not None else None
+            errors = self.validator.errors(states[n], weights, result.tolerance)
+            print(f"Invalid trail: {'; '.join(errors[:5])}{' ...' if len(errors) > 5 else ''}")
+        if len(invalid) != 0:
+            print(f"{len(invalid)} of {len(result)} trails are invalid!")
+        return len(invalid) == 0
+
+    def check_trail(self, diff_trail):
+        """
+        :param diff_trail dict: output of parse_solver_output()
+        :rtype: bool
+        :return: True if the trail is valid
+        """
+
+        trail = Trail.from_dict(diff_trail, self.spec.cell_size)
+        return self.check_trails(trail.states[None], trail.weights[None])
+
     def compute_differential_effect(self):
         """
         Compute the differential effect for a given input/output differences
@@ -818,6 +469,7 @@ class Diff:
             self.milp_model.addConstr(obj >= self.start_weight, 'start_weight_constraint')
         time_start = time.time()
         self.milp_model.optimize()
+        trail_pool = self.open_trail_pool()
         current_probability = 0
         if (self.milp_model.Status == GRB.OPTIMAL):
             self.total_weight = self.milp_model.objVal
@@ -833,6 +485,8 @@ class Diff:
                 self.milp_model.update()
                 self.milp_model.optimize()
                 diff_prob += math.pow(2, -self.total_weight) * self.milp_model.SolCount
+                if trail_pool != None or self.validate:
+                    self.process_solution_pool(self.total_weight, trail_pool)
                 print(f"Current weight: {self.total_weight}")
                 print(f"Number of trails: {self.milp_model.SolCount}")
                 current_probability = math.log(diff_prob, 2)
@@ -848,6 +502,9 @@ class Diff:
             print("The model is infeasible!")
         else:
             print("Unknown Error!")
+        if trail_pool != None:
+            trail_pool.close()
+            print(f"{trail_pool.count} trails written to {trail_pool.file_name}")
         return current_probability
 
     def compute_differential_effect_classic_method(self):
@@ -865,6 +522,7 @@ class Diff:
             self.milp_model.addConstr(obj >= self.start_weight, 'start_weight_constraint')
         time_start = time.time()
         self.milp_model.optimize()
+        trail_pool = self.open_trail_pool()
         # self.milp_model.Params.Quad = 1
         sol_dict = dict()
         if (self.milp_model.Status == GRB.OPTIMAL):
@@ -874,6 +532,12 @@ class Diff:
             while (self.milp_model.Status == GRB.OPTIMAL and self.total_weight <= self.end_weight):
                 self.total_weight = self.milp_model.objVal
                 diff_prob += math.pow(2, -self.total_weight)
+                if trail_pool != None or self.validate:
+                    states = self.solution_states()
+                    if trail_pool != None:
+                        trail_pool.append(states, self.total_weight)
+                    if self.validate:
+                        self.check_trails(states, self.total_weight)
                 total_weight_st = 'ntrails_%0.2f' % self.total_weight
                 sol_dict[total_weight_st] = sol_dict.get(total_weight_st, 0) + 1
                 print('Current weight: %s' % str(self.total_weight))
@@ -887,6 +551,9 @@ class Diff:
             print('The model is infeasible!')
         else:
             print('Unknown Error!')
+        if trail_pool != None:
+            trail_pool.close()
+            print(f"{trail_pool.count} trails written to {trail_pool.file_name}")
 
 def loadparameters(args):
         """
@@ -899,7 +566,10 @@ def loadparameters(args):
                   "endweight" : 128,
                   "timelimit" : 3600,
                   "numberoftrails" : 1,
-                  "fixedVariables" : {}}
+                  "fixedVariables" : {},
+                  "catalog" : None,
+                  "trailpool" : None,
+                  "validate" : False}
 
         # Check if there is an input file specified
         if args.inputfile:
@@ -932,6 +602,15 @@ def loadparameters(args):
         if args.numberoftrails:
             params["numberoftrails"] = args.numberoftrails[0]
 
+        if args.catalog:
+            params["catalog"] = args.catalog[0]
+
+        if args.trailpool:
+            params["trailpool"] = args.trailpool[0]
+
+        if args.validate:
+            params["validate"] = True
+
         return params
 
 def main():
@@ -961,6 +640,12 @@ def main():
                                                      "read the parameters.")
     parser.add_argument('--numberoftrails', nargs=1, type=int,
                         help="Number of trails.")
+    parser.add_argument('--catalog', nargs=1, type=str,
+                        help="SQLite catalog of trails to look up and store the trails.")
+    parser.add_argument('--trailpool', nargs=1, type=str,
+                        help="File to which all trails enumerated in mode 2 are appended (see feistel/trailpool.py).")
+    parser.add_argument('--validate', action='store_true',
+                        help="Check the trails found by the solver against the DDTs of the S-boxes (see feistel/validator.py).")
 
     # Parse command line arguments and construct parameter list.
     args = parser.parse_args()
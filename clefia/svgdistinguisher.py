@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Render boomerang distinguishers of CLEFIA saved by boom.py as SVG files (see feistel/svgrenderer.py)
+"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "feistel"))
+from svgrenderer import SVGRenderer, main
+
+# 16 cells (bytes) of 2 characters each in the trails, and the cells at the input of the S-boxes
+RENDERER = SVGRenderer("CLEFIA", ncells=16, cell_chars=2, sbox_cells=[0, 1, 2, 3, 8, 9, 10, 11])
+
+def svg_distinguisher(bmd, svg_file):
+    """
+    Write the SVG figure of a boomerang distinguisher of CLEFIA
+
+    :param bmd dict: distinguisher saved by boom.py (see the json artifacts)
+    :param svg_file file: opened output file
+    """
+
+    RENDERER.render(bmd, svg_file)
+
+if __name__ == "__main__":
+    main(RENDERER)
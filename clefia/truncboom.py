@@ -8,6 +8,9 @@ from copyreg import constructor
 from truncdiff import WordClefia
 import time
 from gurobipy import *
+from ciphers import clefia_spec
+from modelcompiler import ModelCompiler
+from solutionparser import SolutionParser
 
 class TruncatedBoomerang(WordClefia):
     """
@@ -37,93 +40,7 @@ class TruncatedBoomerang(WordClefia):
         self.w0 = w0
         self.w1 = w1
         self.wm = wm
-
-    def constraint_by_xor(self, a, b, c):
-        """
-        operation:
-        (a, b) |----> c = a + b
-        model:
-        c - a >= 0
-        c - b >= 0
-        a + b - c >= 0
-        """
-
-        constraints = ""
-        constraints += f"{c} - {a} >= 0\n"
-        constraints += f"{c} - {b} >= 0\n"
-        constraints += f"{a} + {b} - {c} >= 0\n"
-        return constraints
-
-    def constraints_by_mds_prob_one(self, dx, dy):
-        """
-        Generate constraints describing the propagation of truncated
-        differential trail through the MDS matrix with probability one
-
-        :param dx list[4]: input of MDS
-        :param dy list[4]: output of MDS
-        """
-
-        constraints = ""
-        for y in dy:
-            for x in dx:
-                constraints += f"{y} - {x} >= 0\n"
-        self.mds_counter += 1
-        return constraints
-
-    def generate_upper_constraints(self):
-        """
-        Generate the constraints describing the propagation of
-        upper differential trail
-        """
-        constraints = ""
-        for rn in range(self.R0):
-            x_in = self.generate_round_x_variables(rn, "u")
-            x_out = self.generate_round_x_variables(rn + 1, "u")
-            x_middle = self.apply_inv_permutation(x_out)
-            z = self.generate_round_z_variables(rn, "u")
-            constraints += self.constraints_by_mds(dx=x_in[0], dy=z[0])
-            constraints += self.constraints_by_mds(dx=x_in[2], dy=z[1])
-            for n in range(4):
-                if rn < self.r0:
-                    constraints += self.constraint_by_trunc_xor(z[0][n], x_in[1][n], x_middle[1][n])
-                    constraints += self.constraint_by_trunc_xor(z[1][n], x_in[3][n], x_middle[3][n])
-                else:
-                    constraints += self.constraint_by_xor(z[0][n], x_in[1][n], x_middle[1][n])
-                    constraints += self.constraint_by_xor(z[1][n], x_in[3][n], x_middle[3][n])
-                constraints += self.constraints_by_equality(x_in[0][n], x_middle[0][n])
-                constraints += self.constraints_by_equality(x_in[2][n], x_middle[2][n])
-            if rn >= 4:
-                constraints += self.diffusion_switching_mechanism(rn, "u")
-                pass
-        return constraints
-
-    def generate_lower_constraints(self):
-        """
-        Generate the constraints describing the propagation of
-        lower differential trail
-        """
-
-        constraints = ""
-        for rn in range(self.R1):
-            x_in = self.generate_round_x_variables(rn, "l")
-            x_out = self.generate_round_x_variables(rn + 1, "l")
-            x_middle = self.apply_inv_permutation(x_out)
-            z = self.generate_round_z_variables(rn, "l")
-            constraints += self.constraints_by_mds(dx=x_in[0], dy=z[0])
-            constraints += self.constraints_by_mds(dx=x_in[2], dy=z[1])
-            for n in range(4):
-                if rn < self.rm:
-                    constraints += self.constraint_by_xor(z[0][n], x_middle[1][n], x_in[1][n])
-                    constraints += self.constraint_by_xor(z[1][n], x_middle[3][n], x_in[3][n])
-                else:
-                    constraints += self.constraint_by_trunc_xor(z[0][n], x_in[1][n], x_middle[1][n])
-                    constraints += self.constraint_by_trunc_xor(z[1][n], x_in[3][n], x_middle[3][n])
-                constraints += self.constraints_by_equality(x_in[0][n], x_middle[0][n])
-                constraints += self.constraints_by_equality(x_in[2][n], x_middle[2][n])
-            if rn >= 4:
-                constraints += self.diffusion_switching_mechanism(rn, "l")
-                pass
-        return constraints
+        self.solution_parser = None
 
     def generate_linking_vars(self, rn):
         """
@@ -132,63 +49,8 @@ class TruncatedBoomerang(WordClefia):
         """
 
         s = [[f"s_{rn}_{bn}_{n}" for n in range(4)] for bn in range(2)]
-        self.milp_variables.extend(self.flatten_byte_state(s))
         return s
 
-    def generate_objective_function(self):
-        """
-        Generate objective function of MILP model
-        """
-
-        upper_active_sboxes = []
-
-        for r in range(0, self.r0):
-            xu = self.generate_round_x_variables(rn=r, ul="u")
-            for i in range(4):
-                if i % 2 == 0:
-                    upper_active_sboxes.append(f"{self.w0*4.67} {xu[0][i]}")
-                    upper_active_sboxes.append(f"{self.w0*6} {xu[2][i]}")
-                else:
-                    upper_active_sboxes.append(f"{self.w0*6} {xu[0][i]}")
-                    upper_active_sboxes.append(f"{self.w0*4.67} {xu[2][i]}")
-        lower_active_sboxes = []
-        for r in range(self.rm, self.R1):
-            xl = self.generate_round_x_variables(rn=r, ul="l")
-            for i in range(4):
-                if i % 2 == 0:
-                    lower_active_sboxes.append(f"{self.w1*4.67} {xl[0][i]}")
-                    lower_active_sboxes.append(f"{self.w1*6} {xl[2][i]}")
-                else:
-                    lower_active_sboxes.append(f"{self.w1*6} {xl[0][i]}")
-                    lower_active_sboxes.append(f"{self.w1*4.67} {xl[2][i]}")
-        common_active_sboxes = []
-        for r in range(self.rm):
-            s = self.generate_linking_vars(r)
-            for i in range(4):
-                if i % 2 == 0:
-                    common_active_sboxes.append(f"{self.wm*4.67} {s[0][i]}")
-                    common_active_sboxes.append(f"{self.wm*6} {s[1][i]}")
-                else:
-                    common_active_sboxes.append(f"{self.wm*6} {s[0][i]}")
-                    common_active_sboxes.append(f"{self.wm*4.67} {s[1][i]}")
-        if upper_active_sboxes == [] and lower_active_sboxes == []:
-            objective  = " + ".join(common_active_sboxes)
-        elif upper_active_sboxes == [] and lower_active_sboxes != [] and common_active_sboxes != []:
-            objective  = " + ".join(lower_active_sboxes) + " + " + \
-                         " + ".join(common_active_sboxes)
-        elif lower_active_sboxes == [] and upper_active_sboxes != [] and common_active_sboxes != []:
-            objective  = " + ".join(upper_active_sboxes) + " + " + \
-                         " + ".join(common_active_sboxes)
-        elif common_active_sboxes == [] and upper_active_sboxes != [] and lower_active_sboxes != []:
-            objective  = " + ".join(upper_active_sboxes) + " + " + \
-                         " + ".join(lower_active_sboxes)
-        else:
-            objective  = " + ".join(upper_active_sboxes) + " + " + \
-                         " + ".join(lower_active_sboxes) + " + " + \
-                         " + ".join(common_active_sboxes)
-        return objective
-
-
     def make_model(self):
         """
         Generate the main constrain of our MILP model
@@ -196,29 +58,9 @@ class TruncatedBoomerang(WordClefia):
         lower parts
         """
 
-        constraints = "minimize\n"
-        constraints += self.generate_objective_function()
-        constraints += "\nsubject to\n"
-        constraints += self.generate_upper_constraints()
-        constraints += self.exclude_trivial_solution(ul="u")
-        constraints += self.generate_lower_constraints()
-        constraints += self.exclude_trivial_solution(ul="l")
-
-        for rn in range(self.rm):
-            s = self.generate_linking_vars(rn)
-            xu = self.generate_round_x_variables(rn + self.r0, ul="u")
-            xl = self.generate_round_x_variables(rn, ul="l")
-            for i in range(4):
-                constraints += f"{xu[0][i]} - {s[0][i]} >= 0\n"
-                constraints += f"{xu[2][i]} - {s[1][i]} >= 0\n"
-                constraints += f"{xl[0][i]} - {s[0][i]} >= 0\n"
-                constraints += f"{xl[2][i]} - {s[1][i]} >= 0\n"
-                constraints += f"- {xu[0][i]} - {xl[0][i]} + {s[0][i]} >= -1\n"
-                constraints += f"- {xu[2][i]} - {xl[2][i]} + {s[1][i]} >= -1\n"
-        constraints += self.declare_binary_vars()
-        constraints += "end"
-        with open(self.lp_file_name, "w") as lpfile:
-            lpfile.write(constraints)
+        lp_contents = ModelCompiler(clefia_spec()).truncated_boomerang(self.r0, self.rm, self.r1, self.w0, self.wm, self.w1)
+        with open(self.lp_file_name, "w") as lp_file:
+            lp_file.write(lp_contents)
 
     def find_truncated_boomerang_trail(self):
         """
@@ -246,45 +88,51 @@ class TruncatedBoomerang(WordClefia):
         objective_value = objective_function.getValue()
         print(f"Number of active S-boxes: {objective_value}")
 
-    def parse_solver_output(self):
+    def index_solution_variables(self):
+        '''
+        Index the variables of the solved model once, and the positions of the
+        truncated states and linking variables in the values of a solution
+        '''
+
+        self.solution_parser = SolutionParser(self.milp_model)
+        self.xu_positions = self.solution_parser.positions([self.flatten_byte_state(self.generate_round_x_variables(rn=r, ul="u")) for r in range(self.R0 + 1)])
+        self.xl_positions = self.solution_parser.positions([self.flatten_byte_state(self.generate_round_x_variables(rn=r, ul="l")) for r in range(self.R1 + 1)])
+        self.s_positions = self.solution_parser.positions([self.flatten_byte_state(self.generate_linking_vars(r)) for r in range(self.rm)])
+
+    def parse_solver_output(self, solution_number=None):
         '''
         Extract the truncated differential characteristic from the solver output
+
+        :param solution_number int: solution of the pool (default: the current value of the SolutionNumber parameter)
         '''
 
         self.upper_trail = dict()
         self.lower_trail = dict()
         self.middle_part = dict()
-        get_value_str = lambda t: str(int(self.milp_model.getVarByName(t).Xn)).zfill(2)
-        get_value_int = lambda t: int(self.milp_model.getVarByName(t).Xn)
+        if self.solution_parser == None or self.solution_parser.milp_model is not self.milp_model:
+            self.index_solution_variables()
+        self.solution_parser.load(solution_number)
+        xu_values = self.solution_parser.bit_strings(self.xu_positions, width=2)
+        xl_values = self.solution_parser.bit_strings(self.xl_positions, width=2)
+        s_values = self.solution_parser.bit_strings(self.s_positions[..., 0:4], width=2)
+        t_values = self.solution_parser.bit_strings(self.s_positions[..., 4::], width=2)
 
         print("\nUpper Truncated Trail:\n")
         for r in range(self.R0 + 1):
-            x_name = self.generate_round_x_variables(rn=r, ul="u")
-            x_name = self.flatten_byte_state(x_name)
-            x_value = ''.join(list(map(get_value_str, x_name)))
-            self.upper_trail[f"x_{r}"] = x_value
-            print(x_value)
+            self.upper_trail[f"x_{r}"] = str(xu_values[r])
+            print(self.upper_trail[f"x_{r}"])
         print("\n%s\n%s" % ("+"*32, "#"*32))
         print("Lower Truncated Trail:\n")
         for r in range(self.R1 + 1):
-            x_name = self.generate_round_x_variables(rn=r, ul="l")
-            x_name = self.flatten_byte_state(x_name)
-            x_value = ''.join(list(map(get_value_str, x_name)))
-            self.lower_trail[f"x_{r}"] = x_value
-            print(x_value)
+            self.lower_trail[f"x_{r}"] = str(xl_values[r])
+            print(self.lower_trail[f"x_{r}"])
         print("\n%s\n%s" % ("#"*32, "#"*32))
         print("Middle Part:\n")
         for r in range(self.rm):
-            s_name = self.generate_linking_vars(r)
-            s_name = self.flatten_byte_state(s_name)
-            s_value = ''.join(list(map(get_value_str, s_name[0:4]))) + "*"*8 + \
-                      ''.join(list(map(get_value_str, s_name[4::]))) + "*"*8
+            s_value = str(s_values[r]) + "*"*8 + str(t_values[r]) + "*"*8
             self.middle_part[f"s_{r}"] = s_value
             print(s_value)
-        s = []
-        for r in range(self.rm):
-            s.extend(self.flatten_byte_state(self.generate_linking_vars(r)))
-        ncs = sum(list(map(get_value_int, s)))
+        ncs = int(self.solution_parser.get(self.s_positions).sum())
         print(f"\nNumber of common active S-boxes: {ncs}")
         self.middle_part["as"] = ncs
         return self.upper_trail, self.middle_part, self.lower_trail
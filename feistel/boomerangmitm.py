@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Exact search for truncated boomerang trails by meet in the middle
+
+The model of ModelCompiler.truncated_boomerang() is solved combinatorially
+for ciphers with 16 cells (TWINE, LBlock and LBlock-s):
+
+- the minimum number of active S-boxes of the first r0 rounds of the upper
+  trail ending in each pattern, and of the last r1 rounds of the lower trail
+  starting in each pattern, are computed by dynamic programs over all 2^16
+  patterns (see truncateddp.py);
+- in the middle part, the upper trail propagates deterministically forwards
+  from its pattern after r0 rounds and the lower trail deterministically
+  backwards from its pattern after rm rounds, so each pattern gives the
+  active S-boxes of all middle rounds, packed into 64-bit words (8 rounds of
+  8 S-boxes per word);
+- patterns with the same middle S-boxes are grouped, keeping the cheapest,
+  and the groups of both trails are joined: the common active S-boxes of two
+  groups are the popcount of the AND of their words.
+
+The join is done block by block in order of increasing cost of the outer
+rounds, and stops when no block can improve the best distinguisher, so the
+result is exactly the optimum of the MILP model.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import time
+import numpy as np
+
+import ciphers
+from truncateddp import TruncatedDP, INFINITY
+
+class BoomerangMITM:
+    """
+    Meet-in-the-middle search for truncated boomerang trails of a generalized Feistel cipher
+    """
+
+    def __init__(self, spec):
+        """
+        :param spec FeistelSpec: description of the cipher (without linear layer, and at most 24 cells)
+        """
+
+        assert(len(set(spec.sbox_costs)) == 1), f"the S-boxes of {spec.name} have different costs"
+        # the lower trail is computed backwards from the copied cells
+        assert(set(spec.sbox_cells) <= set(spec.copied_cells))
+        self.spec = spec
+        self.dp = TruncatedDP(spec)
+        self.sbox_cost = spec.sbox_costs[0]
+        patterns = np.arange(self.dp.npatterns, dtype=np.int64)
+        # the XORs of the middle part: the output is active if and only if an input is active, forwards in the upper
+        # trail and backwards in the lower trail
+        self.upper_next = self.deterministic_round(patterns, forwards=True)
+        self.lower_previous = self.deterministic_round(patterns, forwards=False)
+        # active S-boxes of each pattern, S-box i in bit i
+        cell_bits = 1 << (spec.ncells - 1 - np.arange(spec.ncells, dtype=np.int64))
+        active = (patterns[:, None] & cell_bits[spec.sbox_cells]) != 0
+        self.sbox_masks = (active << np.arange(spec.nsboxes)).sum(axis=1).astype(np.uint64)
+        # transitions of the dynamic program grouped by source, for the lower trail
+        order = np.argsort(self.dp.sources, kind="stable")
+        self.forward_sources = self.dp.sources[order]
+        self.forward_targets = self.dp.targets[order]
+        self.origins, self.origin_starts = np.unique(self.forward_sources, return_index=True)
+
+    def deterministic_round(self, patterns, forwards=True):
+        """
+        :param patterns numpy.ndarray: patterns of the known state
+        :param forwards bool: whether the input (upper trail) or the output (lower trail) of the round is known
+        :rtype: numpy.ndarray
+        :return: pattern of the other state of the round for each known pattern
+        """
+
+        spec = self.spec
+        cell_bits = 1 << (spec.ncells - 1 - np.arange(spec.ncells, dtype=np.int64))
+        output_bits = cell_bits[spec.permutation]
+        known_bits, computed_bits = (cell_bits, output_bits) if forwards else (output_bits, cell_bits)
+        # cell c of the round input, or the cell of the round output it is moved to
+        active = (patterns[:, None] & known_bits) != 0
+        f = [active[:, cell] for cell in spec.sbox_cells]
+        if spec.sbox_permutation != None:
+            for i in range(spec.nsboxes):
+                f[spec.sbox_permutation[i]] = active[:, spec.sbox_cells[i]]
+        result = active[:, spec.copied_cells] @ computed_bits[spec.copied_cells]
+        for j, (src, dst) in enumerate(spec.xor_cells):
+            # dst = f + src forwards, src = f + dst backwards
+            known, computed = (src, dst) if forwards else (dst, src)
+            result |= np.where(f[j] | active[:, known], computed_bits[computed], 0)
+        return result
+
+    def upper_values(self, r0):
+        """
+        :rtype: numpy.ndarray
+        :return: minimum number of active S-boxes of the first r0 rounds of the upper trails ending in each pattern
+        """
+
+        values = self.dp.initial_values()
+        for _ in range(r0):
+            values = self.dp.step(values)[0]
+        return values
+
+    def lower_step(self, values):
+        """
+        One round of the dynamic program of the lower trail, backwards
+
+        :param values numpy.ndarray: minimum cost of the trails starting in each pattern
+        :rtype: tuple
+        :return: minimum cost of the trails starting in each pattern one round earlier, and a successor of each pattern
+        """
+
+        candidates = values[self.forward_targets]
+        best = np.full(self.dp.npatterns, INFINITY, dtype=np.int32)
+        best[self.origins] = np.minimum.reduceat(candidates, self.origin_starts)
+        successors = np.full(self.dp.npatterns, -1, dtype=np.int64)
+        optimal = candidates == best[self.forward_sources]
+        successors[self.forward_sources[optimal]] = self.forward_targets[optimal]
+        return np.minimum(best + self.dp.costs, INFINITY), successors
+
+    def lower_values(self, r1):
+        """
+        :rtype: tuple
+        :return: minimum number of active S-boxes of the last r1 rounds of the lower trails starting in each pattern,
+                 and the successors of each round
+        """
+
+        values = np.zeros(self.dp.npatterns, dtype=np.int32)
+        successors = []
+        for _ in range(r1):
+            values, round_successors = self.lower_step(values)
+            successors.append(round_successors)
+        values[0] = INFINITY
+        return values, successors[::-1]
+
+    def middle_words(self, rm, upper=True):
+        """
+        :rtype: numpy.ndarray
+        :return: active S-boxes of the rm rounds of the middle part for each pattern after r0 rounds of the upper trail
+                 (or for each pattern after rm rounds of the lower trail), 8 S-boxes in a byte and 8 rounds in a word
+        """
+
+        nbits = 8*((self.spec.nsboxes + 7)//8)
+        per_word = 64//nbits
+        words = np.zeros((self.dp.npatterns, max(1, (rm + per_word - 1)//per_word)), dtype=np.uint64)
+        patterns = np.arange(self.dp.npatterns, dtype=np.int64)
+        for t in (range(rm) if upper else range(rm - 1, -1, -1)):
+            if not upper:
+                patterns = self.lower_previous[patterns]
+            word, position = divmod(t, per_word)
+            words[:, word] |= self.sbox_masks[patterns] << np.uint64(nbits*position)
+            if upper:
+                patterns = self.upper_next[patterns]
+        return words
+
+    @staticmethod
+    def groups(words, values):
+        """
+        Group the patterns with the same middle S-boxes, keeping the cheapest pattern of each group
+
+        :rtype: tuple
+        :return: words, cost and representative pattern of each group
+        """
+
+        reachable = np.flatnonzero(values < INFINITY)
+        order = reachable[np.argsort(values[reachable], kind="stable")]
+        keys, first = np.unique(words[order], axis=0, return_index=True)
+        representatives = order[first]
+        return keys, values[representatives], representatives
+
+    def join(self, upper, lower, w0, wm, w1, block_size=256):
+        """
+        :param upper tuple: output of groups() for the upper trail
+        :param lower tuple: output of groups() for the lower trail
+        :rtype: tuple
+        :return: minimum cost, and the representative patterns of the upper and lower trails
+        """
+
+        upper_words, upper_costs, upper_patterns = upper
+        lower_words, lower_costs, lower_patterns = lower
+        upper_order = np.argsort(upper_costs, kind="stable")
+        lower_outer = w1*lower_costs.astype(np.float64)
+        best = (np.inf, None, None)
+        for start in range(0, len(upper_order), block_size):
+            rows = upper_order[start:start + block_size]
+            # the following blocks have more expensive upper trails
+            if w0*upper_costs[rows[0]] + lower_outer.min() >= best[0]:
+                break
+            common = np.bitwise_count(upper_words[rows][:, None, :] & lower_words[None, :, :]).sum(axis=2)
+            totals = w0*upper_costs[rows].astype(np.float64)[:, None] + wm*common + lower_outer[None, :]
+            i, j = np.unravel_index(np.argmin(totals), totals.shape)
+            if totals[i, j] < best[0]:
+                best = (float(totals[i, j]), int(upper_patterns[rows[i]]), int(lower_patterns[j]))
+        return best
+
+    def search(self, r0, rm, r1, w0=1, wm=1, w1=1):
+        """
+        :param r0 int: number of rounds covered by only the upper trail
+        :param rm int: number of rounds covered by both the lower and upper trails (middle part)
+        :param r1 int: number of rounds covered by only the lower trail
+        :param w0 int: cost of active S-boxes in the upper trail
+        :param wm int: cost of common active S-boxes between the upper and lower trails
+        :param w1 int: cost of active S-boxes in the lower trail
+        :rtype: tuple
+        :return: minimum cost, upper trail, middle part and lower trail in the format of TruncatedBoomerang.parse_solver_output()
+        """
+
+        upper_values = self.upper_values(r0)
+        lower_values, successors = self.lower_values(r1)
+        upper = self.groups(self.middle_words(rm, upper=True), upper_values)
+        lower = self.groups(self.middle_words(rm, upper=False), lower_values)
+        cost, u, v = self.join(upper, lower, w0, wm, w1)
+        # upper trail: optimal first r0 rounds ending in u, then the deterministic middle part
+        upper_patterns = self.dp.search(r0, output=u)[1]
+        for _ in range(rm):
+            upper_patterns.append(int(self.upper_next[upper_patterns[-1]]))
+        # lower trail: the deterministic middle part ending in v, then optimal last r1 rounds
+        lower_patterns = [v]
+        for _ in range(rm):
+            lower_patterns.insert(0, int(self.lower_previous[lower_patterns[0]]))
+        for round_successors in successors:
+            lower_patterns.append(int(round_successors[lower_patterns[-1]]))
+        middle_part = dict()
+        ncs = 0
+        for r in range(rm):
+            common = int(self.sbox_masks[upper_patterns[r0 + r]] & self.sbox_masks[lower_patterns[r]])
+            s_values = [(common >> i) & 1 for i in range(self.spec.nsboxes)]
+            middle_part[f"s_{r}"] = '*'.join(map(str, s_values)) + "*"
+            ncs += sum(s_values)
+        middle_part["as"] = ncs
+        return self.sbox_cost*cost, self.dp.trail(upper_patterns), middle_part, self.dp.trail(lower_patterns)
+
+def main():
+    """
+    Print the truncated boomerang trail with the minimum cost
+    """
+
+    specs = {"twine": ciphers.twine_spec, "lblock": ciphers.lblock_spec, "lblock-s": ciphers.lblock_s_spec}
+    parser = ArgumentParser(description="This tool finds the truncated boomerang trail with the minimum cost\n"
+                                        "without solver, for ciphers with 16 cells\n"
+                                        "Example:\n"
+                                        "python3 boomerangmitm.py twine -r0 4 -rm 8 -r1 4 -w0 6 -wm 3 -w1 6",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('cipher', type=str, choices=list(specs), help="cipher")
+    parser.add_argument('-r0', '--r0', type=int, default=4, help="number of rounds covered by E0")
+    parser.add_argument('-rm', '--rm', type=int, default=8, help="number of rounds covered by Em")
+    parser.add_argument('-r1', '--r1', type=int, default=4, help="number of rounds covered by E1")
+    parser.add_argument('-w0', '--w0', type=float, default=6, help="cost of active S-boxes in E0")
+    parser.add_argument('-wm', '--wm', type=float, default=3, help="cost of active S-boxes in Em")
+    parser.add_argument('-w1', '--w1', type=float, default=6, help="cost of active S-boxes in E1")
+    args = parser.parse_args()
+    start_time = time.time()
+    cost, upper_trail, middle_part, lower_trail = BoomerangMITM(specs[args.cipher]()).search(args.r0, args.rm, args.r1,
+                                                                                           args.w0, args.wm, args.w1)
+    print(f"Cost: {cost}")
+    print("\nUpper Truncated Trail:\n")
+    print("\n".join(upper_trail.values()))
+    print("\nLower Truncated Trail:\n")
+    print("\n".join(lower_trail.values()))
+    print("\nMiddle Part:\n")
+    print("\n".join(middle_part[f"s_{r}"] for r in range(args.rm)))
+    print(f"\nNumber of common active S-boxes: {middle_part['as']}")
+    print("Time used: %0.02f seconds" % (time.time() - start_time))
+
+if __name__ == "__main__":
+    main()
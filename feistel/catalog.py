@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Catalog of differential trails in a local SQLite database
+
+Each trail is stored once per cipher in packed binary form (see trail.py),
+together with its input/output differences, its weight and its truncated
+pattern (the activity of all its states), which are indexed. The models that
+were solved to optimality are recorded by a hash of the LP model and the start
+weight (see Diff.model_hash), so that the same search is answered from the
+catalog instead of the solver. Any change of the generated LP file, e.g., in
+modelcompiler.py, gives new hashes, i.e., the earlier entries are not reused.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import sqlite3
+import time
+import numpy as np
+
+from trail import Trail
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trails (
+    id INTEGER PRIMARY KEY,
+    cipher TEXT NOT NULL,
+    nrounds INTEGER NOT NULL,
+    cell_size INTEGER NOT NULL,
+    input BLOB NOT NULL,
+    output BLOB NOT NULL,
+    weight REAL,
+    pattern BLOB NOT NULL,
+    states BLOB NOT NULL,
+    weights BLOB,
+    integral INTEGER NOT NULL DEFAULT 1,
+    source TEXT,
+    created REAL,
+    UNIQUE (cipher, states)
+);
+CREATE INDEX IF NOT EXISTS trails_differential ON trails (cipher, nrounds, input, output, weight);
+CREATE INDEX IF NOT EXISTS trails_output ON trails (cipher, nrounds, output, weight);
+CREATE INDEX IF NOT EXISTS trails_pattern ON trails (cipher, nrounds, pattern, weight);
+CREATE INDEX IF NOT EXISTS trails_weight ON trails (cipher, nrounds, weight);
+CREATE TABLE IF NOT EXISTS solutions (
+    key TEXT PRIMARY KEY,
+    cipher TEXT NOT NULL,
+    nrounds INTEGER NOT NULL,
+    trail_id INTEGER NOT NULL REFERENCES trails (id),
+    optimal INTEGER NOT NULL
+);
+"""
+
+class TrailCatalog:
+    """
+    SQLite catalog of differential trails of several ciphers
+    """
+
+    def __init__(self, file_name="trails.db"):
+        """
+        :param file_name str: SQLite database (created if it does not exist)
+        """
+
+        self.file_name = file_name
+        self.connection = sqlite3.connect(file_name)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def pack_state(state):
+        """
+        :param state str|numpy.ndarray: state in hexadecimal format or packed (see Trail.pack)
+        :rtype: bytes
+        """
+
+        if isinstance(state, str):
+            return bytes.fromhex(state)
+        return np.ascontiguousarray(state, dtype=">u8").tobytes()
+
+    @staticmethod
+    def pack_pattern(pattern):
+        """
+        :param pattern Trail|dict|numpy.ndarray: truncated trail, or activity of each state (see Trail.activity)
+        :rtype: bytes
+        """
+
+        if isinstance(pattern, dict):
+            pattern = Trail.from_dict(pattern)
+        if isinstance(pattern, Trail):
+            pattern = pattern.activity()
+        return np.packbits(np.asarray(pattern, dtype=bool)).tobytes()
+
+    def record(self, cipher, trail, source=None):
+        """
+        :rtype: tuple
+        :return: row of the table trails (without id)
+        """
+
+        weights = None
+        integral = 1
+        if trail.weights is not None:
+            integral = int(np.issubdtype(trail.weights.dtype, np.integer))
+            weights = np.asarray(trail.weights, dtype="<f8").tobytes()
+        weight = trail.total_weight
+        if weight == None and trail.weights is not None:
+            weight = float(np.sum(trail.weights))
+        return (cipher, trail.nrounds, trail.cell_size,
+                self.pack_state(trail.states[0]), self.pack_state(trail.states[-1]),
+                weight, self.pack_pattern(trail.activity()), self.pack_state(trail.states),
+                weights, integral, source, time.time())
+
+    def insert(self, cipher, trails, source=None, cell_size=4):
+        """
+        Insert trails in one transaction (trails already in the catalog are skipped)
+
+        :param cipher str: name of the cipher, e.g., "WARP"
+        :param trails list: Trail objects or dicts in the format of Diff.parse_solver_output()
+        :param source str: where the trails come from, e.g., "find_characteristic"
+        :param cell_size int: cell size of the trails given as dicts
+        :rtype: list
+        :return: ids of the trails
+        """
+
+        trails = [Trail.from_dict(trail, cell_size) if isinstance(trail, dict) else trail for trail in trails]
+        records = [self.record(cipher, trail, source) for trail in trails]
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO trails (cipher, nrounds, cell_size, input, output, weight, pattern, "
+                                        "states, weights, integral, source, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", records)
+        return [self.connection.execute("SELECT id FROM trails WHERE cipher = ? AND states = ?", (cipher, record[7])).fetchone()[0]
+                for record in records]
+
+    def insert_solution(self, cipher, key, trail, optimal=True, source=None, cell_size=4):
+        """
+        Insert a trail and record it as the solution of the model identified by key
+
+        :param key str: key of the model, e.g., Diff.model_hash (SHA-256 of the LP file and the start weight)
+        :param trail Trail|dict: the solution
+        :param optimal bool: whether the model was solved to optimality
+        """
+
+        if isinstance(trail, dict):
+            trail = Trail.from_dict(trail, cell_size)
+        trail_id = self.insert(cipher, [trail], source)[0]
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO solutions (key, cipher, nrounds, trail_id, optimal) VALUES (?, ?, ?, ?, ?)",
+                                    (key, cipher, trail.nrounds, trail_id, int(optimal)))
+
+    @staticmethod
+    def trail(row):
+        """
+        :param row tuple: (nrounds, cell_size, states, weights, integral, weight)
+        :rtype: Trail
+        """
+
+        nrounds, cell_size, states, weights, integral, weight = row
+        states = np.frombuffer(states, dtype=">u8").astype(np.uint64).reshape(nrounds + 1, -1)
+        if weights != None:
+            weights = np.frombuffer(weights, dtype="<f8")
+            weights = weights.astype(np.int64) if integral else weights.copy()
+        return Trail(states, weights, weight, cell_size)
+
+    def solution(self, key, optimal=True):
+        """
+        :param key str: key of the model, e.g., Diff.model_hash (SHA-256 of the LP file and the start weight)
+        :param optimal bool: only return solutions of models solved to optimality
+        :rtype: Trail
+        :return: the recorded solution of the model, or None
+        """
+
+        row = self.connection.execute("SELECT t.nrounds, t.cell_size, t.states, t.weights, t.integral, t.weight FROM solutions s "
+                                      "JOIN trails t ON t.id = s.trail_id WHERE s.key = ? AND s.optimal >= ?",
+                                      (key, int(optimal))).fetchone()
+        return self.trail(row) if row != None else None
+
+    def query(self, cipher, nrounds, input=None, output=None, pattern=None, max_weight=None, limit=None):
+        """
+        Find trails ordered by weight
+
+        :param cipher str: name of the cipher, e.g., "WARP"
+        :param nrounds int: number of rounds
+        :param input str|numpy.ndarray: input difference (hexadecimal or packed)
+        :param output str|numpy.ndarray: output difference (hexadecimal or packed)
+        :param pattern Trail|dict|numpy.ndarray: truncated pattern of all states
+        :param max_weight float: maximum weight
+        :param limit int: maximum number of trails
+        :rtype: list
+        """
+
+        conditions = ["cipher = ?", "nrounds = ?"]
+        arguments = [cipher, nrounds]
+        if input is not None:
+            conditions.append("input = ?")
+            arguments.append(self.pack_state(input))
+        if output is not None:
+            conditions.append("output = ?")
+            arguments.append(self.pack_state(output))
+        if pattern is not None:
+            conditions.append("pattern = ?")
+            arguments.append(self.pack_pattern(pattern))
+        if max_weight != None:
+            conditions.append("weight <= ?")
+            arguments.append(max_weight)
+        sql = "SELECT nrounds, cell_size, states, weights, integral, weight FROM trails WHERE " + " AND ".join(conditions) + " ORDER BY weight"
+        if limit != None:
+            sql += f" LIMIT {int(limit)}"
+        return [self.trail(row) for row in self.connection.execute(sql, arguments)]
+
+    def best(self, cipher, nrounds, **conditions):
+        """
+        :rtype: Trail
+        :return: the trail with the minimum weight satisfying the conditions of query(), or None
+        """
+
+        trails = self.query(cipher, nrounds, limit=1, **conditions)
+        return trails[0] if trails != [] else None
+
+    def count(self, cipher=None):
+        if cipher == None:
+            return self.connection.execute("SELECT COUNT(*) FROM trails").fetchone()[0]
+        return self.connection.execute("SELECT COUNT(*) FROM trails WHERE cipher = ?", (cipher,)).fetchone()[0]
+
+def main():
+    """
+    Print the best trails of the catalog
+    """
+
+    parser = ArgumentParser(description="This tool queries the catalog of differential trails\n"
+                                        "Example:\n"
+                                        "python3 catalog.py trails.db -c WARP -r 6 -n 5",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('catalog', type=str, help="SQLite catalog")
+    parser.add_argument('-c', '--cipher', type=str, required=True, help="name of the cipher, e.g., WARP")
+    parser.add_argument('-r', '--nrounds', type=int, required=True, help="number of rounds")
+    parser.add_argument('-dp', '--input', type=str, help="input difference in hexadecimal format")
+    parser.add_argument('-dc', '--output', type=str, help="output difference in hexadecimal format")
+    parser.add_argument('-w', '--maxweight', type=float, help="maximum weight")
+    parser.add_argument('-n', '--number', type=int, default=10, help="number of trails (default: 10)")
+    args = parser.parse_args()
+    catalog = TrailCatalog(args.catalog)
+    for trail in catalog.query(args.cipher, args.nrounds, input=args.input, output=args.output, max_weight=args.maxweight, limit=args.number):
+        trail = trail.to_dict()
+        print(f"weight: {trail.get('total_weight')}")
+        for r in range(args.nrounds + 1):
+            print(f"x_{r}: {trail[f'x_{r}']}")
+        print("")
+    catalog.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Descriptions of WARP, TWINE, LBlock, LBlock-s and CLEFIA
+
+The encodings of the S-boxes are kept next to the differential models of each
+cipher and are passed to the functions below when a differential model is built.
+The lookup tables of the S-boxes are only used to validate the trails found by
+the solver (see validator.py).
+"""
+
+from feistelspec import FeistelSpec, Matrix
+
+WARP_SBOX = [0xc, 0xa, 0xd, 0x3, 0xe, 0xb, 0xf, 0x7, 0x8, 0x9, 0x1, 0x5, 0x0, 0x2, 0x4, 0x6]
+TWINE_SBOX = [0xc, 0x0, 0xf, 0xa, 0x2, 0xb, 0x9, 0x5, 0x8, 0x3, 0xd, 0x7, 0x1, 0xe, 0x6, 0x4]
+LBLOCK_SBOXES = [[14, 9, 15, 0, 13, 4, 10, 11, 1, 2, 8, 3, 7, 6, 12, 5],
+                 [4, 11, 14, 9, 15, 13, 0, 10, 7, 12, 5, 6, 2, 8, 1, 3],
+                 [1, 14, 7, 12, 15, 13, 0, 6, 11, 5, 9, 3, 2, 4, 8, 10],
+                 [7, 6, 8, 11, 0, 15, 3, 14, 9, 10, 12, 13, 5, 2, 4, 1],
+                 [14, 5, 15, 0, 7, 2, 12, 13, 1, 8, 4, 9, 11, 10, 6, 3],
+                 [2, 13, 11, 12, 15, 14, 0, 9, 7, 10, 6, 3, 1, 8, 4, 5],
+                 [11, 9, 4, 14, 0, 15, 10, 13, 6, 12, 5, 7, 3, 8, 1, 2],
+                 [13, 10, 15, 0, 14, 4, 9, 11, 2, 1, 8, 3, 7, 5, 12, 6]]
+CLEFIA_S0 = [0x57, 0x49, 0xd1, 0xc6, 0x2f, 0x33, 0x74, 0xfb, 0x95, 0x6d, 0x82, 0xea, 0x0e, 0xb0, 0xa8, 0x1c,
+             0x28, 0xd0, 0x4b, 0x92, 0x5c, 0xee, 0x85, 0xb1, 0xc4, 0x0a, 0x76, 0x3d, 0x63, 0xf9, 0x17, 0xaf,
+             0xbf, 0xa1, 0x19, 0x65, 0xf7, 0x7a, 0x32, 0x20, 0x06, 0xce, 0xe4, 0x83, 0x9d, 0x5b, 0x4c, 0xd8,
+             0x42, 0x5d, 0x2e, 0xe8, 0xd4, 0x9b, 0x0f, 0x13, 0x3c, 0x89, 0x67, 0xc0, 0x71, 0xaa, 0xb6, 0xf5,
+             0xa4, 0xbe, 0xfd, 0x8c, 0x12, 0x00, 0x97, 0xda, 0x78, 0xe1, 0xcf, 0x6b, 0x39, 0x43, 0x55, 0x26,
+             0x30, 0x98, 0xcc, 0xdd, 0xeb, 0x54, 0xb3, 0x8f, 0x4e, 0x16, 0xfa, 0x22, 0xa5, 0x77, 0x09, 0x61,
+             0xd6, 0x2a, 0x53, 0x37, 0x45, 0xc1, 0x6c, 0xae, 0xef, 0x70, 0x08, 0x99, 0x8b, 0x1d, 0xf2, 0xb4,
+             0xe9, 0xc7, 0x9f, 0x4a, 0x31, 0x25, 0xfe, 0x7c, 0xd3, 0xa2, 0xbd, 0x56, 0x14, 0x88, 0x60, 0x0b,
+             0xcd, 0xe2, 0x34, 0x50, 0x9e, 0xdc, 0x11, 0x05, 0x2b, 0xb7, 0xa9, 0x48, 0xff, 0x66, 0x8a, 0x73,
+             0x03, 0x75, 0x86, 0xf1, 0x6a, 0xa7, 0x40, 0xc2, 0xb9, 0x2c, 0xdb, 0x1f, 0x58, 0x94, 0x3e, 0xed,
+             0xfc, 0x1b, 0xa0, 0x04, 0xb8, 0x8d, 0xe6, 0x59, 0x62, 0x93, 0x35, 0x7e, 0xca, 0x21, 0xdf, 0x47,
+             0x15, 0xf3, 0xba, 0x7f, 0xa6, 0x69, 0xc8, 0x4d, 0x87, 0x3b, 0x9c, 0x01, 0xe0, 0xde, 0x24, 0x52,
+             0x7b, 0x0c, 0x68, 0x1e, 0x80, 0xb2, 0x5a, 0xe7, 0xad, 0xd5, 0x23, 0xf4, 0x46, 0x3f, 0x91, 0xc9,
+             0x6e, 0x84, 0x72, 0xbb, 0x0d, 0x18, 0xd9, 0x96, 0xf0, 0x5f, 0x41, 0xac, 0x27, 0xc5, 0xe3, 0x3a,
+             0x81, 0x6f, 0x07, 0xa3, 0x79, 0xf6, 0x2d, 0x38, 0x1a, 0x44, 0x5e, 0xb5, 0xd2, 0xec, 0xcb, 0x90,
+             0x9a, 0x36, 0xe5, 0x29, 0xc3, 0x4f, 0xab, 0x64, 0x51, 0xf8, 0x10, 0xd7, 0xbc, 0x02, 0x7d, 0x8e]
+CLEFIA_S1 = [0x6c, 0xda, 0xc3, 0xe9, 0x4e, 0x9d, 0x0a, 0x3d, 0xb8, 0x36, 0xb4, 0x38, 0x13, 0x34, 0x0c, 0xd9,
+             0xbf, 0x74, 0x94, 0x8f, 0xb7, 0x9c, 0xe5, 0xdc, 0x9e, 0x07, 0x49, 0x4f, 0x98, 0x2c, 0xb0, 0x93,
+             0x12, 0xeb, 0xcd, 0xb3, 0x92, 0xe7, 0x41, 0x60, 0xe3, 0x21, 0x27, 0x3b, 0xe6, 0x19, 0xd2, 0x0e,
+             0x91, 0x11, 0xc7, 0x3f, 0x2a, 0x8e, 0xa1, 0xbc, 0x2b, 0xc8, 0xc5, 0x0f, 0x5b, 0xf3, 0x87, 0x8b,
+             0xfb, 0xf5, 0xde, 0x20, 0xc6, 0xa7, 0x84, 0xce, 0xd8, 0x65, 0x51, 0xc9, 0xa4, 0xef, 0x43, 0x53,
+             0x25, 0x5d, 0x9b, 0x31, 0xe8, 0x3e, 0x0d, 0xd7, 0x80, 0xff, 0x69, 0x8a, 0xba, 0x0b, 0x73, 0x5c,
+             0x6e, 0x54, 0x15, 0x62, 0xf6, 0x35, 0x30, 0x52, 0xa3, 0x16, 0xd3, 0x28, 0x32, 0xfa, 0xaa, 0x5e,
+             0xcf, 0xea, 0xed, 0x78, 0x33, 0x58, 0x09, 0x7b, 0x63, 0xc0, 0xc1, 0x46, 0x1e, 0xdf, 0xa9, 0x99,
+             0x55, 0x04, 0xc4, 0x86, 0x39, 0x77, 0x82, 0xec, 0x40, 0x18, 0x90, 0x97, 0x59, 0xdd, 0x83, 0x1f,
+             0x9a, 0x37, 0x06, 0x24, 0x64, 0x7c, 0xa5, 0x56, 0x48, 0x08, 0x85, 0xd0, 0x61, 0x26, 0xca, 0x6f,
+             0x7e, 0x6a, 0xb6, 0x71, 0xa0, 0x70, 0x05, 0xd1, 0x45, 0x8c, 0x23, 0x1c, 0xf0, 0xee, 0x89, 0xad,
+             0x7a, 0x4b, 0xc2, 0x2f, 0xdb, 0x5a, 0x4d, 0x76, 0x67, 0x17, 0x2d, 0xf4, 0xcb, 0xb1, 0x4a, 0xa8,
+             0xb5, 0x22, 0x47, 0x3a, 0xd5, 0x10, 0x4c, 0x72, 0xcc, 0x00, 0xf9, 0xe0, 0xfd, 0xe2, 0xfe, 0xae,
+             0xf8, 0x5f, 0xab, 0xf1, 0x1b, 0x42, 0x81, 0xd6, 0xbe, 0x44, 0x29, 0xa6, 0x57, 0xb9, 0xaf, 0xf2,
+             0xd4, 0x75, 0x66, 0xbb, 0x68, 0x9f, 0x50, 0x02, 0x01, 0x3c, 0x7f, 0x8d, 0x1a, 0x88, 0xbd, 0xac,
+             0xf7, 0xe4, 0x79, 0x96, 0xa2, 0xfc, 0x6d, 0xb2, 0x6b, 0x03, 0xe1, 0x2e, 0x7d, 0x14, 0x95, 0x1d]
+
+def warp_spec(sbox_encodings=None):
+    permutation = [31, 6, 29, 14, 1, 12, 21, 8, 27, 2, 3, 0, 25, 4, 23, 10,
+                   15, 22, 13, 30, 17, 28, 5, 24, 11, 18, 19, 16, 9, 20, 7, 26]
+    return FeistelSpec("WARP", ncells=32, cell_size=4,
+                       sbox_cells=[2*n for n in range(16)],
+                       xor_cells=[(2*n + 1, 2*n + 1) for n in range(16)],
+                       permutation=permutation,
+                       sbox_encodings=sbox_encodings,
+                       sbox_tables=[WARP_SBOX])
+
+def twine_spec(sbox_encodings=None):
+    permutation = [0x5, 0x0, 0x1, 0x4, 0x7, 0xc, 0x3, 0x8, 0xd, 0x6, 0x9, 0x2, 0xf, 0xa, 0xb, 0xe]
+    return FeistelSpec("TWINE", ncells=16, cell_size=4,
+                       sbox_cells=[2*n for n in range(8)],
+                       xor_cells=[(2*n + 1, 2*n + 1) for n in range(8)],
+                       permutation=permutation,
+                       sbox_encodings=sbox_encodings,
+                       sbox_tables=[TWINE_SBOX])
+
+def lblock_spec(sbox_encodings=None, name="LBlock", sbox_types=None, sbox_tables=None):
+    """
+    The left half (nibbles 0, ..., 7) enters the S-boxes, the outputs of the S-boxes are permuted and added
+    to the right half rotated by 8 bits to the left, and both halves are swapped
+    """
+
+    return FeistelSpec(name, ncells=16, cell_size=4,
+                       sbox_cells=list(range(8)),
+                       xor_cells=[(8 + (n + 2)%8, 8 + n) for n in range(8)],
+                       permutation=[(n + 8)%16 for n in range(16)],
+                       sbox_types=sbox_types if sbox_types != None else [7 - n for n in range(8)],
+                       sbox_encodings=sbox_encodings,
+                       sbox_permutation=[2, 0, 3, 1, 6, 4, 7, 5],
+                       sbox_tables=sbox_tables if sbox_tables != None else LBLOCK_SBOXES)
+
+def lblock_s_spec(sbox_encodings=None):
+    """
+    LBlock-s uses the same S-box in all positions
+    """
+
+    return lblock_spec(sbox_encodings, name="LBlock-s", sbox_types=[0]*8, sbox_tables=LBLOCK_SBOXES[:1])
+
+def clefia_dsm(compiler, rn, ul):
+    """
+    Conditions modeling the diffusion switching mechanism (DSM) of CLEFIA in the truncated models.
+    Switching between two different MDS matrices in the diffusion layer of CLEFIA guarantees
+    a certain number of active S-boxes over consecutive rounds.
+    Reference:
+    - On Feistel Structures Using a Diffusion Switching Mechanism (https://www.iacr.org/archive/fse2006/40470042/40470042.pdf)
+
+    :param rn int: round number
+    :rtype: list
+    :return: constraints modeling the DSM in rounds rn - 4, ..., rn
+    """
+
+    if rn < 4:
+        return []
+    x = [compiler.truncated_state(t, ul) for t in range(rn - 4, rn + 1)]
+    branch = lambda state, bn: state[4*bn:4*(bn + 1)]
+    constraints = []
+    for first, second in [(branch(x[3], 0) + branch(x[1], 2), branch(x[4], 0) + branch(x[0], 0)),
+                          (branch(x[3], 2) + branch(x[1], 0), branch(x[4], 2) + branch(x[0], 2))]:
+        dsm = compiler.counter_variable("dsm")
+        temp0 = " + ".join(first)
+        temp1 = " + ".join(first + second)
+        constraints.append(f"{temp0} - 8 {dsm} <= 0\n")
+        constraints.append(f"{temp0} - {dsm} >= 0\n")
+        constraints.append(f"{temp1} - 5 {dsm} >= 0\n")
+    return constraints
+
+def clefia_spec(sbox_encodings=None):
+    """
+    The state consists of four branches of four bytes, and the cells are labeled branch_byte.
+    The F-functions F0 and F1 take the branches 0 and 2, and the S-boxes are labeled F_byte.
+    The S-boxes S0 (type 0) and S1 (type 1) alternate in each F-function.
+    """
+
+    m0 = [[0x1, 0x2, 0x4, 0x6], [0x2, 0x1, 0x6, 0x4], [0x4, 0x6, 0x1, 0x2], [0x6, 0x4, 0x2, 0x1]]
+    m1 = [[0x1, 0x8, 0x2, 0xa], [0x8, 0x1, 0xa, 0x2], [0x2, 0xa, 0x1, 0x8], [0xa, 0x2, 0x8, 0x1]]
+    return FeistelSpec("CLEFIA", ncells=16, cell_size=8,
+                       sbox_cells=[0, 1, 2, 3, 8, 9, 10, 11],
+                       xor_cells=[(4 + n, 4 + n) for n in range(4)] + [(12 + n, 12 + n) for n in range(4)],
+                       permutation=[4*((bn + 3)%4) + n for bn in range(4) for n in range(4)],
+                       sbox_types=[0, 1, 0, 1, 1, 0, 1, 0],
+                       sbox_encodings=sbox_encodings,
+                       matrices=[Matrix([0, 1, 2, 3], m0, 0x11d, 5), Matrix([4, 5, 6, 7], m1, 0x11d, 5)],
+                       cell_labels=[f"{bn}_{n}" for bn in range(4) for n in range(4)],
+                       sbox_labels=[f"{fn}_{n}" for fn in range(2) for n in range(4)],
+                       sbox_costs=[4.67, 6],
+                       truncated_xor_model=1,
+                       truncated_constraints=clefia_dsm,
+                       sbox_tables=[CLEFIA_S0, CLEFIA_S1])
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Declarative description of generalized Feistel ciphers
+
+The state consists of ncells cells of cell_size bits, and each round is made of the following steps:
+    1. S-box j is applied to the cell sbox_cells[j] of the round input,
+    2. optionally, a linear layer is applied to the outputs of the S-boxes, i.e., either a
+       permutation of the S-box outputs (as in LBlock), or matrices over GF(2^cell_size)
+       applied to groups of S-box outputs (as the MDS matrices of CLEFIA),
+    3. output j of the F-functions is added to the cell xor_cells[j][0] of the round input and
+       the sum is written into the cell xor_cells[j][1], whereas every other cell is copied,
+    4. the cell i of the resulting state becomes the cell permutation[i] of the round output.
+The round keys do not affect the propagation of differences and are not described.
+"""
+
+class SboxEncoding:
+    """
+    Encoding of the DDT of an S-box by linear inequalities over
+    a0, a1, ... (input difference, a0: msb), b0, b1, ... (output difference, b0: msb)
+    and p0, p1, ..., such that the solutions are the possible transitions and the
+    weight of a transition, i.e., -log2 of its probability, is the sum of the p's.
+    """
+
+    def __init__(self, inequalities, nweights):
+        """
+        :param inequalities list: inequalities in string format, e.g., "- a0 + b1 - p2 >= -1"
+        :param nweights int: number of variables p0, p1, ...
+        """
+
+        self.inequalities = inequalities
+        self.nweights = nweights
+
+class IndicatorSboxEncoding:
+    """
+    Encoding of the DDT of an S-box by one set of inequalities over a0, a1, ... and b0, b1, ...
+    for each probability of the DDT. Each set is activated by its own indicator variable (big-M
+    method), and exactly one indicator is one if the S-box is active.
+    """
+
+    def __init__(self, inequalities, weights, big_m):
+        """
+        :param inequalities dict: label of the probability -> list of inequalities in string format
+        :param weights dict: label of the probability -> weight of the transitions, i.e., -log2 of their probability
+        :param big_m int: constant of the big-M method
+        """
+
+        self.inequalities = inequalities
+        self.weights = weights
+        self.big_m = big_m
+
+class Matrix:
+    """
+    Matrix over GF(2^n) applied to the outputs of a group of S-boxes
+    """
+
+    def __init__(self, sboxes, entries, polynomial, branch_number):
+        """
+        :param sboxes list: S-boxes whose outputs form the input vector of the matrix (and are replaced by its output)
+        :param entries list: rows of the matrix, where each entry is an element of GF(2^n) in integer representation
+        :param polynomial int: irreducible polynomial defining GF(2^n), e.g., 0x11d
+        :param branch_number int: differential branch number of the matrix
+        """
+
+        assert(len(entries) == len(sboxes) and all(len(row) == len(sboxes) for row in entries))
+        self.sboxes = sboxes
+        self.entries = entries
+        self.polynomial = polynomial
+        self.branch_number = branch_number
+
+    def multiply(self, a, b, n):
+        result = 0
+        while b != 0:
+            if b & 1:
+                result ^= a
+            b >>= 1
+            a <<= 1
+            if a >> n:
+                a ^= self.polynomial
+        return result
+
+    def binary(self, n):
+        """
+        :param n int: cell size
+        :rtype: list
+        :return: rows of the binary matrix acting on the input bits (msb first in each cell)
+        """
+
+        rows = []
+        for row in self.entries:
+            for bit in range(n):
+                rows.append([(self.multiply(entry, 1 << (n - 1 - ibit), n) >> (n - 1 - bit)) & 1
+                             for entry in row for ibit in range(n)])
+        return rows
+
+class FeistelSpec:
+    """
+    Description of a generalized Feistel cipher (see the module docstring for the meaning of the parameters)
+    """
+
+    def __init__(self, name, ncells, cell_size, sbox_cells, xor_cells, permutation,
+                 sbox_types=None, sbox_encodings=None, sbox_permutation=None, matrices=None,
+                 cell_labels=None, sbox_labels=None, sbox_costs=None, truncated_xor_model=2,
+                 truncated_constraints=None, sbox_tables=None):
+        """
+        :param name str: name of the cipher, used in the comments of the models
+        :param ncells int: number of cells of the state
+        :param cell_size int: number of bits of each cell
+        :param sbox_cells list: cell at the input of each S-box
+        :param xor_cells list: (cell added to the output j of the F-functions, cell receiving the sum) for each output j
+        :param permutation list: the cell i after the XORs becomes the cell permutation[i] of the round output
+        :param sbox_types list: type of each S-box, i.e., index of its encoding and cost (default: a single type)
+        :param sbox_encodings list: SboxEncoding or IndicatorSboxEncoding of each type (only needed for the differential models)
+        :param sbox_permutation list: output i of the S-boxes becomes output sbox_permutation[i] of the F-functions
+        :param matrices list: Matrix objects applied to the outputs of the S-boxes
+        :param cell_labels list: label of each cell in the names of the variables (default: its index)
+        :param sbox_labels list: label of each S-box in the names of the variables (default: its index)
+        :param sbox_costs list: cost of an active S-box of each type in the truncated boomerang models (default: 1)
+        :param truncated_xor_model int: model of the truncated XOR, 1 (with a dummy variable) or 2 (without)
+        :param truncated_constraints function: f(compiler, rn, ul) returning additional constraints of the
+                                               truncated models for round rn, e.g., the diffusion switching mechanism of CLEFIA
+        :param sbox_tables list: lookup table of the S-box of each type (only needed to validate trails)
+        """
+
+        nsboxes = len(sbox_cells)
+        assert(sorted(permutation) == list(range(ncells)))
+        assert(len(xor_cells) == nsboxes)
+        assert(len(set([dst for _, dst in xor_cells])) == nsboxes)
+        assert(sbox_permutation == None or sorted(sbox_permutation) == list(range(nsboxes)))
+        assert(sbox_tables == None or all(sorted(table) == list(range(2**cell_size)) for table in sbox_tables))
+        self.name = name
+        self.ncells = ncells
+        self.cell_size = cell_size
+        self.nsboxes = nsboxes
+        self.sbox_cells = sbox_cells
+        self.xor_cells = xor_cells
+        self.permutation = permutation
+        self.sbox_types = sbox_types if sbox_types != None else [0]*nsboxes
+        self.sbox_encodings = sbox_encodings
+        self.sbox_permutation = sbox_permutation
+        self.matrices = matrices if matrices != None else []
+        self.cell_labels = cell_labels if cell_labels != None else [str(n) for n in range(ncells)]
+        self.sbox_labels = sbox_labels if sbox_labels != None else [str(n) for n in range(nsboxes)]
+        self.sbox_costs = sbox_costs if sbox_costs != None else [1]*(max(self.sbox_types) + 1)
+        self.truncated_xor_model = truncated_xor_model
+        self.truncated_constraints = truncated_constraints
+        self.sbox_tables = sbox_tables
+        destinations = set([dst for _, dst in xor_cells])
+        # cells which are copied from the round input
+        self.copied_cells = [n for n in range(ncells) if n not in destinations]
@@ -0,0 +1,593 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Compile the MILP models of a cipher described by a FeistelSpec into the LP format
+
+The following models are supported:
+    - differential: the best differential trail, or all trails of a differential (bit-level),
+    - truncated differential: the truncated differential trail with the minimum number of active S-boxes,
+    - truncated boomerang: the upper/lower truncated trails and the common active S-boxes of the middle part.
+The inequalities of the S-box encodings are compiled once into a single format string per
+encoding, so that the constraints of each S-box are generated by one call, and the LP text is
+collected in a list and joined at the end.
+
+The fixed variables of the differential model (e.g., the inactive cells of a truncated trail) are
+propagated through the rounds before the model is generated. The constraints whose variables are
+all fixed are dropped (in particular the S-boxes and matrices with zero input and output), the fixed
+variables are substituted in the XORs and matrices, and they are fixed by bounds instead of rows.
+"""
+
+import re
+
+from feistelspec import SboxEncoding, IndicatorSboxEncoding
+
+class ModelCompiler:
+    """
+    Generate the LP files of the MILP models for a given FeistelSpec
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.binary_variables = {}
+        self.general_variables = {}
+        self.counters = {}
+        self.bounds = {}
+        self.sbox_templates = {}
+        self.binary_matrices = [matrix.binary(spec.cell_size) for matrix in spec.matrices]
+
+    def reset(self):
+        self.binary_variables = {}
+        self.general_variables = {}
+        self.counters = {}
+        self.bounds = {}
+
+    def declare(self, variables):
+        self.binary_variables.update(dict.fromkeys(variables))
+        return variables
+
+    def counter_variable(self, prefix, binary=True):
+        """
+        :rtype: str
+        :return: a new variable prefix_n, where n counts the variables with the same prefix
+        """
+
+        n = self.counters.get(prefix, 0)
+        self.counters[prefix] = n + 1
+        variable = f"{prefix}_{n}"
+        if binary:
+            self.binary_variables[variable] = None
+        else:
+            self.general_variables[variable] = None
+        return variable
+
+    @staticmethod
+    def compile_inequalities(inequalities, suffix=None):
+        """
+        Turn inequalities over a0, ..., b0, ..., p0, ... into one format string with the
+        fields {a[i]}, {b[i]} and {p[i]}
+
+        :param suffix function: applied to (lhs, rhs) of each inequality, e.g., to add a big-M term
+        """
+
+        lines = []
+        for inequality in inequalities:
+            inequality = re.sub(r"\b([abp])(\d+)\b", r"{\1[\2]}", inequality.strip())
+            if suffix != None:
+                lhs, rhs = inequality.split(" >= ")
+                inequality = suffix(lhs, rhs)
+            lines.append(inequality + "\n")
+        return "".join(lines)
+
+    def sbox_template(self, sbox_type):
+        if sbox_type in self.sbox_templates:
+            return self.sbox_templates[sbox_type]
+        encoding = self.spec.sbox_encodings[sbox_type]
+        if isinstance(encoding, SboxEncoding):
+            template = self.compile_inequalities(encoding.inequalities)
+        elif isinstance(encoding, IndicatorSboxEncoding):
+            big_m = encoding.big_m
+            template = {}
+            for label, inequalities in encoding.inequalities.items():
+                template[label] = self.compile_inequalities(inequalities,
+                    lambda lhs, rhs: f"{lhs} - {big_m} {{q}} >= {int(rhs) - big_m}")
+        else:
+            raise TypeError(f"unknown S-box encoding: {type(encoding)}")
+        self.sbox_templates[sbox_type] = template
+        return template
+
+    ##########################################################################################
+    # Differential model
+    ##########################################################################################
+
+    def bit_variables(self, name, rn, labels, declare=True):
+        n = self.spec.cell_size
+        variables = [[f"{name}_{rn}_{label}_{bit}" for bit in range(n)] for label in labels]
+        if declare:
+            for cell in variables:
+                self.declare(cell)
+        return variables
+
+    def state(self, rn):
+        """
+        :rtype: list
+        :return: variables of the input difference of round rn, cell by cell (msb first)
+        """
+
+        return self.bit_variables("x", rn, self.spec.cell_labels)
+
+    @staticmethod
+    def xor_constraints(a, b, c):
+        return [f"- {a} - {b} - {c} >= -2\n",
+                f"{a} + {b} - {c} >= 0\n",
+                f"{a} - {b} + {c} >= 0\n",
+                f"- {a} + {b} + {c} >= 0\n"]
+
+    def sbox_constraints(self, rn, j, di, do, objective, inactive=False):
+        """
+        Constraints modeling the DDT of S-box j in round rn, where the terms of its
+        weight are appended to the objective
+
+        :param inactive bool: the input and output are fixed to zero, so the weight variables are only fixed to zero
+        """
+
+        spec = self.spec
+        label = spec.sbox_labels[j]
+        encoding = spec.sbox_encodings[spec.sbox_types[j]]
+        if inactive:
+            if isinstance(encoding, SboxEncoding):
+                weights = [f"pr_{rn}_{label}_{bit}" for bit in range(encoding.nweights)]
+            else:
+                weights = [f"Q_{rn}_{label}"] + [f"q_{rn}_{label}_{q}" for q in encoding.weights]
+            self.bounds.update(dict.fromkeys(self.declare(weights), 0))
+            return []
+        template = self.sbox_template(spec.sbox_types[j])
+        if isinstance(encoding, SboxEncoding):
+            pr = self.declare([f"pr_{rn}_{label}_{bit}" for bit in range(encoding.nweights)])
+            objective.extend(pr)
+            return [template.format(a=di, b=do, p=pr)]
+        indicator = f"Q_{rn}_{label}"
+        self.binary_variables[indicator] = None
+        # link the activeness indicator to the input/output
+        constraints = [f"{' + '.join(di)} - {indicator} >= 0\n",
+                       f"{' + '.join(do)} - {indicator} >= 0\n"]
+        for i in range(len(di)):
+            constraints.append(f"{indicator} - {di[i]} >= 0\n")
+            constraints.append(f"{indicator} - {do[i]} >= 0\n")
+        pr_indicators = []
+        for q, weight in encoding.weights.items():
+            q_indicator = f"q_{rn}_{label}_{q}"
+            pr_indicators.append(q_indicator)
+            objective.append(f"{weight} {q_indicator}")
+            constraints.append(template[q].format(a=di, b=do, q=q_indicator))
+        self.declare(pr_indicators)
+        constraints.append(f"{' + '.join(pr_indicators)} - {indicator} = 0\n")
+        return constraints
+
+    def matrix_constraints(self, rn, m, mi, mo):
+        """
+        Constraints modeling the bit-level XORs of matrix m, where the fixed variables are substituted
+
+        :param mi list: input variables, cell by cell
+        :param mo list: output variables, cell by cell
+        """
+
+        mi = [bit for cell in mi for bit in cell]
+        mo = [bit for cell in mo for bit in cell]
+        constraints = []
+        for i, row in enumerate(self.binary_matrices[m]):
+            terms = [mi[j] for j in range(len(mi)) if row[j] == 1] + [mo[i]]
+            free = [term for term in terms if term not in self.bounds]
+            if free == []:
+                continue
+            ones = sum(self.bounds[term] for term in terms if term in self.bounds)
+            dummy = f"mds_{rn}_{m}_{i}"
+            self.general_variables[dummy] = None
+            constraints.append(f"{' + '.join(free)} - 2 {dummy} = {-ones}\n")
+            constraints.append(f"{dummy} <= {len(terms)//2}\n")
+            constraints.append(f"{dummy} >= 0\n")
+        return constraints
+
+    def xor_with_fixed_variables(self, a, b, c):
+        """
+        Constraints modeling a + b + c = 0, where the fixed variables are substituted (after
+        propagate_fixed_values(), at most one of them is fixed unless all of them are)
+        """
+
+        free = [v for v in (a, b, c) if v not in self.bounds]
+        if len(free) == 3:
+            return self.xor_constraints(a, b, c)
+        if len(free) == 2:
+            if sum(self.bounds[v] for v in (a, b, c) if v in self.bounds) == 0:
+                return [f"{free[0]} - {free[1]} = 0\n"]
+            return [f"{free[0]} + {free[1]} = 1\n"]
+        return []
+
+    def differential_variables(self, rn):
+        """
+        :rtype: tuple
+        :return: variables of round rn, cell by cell: input, output before the cell permutation, outputs of
+                 the S-boxes, inputs and outputs of the matrices (None without linear layer) and outputs of the F-functions
+        """
+
+        spec = self.spec
+        x_in = self.state(rn)
+        x_out = self.state(rn + 1)
+        x_mid = [x_out[spec.permutation[i]] for i in range(spec.ncells)]
+        y = self.bit_variables("y", rn, spec.sbox_labels)
+        f = list(y)
+        if spec.sbox_permutation != None:
+            for i in range(spec.nsboxes):
+                f[spec.sbox_permutation[i]] = y[i]
+        matrices = None
+        if spec.matrices != []:
+            # declared with the constraints of the matrices
+            z = self.bit_variables("z", rn, spec.sbox_labels, declare=False)
+            matrices = (f, z)
+            f = list(f)
+            for matrix in spec.matrices:
+                for j in matrix.sboxes:
+                    f[j] = z[j]
+        return x_in, x_mid, y, matrices, f
+
+    def differential_round(self, rn, objective):
+        """
+        Constraints of round rn, without the constraints whose variables are all fixed (see propagate_fixed_values())
+        """
+
+        spec = self.spec
+        x_in, x_mid, y, matrices, f = self.differential_variables(rn)
+        constraints = []
+        for n in spec.copied_cells:
+            constraints.extend([f"{a} - {b} = 0\n" for a, b in zip(x_in[n], x_mid[n])
+                                if a not in self.bounds and b not in self.bounds])
+        for j, cell in enumerate(spec.sbox_cells):
+            inactive = all(self.bounds.get(bit) == 0 for bit in x_in[cell] + y[j])
+            constraints.extend(self.sbox_constraints(rn, j, x_in[cell], y[j], objective, inactive))
+        if matrices != None:
+            mi, mo = matrices
+            for cell in mo:
+                self.declare(cell)
+            for m, matrix in enumerate(spec.matrices):
+                constraints.extend(self.matrix_constraints(rn, m, [mi[j] for j in matrix.sboxes], [mo[j] for j in matrix.sboxes]))
+        for j, (src, dst) in enumerate(spec.xor_cells):
+            for a, b, c in zip(f[j], x_in[src], x_mid[dst]):
+                constraints.extend(self.xor_with_fixed_variables(a, b, c))
+        return constraints
+
+    def fixed_values(self, fixed_variables):
+        """
+        :param fixed_variables dict: x_r -> value of the whole state in hex ("*" for the cells which are not fixed),
+                                     x_r_cell -> value of a cell in hex, or variable -> value
+        :rtype: dict
+        :return: value of each fixed variable
+        """
+
+        spec = self.spec
+        nchars = spec.cell_size//4
+        values = {}
+        for var, val in fixed_variables.items():
+            parts = var.split("_")
+            assert(parts[0] == "x")
+            if len(parts) == 2:
+                state = self.state(parts[1])
+                for n in range(spec.ncells):
+                    cell_value = val[nchars*n:nchars*(n + 1)]
+                    if "*" in cell_value:
+                        continue
+                    bits = bin(int(cell_value, 16))[2:].zfill(spec.cell_size)
+                    values.update({state[n][i]: int(bits[i]) for i in range(spec.cell_size)})
+            elif "_".join(parts[2:]) in spec.cell_labels:
+                cell = [f"x_{parts[1]}_{'_'.join(parts[2:])}_{bit}" for bit in range(spec.cell_size)]
+                bits = bin(int(val, 16))[2:].zfill(spec.cell_size)
+                values.update({cell[i]: int(bits[i]) for i in range(spec.cell_size)})
+            else:
+                values[var] = int(val)
+        return values
+
+    def propagate_fixed_values(self, nrounds, values):
+        """
+        Propagate the fixed variables through the rounds until nothing changes: copied cells are
+        equal, a bit of an XOR is fixed by the two other bits, the input of an S-box or a matrix is
+        zero if and only if its output is zero (both are permutations), and the output of a matrix
+        is fixed by its input
+
+        :param values dict: value of each fixed variable, which is completed
+        :rtype: bool
+        :return: False if the fixed variables contradict each other
+        """
+
+        spec = self.spec
+        # the variables are declared in the order of the constraints, afterwards
+        declared = dict(self.binary_variables)
+        rounds = [self.differential_variables(rn) for rn in range(nrounds)]
+        self.binary_variables = declared
+        # pairs of cells with an all-zero relation, and bit-level relations (equalities and XORs)
+        zero_pairs = []
+        equalities = []
+        xors = []
+        linear = []
+        for x_in, x_mid, y, matrices, f in rounds:
+            for n in spec.copied_cells:
+                equalities.extend(zip(x_in[n], x_mid[n]))
+            for j, cell in enumerate(spec.sbox_cells):
+                zero_pairs.append((x_in[cell], y[j]))
+            if matrices != None:
+                mi, mo = matrices
+                for m, matrix in enumerate(spec.matrices):
+                    inputs = [bit for j in matrix.sboxes for bit in mi[j]]
+                    outputs = [bit for j in matrix.sboxes for bit in mo[j]]
+                    zero_pairs.append((inputs, outputs))
+                    linear.append((self.binary_matrices[m], inputs, outputs))
+            for j, (src, dst) in enumerate(spec.xor_cells):
+                xors.extend(zip(f[j], x_in[src], x_mid[dst]))
+        changed = True
+        while changed:
+            changed = False
+            for a, b in equalities:
+                if (a in values) != (b in values):
+                    values[a if b in values else b] = values[a if a in values else b]
+                    changed = True
+                elif a in values and values[a] != values[b]:
+                    return False
+            for bits in xors:
+                free = [v for v in bits if v not in values]
+                if len(free) == 1:
+                    values[free[0]] = sum(values[v] for v in bits if v in values) % 2
+                    changed = True
+                elif free == [] and sum(values[v] for v in bits) % 2 != 0:
+                    return False
+            for di, do in zero_pairs:
+                for zero, other in ((di, do), (do, di)):
+                    if all(values.get(v) == 0 for v in zero):
+                        if any(values.get(v) == 1 for v in other):
+                            return False
+                        if any(v not in values for v in other):
+                            values.update(dict.fromkeys(other, 0))
+                            changed = True
+            for rows, inputs, outputs in linear:
+                if all(v in values for v in inputs):
+                    changed |= any(v not in values for v in outputs)
+                    for row, output in zip(rows, outputs):
+                        value = sum(values[v] for v, r in zip(inputs, row) if r == 1) % 2
+                        if values.setdefault(output, value) != value:
+                            return False
+        return True
+
+    def differential(self, nrounds, fixed_variables={}):
+        """
+        Model minimizing the weight of a differential trail
+
+        :param nrounds int: number of rounds
+        :param fixed_variables dict: see fixed_values()
+        :rtype: str
+        :return: contents of the LP file
+        """
+
+        assert(self.spec.sbox_encodings != None)
+        self.reset()
+        values = self.fixed_values(fixed_variables)
+        propagated = dict(values)
+        if self.propagate_fixed_values(nrounds, propagated):
+            self.bounds = propagated
+        objective = []
+        constraints = []
+        for rn in range(nrounds):
+            constraints.extend(self.differential_round(rn, objective))
+        # contradicting fixed variables are not propagated, they only make the model infeasible
+        self.bounds.update(values)
+        # exclude the trivial trail
+        x_0 = [bit for cell in self.state(0) for bit in cell]
+        if all(self.bounds.get(bit) != 1 for bit in x_0):
+            free = [bit for bit in x_0 if bit not in self.bounds]
+            constraints.append(f"{' + '.join(free if free != [] else x_0)} >= 1\n")
+        return self.lp_contents(f"Differential attack on {nrounds} rounds of {self.spec.name}", objective, constraints)
+
+    ##########################################################################################
+    # Truncated models
+    ##########################################################################################
+
+    def truncated_state(self, rn, ul="u"):
+        """
+        :param ul str: 'u' or 'l' denoting whether it is a variable in upper or lower trail
+        :rtype: list
+        :return: activeness of the cells at the input of round rn
+        """
+
+        return self.declare([f"x{ul}_{rn}_{label}" for label in self.spec.cell_labels])
+
+    def linking_variables(self, rn):
+        """
+        :rtype: list
+        :return: variables modeling the common active S-boxes between the upper and lower trails in round rn of the middle part
+        """
+
+        return self.declare([f"s_{rn}_{label}" for label in self.spec.sbox_labels])
+
+    def truncated_xor(self, a, b, c):
+        """
+        (a, b) |----> c = a + b, where the differences may cancel each other
+        """
+
+        if self.spec.truncated_xor_model == 1:
+            d = self.counter_variable("d")
+            return [f"{a} + {b} + {c} - 2 {d} >= 0\n",
+                    f"{d} - {a} >= 0\n",
+                    f"{d} - {b} >= 0\n",
+                    f"{d} - {c} >= 0\n"]
+        return [f"{a} + {b} - {c} >= 0\n",
+                f"{a} - {b} + {c} >= 0\n",
+                f"- {a} + {b} + {c} >= 0\n"]
+
+    @staticmethod
+    def deterministic_xor(a, b, c):
+        """
+        (a, b) |----> c = a + b, where c is active if and only if a or b is active
+        """
+
+        return [f"{c} - {a} >= 0\n",
+                f"{c} - {b} >= 0\n",
+                f"{a} + {b} - {c} >= 0\n"]
+
+    def truncated_matrix(self, m, dx, dy):
+        """
+        Constraints modeling the branch number of matrix m, where every output is active if an input is active
+        """
+
+        dm = self.counter_variable("dm")
+        iodiffs = dx + dy
+        constraints = [f"{' + '.join(iodiffs)} - {self.spec.matrices[m].branch_number} {dm} >= 0\n"]
+        constraints.extend([f"{dm} - {x} >= 0\n" for x in iodiffs])
+        constraints.extend([f"{y} - {x} >= 0\n" for y in dy for x in dx])
+        return constraints
+
+    def truncated_round(self, rn, ul="u", xor="truncated"):
+        """
+        :param xor str: 'truncated', 'upper' (deterministic in encryption direction)
+                        or 'lower' (deterministic in decryption direction)
+        """
+
+        spec = self.spec
+        x_in = self.truncated_state(rn, ul)
+        x_out = self.truncated_state(rn + 1, ul)
+        x_mid = [x_out[spec.permutation[i]] for i in range(spec.ncells)]
+        constraints = [f"{x_in[n]} - {x_mid[n]} = 0\n" for n in spec.copied_cells]
+        f = [x_in[cell] for cell in spec.sbox_cells]
+        if spec.sbox_permutation != None:
+            f = [None]*spec.nsboxes
+            for i in range(spec.nsboxes):
+                f[spec.sbox_permutation[i]] = x_in[spec.sbox_cells[i]]
+        if spec.matrices != []:
+            z = self.declare([f"z{ul}_{rn}_{label}" for label in spec.sbox_labels])
+            for m, matrix in enumerate(spec.matrices):
+                constraints.extend(self.truncated_matrix(m, [f[j] for j in matrix.sboxes], [z[j] for j in matrix.sboxes]))
+                for j in matrix.sboxes:
+                    f[j] = z[j]
+        for j, (src, dst) in enumerate(spec.xor_cells):
+            if xor == "truncated":
+                constraints.extend(self.truncated_xor(f[j], x_in[src], x_mid[dst]))
+            elif xor == "upper":
+                constraints.extend(self.deterministic_xor(f[j], x_in[src], x_mid[dst]))
+            else:
+                constraints.extend(self.deterministic_xor(f[j], x_mid[dst], x_in[src]))
+        if spec.truncated_constraints != None:
+            constraints.extend(spec.truncated_constraints(self, rn, ul))
+        return constraints
+
+    def exclude_trivial_solution(self, ul="u"):
+        return f"{' + '.join(self.truncated_state(0, ul))} >= 1\n"
+
+    def active_sboxes(self, rn, ul="u"):
+        x = self.truncated_state(rn, ul)
+        return [x[cell] for cell in self.spec.sbox_cells]
+
+    def lower_bounds(self, rounds, bounds, ul="u"):
+        """
+        Constraints requiring at least bounds[r] active S-boxes in the first r of the given rounds
+
+        :param rounds list: consecutive rounds of a truncated trail with an active input
+        :param bounds list: minimum number of active S-boxes over r rounds, e.g., TruncatedDP.table()
+        """
+
+        constraints = []
+        for r in range(2, min(len(rounds), len(bounds) - 1) + 1):
+            if bounds[r] > 0:
+                active = [x for rn in rounds[:r] for x in self.active_sboxes(rn, ul)]
+                constraints.append(f"{' + '.join(active)} >= {bounds[r]}\n")
+        return constraints
+
+    def truncated_differential(self, nrounds, bounds=None):
+        """
+        Model minimizing the number of active S-boxes of a truncated differential trail
+
+        :param bounds list: minimum number of active S-boxes over r rounds (see lower_bounds()), which are
+                            added as constraints to speed up the solver
+        :rtype: str
+        :return: contents of the LP file
+        """
+
+        self.reset()
+        objective = []
+        constraints = []
+        for rn in range(nrounds):
+            objective.extend(self.active_sboxes(rn))
+            constraints.extend(self.truncated_round(rn))
+        constraints.append(self.exclude_trivial_solution())
+        if bounds != None:
+            constraints.extend(self.lower_bounds(list(range(nrounds)), bounds))
+        return self.lp_contents(f"Truncated differential trail for {nrounds} rounds of {self.spec.name}", objective, constraints)
+
+    def truncated_boomerang(self, r0, rm, r1, w0=1, wm=1, w1=1, iterative=False, bounds=None):
+        """
+        Model minimizing the weighted number of active S-boxes of a truncated boomerang trail
+
+        :param r0 int: number of rounds covered by only the upper trail
+        :param rm int: number of rounds covered by both the lower and upper trails (middle part)
+        :param r1 int: number of rounds covered by only the lower trail
+        :param w0 int: cost of active S-boxes in the upper trail
+        :param wm int: cost of common active S-boxes between the upper and lower trails
+        :param w1 int: cost of active S-boxes in the lower trail
+        :param iterative bool: require the input of the upper trail to be equal to the input of the middle part
+        :param bounds list: minimum number of active S-boxes over r rounds (see lower_bounds()), which
+                            are added as constraints on the first r0 rounds and the last r1 rounds
+        :rtype: str
+        :return: contents of the LP file
+        """
+
+        spec = self.spec
+        self.reset()
+        costs = [spec.sbox_costs[t] for t in spec.sbox_types]
+        objective = []
+        for rn in range(r0):
+            objective.extend([f"{w0*cost} {x}" for cost, x in zip(costs, self.active_sboxes(rn, "u"))])
+        for rn in range(rm, rm + r1):
+            objective.extend([f"{w1*cost} {x}" for cost, x in zip(costs, self.active_sboxes(rn, "l"))])
+        for rn in range(rm):
+            objective.extend([f"{wm*cost} {s}" for cost, s in zip(costs, self.linking_variables(rn))])
+        constraints = []
+        for rn in range(r0 + rm):
+            constraints.extend(self.truncated_round(rn, "u", "truncated" if rn < r0 else "upper"))
+        constraints.append(self.exclude_trivial_solution("u"))
+        for rn in range(rm + r1):
+            constraints.extend(self.truncated_round(rn, "l", "lower" if rn < rm else "truncated"))
+        constraints.append(self.exclude_trivial_solution("l"))
+        for rn in range(rm):
+            s = self.linking_variables(rn)
+            xu = self.active_sboxes(rn + r0, "u")
+            xl = self.active_sboxes(rn, "l")
+            for i in range(spec.nsboxes):
+                constraints.append(f"{xu[i]} - {s[i]} >= 0\n")
+                constraints.append(f"{xl[i]} - {s[i]} >= 0\n")
+                constraints.append(f"- {xu[i]} - {xl[i]} + {s[i]} >= -1\n")
+        if iterative:
+            x_in = self.truncated_state(0, "u")
+            x_out = self.truncated_state(rm, "u")
+            constraints.extend([f"{a} - {b} = 0\n" for a, b in zip(x_in, x_out)])
+        if bounds != None:
+            constraints.extend(self.lower_bounds(list(range(r0)), bounds, "u"))
+            # the input of the last r1 rounds of the lower trail is active if the S-boxes only take copied cells
+            if set(spec.sbox_cells) <= set(spec.copied_cells):
+                constraints.extend(self.lower_bounds(list(range(rm, rm + r1)), bounds, "l"))
+        return self.lp_contents(f"Truncated boomerang trail for {r0} + {rm} + {r1} rounds of {spec.name}", objective, constraints)
+
+    ##########################################################################################
+
+    def lp_contents(self, comment, objective, constraints):
+        lp_contents = [f"\\ {comment}\n", "minimize\n", " + ".join(objective) + "\n", "subject to\n"]
+        lp_contents.extend(constraints)
+        if self.bounds != {}:
+            # fixed variables are continuous variables with equal bounds
+            lp_contents.append("Bounds\n")
+            lp_contents.extend([f"{var} = {val}\n" for var, val in self.bounds.items()])
+        lp_contents.append("Binary\n")
+        lp_contents.append("\n".join([var for var in self.binary_variables if var not in self.bounds]) + "\n")
+        if self.general_variables != {}:
+            lp_contents.append("General\n")
+            lp_contents.append("\n".join(self.general_variables) + "\n")
+        lp_contents.append("end")
+        return "".join(lp_contents)
+
+    @staticmethod
+    def write(lp_file_name, lp_contents):
+        with open(lp_file_name, "w") as lp_file:
+            lp_file.write(lp_contents)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Extract the values of the variables from the solutions of a Gurobi model
+
+The index of the variables is built once per model, the values of all variables
+of a solution are fetched by a single getAttr call, and the states are packed
+into hexadecimal (or bit) strings with NumPy, for one solution or for all
+solutions of the pool at once.
+"""
+
+import numpy as np
+
+HEX_DIGITS = np.array(list("0123456789abcdef"))
+
+class SolutionParser:
+    """
+    Cached index of the variables of a Gurobi model
+    """
+
+    def __init__(self, milp_model):
+        """
+        :param milp_model Model: Gurobi model (its variables must not change afterwards)
+        """
+
+        self.milp_model = milp_model
+        self.variables = milp_model.getVars()
+        names = milp_model.getAttr("VarName", self.variables)
+        self.index = dict(zip(names, range(len(names))))
+        self.values = None
+
+    def positions(self, names):
+        """
+        :param names list: (nested) list of variable names
+        :rtype: numpy.ndarray
+        :return: positions of the variables in the values of a solution, with the shape of names
+        """
+
+        return np.vectorize(self.index.__getitem__, otypes=[np.int64])(np.array(names))
+
+    def load(self, solution_number=None):
+        """
+        Fetch the values of all variables of a solution
+
+        :param solution_number int: solution of the pool (default: the current value of the SolutionNumber parameter)
+        :rtype: numpy.ndarray
+        :return: values of the variables rounded to integers
+        """
+
+        if solution_number != None:
+            self.milp_model.Params.SolutionNumber = solution_number
+        self.values = np.rint(self.milp_model.getAttr("Xn", self.variables)).astype(np.int64)
+        return self.values
+
+    def load_pool(self, solution_numbers=None):
+        """
+        Fetch the values of all variables of several solutions of the pool
+
+        :param solution_numbers list: solutions of the pool (default: all solutions, i.e., range(SolCount))
+        :rtype: numpy.ndarray
+        :return: one row of values for each solution
+        """
+
+        if solution_numbers == None:
+            solution_numbers = range(self.milp_model.SolCount)
+        return np.array([self.load(n) for n in solution_numbers]).reshape(-1, len(self.variables))
+
+    def get(self, positions, values=None):
+        """
+        :param positions numpy.ndarray: output of positions()
+        :param values numpy.ndarray: output of load() or load_pool() (default: the last solution loaded)
+        :rtype: numpy.ndarray
+        :return: values of the variables, with the shape values.shape[:-1] + positions.shape
+        """
+
+        values = self.values if values is None else values
+        return values[..., positions]
+
+    @staticmethod
+    def join(characters):
+        """
+        Join the strings along the last axis of an array of strings of equal length
+        """
+
+        characters = np.ascontiguousarray(characters)
+        if characters.size == 0:
+            return np.full(characters.shape[:-1], "")
+        length = characters.dtype.itemsize//4
+        return characters.view(f"<U{length*characters.shape[-1]}")[..., 0]
+
+    def hex_strings(self, positions, values=None):
+        """
+        :param positions numpy.ndarray: positions of the bits of each state (msb first), i.e., shape (..., nbits)
+        :param values numpy.ndarray: output of load() or load_pool() (default: the last solution loaded)
+        :rtype: numpy.ndarray
+        :return: hexadecimal string of each state
+        """
+
+        bits = self.get(positions, values)
+        digits = bits.reshape(bits.shape[:-1] + (-1, 4)) @ np.array([8, 4, 2, 1])
+        return self.join(HEX_DIGITS[digits])
+
+    def bit_strings(self, positions, width=1, values=None):
+        """
+        :param positions numpy.ndarray: positions of the variables of each state, i.e., shape (..., nvariables)
+        :param width int: number of characters of each value (padded with zeros)
+        :param values numpy.ndarray: output of load() or load_pool() (default: the last solution loaded)
+        :rtype: numpy.ndarray
+        :return: string made of the values of each state
+        """
+
+        characters = self.get(positions, values).astype(str)
+        if characters.size != 0:
+            characters = np.char.zfill(characters, width)
+        return self.join(characters)
+
+    def words(self, positions, values=None):
+        """
+        :param positions numpy.ndarray: positions of the bits of each state (msb first), i.e., shape (..., nbits)
+        :param values numpy.ndarray: output of load() or load_pool() (default: the last solution loaded)
+        :rtype: numpy.ndarray
+        :return: each state packed into 64-bit words as in trail.py, i.e., shape (..., nbits/64)
+        """
+
+        data = np.packbits(self.get(positions, values).astype(np.uint8), axis=-1)
+        return np.ascontiguousarray(data).view(">u8").astype(np.uint64)
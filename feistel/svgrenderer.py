@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Render boomerang distinguishers saved by boom.py as SVG files
+
+In contrast to plotdistinguisher.py, no TeX toolchain is needed. Each row
+shows the state before a round: cells which are active in the upper trail are
+red, those active in the lower trail are blue (purple if both), and the
+common active S-boxes of the middle part are marked between the rows. If a
+differential trail is available, its differences are written into the cells.
+The SVG elements are written to the file as they are generated.
+
+The renderer is shared by all ciphers; the svgdistinguisher.py of each cipher
+only passes the layout of its state to SVGRenderer.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import json
+import os
+
+CELL_SIZE = 18
+ROW_HEIGHT = 36
+MARGIN_LEFT = 60
+MARGIN_TOP = 50
+COLORS = {"upper": "#d62728", "lower": "#1f77b4", "E0": "#fbeaea", "Em": "#f3eefa", "E1": "#e9f1f9"}
+
+class SVGWriter:
+    """
+    Write SVG elements directly into a file
+    """
+
+    def __init__(self, svg_file, width, height):
+        self.svg_file = svg_file
+        self.svg_file.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                            f'viewBox="0 0 {width} {height}" font-family="monospace">\n')
+        self.rect(0, 0, width, height, fill="white")
+
+    @staticmethod
+    def attributes(attributes):
+        return " ".join([f'{name.replace("_", "-")}="{value}"' for name, value in attributes.items()])
+
+    def rect(self, x, y, width, height, **attributes):
+        self.svg_file.write(f'<rect x="{x}" y="{y}" width="{width}" height="{height}" {self.attributes(attributes)}/>\n')
+
+    def text(self, x, y, content, **attributes):
+        self.svg_file.write(f'<text x="{x}" y="{y}" {self.attributes(attributes)}>{content}</text>\n')
+
+    def close(self):
+        self.svg_file.write("</svg>\n")
+
+class SVGRenderer:
+    """
+    Draw the boomerang distinguishers of one cipher
+    """
+
+    def __init__(self, cipher, ncells, cell_chars, sbox_cells):
+        """
+        :param cipher str: name of the cipher in the caption
+        :param ncells int: number of cells of the state
+        :param cell_chars int: number of characters per cell in the trails
+        :param sbox_cells list: cells at the input of the S-boxes, in the order of the S-boxes in middle_part["s_r"]
+        """
+
+        self.cipher = cipher
+        self.ncells = ncells
+        self.cell_chars = cell_chars
+        self.sbox_cells = sbox_cells
+
+    def cells(self, state):
+        """
+        Split a state of a trail into its cells
+
+        :param state str: e.g., upper_trail["x_0"] or diff_upper_trail["x_0"]
+        :rtype: list
+        """
+
+        return [state[self.cell_chars*i:self.cell_chars*(i + 1)] for i in range(self.ncells)]
+
+    def active_sboxes(self, s):
+        """
+        :param s str: e.g., middle_part["s_0"]
+        :rtype: list
+        :return: cells at the input of the common active S-boxes
+        """
+
+        values = s.replace("*", "")
+        values = [values[self.cell_chars*i:self.cell_chars*(i + 1)] for i in range(len(values)//self.cell_chars)]
+        return [self.sbox_cells[i] for i, value in enumerate(values) if int(value, 16) != 0]
+
+    def rows(self, bmd):
+        """
+        Derive the activity of each state of the distinguisher
+
+        :param bmd dict: distinguisher saved by boom.py
+        :rtype: list
+        :return: for each state x_0, ..., x_R: dict(part, upper, lower, values, sboxes), where upper/lower are
+                 the active cells, values the differences (if known) and sboxes the common active S-boxes of the following round
+        """
+
+        r0, rm, r1 = bmd["r0"], bmd["rm"], bmd["r1"]
+        upper_trail, middle_part, lower_trail = bmd["upper_trail"], bmd["middle_part"], bmd["lower_trail"]
+        diff_upper_trail, diff_lower_trail = bmd.get("diff_upper_trail"), bmd.get("diff_lower_trail")
+        result = []
+        for t in range(r0 + rm + r1 + 1):
+            row = {"part": "E0" if t < r0 else ("Em" if t < r0 + rm else "E1"), "upper": [], "lower": [], "values": [None]*self.ncells, "sboxes": []}
+            if t <= r0 + rm:
+                row["upper"] = [n for n, value in enumerate(self.cells(upper_trail[f"x_{t}"])) if int(value, 16) != 0]
+            if t >= r0:
+                row["lower"] = [n for n, value in enumerate(self.cells(lower_trail[f"x_{t - r0}"])) if int(value, 16) != 0]
+            if diff_upper_trail != None and t <= r0:
+                row["values"] = self.cells(diff_upper_trail[f"x_{t}"])
+            if diff_lower_trail != None and t >= r0 + rm:
+                row["values"] = self.cells(diff_lower_trail[f"x_{t - r0 - rm}"])
+            if r0 <= t < r0 + rm:
+                row["sboxes"] = self.active_sboxes(middle_part[f"s_{t - r0}"])
+            result.append(row)
+        return result
+
+    def caption(self, bmd):
+        r0, rm, r1 = bmd["r0"], bmd["rm"], bmd["r1"]
+        text = f"Boomerang distinguisher for {r0 + rm + r1} rounds of {self.cipher} ({r0} + {rm} + {r1})"
+        if isinstance(bmd.get("diff_effect_upper"), (int, float)) and isinstance(bmd.get("diff_effect_lower"), (int, float)):
+            text += ": p^2*q^2 = 2^(%0.2f)" % (2*bmd["diff_effect_upper"] + 2*bmd["diff_effect_lower"])
+            switch_pr = bmd.get("switch_pr")
+            if isinstance(switch_pr, (int, float)):
+                text += ", r = 2^(%0.2f)" % switch_pr
+        return text
+
+    def render(self, bmd, svg_file):
+        """
+        Write the SVG figure of a boomerang distinguisher
+
+        :param bmd dict: distinguisher saved by boom.py (see the json artifacts)
+        :param svg_file file: opened output file
+        """
+
+        states = self.rows(bmd)
+        width = MARGIN_LEFT + self.ncells*CELL_SIZE + 20
+        height = MARGIN_TOP + len(states)*ROW_HEIGHT + 40
+        svg = SVGWriter(svg_file, width, height)
+        svg.text(10, 20, self.caption(bmd), font_size=12)
+        for n in range(self.ncells):
+            svg.text(MARGIN_LEFT + n*CELL_SIZE + CELL_SIZE/2, MARGIN_TOP - 8, n, font_size=7, text_anchor="middle", fill="gray")
+        # background of the part each round belongs to
+        for t, row in enumerate(states[:-1]):
+            svg.rect(0, MARGIN_TOP + t*ROW_HEIGHT + CELL_SIZE/2, width, ROW_HEIGHT, fill=COLORS[row["part"]])
+        for t, row in enumerate(states):
+            y = MARGIN_TOP + t*ROW_HEIGHT
+            svg.text(8, y + CELL_SIZE*0.7, f"x_{t}", font_size=10)
+            if t < len(states) - 1:
+                svg.text(36, y + CELL_SIZE + 12, row["part"], font_size=8, fill="gray")
+            for n in range(self.ncells):
+                x = MARGIN_LEFT + n*CELL_SIZE
+                svg.rect(x, y, CELL_SIZE, CELL_SIZE, fill="white", stroke="gray", stroke_width=0.5)
+                if n in row["upper"]:
+                    svg.rect(x, y, CELL_SIZE, CELL_SIZE, fill=COLORS["upper"], fill_opacity=0.5)
+                if n in row["lower"]:
+                    svg.rect(x, y, CELL_SIZE, CELL_SIZE, fill=COLORS["lower"], fill_opacity=0.5)
+                if row["values"][n] != None and int(row["values"][n], 16) != 0:
+                    svg.text(x + CELL_SIZE/2, y + CELL_SIZE*0.7, row["values"][n], font_size=9, text_anchor="middle")
+            for n in row["sboxes"]:
+                x = MARGIN_LEFT + n*CELL_SIZE
+                svg.rect(x + 3, y + CELL_SIZE + 3, CELL_SIZE - 6, ROW_HEIGHT - CELL_SIZE - 6, fill="black")
+        legend_y = MARGIN_TOP + len(states)*ROW_HEIGHT + 10
+        for i, (label, color) in enumerate([("upper trail", COLORS["upper"]), ("lower trail", COLORS["lower"]), ("common active S-box", "black")]):
+            svg.rect(MARGIN_LEFT + 150*i, legend_y, 10, 10, fill=color, fill_opacity=0.5 if color != "black" else 1)
+            svg.text(MARGIN_LEFT + 150*i + 14, legend_y + 9, label, font_size=10)
+        svg.close()
+
+def main(renderer):
+    """
+    Render the distinguishers saved by boom.py (e.g., after a sweep with --no-plot)
+
+    :param renderer SVGRenderer: renderer of the cipher
+    """
+
+    parser = ArgumentParser(description="This tool draws boomerang distinguishers saved by boom.py as SVG files\n"
+                                        "Example:\n"
+                                        "python3 svgdistinguisher.py bmd_2_10_2.json bmd_6_10_7.json",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('artifacts', type=str, nargs='+',
+                        help="json files saved by boom.py")
+    parser.add_argument('-o', '--outputdir', type=str,
+                        help="directory of the generated svg files (default: next to the json files)")
+    args = parser.parse_args()
+    for artifact_file_name in args.artifacts:
+        with open(artifact_file_name, "r") as artifact_file:
+            bmd = json.load(artifact_file)
+        svg_file_name = os.path.splitext(os.path.basename(artifact_file_name))[0] + ".svg"
+        output_dir = args.outputdir if args.outputdir != None else os.path.dirname(artifact_file_name)
+        svg_file_name = os.path.join(output_dir, svg_file_name)
+        with open(svg_file_name, "w") as svg_file:
+            renderer.render(bmd, svg_file)
+        print(f"{artifact_file_name} -> {svg_file_name}")
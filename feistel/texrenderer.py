@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Generate the tex files of boomerang distinguishers saved by boom.py
+
+The figures are drawn by the TikZ helpers in the plotdistinguisher.py of each
+cipher (tex_init, tikz_mark_input_bits, tex_diff_trail, tex_middle,
+tex_diff_lower_trail, tikz_mark_output_bits and tex_fin). This module loads
+the artifacts, derives the active bits at both ends of the distinguisher and
+calls the helpers in order.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import json
+import os
+from trail import Trail
+
+def active_bits(activity):
+    """
+    :param activity numpy.ndarray: activity pattern of a state of nibbles
+    :rtype: list
+    :return: bits of the active nibbles
+    """
+
+    return [4*i + j for i in range(len(activity)) if activity[i] for j in range(4)]
+
+def tex_distinguisher(bmd, tikz):
+    """
+    Generate the tex file representing a boomerang distinguisher
+
+    :param bmd dict: distinguisher saved by boom.py (see the json artifacts)
+    :param tikz module: TikZ helpers of the cipher, i.e., its plotdistinguisher.py
+    :rtype: str
+    """
+
+    r0, rm, r1 = bmd["r0"], bmd["rm"], bmd["r1"]
+    upper_trail = bmd["upper_trail"]
+    middle_part = bmd["middle_part"]
+    lower_trail = bmd["lower_trail"]
+    diff_upper_trail = bmd["diff_upper_trail"]
+    diff_lower_trail = bmd["diff_lower_trail"]
+    upper_active = Trail.from_dict(upper_trail).activity()
+    lower_active = Trail.from_dict(lower_trail).activity()
+    tex_content = tikz.tex_init()
+    if diff_upper_trail != None:
+        diff_upper_active = Trail.from_dict(diff_upper_trail).activity()
+        tex_content += tikz.tikz_mark_input_bits(active_bits(diff_upper_active[0]), color="red")
+        tex_content += tikz.tex_diff_trail(trail=diff_upper_trail, markpattern="markupperpath", direction="->")
+    else:
+        tex_content += tikz.tikz_mark_input_bits(active_bits(upper_active[0]), color="red")
+
+    tex_content += tikz.tex_middle(upper_trail=upper_trail, midd_trail=middle_part, lower_trail=lower_trail, r0=r0, rm=rm, r1=r1)
+
+    if diff_lower_trail != None:
+        diff_lower_active = Trail.from_dict(diff_lower_trail).activity()
+        tex_content += tikz.tex_diff_lower_trail(trail=diff_lower_trail, \
+                                                 upper_crossing_difference=[str(i) for i in range(len(upper_active[r0 + rm])) if upper_active[r0 + rm][i]],\
+                                                 markpattern="marklowerpath",\
+                                                 direction="<-")
+        tex_content += tikz.tikz_mark_output_bits(active_bits(diff_lower_active[r1]), color="blue")
+    else:
+        tex_content += tikz.tikz_mark_output_bits(active_bits(lower_active[rm + r1]), color="blue")
+
+    tex_content += tikz.tex_fin(r0 + rm + r1)
+    return tex_content
+
+def main(tex_distinguisher):
+    """
+    Render the distinguishers saved by boom.py (e.g., after a sweep with --no-plot)
+
+    :param tex_distinguisher function: tex_distinguisher of the cipher, mapping a distinguisher to the content of its tex file
+    """
+
+    parser = ArgumentParser(description="This tool generates the shape of boomerang distinguishers saved by boom.py\n"
+                                        "Example:\n"
+                                        "python3 plotdistinguisher.py bmd_2_10_2.json bmd_6_10_7.json",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('artifacts', type=str, nargs='+',
+                        help="json files saved by boom.py")
+    parser.add_argument('-o', '--outputdir', type=str,
+                        help="directory of the generated tex files (default: next to the json files)")
+    args = parser.parse_args()
+    for artifact_file_name in args.artifacts:
+        with open(artifact_file_name, "r") as artifact_file:
+            bmd = json.load(artifact_file)
+        tex_file_name = os.path.splitext(os.path.basename(artifact_file_name))[0] + ".tex"
+        output_dir = args.outputdir if args.outputdir != None else os.path.dirname(artifact_file_name)
+        tex_file_name = os.path.join(output_dir, tex_file_name)
+        with open(tex_file_name, "w") as texfile:
+            texfile.write(tex_distinguisher(bmd))
+        print(f"{artifact_file_name} -> {tex_file_name}")
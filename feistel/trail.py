@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Compact representation of (truncated) differential trails
+
+The state before each round is packed into 64-bit words (a 128-bit state of WARP
+or CLEFIA takes two words, a 64-bit state of TWINE or LBlock one word), msb first.
+A truncated trail is stored in the same way, with one bit per cell set if the cell
+is active. Trails are converted from and to the dictionaries produced by
+Diff.parse_solver_output() and TruncatedBoomerang.parse_solver_output(), e.g.,
+{"x_0": "0a00...", "pr_0": "-2", ..., "total_weight": "12.00", "nrounds": 6}.
+"""
+
+import numpy as np
+
+class Trail:
+    """
+    Differential trail with the states packed into a NumPy array of 64-bit words
+    """
+
+    __slots__ = ("states", "weights", "total_weight", "cell_size")
+
+    def __init__(self, states, weights=None, total_weight=None, cell_size=4):
+        """
+        :param states numpy.ndarray: shape (nrounds + 1, nwords), dtype uint64
+        :param weights numpy.ndarray: weight of each round, i.e., -log2 of its probability (None for truncated trails)
+        :param total_weight float: weight of the trail reported by the solver
+        :param cell_size int: number of bits of each cell (4 or 8)
+        """
+
+        assert(cell_size in [4, 8])
+        self.states = np.ascontiguousarray(states, dtype=np.uint64)
+        self.weights = weights
+        self.total_weight = total_weight
+        self.cell_size = cell_size
+
+    @property
+    def nrounds(self):
+        return self.states.shape[0] - 1
+
+    @property
+    def ncells(self):
+        return 64*self.states.shape[1]//self.cell_size
+
+    @staticmethod
+    def pack(hex_states):
+        """
+        :param hex_states list: states in hexadecimal format, e.g., ["0a00...", ...]
+        :rtype: numpy.ndarray
+        :return: packed states, shape (len(hex_states), nwords)
+        """
+
+        assert(all(len(state) % 16 == 0 for state in hex_states))
+        data = b"".join([bytes.fromhex(state) for state in hex_states])
+        return np.frombuffer(data, dtype=">u8").astype(np.uint64).reshape(len(hex_states), -1)
+
+    @staticmethod
+    def unpack(states):
+        """
+        :param states numpy.ndarray: packed states, shape (..., nwords)
+        :rtype: list
+        :return: states in hexadecimal format
+        """
+
+        data = np.ascontiguousarray(states, dtype=">u8").reshape(-1, states.shape[-1])
+        return [row.tobytes().hex() for row in data]
+
+    @staticmethod
+    def cells_of(states, cell_size=4):
+        """
+        :param states numpy.ndarray: packed states, shape (..., nwords)
+        :param cell_size int: number of bits of each cell (4 or 8)
+        :rtype: numpy.ndarray
+        :return: value of each cell, shape (..., ncells)
+        """
+
+        states = np.ascontiguousarray(states, dtype=">u8")
+        data = states.view(np.uint8)
+        if cell_size == 8:
+            return data
+        return np.stack([data >> 4, data & 0xf], axis=-1).reshape(data.shape[:-1] + (-1,))
+
+    @staticmethod
+    def stack(trails):
+        """
+        :param trails list: trails with the same number of rounds and state size
+        :rtype: numpy.ndarray
+        :return: packed states of all trails, shape (len(trails), nrounds + 1, nwords), for vectorized comparisons
+        """
+
+        return np.stack([trail.states for trail in trails])
+
+    @classmethod
+    def from_dict(cls, trail, cell_size=4):
+        """
+        :param trail dict: (truncated) trail in the format of parse_solver_output(); the cells of a
+                           truncated trail are given by their activity, e.g., "0110..." or "000101..." for CLEFIA
+        :param cell_size int: number of bits of each cell (4 or 8)
+        :rtype: Trail
+        """
+
+        nrounds = trail.get("nrounds")
+        if nrounds == None:
+            nrounds = 0
+            while f"x_{nrounds + 1}" in trail:
+                nrounds += 1
+        states = cls.pack([trail[f"x_{r}"] for r in range(nrounds + 1)])
+        weights = None
+        if "nrounds" in trail:
+            weights = [-(int(value) if value.lstrip("-").isdigit() else float(value)) for value in
+                       [trail[f"pr_{r}"] for r in range(nrounds)]]
+            weights = np.array(weights, dtype=np.int64 if all(isinstance(w, int) for w in weights) else np.float64)
+        total_weight = float(trail["total_weight"]) if "total_weight" in trail else None
+        return cls(states, weights, total_weight, cell_size)
+
+    def to_dict(self):
+        """
+        :rtype: dict
+        :return: trail in the format of parse_solver_output()
+        """
+
+        trail = dict()
+        for r, state in enumerate(self.unpack(self.states)):
+            trail[f"x_{r}"] = state
+        if self.weights is not None:
+            for r in range(self.nrounds):
+                trail[f"pr_{r}"] = f"-{self.weights[r].item()}"
+        if self.total_weight != None:
+            trail["total_weight"] = "%0.02f" % self.total_weight
+        if self.weights is not None:
+            trail["nrounds"] = self.nrounds
+        return trail
+
+    @classmethod
+    def from_bits(cls, bits, weights=None, total_weight=None, cell_size=4):
+        """
+        :param bits numpy.ndarray: bits of each state (msb first), shape (nrounds + 1, nbits)
+        :rtype: Trail
+        """
+
+        data = np.packbits(np.asarray(bits, dtype=np.uint8), axis=-1)
+        states = np.ascontiguousarray(data).view(">u8").astype(np.uint64)
+        return cls(states, weights, total_weight, cell_size)
+
+    def cells(self):
+        """
+        :rtype: numpy.ndarray
+        :return: value of each cell of each state, shape (nrounds + 1, ncells)
+        """
+
+        return self.cells_of(self.states, self.cell_size)
+
+    def activity(self):
+        """
+        :rtype: numpy.ndarray
+        :return: activity pattern of each state, i.e., boolean array of shape (nrounds + 1, ncells)
+        """
+
+        return self.cells() != 0
+
+    def active_cells(self, rn):
+        """
+        :param rn int: round number
+        :rtype: list
+        :return: active cells of the state before round rn
+        """
+
+        return np.flatnonzero(self.cells_of(self.states[rn], self.cell_size)).tolist()
+
+    def __eq__(self, other):
+        if not isinstance(other, Trail):
+            return NotImplemented
+        if self.cell_size != other.cell_size or not np.array_equal(self.states, other.states):
+            return False
+        if self.weights is None or other.weights is None:
+            return self.weights is None and other.weights is None
+        return np.array_equal(self.weights, other.weights)
+
+    def __hash__(self):
+        weights = np.asarray(self.weights, dtype=np.float64).tobytes() if self.weights is not None else None
+        return hash((self.cell_size, self.states.tobytes(), weights))
+
+    def __repr__(self):
+        return f"Trail(nrounds={self.nrounds}, x_0={self.unpack(self.states[0])[0]}, total_weight={self.total_weight})"
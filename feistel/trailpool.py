@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Append-only file of enumerated differential trails
+
+The file starts with a header of HEADER_SIZE bytes describing the records,
+followed by fixed-width records made of the packed states of a trail (see
+trail.py) and its weight. TrailPoolWriter appends batches of trails to the
+file, and TrailPool maps the file into memory as a NumPy structured array, so
+that millions of trails can be stored and scanned without Python objects.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import json
+import os
+import numpy as np
+
+from trail import Trail
+
+MAGIC = b"TRAILPOOL1\n"
+HEADER_SIZE = 256
+
+def record_dtype(nrounds, nwords):
+    """
+    :rtype: numpy.dtype
+    :return: dtype of the records of trails over nrounds rounds with states of nwords 64-bit words
+    """
+
+    return np.dtype([("states", "<u8", (nrounds + 1, nwords)), ("weight", "<f8")])
+
+def read_header(pool_file):
+    header = pool_file.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE or not header.startswith(MAGIC):
+        raise ValueError(f"{pool_file.name} is not a trail pool")
+    return json.loads(header[len(MAGIC):].rstrip(b"\0 ").decode())
+
+class TrailPoolWriter:
+    """
+    Append trails to a trail pool file (created if it does not exist)
+    """
+
+    def __init__(self, file_name, nrounds, nwords, cell_size=4, cipher=""):
+        """
+        :param file_name str: trail pool file
+        :param nrounds int: number of rounds of the trails
+        :param nwords int: number of 64-bit words of each state
+        :param cell_size int: number of bits of each cell
+        :param cipher str: name of the cipher
+        """
+
+        self.file_name = file_name
+        self.header = {"cipher": cipher, "nrounds": nrounds, "nwords": nwords, "cell_size": cell_size}
+        self.dtype = record_dtype(nrounds, nwords)
+        if os.path.exists(file_name) and os.path.getsize(file_name) > 0:
+            with open(file_name, "rb") as pool_file:
+                header = read_header(pool_file)
+            # TWINE, LBlock and LBlock-s have trails of the same shape, which must not be mixed
+            if any(header.get(key) != value for key, value in self.header.items()):
+                raise ValueError(f"{file_name} holds trails of another cipher or shape: {header}")
+            # drop an incomplete record left by an interrupted run
+            size = os.path.getsize(file_name) - HEADER_SIZE
+            if size % self.dtype.itemsize != 0:
+                os.truncate(file_name, HEADER_SIZE + size - size % self.dtype.itemsize)
+            self.pool_file = open(file_name, "ab")
+        else:
+            self.pool_file = open(file_name, "wb")
+            header = MAGIC + json.dumps(self.header).encode()
+            assert(len(header) <= HEADER_SIZE)
+            self.pool_file.write(header.ljust(HEADER_SIZE, b"\0"))
+        self.count = 0
+
+    def append(self, states, weights):
+        """
+        :param states numpy.ndarray: packed states of the trails, shape (ntrails, nrounds + 1, nwords)
+        :param weights numpy.ndarray|float: weight of each trail, or one weight for all of them
+        """
+
+        records = np.empty(len(states), dtype=self.dtype)
+        records["states"] = states
+        records["weight"] = weights
+        self.pool_file.write(records.tobytes())
+        self.count += len(records)
+
+    def append_trails(self, trails):
+        """
+        :param trails list: Trail objects
+        """
+
+        self.append(Trail.stack(trails), [trail.total_weight for trail in trails])
+
+    def close(self):
+        self.pool_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class TrailPool:
+    """
+    Trail pool file mapped into memory as a NumPy structured array
+    """
+
+    def __init__(self, file_name):
+        """
+        :param file_name str: trail pool file written by TrailPoolWriter
+        """
+
+        self.file_name = file_name
+        with open(file_name, "rb") as pool_file:
+            self.header = read_header(pool_file)
+        self.cipher = self.header["cipher"]
+        self.nrounds = self.header["nrounds"]
+        self.cell_size = self.header["cell_size"]
+        self.dtype = record_dtype(self.nrounds, self.header["nwords"])
+        count = (os.path.getsize(file_name) - HEADER_SIZE)//self.dtype.itemsize
+        if count != 0:
+            self.records = np.memmap(file_name, dtype=self.dtype, mode="r", offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, n):
+        """
+        :rtype: Trail
+        """
+
+        record = self.records[n]
+        return Trail(record["states"], None, float(record["weight"]), self.cell_size)
+
+    @property
+    def states(self):
+        return self.records["states"]
+
+    @property
+    def weights(self):
+        return self.records["weight"]
+
+    def differentials(self, chunk_size=1 << 20):
+        """
+        Group the trails by their input and output differences
+
+        :param chunk_size int: number of records processed at once
+        :rtype: dict
+        :return: (input difference, output difference) -> (number of trails, log2 of the sum of their probabilities)
+        """
+
+        result = dict()
+        for start in range(0, len(self.records), chunk_size):
+            chunk = self.records[start:start + chunk_size]
+            endpoints = np.concatenate([chunk["states"][:, 0, :], chunk["states"][:, -1, :]], axis=1)
+            keys, inverse = np.unique(endpoints, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            counts = np.bincount(inverse, minlength=len(keys))
+            probabilities = np.bincount(inverse, weights=np.exp2(-chunk["weight"]), minlength=len(keys))
+            nwords = self.header["nwords"]
+            for key, count, probability in zip(keys, counts, probabilities):
+                differential = (Trail.unpack(key[:nwords])[0], Trail.unpack(key[nwords:])[0])
+                previous_count, previous_probability = result.get(differential, (0, 0.0))
+                result[differential] = (previous_count + int(count), previous_probability + float(probability))
+        return {differential: (count, float(np.log2(probability))) for differential, (count, probability) in result.items()}
+
+def main():
+    """
+    Summarize a trail pool
+    """
+
+    parser = ArgumentParser(description="This tool summarizes a trail pool written by diff.py\n"
+                                        "Example:\n"
+                                        "python3 trailpool.py hull.pool -n 10",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('pool', type=str, help="trail pool file")
+    parser.add_argument('-n', '--number', type=int, default=10,
+                        help="number of differentials to print, ordered by probability (default: 10)")
+    args = parser.parse_args()
+    pool = TrailPool(args.pool)
+    print(f"{pool.cipher}: {len(pool)} trails over {pool.nrounds} rounds")
+    if len(pool) == 0:
+        return
+    weights, counts = np.unique(pool.weights, return_counts=True)
+    for weight, count in zip(weights, counts):
+        print(f"weight {weight:0.2f}: {count} trails")
+    differentials = sorted(pool.differentials().items(), key=lambda item: -item[1][1])
+    print(f"\n{len(differentials)} differentials:")
+    for (input_difference, output_difference), (count, probability) in differentials[:args.number]:
+        print(f"{input_difference} -> {output_difference}: {count} trails, 2^({probability:0.2f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Exact minimum number of active S-boxes of truncated differential trails by dynamic programming
+
+For ciphers with a small number of cells (TWINE, LBlock and LBlock-s have 16
+nibbles), all 2^ncells activity patterns of the state fit in one NumPy array.
+All transitions between patterns allowed by the truncated model of
+modelcompiler.py (every XOR of two active cells may cancel) are enumerated
+once, and each round of the dynamic program keeps, for every pattern, the
+minimum number of active S-boxes of the trails ending in it, together with a
+predecessor to reconstruct the trail. The minimum numbers of active S-boxes
+for r = 1, ..., nrounds rounds are used as lower bounds by the MILP models
+(see ModelCompiler.truncated_differential() and truncated_boomerang()).
+
+A pattern is an integer whose binary representation with ncells digits is the
+truncated state in the format of the truncated trails, e.g., "0110...", i.e.,
+the cell 0 is the most significant bit.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import time
+import numpy as np
+
+import ciphers
+
+INFINITY = np.iinfo(np.int32).max//2
+
+class TruncatedDP:
+    """
+    Dynamic program over all activity patterns of the state of a generalized Feistel cipher
+    """
+
+    def __init__(self, spec):
+        """
+        :param spec FeistelSpec: description of the cipher (without linear layer, and at most 24 cells)
+        """
+
+        assert(spec.matrices == [] and spec.truncated_constraints == None), f"the truncated model of {spec.name} is not supported"
+        assert(spec.ncells <= 24), f"{spec.name} has too many activity patterns"
+        self.spec = spec
+        self.ncells = spec.ncells
+        self.npatterns = 1 << spec.ncells
+        patterns = np.arange(self.npatterns, dtype=np.int64)
+        cell_bits = 1 << (spec.ncells - 1 - np.arange(spec.ncells, dtype=np.int64))
+        active = (patterns[:, None] & cell_bits) != 0
+        # active S-boxes of each pattern
+        self.costs = active[:, spec.sbox_cells].sum(axis=1).astype(np.int32)
+        f = [active[:, cell] for cell in spec.sbox_cells]
+        if spec.sbox_permutation != None:
+            for i in range(spec.nsboxes):
+                f[spec.sbox_permutation[i]] = active[:, spec.sbox_cells[i]]
+        output_bits = cell_bits[spec.permutation]
+        base = active[:, spec.copied_cells] @ output_bits[spec.copied_cells]
+        sources = patterns
+        targets = base
+        for j, (src, dst) in enumerate(spec.xor_cells):
+            # one active input: active output, two active inputs: the output may be active or not
+            one = f[j][sources] ^ active[sources, src]
+            both = f[j][sources] & active[sources, src]
+            targets = targets | np.where(one, output_bits[dst], 0)
+            sources = np.concatenate([sources, sources[both]])
+            targets = np.concatenate([targets, targets[both] | output_bits[dst]])
+        order = np.argsort(targets, kind="stable")
+        self.sources = sources[order]
+        self.targets = targets[order]
+        # the transitions to self.reachable[i] start at self.starts[i]
+        self.reachable, self.starts = np.unique(self.targets, return_index=True)
+
+    def step(self, values):
+        """
+        One round of the dynamic program
+
+        :param values numpy.ndarray: minimum cost of the trails ending in each pattern (INFINITY if there is none)
+        :rtype: tuple
+        :return: minimum cost of the trails ending in each pattern after one more round, and a predecessor of each pattern
+        """
+
+        candidates = values[self.sources] + self.costs[self.sources]
+        best = np.full(self.npatterns, INFINITY, dtype=np.int32)
+        best[self.reachable] = np.minimum.reduceat(candidates, self.starts)
+        best = np.minimum(best, INFINITY)
+        predecessors = np.full(self.npatterns, -1, dtype=np.int32)
+        optimal = candidates == best[self.targets]
+        predecessors[self.targets[optimal]] = self.sources[optimal]
+        return best, predecessors
+
+    def initial_values(self, input=None):
+        """
+        :param input int|str: input pattern (default: any nonzero pattern)
+        :rtype: numpy.ndarray
+        """
+
+        values = np.zeros(self.npatterns, dtype=np.int32)
+        if input != None:
+            values[:] = INFINITY
+            values[self.pattern(input)] = 0
+        values[0] = INFINITY
+        return values
+
+    def table(self, nrounds, input=None):
+        """
+        :param nrounds int: maximum number of rounds
+        :param input int|str: input pattern (default: any nonzero pattern)
+        :rtype: list
+        :return: minimum number of active S-boxes of the truncated trails over r rounds, for r = 0, ..., nrounds
+        """
+
+        values = self.initial_values(input)
+        bounds = [0]
+        for _ in range(nrounds):
+            values = self.step(values)[0]
+            bounds.append(int(values.min()))
+        return bounds
+
+    def search(self, nrounds, input=None, output=None):
+        """
+        :param nrounds int: number of rounds
+        :param input int|str: input pattern (default: any nonzero pattern)
+        :param output int|str: output pattern (default: any pattern)
+        :rtype: tuple
+        :return: minimum number of active S-boxes and the patterns of an optimal trail (None if there is no trail)
+        """
+
+        values = self.initial_values(input)
+        predecessors = []
+        for _ in range(nrounds):
+            values, round_predecessors = self.step(values)
+            predecessors.append(round_predecessors)
+        pattern = int(np.argmin(values)) if output == None else self.pattern(output)
+        if values[pattern] >= INFINITY:
+            return None, None
+        cost = int(values[pattern])
+        patterns = [pattern]
+        for round_predecessors in reversed(predecessors):
+            patterns.append(int(round_predecessors[patterns[-1]]))
+        return cost, patterns[::-1]
+
+    def pattern(self, pattern):
+        """
+        :param pattern int|str: pattern, or truncated state, e.g., "0110..."
+        :rtype: int
+        """
+
+        if isinstance(pattern, str):
+            assert(len(pattern) == self.ncells)
+            return int(pattern, 2)
+        return int(pattern)
+
+    def trail(self, patterns):
+        """
+        :param patterns list: output of search()
+        :rtype: dict
+        :return: truncated trail in the format of the truncated trails, e.g., {"x_0": "0110...", ...}
+        """
+
+        return {f"x_{r}": bin(pattern)[2:].zfill(self.ncells) for r, pattern in enumerate(patterns)}
+
+def main():
+    """
+    Print the minimum number of active S-boxes for 1, ..., nrounds rounds
+    """
+
+    specs = {"twine": ciphers.twine_spec, "lblock": ciphers.lblock_spec, "lblock-s": ciphers.lblock_s_spec}
+    parser = ArgumentParser(description="This tool computes the minimum number of active S-boxes\n"
+                                        "of truncated differential trails for all numbers of rounds\n"
+                                        "Example:\n"
+                                        "python3 truncateddp.py twine -r 40 -t 11",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('cipher', type=str, choices=list(specs), help="cipher")
+    parser.add_argument('-r', '--nrounds', type=int, default=40, help="maximum number of rounds (default: 40)")
+    parser.add_argument('-t', '--trail', type=int, help="print an optimal truncated trail for this number of rounds")
+    args = parser.parse_args()
+    start_time = time.time()
+    dp = TruncatedDP(specs[args.cipher]())
+    bounds = dp.table(args.nrounds)
+    for r in range(1, args.nrounds + 1):
+        print(f"{r:2d} rounds: {bounds[r]} active S-boxes")
+    print("Time used: %0.02f seconds" % (time.time() - start_time))
+    if args.trail != None:
+        cost, patterns = dp.search(args.trail)
+        print(f"\nTruncated trail over {args.trail} rounds with {cost} active S-boxes:")
+        for name, state in dp.trail(patterns).items():
+            print(f"{name}: {state}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Exact minimum number of active S-boxes of truncated differential trails by a frontier search
+
+The dynamic program of truncateddp.py needs all 2^ncells activity patterns of
+the state, which is out of reach for WARP (32 nibbles). This module keeps
+only the patterns that can still be part of a trail with at most a given
+number of active S-boxes (the budget): sorted arrays of patterns (uint32 for
+up to 32 cells) with the minimum cost of reaching each of them. A forward
+frontier is expanded from round 1 and a backward frontier from round
+nrounds - 2, round by round, by shifting whole groups of cells at once (the
+wiring of the round), and both meet in the middle. The frontiers are pruned
+with the minimum numbers of active S-boxes over fewer rounds, which are
+computed first, and the budget is increased one cost level at a time from a
+lower bound until a trail is found, so the first trail found is optimal.
+
+The truncated model is the one of modelcompiler.py (every XOR of two active
+cells may cancel). The cipher must be a generalized Feistel cipher whose
+S-box inputs are copied to the next round and where each F-function takes
+one cell and is added to another one (WARP, TWINE, LBlock and LBlock-s).
+A pattern is an integer whose binary representation with ncells digits is the
+truncated state in the format of the truncated trails, as in truncateddp.py.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import time
+import numpy as np
+
+import ciphers
+
+class TruncatedFrontier:
+    """
+    Meet-in-the-middle search over the activity patterns of the state of a generalized Feistel cipher
+    """
+
+    def __init__(self, spec, chunk_size=1 << 20):
+        """
+        :param spec FeistelSpec: description of the cipher (without linear layer, and at most 64 cells)
+        :param chunk_size int: number of start patterns expanded at once, which bounds the memory
+        """
+
+        assert(spec.matrices == [] and spec.truncated_constraints == None), f"the truncated model of {spec.name} is not supported"
+        assert(spec.ncells <= 64), f"{spec.name} has too many cells"
+        assert(sorted(spec.sbox_cells) == sorted(spec.copied_cells)), f"the S-box inputs of {spec.name} are not copied"
+        self.spec = spec
+        self.ncells = spec.ncells
+        self.chunk_size = chunk_size
+        self.dtype = np.uint32 if spec.ncells <= 32 else np.uint64
+        # input cell of the F-function of each XOR
+        self.f_cells = list(spec.sbox_cells)
+        if spec.sbox_permutation != None:
+            for i in range(spec.nsboxes):
+                self.f_cells[spec.sbox_permutation[i]] = spec.sbox_cells[i]
+        self.xor_sources = [src for src, _ in spec.xor_cells]
+        self.pairs = list(zip(self.f_cells, self.xor_sources))
+        assert(sorted(self.f_cells + self.xor_sources) == list(range(spec.ncells))), \
+            f"the F-functions of {spec.name} do not pair the cells"
+        permutation = spec.permutation
+        self.sbox_mask = self.mask(spec.sbox_cells)
+        # cells of the next state receiving a copy of an S-box input, i.e., the S-box inputs of the previous state are determined
+        self.previous_sbox_mask = self.mask([permutation[cell] for cell in spec.sbox_cells])
+        # wiring of the round in both directions
+        self.copy_forward = self.moves([(cell, permutation[cell]) for cell in spec.copied_cells])
+        self.f_to_source = self.moves(self.pairs)
+        self.source_forward = self.moves([(src, permutation[dst]) for src, dst in spec.xor_cells])
+        self.copy_backward = self.moves([(permutation[cell], cell) for cell in spec.copied_cells])
+        self.f_to_source_backward = self.moves([(permutation[f_cell], src) for f_cell, src in self.pairs])
+        self.output_to_source = self.moves([(permutation[dst], src) for src, dst in spec.xor_cells])
+        self.source_mask = self.mask(self.xor_sources)
+        self.source_bits = [self.bit(src) for src in self.xor_sources]
+        self.output_bits = [self.bit(permutation[dst]) for _, dst in spec.xor_cells]
+        # if the sums enter S-boxes in the next round (as in WARP, TWINE and LBlock), the number of active S-boxes
+        # of a pattern plus the forced ones of the next round can only grow when a sum does not cancel
+        self.sums_enter_sboxes = all(permutation[dst] in spec.sbox_cells for _, dst in spec.xor_cells)
+        # minimum number of active S-boxes over r rounds, for r = 0, 1, ...
+        self.bounds = [0]
+
+    def bit(self, cell):
+        return self.ncells - 1 - cell
+
+    def mask(self, cells):
+        return self.dtype(sum(1 << self.bit(cell) for cell in cells))
+
+    def moves(self, cell_pairs):
+        """
+        :param cell_pairs list: (from cell, to cell)
+        :rtype: numpy.ndarray
+        :return: tables[k][v]: moved cells for the value v of the bits 16k, ..., 16k + 15 of the patterns
+        """
+
+        values = np.arange(1 << 16)
+        tables = np.zeros(((self.ncells + 15)//16, 1 << 16), dtype=self.dtype)
+        for src, dst in cell_pairs:
+            k, shift = divmod(self.bit(src), 16)
+            tables[k][(values >> shift) & 1 == 1] |= self.dtype(1 << self.bit(dst))
+        return tables
+
+    def move(self, patterns, tables):
+        """
+        Move cells of the patterns with one lookup per 16 cells
+        """
+
+        result = tables[0][patterns & self.dtype(0xffff)]
+        for k in range(1, len(tables)):
+            result |= tables[k][(patterns >> self.dtype(16*k)) & self.dtype(0xffff)]
+        return result
+
+    def cost(self, patterns):
+        """
+        :rtype: numpy.ndarray
+        :return: number of active S-boxes of each pattern
+        """
+
+        return np.bitwise_count(patterns & self.sbox_mask).astype(np.int32)
+
+    def forward_base(self, patterns):
+        """
+        :rtype: tuple
+        :return: the next patterns where every XOR of two active cells cancels, and a mask of these XORs (source cells)
+        """
+
+        f = self.move(patterns, self.f_to_source)
+        sources = patterns & self.source_mask
+        return self.move(patterns, self.copy_forward) | self.move(f ^ sources, self.source_forward), f & sources
+
+    def backward_base(self, patterns):
+        """
+        :rtype: tuple
+        :return: the previous patterns with inactive source cells where the XOR output and the F-function
+                 are both active, and a mask of these source cells
+        """
+
+        f = self.move(patterns, self.f_to_source_backward)
+        outputs = self.move(patterns, self.output_to_source)
+        return self.move(patterns, self.copy_backward) | (f ^ outputs), f & outputs
+
+    def forced(self, patterns):
+        """
+        :rtype: numpy.ndarray
+        :return: minimum number of active S-boxes of the next patterns
+        """
+
+        return self.cost(self.forward_base(patterns)[0])
+
+    def determined(self, patterns):
+        """
+        :rtype: numpy.ndarray
+        :return: number of active S-boxes of the previous patterns (the S-box inputs are copied)
+        """
+
+        return np.bitwise_count(patterns & self.previous_sbox_mask).astype(np.int32)
+
+    def expand(self, base, free, bits, weight_mask, limits):
+        """
+        :param base numpy.ndarray: patterns where all free cells are inactive
+        :param free numpy.ndarray: free cells of each pattern (at the positions of bits)
+        :param bits list: position of the cell set in the expanded patterns for each free cell
+        :param weight_mask numpy.uint32: cells counted by the limits
+        :param limits numpy.ndarray: maximum number of active cells of weight_mask in each expanded pattern
+        :rtype: tuple
+        :return: parent and expanded patterns
+        """
+
+        parents = np.arange(len(base))
+        patterns = base
+        weights = np.bitwise_count(base & weight_mask).astype(np.int32)
+        keep = weights <= limits
+        parents, patterns, weights = parents[keep], patterns[keep], weights[keep]
+        for free_bit, bit in zip(self.source_bits, bits):
+            cell = self.dtype(1 << bit)
+            increment = int((cell & weight_mask) != 0)
+            selected = ((free[parents] >> self.dtype(free_bit)) & self.dtype(1)) != 0
+            selected &= weights + increment <= limits[parents]
+            parents = np.concatenate([parents, parents[selected]])
+            patterns = np.concatenate([patterns, patterns[selected] | cell])
+            weights = np.concatenate([weights, weights[selected] + increment])
+        return parents, patterns
+
+    def successors(self, patterns, limits):
+        """
+        :param limits numpy.ndarray: maximum number of active S-boxes of the next patterns
+        :rtype: tuple
+        :return: parent and next patterns
+        """
+
+        base, free = self.forward_base(patterns)
+        parents, targets = self.expand(base, free, self.output_bits, self.sbox_mask, limits)
+        nonzero = targets != 0
+        return parents[nonzero], targets[nonzero]
+
+    def predecessors(self, patterns, limits):
+        """
+        :param limits numpy.ndarray: maximum number of active S-boxes of the previous patterns plus their determined ones
+        :rtype: tuple
+        :return: parent and previous patterns
+        """
+
+        base, free = self.backward_base(patterns)
+        return self.expand(base, free, self.source_bits, self.sbox_mask | self.previous_sbox_mask, limits)
+
+    def reduce(self, patterns, costs, parents):
+        """
+        Keep each pattern once, with its minimum cost
+
+        :rtype: tuple
+        :return: sorted patterns, costs and parents
+        """
+
+        if self.dtype == np.uint32:
+            # one sort of the patterns followed by the costs, which are smaller than 2^16
+            order = np.argsort((patterns.astype(np.uint64) << np.uint64(16)) | costs.astype(np.uint64))
+        else:
+            order = np.lexsort((costs, patterns))
+        patterns, costs, parents = patterns[order], costs[order], parents[order]
+        first = np.ones(len(patterns), dtype=bool)
+        first[1:] = patterns[1:] != patterns[:-1]
+        return patterns[first], costs[first], parents[first]
+
+    def forward_bound(self, patterns, rn, nrounds):
+        """
+        :rtype: numpy.ndarray
+        :return: lower bound on the number of active S-boxes of the rounds rn, ..., nrounds - 1 of trails through the patterns in round rn
+        """
+
+        B = self.bounds
+        k = nrounds - rn
+        costs = self.cost(patterns)
+        bound = np.maximum(B[k], costs + B[k - 1])
+        if k >= 2:
+            following = self.forward_base(patterns)[0]
+            following_costs = self.cost(following)
+            bound = np.maximum(bound, costs + following_costs + B[k - 2])
+            if k >= 3 and self.sums_enter_sboxes:
+                bound = np.maximum(bound, costs + following_costs + self.forced(following) + B[k - 3])
+        return bound
+
+    def backward_bound(self, patterns, rn):
+        """
+        :rtype: numpy.ndarray
+        :return: lower bound on the number of active S-boxes of the rounds 0, ..., rn - 1 of trails through the patterns in round rn
+        """
+
+        B = self.bounds
+        determined = self.determined(patterns)
+        bound = np.maximum(B[rn], determined + B[rn - 1])
+        if rn >= 2:
+            # the previous patterns contain the one where no source cell is active
+            bound = np.maximum(bound, determined + self.determined(self.backward_base(patterns)[0]) + B[rn - 2])
+        return bound
+
+    def start_weights(self, patterns, nrounds):
+        """
+        :rtype: numpy.ndarray
+        :return: number of active S-boxes of the trails through the patterns in round 1 which are fixed by the patterns:
+                 in rounds 0 and 1, and the forced ones of round 2
+        """
+
+        weights = self.determined(patterns)
+        if nrounds >= 2:
+            weights += self.cost(patterns)
+        if nrounds >= 3:
+            weights += self.forced(patterns)
+        return weights
+
+    def start_patterns(self, limit, nrounds):
+        """
+        Generate, chunk by chunk, the nonzero patterns with start weights of at most limit
+
+        The start weights are sums of the weights of the pairs of cells (input of an F-function, source cell of its XOR),
+        so that the patterns are generated pair by pair.
+
+        :rtype: generator
+        """
+
+        local_patterns = np.zeros((len(self.pairs), 4), dtype=self.dtype)
+        for j, (f_cell, src) in enumerate(self.pairs):
+            local_patterns[j] = [0, 1 << self.bit(src), 1 << self.bit(f_cell), (1 << self.bit(src)) | (1 << self.bit(f_cell))]
+        local_weights = [self.start_weights(local_patterns[j], nrounds) for j in range(len(self.pairs))]
+        for patterns, _ in self.complete(np.zeros(1, dtype=self.dtype), np.zeros(1, dtype=np.int32), 0,
+                                         limit, local_patterns, local_weights):
+            patterns = patterns[patterns != 0]
+            if len(patterns) != 0:
+                yield patterns
+
+    def complete(self, patterns, weights, j, limit, local_patterns, local_weights):
+        """
+        Add the pairs j, j + 1, ... to partial patterns, splitting them into chunks when there are too many
+        """
+
+        while j < len(local_patterns):
+            if len(patterns) > self.chunk_size:
+                for start in range(0, len(patterns), self.chunk_size):
+                    yield from self.complete(patterns[start:start + self.chunk_size], weights[start:start + self.chunk_size],
+                                             j, limit, local_patterns, local_weights)
+                return
+            new_weights = weights[:, None] + local_weights[j]
+            feasible = new_weights <= limit
+            patterns = (patterns[:, None] | local_patterns[j])[feasible]
+            weights = new_weights[feasible]
+            j += 1
+        yield patterns, weights
+
+    def forward(self, patterns, costs, first, last, nrounds, budget, layers=None):
+        """
+        Expand a forward frontier from round first to round last
+
+        :param costs numpy.ndarray: number of active S-boxes of the rounds before first
+        :param layers list: if given, the frontier of each round is appended (with the parents) to reconstruct the trails
+        :rtype: tuple
+        :return: patterns and costs of round last
+        """
+
+        keep = costs + self.forward_bound(patterns, first, nrounds) <= budget
+        patterns, costs = patterns[keep], costs[keep]
+        for rn in range(first, last):
+            costs = costs + self.cost(patterns)
+            remaining = self.bounds[nrounds - rn - 2] if nrounds - rn - 2 >= 0 else 0
+            parents, targets = self.successors(patterns, budget - costs - remaining)
+            targets, target_costs, parents = self.reduce(targets, costs[parents], parents)
+            keep = target_costs + self.forward_bound(targets, rn + 1, nrounds) <= budget
+            if layers != None:
+                layers.append((patterns, parents[keep]))
+            patterns, costs = targets[keep], target_costs[keep]
+        return patterns, costs
+
+    def backward(self, patterns, costs, first, last, budget, layers=None):
+        """
+        Expand a backward frontier from round first down to round last
+
+        :param costs numpy.ndarray: number of active S-boxes of the rounds from first on
+        :rtype: tuple
+        :return: patterns and costs of round last
+        """
+
+        keep = costs + self.backward_bound(patterns, first) <= budget
+        patterns, costs = patterns[keep], costs[keep]
+        for rn in range(first, last, -1):
+            remaining = self.bounds[rn - 2] if rn >= 2 else 0
+            parents, sources = self.predecessors(patterns, budget - costs - remaining)
+            sources, source_costs, parents = self.reduce(sources, costs[parents] + self.cost(sources), parents)
+            keep = source_costs + self.backward_bound(sources, rn - 1) <= budget
+            if layers != None:
+                layers.append((patterns, parents[keep]))
+            patterns, costs = sources[keep], source_costs[keep]
+        return patterns, costs
+
+    @staticmethod
+    def trace(layers, index):
+        """
+        :rtype: list
+        :return: patterns of the frontiers leading to the index'th pattern of the last frontier
+        """
+
+        patterns = []
+        for layer_patterns, parents in reversed(layers):
+            index = parents[index]
+            patterns.append(int(layer_patterns[index]))
+        return patterns[::-1]
+
+    def search(self, nrounds, budget=None):
+        """
+        :param nrounds int: number of rounds
+        :param budget int: maximum number of active S-boxes (default: increased from a lower bound until a trail is found)
+        :rtype: tuple
+        :return: minimum number of active S-boxes and the patterns of an optimal trail (None if there is none within the budget)
+        """
+
+        assert(nrounds >= 1)
+        self.table(nrounds - 1)
+        if budget != None:
+            return self.search_within(nrounds, budget)
+        B = self.bounds
+        budget = max([B[nrounds - 1]] + [B[r] + B[nrounds - r] for r in range(1, nrounds)])
+        while True:
+            cost, patterns = self.search_within(nrounds, budget)
+            if cost != None:
+                return cost, patterns
+            budget += 1
+
+    def search_within(self, nrounds, budget):
+        """
+        Search for an optimal trail among the trails with at most budget active S-boxes (see search())
+        """
+
+        if nrounds < 3:
+            best = (None, None)
+            for patterns in self.start_patterns(budget, nrounds):
+                weights = self.start_weights(patterns, nrounds)
+                index = int(np.argmin(weights))
+                if best[0] == None or weights[index] < best[0]:
+                    best = (int(weights[index]), int(patterns[index]))
+            if best[0] == None:
+                return None, None
+            patterns = [int(self.backward_base(np.array([best[1]], dtype=self.dtype))[0][0]), best[1]]
+            if nrounds == 2:
+                patterns.append(int(self.forward_base(np.array([best[1]], dtype=self.dtype))[0][0]))
+            return best[0], patterns
+        middle = (nrounds - 1)//2
+        forward_patterns, forward_costs, backward_patterns, backward_costs = [], [], [], []
+        for patterns in self.start_patterns(budget - self.bounds[nrounds - 3], nrounds):
+            frontier = self.forward(patterns, self.determined(patterns), 1, middle, nrounds, budget)
+            forward_patterns.append(frontier[0])
+            forward_costs.append(frontier[1])
+            frontier = self.backward(patterns, self.cost(patterns) + self.forced(patterns), nrounds - 2, middle, budget)
+            backward_patterns.append(frontier[0])
+            backward_costs.append(frontier[1])
+        if forward_patterns == []:
+            return None, None
+        forward_patterns, forward_costs, _ = self.reduce(np.concatenate(forward_patterns), np.concatenate(forward_costs),
+                                                         np.zeros(sum(map(len, forward_patterns)), dtype=np.int64))
+        backward_patterns, backward_costs, _ = self.reduce(np.concatenate(backward_patterns), np.concatenate(backward_costs),
+                                                           np.zeros(sum(map(len, backward_patterns)), dtype=np.int64))
+        _, i, j = np.intersect1d(forward_patterns, backward_patterns, assume_unique=True, return_indices=True)
+        if len(i) == 0:
+            return None, None
+        totals = forward_costs[i] + backward_costs[j]
+        best = int(np.argmin(totals))
+        if totals[best] > budget:
+            return None, None
+        pattern = forward_patterns[i[best]:i[best] + 1]
+        prefix_cost, suffix_cost = int(forward_costs[i[best]]), int(backward_costs[j[best]])
+        # trails through the meeting pattern: backward to round 1 within the cost of the prefix, forward to round nrounds - 1
+        layers = []
+        patterns, costs = self.backward(pattern, np.zeros(1, dtype=np.int32), middle, 1, prefix_cost, layers)
+        index = int(np.flatnonzero(costs + self.determined(patterns) == prefix_cost)[0])
+        prefix = [int(patterns[index])] + self.trace(layers, index)[::-1]
+        layers = []
+        patterns, costs = self.forward(pattern, np.zeros(1, dtype=np.int32), middle, nrounds - 1, nrounds, suffix_cost, layers)
+        index = int(np.flatnonzero(costs + self.cost(patterns) == suffix_cost)[0])
+        suffix = self.trace(layers, index) + [int(patterns[index])]
+        first = np.array([prefix[0]], dtype=self.dtype)
+        last = np.array([suffix[-1]], dtype=self.dtype)
+        patterns = [int(self.backward_base(first)[0][0])] + prefix[:-1] + suffix + [int(self.forward_base(last)[0][0])]
+        return prefix_cost + suffix_cost, patterns
+
+    def table(self, nrounds):
+        """
+        :param nrounds int: maximum number of rounds
+        :rtype: list
+        :return: minimum number of active S-boxes of the truncated trails over r rounds, for r = 0, ..., nrounds
+        """
+
+        while len(self.bounds) <= nrounds:
+            self.bounds.append(self.search(len(self.bounds))[0])
+        return self.bounds[:nrounds + 1]
+
+    def trail(self, patterns):
+        """
+        :param patterns list: output of search()
+        :rtype: dict
+        :return: truncated trail in the format of the truncated trails, e.g., {"x_0": "0110...", ...}
+        """
+
+        return {f"x_{r}": bin(pattern)[2:].zfill(self.ncells) for r, pattern in enumerate(patterns)}
+
+def main():
+    """
+    Print the minimum number of active S-boxes for 1, ..., nrounds rounds
+    """
+
+    specs = {"warp": ciphers.warp_spec, "twine": ciphers.twine_spec, "lblock": ciphers.lblock_spec, "lblock-s": ciphers.lblock_s_spec}
+    parser = ArgumentParser(description="This tool computes the minimum number of active S-boxes\n"
+                                        "of truncated differential trails for all numbers of rounds\n"
+                                        "Example:\n"
+                                        "python3 truncatedfrontier.py warp -r 12 -t 12",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('cipher', type=str, choices=list(specs), help="cipher")
+    parser.add_argument('-r', '--nrounds', type=int, default=12, help="maximum number of rounds (default: 12)")
+    parser.add_argument('-t', '--trail', type=int, help="print an optimal truncated trail for this number of rounds")
+    args = parser.parse_args()
+    start_time = time.time()
+    frontier = TruncatedFrontier(specs[args.cipher]())
+    for r in range(1, args.nrounds + 1):
+        print(f"{r:2d} rounds: {frontier.table(r)[r]} active S-boxes ({time.time() - start_time:0.2f} seconds)", flush=True)
+    if args.trail != None:
+        cost, patterns = frontier.search(args.trail)
+        print(f"\nTruncated trail over {args.trail} rounds with {cost} active S-boxes:")
+        for name, state in frontier.trail(patterns).items():
+            print(f"{name}: {state}")
+
+if __name__ == "__main__":
+    main()
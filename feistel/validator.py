@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Independent validation of differential trails
+
+The trails found by the solver are checked against the cipher description
+(see feistelspec.py) instead of the MILP model: the copied cells must be
+equal after the cell permutation, the outputs of the S-boxes are recovered
+from the differences added by the F-functions (inverting the linear layer),
+and every S-box transition is looked up in the DDT computed from the lookup
+table of the S-box. The weights of the trails are recomputed from the DDT,
+i.e., exactly, and compared with the weights reported by the model. All
+trails of a batch are processed at once by NumPy gathers.
+"""
+
+import numpy as np
+
+from trail import Trail
+
+def gf2_inverse(rows):
+    """
+    :param rows list: square binary matrix
+    :rtype: numpy.ndarray
+    :return: inverse of the matrix over GF(2)
+    """
+
+    size = len(rows)
+    matrix = np.concatenate([np.array(rows, dtype=np.uint8), np.eye(size, dtype=np.uint8)], axis=1)
+    for column in range(size):
+        pivots = np.flatnonzero(matrix[column:, column]) + column
+        assert(len(pivots) != 0), "the matrix is not invertible"
+        matrix[[column, pivots[0]]] = matrix[[pivots[0], column]]
+        rows_to_reduce = np.flatnonzero(matrix[:, column])
+        rows_to_reduce = rows_to_reduce[rows_to_reduce != column]
+        matrix[rows_to_reduce] ^= matrix[column]
+    return matrix[:, size:]
+
+class ValidationResult:
+    """
+    Result of TrailValidator.validate() for a batch of trails
+    """
+
+    def __init__(self, wiring, transitions, round_weights, reported_weights=None, tolerance=0.01):
+        """
+        :param wiring numpy.ndarray: whether the copied cells of each round are consistent, shape (ntrails, nrounds)
+        :param transitions numpy.ndarray: whether all S-box transitions of each round are possible, shape (ntrails, nrounds)
+        :param round_weights numpy.ndarray: exact weight of each round (inf if a transition is impossible), shape (ntrails, nrounds)
+        :param reported_weights numpy.ndarray: weights reported by the model, shape (ntrails,) or (ntrails, nrounds)
+        :param tolerance float: maximum difference between an exact and a reported weight
+        """
+
+        self.wiring = wiring
+        self.transitions = transitions
+        self.round_weights = round_weights
+        self.reported_weights = reported_weights
+        self.tolerance = tolerance
+
+    def __len__(self):
+        return len(self.round_weights)
+
+    @property
+    def weights(self):
+        """
+        :rtype: numpy.ndarray
+        :return: exact weight of each trail
+        """
+
+        return self.round_weights.sum(axis=1)
+
+    @property
+    def weight_mismatch(self):
+        """
+        :rtype: numpy.ndarray
+        :return: whether the reported weight of each trail (or of one of its rounds) differs from its exact weight
+        """
+
+        if self.reported_weights is None:
+            return np.zeros(len(self), dtype=bool)
+        if self.reported_weights.ndim == 2:
+            return (np.abs(self.round_weights - self.reported_weights) > self.tolerance).any(axis=1)
+        return np.abs(self.weights - self.reported_weights) > self.tolerance
+
+    @property
+    def valid(self):
+        """
+        :rtype: numpy.ndarray
+        :return: whether each trail is a valid characteristic with the reported weight
+        """
+
+        return self.wiring.all(axis=1) & self.transitions.all(axis=1) & ~self.weight_mismatch
+
+    def invalid(self):
+        """
+        :rtype: numpy.ndarray
+        :return: indices of the invalid trails
+        """
+
+        return np.flatnonzero(~self.valid)
+
+class TrailValidator:
+    """
+    Vectorized validation of differential trails of a generalized Feistel cipher
+    """
+
+    def __init__(self, spec):
+        """
+        :param spec FeistelSpec: description of the cipher, including the lookup tables of its S-boxes
+        """
+
+        assert(spec.sbox_tables != None), f"the S-boxes of {spec.name} are not described"
+        self.spec = spec
+        size = 2**spec.cell_size
+        self.ddts = np.array([[np.bincount(np.array(table) ^ np.array(table)[np.arange(size) ^ dx], minlength=size)
+                               for dx in range(size)] for table in spec.sbox_tables])
+        with np.errstate(divide="ignore"):
+            weights = spec.cell_size - np.log2(self.ddts)
+        # weight of the transition dx -> dy of S-box j: weight_table[sbox_offsets[j] + size*dx + dy],
+        # with indices as narrow as possible, which makes the gathers faster
+        self.weight_table = weights.ravel()
+        self.index_dtype = np.uint16 if len(self.weight_table) <= 2**16 else np.uint32
+        self.sbox_offsets = (np.array(spec.sbox_types)*size*size).astype(self.index_dtype)
+        self.inverse_matrices = [(matrix.sboxes, self.inverse_tables(matrix)) for matrix in spec.matrices]
+        permutation = np.array(spec.permutation)
+        self.sbox_cells = np.array(spec.sbox_cells)
+        self.xor_sources = np.array([src for src, _ in spec.xor_cells])
+        # cells of the round output receiving the sums and the copied cells, i.e., after the cell permutation
+        self.xor_outputs = permutation[[dst for _, dst in spec.xor_cells]]
+        self.copied_cells = np.array(spec.copied_cells, dtype=np.int64)
+        self.copied_outputs = permutation[self.copied_cells]
+
+    def inverse_tables(self, matrix):
+        """
+        :param matrix Matrix: matrix applied to the outputs of a group of S-boxes
+        :rtype: numpy.ndarray
+        :return: tables[i][v]: output of the inverse matrix for the input v in the cell i and zeros elsewhere,
+                 so that the output for any input is the XOR of one entry of each table
+        """
+
+        n = self.spec.cell_size
+        k = len(matrix.sboxes)
+        inverse = gf2_inverse(matrix.binary(n)).astype(np.int64)
+        shifts = np.arange(n - 1, -1, -1)
+        values = np.arange(2**n)
+        tables = np.zeros((k, 2**n, k), dtype=np.uint8)
+        for i in range(k):
+            bits = np.zeros((2**n, k*n), dtype=np.int64)
+            bits[:, i*n:(i + 1)*n] = (values[:, None] >> shifts) & 1
+            tables[i] = (((bits @ inverse.T) & 1).reshape(2**n, k, n) << shifts).sum(axis=2)
+        return tables
+
+    def sbox_outputs(self, x, y):
+        """
+        :param x numpy.ndarray: cells of the round inputs, shape (..., ncells)
+        :param y numpy.ndarray: cells of the round outputs, shape (..., ncells)
+        :rtype: numpy.ndarray
+        :return: output difference of each S-box, shape (..., nsboxes)
+        """
+
+        f = y[..., self.xor_outputs] ^ x[..., self.xor_sources]
+        for sboxes, tables in self.inverse_matrices:
+            output = tables[0][f[..., sboxes[0]]]
+            for i in range(1, len(sboxes)):
+                output ^= tables[i][f[..., sboxes[i]]]
+            f[..., sboxes] = output
+        if self.spec.sbox_permutation != None:
+            f = f[..., self.spec.sbox_permutation]
+        return f
+
+    def transitions(self, states):
+        """
+        :param states numpy.ndarray: packed trails, shape (ntrails, nrounds + 1, nwords)
+        :rtype: tuple
+        :return: consistency of each copied cell, input/output differences and weight of each S-box,
+                 with the shapes (ntrails, nrounds, ncopied) and (ntrails, nrounds, nsboxes)
+        """
+
+        cells = Trail.cells_of(states, self.spec.cell_size)
+        x = cells[:, :-1]
+        y = cells[:, 1:]
+        wiring = y[..., self.copied_outputs] == x[..., self.copied_cells]
+        dx = x[..., self.sbox_cells]
+        dy = self.sbox_outputs(x, y)
+        weights = self.weight_table[self.sbox_offsets + ((dx.astype(self.index_dtype) << self.spec.cell_size) | dy)]
+        return wiring, dx, dy, weights
+
+    def validate(self, states, weights=None, tolerance=0.01, chunk_size=1 << 12):
+        """
+        :param states numpy.ndarray: packed trails, shape (ntrails, nrounds + 1, nwords), e.g., Trail.stack(trails)
+        :param weights numpy.ndarray|float: weights reported by the model, of each trail or of each round of each trail
+        :param tolerance float: maximum difference between an exact and a reported weight
+        :param chunk_size int: number of trails processed at once
+        :rtype: ValidationResult
+        """
+
+        states = np.asarray(states, dtype=np.uint64)
+        wiring, transitions, round_weights = [], [], []
+        for start in range(0, len(states), chunk_size):
+            chunk_wiring, _, _, chunk_weights = self.transitions(states[start:start + chunk_size])
+            wiring.append(chunk_wiring.all(axis=2))
+            transitions.append(np.isfinite(chunk_weights).all(axis=2))
+            round_weights.append(chunk_weights.sum(axis=2))
+        nrounds = states.shape[1] - 1
+        if len(states) == 0:
+            wiring = transitions = [np.ones((0, nrounds), dtype=bool)]
+            round_weights = [np.zeros((0, nrounds))]
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+            weights = np.broadcast_to(weights, (len(states),) + weights.shape[1:])
+        return ValidationResult(np.concatenate(wiring), np.concatenate(transitions), np.concatenate(round_weights),
+                                weights, tolerance)
+
+    def validate_trails(self, trails, tolerance=0.01):
+        """
+        :param trails list: Trail objects or dicts in the format of Diff.parse_solver_output()
+        :rtype: ValidationResult
+        """
+
+        trails = [Trail.from_dict(trail, self.spec.cell_size) if isinstance(trail, dict) else trail for trail in trails]
+        if all(trail.weights is not None for trail in trails):
+            weights = np.array([trail.weights for trail in trails], dtype=np.float64).reshape(len(trails), -1)
+        elif all(trail.total_weight != None for trail in trails):
+            weights = np.array([trail.total_weight for trail in trails])
+        else:
+            weights = None
+        return self.validate(Trail.stack(trails), weights, tolerance)
+
+    def errors(self, states, weights=None, tolerance=0.01):
+        """
+        :param states numpy.ndarray: packed states of one trail, shape (nrounds + 1, nwords)
+        :param weights numpy.ndarray|float: weight reported by the model, of the trail or of each round
+        :rtype: list
+        :return: description of the errors of the trail
+        """
+
+        wiring, dx, dy, sbox_weights = self.transitions(np.asarray(states, dtype=np.uint64)[None])
+        wiring, dx, dy, sbox_weights = wiring[0], dx[0], dy[0], sbox_weights[0]
+        labels = self.spec.cell_labels
+        errors = []
+        for rn, n in zip(*np.nonzero(~wiring)):
+            errors.append(f"round {rn}: cell {labels[self.copied_cells[n]]} is not copied to cell {labels[self.copied_outputs[n]]}")
+        for rn, j in zip(*np.nonzero(~np.isfinite(sbox_weights))):
+            errors.append(f"round {rn}: impossible transition {dx[rn, j]:x} -> {dy[rn, j]:x} of S-box {self.spec.sbox_labels[j]}")
+        if weights is not None and errors == []:
+            weights = np.asarray(weights, dtype=np.float64)
+            round_weights = sbox_weights.sum(axis=1)
+            if weights.ndim == 1:
+                for rn in np.flatnonzero(np.abs(round_weights - weights) > tolerance):
+                    errors.append(f"round {rn}: weight {round_weights[rn]:0.4f} instead of {weights[rn]:0.4f}")
+            elif abs(round_weights.sum() - weights) > tolerance:
+                errors.append(f"weight {round_weights.sum():0.4f} instead of {float(weights):0.4f}")
+        return errors
@@ -7,8 +7,8 @@ Author: Hosein Hadipour
 
 from argparse import ArgumentParser, RawTextHelpFormatter
 from truncboom import TruncatedBoomerang
-from diff import Diff
-from plotdistinguisher import *
+from trail import Trail
+import json
 
 def main():
 
@@ -57,25 +57,42 @@ def main():
                         help="time limit in seconds")
     parser.add_argument('-ns', '--numofsols', type=int,
                         help="number of solutions (currently disabled)")
+    parser.add_argument('-np', '--no-plot', dest='noplot', action='store_true',
+                        help="do not generate bmd.tex and bmd.svg (render them later from the saved artifact)")
+    parser.add_argument('-a', '--artifact', type=str,
+                        help="json file to save the discovered distinguisher (default: bmd_r0_rm_r1.json)")
+    parser.add_argument('-c', '--catalog', type=str,
+                        help="SQLite catalog of differential trails, to reuse the trails found by earlier runs")
+    parser.add_argument('-mitm', '--mitm', action='store_true',
+                        help="find the truncated boomerang trail without solver (exact, see feistel/boomerangmitm.py)")
 
     # Parse command line arguments and construct parameter list.
     args = parser.parse_args()
     params = loadparameters(args)
     r0, rm, r1 = params["r0"], params["rm"], params["r1"]
     w0, wm, w1 = params["w0"], params["wm"], params["w1"]
+    noplot = params["noplot"]
+    artifact_file_name = params["artifact"]
+    catalog_file_name = params["catalog"]
+    if artifact_file_name == None:
+        artifact_file_name = f"bmd_{r0}_{rm}_{r1}.json"
 
     assert(rm > 0)
-    tex_content = tex_init()
     ##############################################################################################
     ##############################################################################################
     # Step1- Find a truncated boomerang trail
     bm = TruncatedBoomerang(r0=r0, r1=r1, rm=rm, w0=w0, w1=w1, wm=wm)
     bm.iterative = False
-    bm.find_truncated_boomerang_trail()
-    upper_trail, middle_part, lower_trail = bm.parse_solver_output()
+    if params["mitm"]:
+        upper_trail, middle_part, lower_trail = bm.search_truncated_boomerang_trail()
+    else:
+        bm.find_truncated_boomerang_trail()
+        upper_trail, middle_part, lower_trail = bm.parse_solver_output()
     ##############################################################################################
     ##############################################################################################
     # Step2- Instantiate the upper/lower truncated trails with real differential trails
+    # (Diff requires Gurobi, which is not needed to find the truncated trail with --mitm)
+    from diff import Diff
     diff_upper_trail = None
     diff_effect_upper = 0
     if r0 != 0:
@@ -86,12 +103,14 @@ def main():
                   "endweight" : 128,
                   "timelimit" : time_limit,
                   "numberoftrails" : 1,
+                  "catalog" : catalog_file_name,
                   "fixedVariables" : {}}
+        upper_activity = Trail.from_dict(upper_trail).activity()
         for nibble in range(16):
-            if upper_trail[f"x_0"][nibble] == "0":
+            if not upper_activity[0][nibble]:
                 for bit in range(4):
                     params["fixedVariables"][f"x_{0}_{nibble}_{bit}"] = "0"
-            if upper_trail[f"x_{bm.r0}"][nibble] == "0":
+            if not upper_activity[bm.r0][nibble]:
                 for bit in range(4):
                     params["fixedVariables"][f"x_{bm.r0}_{nibble}_{bit}"] = "0"
         diff = Diff(params)
@@ -113,12 +132,14 @@ def main():
                   "endweight" : 128,
                   "timelimit" : time_limit,
                   "numberoftrails" : 1,
+                  "catalog" : catalog_file_name,
                   "fixedVariables" : {}}
+        lower_activity = Trail.from_dict(lower_trail).activity()
         for nibble in range(16):
-            if lower_trail[f"x_{bm.rm}"][nibble] == "0":
+            if not lower_activity[bm.rm][nibble]:
                 for bit in range(4):
                     params["fixedVariables"][f"x_{0}_{nibble}_{bit}"] = "0"
-            if lower_trail[f"x_{bm.R1}"][nibble] == "0":
+            if not lower_activity[bm.R1][nibble]:
                 for bit in range(4):
                     params["fixedVariables"][f"x_{bm.r1}_{nibble}_{bit}"] = "0"
         diff = Diff(params)
@@ -160,38 +181,26 @@ def main():
 
     ##############################################################################################
     ##############################################################################################
+    # save the discovered distinguisher, so that it can be plotted later
+    bmd = {"r0" : r0, "rm" : rm, "r1" : r1,
+           "w0" : w0, "wm" : wm, "w1" : w1,
+           "upper_trail" : upper_trail,
+           "middle_part" : middle_part,
+           "lower_trail" : lower_trail,
+           "diff_upper_trail" : diff_upper_trail,
+           "diff_lower_trail" : diff_lower_trail,
+           "diff_effect_upper" : diff_effect_upper,
+           "diff_effect_lower" : diff_effect_lower}
+    with open(artifact_file_name, "w") as artifact_file:
+        json.dump(bmd, artifact_file)
     # plot distinguisher
-    if diff_upper_trail != None:
-        active_input_bits = diff.flatten_state([[4*i + j for j in range(4)] for i in range(16) if diff_upper_trail["x_0"][i] != "0"])
-        tex_content += tikz_mark_input_bits(active_input_bits, color="red")
-        tex_content += tex_diff_trail(trail=diff_upper_trail, markpattern="markupperpath", direction="->")
-    else:
-        active_input_bits = []
-        for i in range(16):
-            if upper_trail[f"x_{0}"][i] != "0":
-                active_input_bits.extend([j for j in range(4*i, 4*(i + 1))])
-        tex_content += tikz_mark_input_bits(active_input_bits, color="red")
-
-    tex_content += tex_middle(upper_trail=upper_trail, midd_trail=middle_part, lower_trail=lower_trail, r0=r0, rm=rm, r1=r1)
-
-    # tex_content += tex_diff_trail(trail=diff_lower_trail, markpattern="marklowerpath", direction="<-")
-    if diff_lower_trail != None:
-        tex_content += tex_diff_lower_trail(trail=diff_lower_trail, \
-                                            upper_crossing_difference=[str(i) for i in range(16) if upper_trail[f"x_{r0 + rm}"][i] != "0"],\
-                                            markpattern="marklowerpath",\
-                                            direction="<-")
-        active_output_bits = diff.flatten_state([[4*i + j for j in range(4)] for i in range(16) if diff_lower_trail[f"x_{r1}"][i] != "0"])
-        tex_content += tikz_mark_output_bits(active_output_bits, color="blue")
-    else:
-        active_output_bits = []
-        for i in range(16):
-            if lower_trail[f"x_{rm + r1}"][i] != "0":
-                active_output_bits.extend([j for j in range(4*i, 4*(i + 1))])
-        tex_content += tikz_mark_output_bits(active_output_bits, color="blue")
-
-    tex_content += tex_fin(r0 + rm + r1)
-    with open("bmd.tex", "w") as texfile:
-        texfile.write(tex_content)
+    if not noplot:
+        from plotdistinguisher import tex_distinguisher
+        with open("bmd.tex", "w") as texfile:
+            texfile.write(tex_distinguisher(bmd))
+        from svgdistinguisher import svg_distinguisher
+        with open("bmd.svg", "w") as svg_file:
+            svg_distinguisher(bmd, svg_file)
 
 def loadparameters(args):
     """
@@ -207,7 +216,11 @@ def loadparameters(args):
                 "wm" : 3,
                 "w1" : 6,
                 "timelimit" : 1200,
-                "numofsols" : 1}
+                "numofsols" : 1,
+                "noplot" : False,
+                "artifact" : None,
+                "catalog" : None,
+                "mitm" : False}
 
     # Check if there is an input file specified
     if args.inputfile:
@@ -250,6 +263,18 @@ def loadparameters(args):
     if args.numofsols != None:
         params["numofsols"] = args.numofsols
 
+    if args.noplot:
+        params["noplot"] = True
+
+    if args.artifact != None:
+        params["artifact"] = args.artifact
+
+    if args.catalog != None:
+        params["catalog"] = args.catalog
+
+    if args.mitm:
+        params["mitm"] = True
+
     return params
 
 if __name__ == "__main__":
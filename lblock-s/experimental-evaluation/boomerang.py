@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Experimental evaluation of differentials and boomerang distinguishers for
+LBlock-s using the table-driven implementation in lblock.py. In contrast to
+boomerang.c, the differences and the number of queries are given at
+runtime, so that a trail found by Diff can be checked from the same process.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import math
+import os
+import time
+import numpy as np
+from lblock import LBlock
+
+class Experiment:
+    """
+    Encrypt/decrypt pairs and quartets of random states in batches
+    """
+
+    def __init__(self, nrounds, seed=None):
+        """
+        :param nrounds int: number of rounds
+        :param seed int: seed of the PRNG (default: random)
+        """
+
+        self.nrounds = nrounds
+        self.cipher = LBlock()
+        if seed == None:
+            seed = int.from_bytes(os.urandom(4), "little")
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def random_subkeys(self):
+        key = self.rng.integers(0, 256, size=10).tolist()
+        return self.cipher.key_schedule(key, self.nrounds)
+
+    def random_states(self, n):
+        return self.rng.integers(0, 2**64, size=n, dtype=np.uint64, endpoint=False)
+
+    def pairs(self, subkeys, n, din, dout):
+        """
+        Encrypt n random pairs with input difference din
+
+        :rtype: int
+        :return: number of pairs whose output difference is dout
+        """
+
+        p1 = self.random_states(n)
+        c1 = self.cipher.enc(p1, subkeys)
+        c2 = self.cipher.enc(p1 ^ din, subkeys)
+        return int(np.count_nonzero((c1 ^ c2) == dout))
+
+    def quartets(self, subkeys, n, dp, dc):
+        """
+        Throw n boomerangs
+
+        :rtype: int
+        :return: number of returned boomerangs
+        """
+
+        p1 = self.random_states(n)
+        c1 = self.cipher.enc(p1, subkeys)
+        c2 = self.cipher.enc(p1 ^ dp, subkeys)
+        p3 = self.cipher.dec(c1 ^ dc, subkeys)
+        p4 = self.cipher.dec(c2 ^ dc, subkeys)
+        return int(np.count_nonzero((p3 ^ p4) == dp))
+
+    def run(self, query, din, dout, deg1, deg2, batch=20):
+        """
+        Make 2^deg2 queries under each of 2^deg1 random keys
+
+        :param query function: Experiment.pairs or Experiment.quartets
+        :param din str: input difference as a hexadecimal string of 16 nibbles
+        :param dout str: output difference as a hexadecimal string of 16 nibbles
+        :param deg1 int: log2 of the number of keys
+        :param deg2 int: log2 of the number of queries per key
+        :param batch int: log2 of the maximum number of queries in one call
+        :rtype: int
+        :return: number of right pairs/quartets
+        """
+
+        din, dout = LBlock.hexstr_to_state(din), LBlock.hexstr_to_state(dout)
+        num = 0
+        for _ in range(2**deg1):
+            subkeys = self.random_subkeys()
+            remaining = 2**deg2
+            while remaining > 0:
+                n = min(remaining, 2**batch)
+                num += query(subkeys, n, din, dout)
+                remaining -= n
+        return num
+
+    def send_pairs(self, din, dout, deg1, deg2, batch=20):
+        return self.run(self.pairs, din, dout, deg1, deg2, batch)
+
+    def send_boomerangs(self, dp, dc, deg1, deg2, batch=20):
+        return self.run(self.quartets, dp, dc, deg1, deg2, batch)
+
+    def write_result(self, file_name, dp, dc, number_of_queries_log2, num):
+        """
+        Write the result of a boomerang experiment in the same format as boomerang.c
+        """
+
+        if num != 0:
+            avg_pr = number_of_queries_log2 - math.log(num, 2)
+        else:
+            avg_pr = math.inf
+        with open(file_name, "w") as result_file:
+            result_file.write("Initial seed 0x%08X\n" % self.seed)
+            result_file.write(f"Boomerang distinguisher for {self.nrounds} rounds of LBlock-s\n")
+            result_file.write(f"Input difference: \t {dp}\n")
+            result_file.write(f"Output difference: \t {dc}\n")
+            result_file.write("Average probability = 2^(-%0.4f)\n" % avg_pr)
+            result_file.write(f"Number of boomerangs thrown = 2^{number_of_queries_log2}\n")
+            result_file.write(f"Number of boomerangs returned = {num}\n")
+
+def differential_probability(nrounds, din, dout, deg1=4, deg2=20, seed=None):
+    """
+    Estimate the probability of a differential
+
+    :rtype: float
+    :return: log2 of the estimated probability (-inf if no right pair was found)
+    """
+
+    num = Experiment(nrounds, seed).send_pairs(din, dout, deg1, deg2)
+    return math.log(num, 2) - deg1 - deg2 if num != 0 else -math.inf
+
+def boomerang_return_rate(nrounds, dp, dc, deg1=4, deg2=20, seed=None):
+    """
+    Estimate the probability that a boomerang returns
+
+    :rtype: float
+    :return: log2 of the estimated probability (-inf if no boomerang returned)
+    """
+
+    num = Experiment(nrounds, seed).send_boomerangs(dp, dc, deg1, deg2)
+    return math.log(num, 2) - deg1 - deg2 if num != 0 else -math.inf
+
+def main():
+    parser = ArgumentParser(description="This tool evaluates the probability of a differential or a boomerang distinguisher for LBlock-s experimentally\n"
+                                        "Example:\n"
+                                        "python3 boomerang.py -r 9 -dp 0003000000000000 -dc 0000000000003000 -d1 4 -d2 20\n"
+                                        "python3 boomerang.py -r 2 -dp 0003000000000000 -dc 130000000a000000 --differential",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('-r', '--nrounds', type=int, required=True,
+                        help="number of rounds")
+    parser.add_argument('-dp', '--dp', type=str, required=True,
+                        help="input difference")
+    parser.add_argument('-dc', '--dc', type=str, required=True,
+                        help="output difference")
+    parser.add_argument('-df', '--differential', action='store_true',
+                        help="evaluate the differential dp -> dc instead of the boomerang distinguisher")
+    parser.add_argument('-d1', '--deg1', type=int, default=4,
+                        help="log2 of the number of random keys per experiment")
+    parser.add_argument('-d2', '--deg2', type=int, default=20,
+                        help="log2 of the number of queries per key")
+    parser.add_argument('-ne', '--experiments', type=int, default=1,
+                        help="number of independent experiments")
+    parser.add_argument('-b', '--batch', type=int, default=20,
+                        help="log2 of the number of queries made at once")
+    parser.add_argument('-s', '--seed', type=int,
+                        help="seed of the PRNG")
+    parser.add_argument('-t', '--taskid', type=int, default=0,
+                        help="task id used in the name of the result file result_<nrounds>_<taskid>.txt")
+    args = parser.parse_args()
+
+    experiment = Experiment(args.nrounds, args.seed)
+    print("[+] PRNG initialized to 0x%08X" % experiment.seed)
+    print(f"#Rounds: {args.nrounds} rounds")
+    print(f"Input difference: \t {args.dp}")
+    print(f"Output difference: \t {args.dc}")
+    number_of_queries_log2 = math.log(args.experiments, 2) + args.deg1 + args.deg2
+    print("#Total Queries = (#Experiments) * (#Keys) * (#Queries per key) = %d * 2^%d * 2^%d = 2^(%f)" % (args.experiments, args.deg1, args.deg2, number_of_queries_log2))
+    start_time = time.time()
+    num = 0
+    for _ in range(args.experiments):
+        if args.differential:
+            num += experiment.send_pairs(args.dp, args.dc, args.deg1, args.deg2, args.batch)
+        else:
+            num += experiment.send_boomerangs(args.dp, args.dc, args.deg1, args.deg2, args.batch)
+    elapsed_time = time.time() - start_time
+    print("time on wall: %0.4f" % elapsed_time)
+    print(f"Number of right {'pairs' if args.differential else 'quartets'}: {num}")
+    if num != 0:
+        print("Average probability = 2^(-%0.4f)" % (number_of_queries_log2 - math.log(num, 2)))
+    else:
+        print("Average probability = 2^(-inf)")
+    if not args.differential:
+        experiment.write_result(f"result_{args.nrounds}_{args.taskid}.txt", args.dp, args.dc, int(round(number_of_queries_log2)), num)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Table-driven implementation of LBlock-s in NumPy
+It follows the reference implementation in lblock.c
+"""
+
+import sys
+import numpy as np
+
+class LBlock:
+    """
+    A state is a uint64 whose j'th byte from the right is x[j] in lblock.c,
+    i.e., int(hex_str, 16) for the differences given in boomerang.h. A round
+    is computed by 4 lookups (one per 16-bit chunk of the state) into tables
+    fusing the S-boxes, the permutation P and the byte rotation; the round
+    key is folded into the indexes.
+    """
+
+    S0 = [14, 9, 15, 0, 13, 4, 10, 11, 1, 2, 8, 3, 7, 6, 12, 5]
+    S1 = [14, 9, 15, 0, 13, 4, 10, 11, 1, 2, 8, 3, 7, 6, 12, 5]
+    S2 = [14, 9, 15, 0, 13, 4, 10, 11, 1, 2, 8, 3, 7, 6, 12, 5]
+    S3 = [14, 9, 15, 0, 13, 4, 10, 11, 1, 2, 8, 3, 7, 6, 12, 5]
+    S4 = [14, 9, 15, 0, 13, 4, 10, 11, 1, 2, 8, 3, 7, 6, 12, 5]
+    S5 = [14, 9, 15, 0, 13, 4, 10, 11, 1, 2, 8, 3, 7, 6, 12, 5]
+    S6 = [14, 9, 15, 0, 13, 4, 10, 11, 1, 2, 8, 3, 7, 6, 12, 5]
+    S7 = [14, 9, 15, 0, 13, 4, 10, 11, 1, 2, 8, 3, 7, 6, 12, 5]
+    # S-boxes of the key schedule
+    S8 = [8, 7, 14, 5, 15, 13, 0, 6, 11, 12, 9, 10, 2, 4, 1, 3]
+    S9 = [11, 5, 15, 0, 7, 2, 9, 13, 4, 8, 1, 12, 14, 10, 3, 6]
+
+    def __init__(self):
+        # sboxes[j] maps the j'th input byte of F to its output byte
+        self.sboxes = np.array([[(S_high[u >> 4] << 4) ^ S_low[u & 0x0f] for u in range(256)]
+                                for S_low, S_high in [(self.S0, self.S1), (self.S2, self.S3), (self.S4, self.S5), (self.S6, self.S7)]],
+                               dtype=np.uint8)
+        # chunk j is the j'th uint16 of a state in memory
+        self.shifts = [np.uint64(16*j if sys.byteorder == "little" else 16*(3 - j)) for j in range(4)]
+        self.enc_tables = self.build_tables(self.round_bytes)
+        self.dec_tables = self.build_tables(self.inv_round_bytes)
+
+    @staticmethod
+    def pack(x):
+        """
+        Convert an array of shape (N, 8) of bytes into an array of N states
+        """
+
+        x = np.asarray(x, dtype=np.uint64)
+        shifts = np.arange(0, 64, 8, dtype=np.uint64)
+        return np.bitwise_xor.reduce(x << shifts, axis=1)
+
+    @staticmethod
+    def unpack(states):
+        """
+        Convert an array of N states into an array of shape (N, 8) of bytes
+        """
+
+        shifts = np.arange(0, 64, 8, dtype=np.uint64)
+        return ((np.asarray(states, dtype=np.uint64)[:, None] >> shifts) & np.uint64(0xff)).astype(np.uint8)
+
+    @staticmethod
+    def hexstr_to_state(hex_str):
+        return np.uint64(int(hex_str, 16))
+
+    def F(self, x, k):
+        """
+        Round function on an array of shape (N, 4) of bytes
+        """
+
+        tmp = x ^ np.asarray(k, dtype=np.uint8)
+        for j in range(4):
+            tmp[:, j] = self.sboxes[j][tmp[:, j]]
+        t = np.empty_like(tmp)
+        t[:, 0] = (tmp[:, 0] >> 4) ^ (tmp[:, 1] & 0xf0)
+        t[:, 1] = (tmp[:, 0] & 0x0f) ^ (tmp[:, 1] << 4)
+        t[:, 2] = (tmp[:, 2] >> 4) ^ (tmp[:, 3] & 0xf0)
+        t[:, 3] = (tmp[:, 2] & 0x0f) ^ (tmp[:, 3] << 4)
+        return t
+
+    def round_bytes(self, x, k):
+        """
+        One round of encryption on an array of shape (N, 8) of bytes (OneRound and Swap in lblock.c)
+        """
+
+        y = np.empty_like(x)
+        y[:, 4:8] = x[:, [3, 0, 1, 2]] ^ self.F(x[:, 4:8], k)
+        y[:, 0:4] = x[:, 4:8]
+        return y
+
+    def inv_round_bytes(self, x, k):
+        """
+        One round of decryption on an array of shape (N, 8) of bytes (Swap and OneRound_Inv in lblock.c)
+        """
+
+        y = np.empty_like(x)
+        y[:, [3, 0, 1, 2]] = x[:, 4:8] ^ self.F(x[:, 0:4], k)
+        y[:, 4:8] = x[:, 0:4]
+        return y
+
+    @staticmethod
+    def enc_key_mask(k):
+        # the round key is added to the right half x[4..7]
+        x = np.zeros((1, 8), dtype=np.uint8)
+        x[0, 4:8] = k
+        return x
+
+    @staticmethod
+    def dec_key_mask(k):
+        # after swapping, the round key is added to x[0..3]
+        x = np.zeros((1, 8), dtype=np.uint8)
+        x[0, 0:4] = k
+        return x
+
+    def build_tables(self, round_function):
+        """
+        Tabulate a round without key: round(x) = tables[0][chunk_0(x)] + ... + tables[3][chunk_3(x)]
+        """
+
+        zero_key = [0]*4
+        constant = self.pack(round_function(np.zeros((1, 8), dtype=np.uint8), zero_key))[0]
+        values = np.arange(2**16, dtype=np.uint64)
+        tables = np.empty((4, 2**16), dtype=np.uint64)
+        for j in range(4):
+            states = self.unpack(values << self.shifts[j])
+            tables[j] = self.pack(round_function(states, zero_key))
+            if j > 0:
+                tables[j] ^= constant
+        return tables
+
+    def round_constants(self, round_function, key_mask, subkeys):
+        """
+        For each round key k compute (m, c) such that round_k(x) = round_0(x + m) + c
+        """
+
+        zero = np.zeros((1, 8), dtype=np.uint8)
+        constants = []
+        for k in subkeys:
+            m = key_mask(k)
+            c = self.pack(round_function(zero, k))[0] ^ self.pack(round_function(m, [0]*4))[0]
+            constants.append((self.pack(m)[0], c))
+        return constants
+
+    def key_schedule(self, key, nrounds):
+        """
+        Generate the round keys (EncryptKeySchedule in lblock.c)
+
+        :param key list: master key as a list of 10 bytes (key[9] is the most significant byte)
+        :param nrounds int: number of rounds
+        :rtype: list
+        :return: list of round keys, each one a list of 4 bytes
+        """
+
+        K = sum(key[i] << (8*i) for i in range(10))
+        mask = 2**80 - 1
+        output = [[(K >> (8*i)) & 0xff for i in range(6, 10)]]
+        for i in range(1, nrounds):
+            K = ((K << 29) | (K >> 51)) & mask
+            K = (K & ~(0xff << 72)) | ((self.S9[(K >> 76) & 0x0f] << 76) ^ (self.S8[(K >> 72) & 0x0f] << 72))
+            K ^= ((i >> 2) & 0x07) << 48
+            K ^= ((i & 0x03) << 6) << 40
+            output.append([(K >> (8*j)) & 0xff for j in range(6, 10)])
+        return output
+
+    def apply_rounds(self, states, tables, constants):
+        states = np.ascontiguousarray(states, dtype=np.uint64)
+        for m, c in constants:
+            y = (states ^ m).view(np.uint16).reshape(-1, 4)
+            states = np.full(y.shape[0], c, dtype=np.uint64)
+            for j in range(4):
+                states ^= tables[j][y[:, j]]
+        return states
+
+    def enc(self, states, subkeys):
+        """
+        Encrypt an array of states with the given round keys (Encrypt in lblock.c)
+        """
+
+        constants = self.round_constants(self.round_bytes, self.enc_key_mask, subkeys)
+        return self.apply_rounds(states, self.enc_tables, constants)
+
+    def dec(self, states, subkeys):
+        """
+        Decrypt an array of states with the given round keys (Decrypt in lblock.c)
+        """
+
+        constants = self.round_constants(self.inv_round_bytes, self.dec_key_mask, subkeys[::-1])
+        return self.apply_rounds(states, self.dec_tables, constants)
@@ -6,7 +6,12 @@ Date: Feb 1, 2022
 
 from truncdiff import WordLBlock
 import time
-from gurobipy import *
+import os
+from ciphers import lblock_s_spec
+from modelcompiler import ModelCompiler
+from truncateddp import TruncatedDP
+from boomerangmitm import BoomerangMITM
+from solutionparser import SolutionParser
 
 class TruncatedBoomerang(WordLBlock):
     """
@@ -36,63 +41,9 @@ class TruncatedBoomerang(WordLBlock):
         self.w0 = w0
         self.w1 = w1
         self.wm = wm
+        self.solution_parser = None
         self.iterative = False
 
-    def constraint_by_xor(self, a, b, c):
-        """
-        operation:
-        (a, b) |----> c = a + b
-        model:
-        c - a >= 0
-        c - b >= 0
-        a + b - c >= 0
-        """
-
-        constraints = ""
-        constraints += f"{c} - {a} >= 0\n"
-        constraints += f"{c} - {b} >= 0\n"
-        constraints += f"{a} + {b} - {c} >= 0\n"
-        return constraints
-
-    def generate_upper_constraints(self):
-        """
-        Generate the constraints describing the propagation of
-        upper differential trail
-        """
-        constraints = ""
-        for rn in range(self.R0):
-            x_in = self.generate_round_x_variables(rn, ul="u")
-            x_out = self.generate_round_x_variables(rn + 1, ul="u")
-            x_middle = self.swap(x_out)
-            sbo = self.apply_permutation(x_in[0:8])
-            for n in range(8):
-                constraints += self.constraints_by_equality(x_in[n], x_middle[n])
-                if rn < self.r0:
-                    constraints += self.constraint_by_trunc_xor(sbo[n], x_in[8 + (n + 2)%8], x_middle[8 + n])
-                else:
-                    constraints += self.constraint_by_xor(sbo[n], x_in[8 + (n + 2)%8], x_middle[8 + n])
-        return constraints
-
-    def generate_lower_constraints(self):
-        """
-        Generate the constraints describing the propagation of
-        lower differential trail
-        """
-
-        constraints = ""
-        for rn in range(self.R1):
-            x_in = self.generate_round_x_variables(rn, ul="l")
-            x_out = self.generate_round_x_variables(rn + 1, ul="l")
-            x_middle = self.swap(x_out)
-            sbo = self.apply_permutation(x_in[0:8])
-            for n in range(8):
-                constraints += self.constraints_by_equality(x_in[n], x_middle[n])
-                if rn < self.rm:
-                    constraints += self.constraint_by_xor(sbo[n], x_middle[8 + n], x_in[8 + (n + 2)%8])
-                else:
-                    constraints += self.constraint_by_trunc_xor(sbo[n], x_in[8 + (n + 2)%8], x_middle[8 + n])
-        return constraints
-
     def generate_linking_vars(self, rn):
         """
         Generate linking variables to model the common active
@@ -100,45 +51,8 @@ class TruncatedBoomerang(WordLBlock):
         """
 
         s = [f"s_{rn}_{n}" for n in range(8)]
-        self.milp_variables.extend(s)
         return s
 
-    def generate_objective_function(self):
-        """
-        Generate objective function of MILP model
-        """
-
-        upper_active_sboxes = []
-
-        for r in range(0, self.r0):
-            xu = self.generate_round_x_variables(rn=r, ul="u")
-            for i in range(8):
-                upper_active_sboxes.append(f"{self.w0} {xu[i]}")
-        lower_active_sboxes = []
-        for r in range(self.rm, self.R1):
-            xl = self.generate_round_x_variables(rn=r, ul="l")
-            for i in range(8):
-                lower_active_sboxes.append(f"{self.w1} {xl[i]}")
-        common_active_sboxes = []
-        for r in range(self.rm):
-            s = self.generate_linking_vars(r)
-            for i in range(8):
-                common_active_sboxes.append(f"{self.wm} {s[i]}")
-        if upper_active_sboxes == [] and lower_active_sboxes == []:
-            objective  = " + ".join(common_active_sboxes)
-        elif upper_active_sboxes == []:
-            objective  = " + ".join(lower_active_sboxes) + " + " + \
-                         " + ".join(common_active_sboxes)
-        elif lower_active_sboxes == []:
-            objective  = " + ".join(upper_active_sboxes) + " + " + \
-                         " + ".join(common_active_sboxes)
-        else:
-            objective  = " + ".join(upper_active_sboxes) + " + " + \
-                         " + ".join(lower_active_sboxes) + " + " + \
-                         " + ".join(common_active_sboxes)
-        return objective
-
-
     def make_model(self):
         """
         Generate the main constrain of our MILP model
@@ -146,38 +60,19 @@ class TruncatedBoomerang(WordLBlock):
         lower parts
         """
 
-        constraints = "minimize\n"
-        constraints += self.generate_objective_function()
-        constraints += "\nsubject to\n"
-        constraints += self.generate_upper_constraints()
-        constraints += self.exclude_trivial_solution(ul="u")
-        constraints += self.generate_lower_constraints()
-        constraints += self.exclude_trivial_solution(ul="l")
-
-        for rn in range(self.rm):
-            s = self.generate_linking_vars(rn)
-            xu = self.generate_round_x_variables(rn + self.r0, ul="u")
-            xl = self.generate_round_x_variables(rn, ul="l")
-            for i in range(8):
-                constraints += f"{xu[i]} - {s[i]} >= 0\n"
-                constraints += f"{xl[i]} - {s[i]} >= 0\n"
-                constraints += f"- {xu[i]} - {xl[i]} + {s[i]} >= -1\n"
-        if self.iterative == True:
-            x_in = self.generate_round_x_variables(0, ul="u")
-            # x_out = self.generate_round_x_variables(self.R1, ul="l")
-            x_out = self.generate_round_x_variables(self.rm, ul="u")
-            for i in range(16):
-                constraints += f"{x_in[i]} - {x_out[i]} = 0\n"
-        constraints += self.declare_binary_vars()
-        constraints += "end"
-        with open(self.lp_file_name, "w") as lpfile:
-            lpfile.write(constraints)
+        spec = lblock_s_spec()
+        bounds = TruncatedDP(spec).table(max(self.r0, self.r1))
+        lp_contents = ModelCompiler(spec).truncated_boomerang(self.r0, self.rm, self.r1, self.w0, self.wm, self.w1, self.iterative, bounds)
+        with open(self.lp_file_name, "w") as lp_file:
+            lp_file.write(lp_contents)
 
     def find_truncated_boomerang_trail(self):
         """
         Solve the constructed model minimizing the number of active S-boxes
         """
 
+        from gurobipy import read, GRB
+
         self.make_model()
         self.milp_model = read(self.lp_file_name)
         os.remove(self.lp_file_name)
@@ -192,44 +87,77 @@ class TruncatedBoomerang(WordLBlock):
         objective_value = objective_function.getValue()
         print(f"Number of active S-boxes: {objective_value}")
 
-    def parse_solver_output(self):
+    def search_truncated_boomerang_trail(self):
+        """
+        Find the truncated boomerang trail minimizing the same cost as the MILP model without
+        solver, by meeting in the middle part (see feistel/boomerangmitm.py)
+        """
+
+        assert(not self.iterative), "iterative trails are only supported by the MILP model"
+        start_time = time.time()
+        objective_value, self.upper_trail, self.middle_part, self.lower_trail = \
+            BoomerangMITM(lblock_s_spec()).search(self.r0, self.rm, self.r1, self.w0, self.wm, self.w1)
+        elapsed_time = time.time() - start_time
+        print(f"Number of active S-boxes: {objective_value}")
+        print("Total time to find the trail: %0.02f seconds" % elapsed_time)
+        self.print_truncated_boomerang_trail()
+        return self.upper_trail, self.middle_part, self.lower_trail
+
+    def index_solution_variables(self):
+        '''
+        Index the variables of the solved model once, and the positions of the
+        truncated states and linking variables in the values of a solution
+        '''
+
+        self.solution_parser = SolutionParser(self.milp_model)
+        self.xu_positions = self.solution_parser.positions([self.generate_round_x_variables(rn=r, ul="u") for r in range(self.R0 + 1)])
+        self.xl_positions = self.solution_parser.positions([self.generate_round_x_variables(rn=r, ul="l") for r in range(self.R1 + 1)])
+        self.s_positions = self.solution_parser.positions([self.generate_linking_vars(r) for r in range(self.rm)])
+
+    def parse_solver_output(self, solution_number=None):
         '''
         Extract the truncated differential characteristic from the solver output
+
+        :param solution_number int: solution of the pool (default: the current value of the SolutionNumber parameter)
         '''
 
         self.upper_trail = dict()
         self.lower_trail = dict()
         self.middle_part = dict()
-        get_value_str = lambda t: str(int(self.milp_model.getVarByName(t).Xn))
-        get_value_int = lambda t: int(self.milp_model.getVarByName(t).Xn)
+        if self.solution_parser == None or self.solution_parser.milp_model is not self.milp_model:
+            self.index_solution_variables()
+        self.solution_parser.load(solution_number)
+        xu_values = self.solution_parser.bit_strings(self.xu_positions)
+        xl_values = self.solution_parser.bit_strings(self.xl_positions)
+        s_values = self.solution_parser.get(self.s_positions)
+
+        for r in range(self.R0 + 1):
+            self.upper_trail[f"x_{r}"] = str(xu_values[r])
+        for r in range(self.R1 + 1):
+            self.lower_trail[f"x_{r}"] = str(xl_values[r])
+        for r in range(self.rm):
+            self.middle_part[f"s_{r}"] = '*'.join(map(str, s_values[r])) + "*"
+        self.middle_part["as"] = int(s_values.sum())
+        self.print_truncated_boomerang_trail()
+        return self.upper_trail, self.middle_part, self.lower_trail
+
+    def print_truncated_boomerang_trail(self):
+        """
+        Print the upper and lower truncated trails and the common active S-boxes of the middle part
+        """
 
         print("\nUpper Truncated Trail:\n")
         for r in range(self.R0 + 1):
-            x_name = self.generate_round_x_variables(rn=r, ul="u")
-            x_value = ''.join(list(map(get_value_str, x_name)))
-            self.upper_trail[f"x_{r}"] = x_value
-            print(x_value)
+            print(self.upper_trail[f"x_{r}"])
         print("\n%s\n%s" % ("+"*16, "#"*16))
         print("Lower Truncated Trail:\n")
         for r in range(self.R1 + 1):
-            x_name = self.generate_round_x_variables(rn=r, ul="l")
-            x_value = ''.join(list(map(get_value_str, x_name)))
-            self.lower_trail[f"x_{r}"] = x_value
-            print(x_value)
+            print(self.lower_trail[f"x_{r}"])
         print("\n%s\n%s" % ("#"*16, "#"*16))
         print("Middle Part:\n")
         for r in range(self.rm):
-            s_name = self.generate_linking_vars(r)
-            s_value = '*'.join(list(map(get_value_str, s_name))) + "*"
-            self.middle_part[f"s_{r}"] = s_value
-            print(s_value)
-        s = []
-        for r in range(self.rm):
-            s.extend(self.generate_linking_vars(r))
-        ncs = sum(list(map(get_value_int, s)))
-        print(f"\nNumber of common active S-boxes: {ncs}")
-        self.middle_part["as"] = ncs
-        return self.upper_trail, self.middle_part, self.lower_trail
+            print(self.middle_part[f"s_{r}"])
+        print(f"\nNumber of common active S-boxes: {self.middle_part['as']}")
 
 if __name__ == "__main__":
     r0, rm, r1 = 0, 6, 0
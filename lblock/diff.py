@@ -11,6 +11,17 @@ import time
 from gurobipy import *
 import math
 import os
+import sys
+import hashlib
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "feistel"))
+from feistelspec import SboxEncoding
+from ciphers import lblock_spec
+from modelcompiler import ModelCompiler
+from solutionparser import SolutionParser
+from catalog import TrailCatalog
+from trailpool import TrailPoolWriter
+from trail import Trail
+from validator import TrailValidator
 
 class Diff:
     """
@@ -42,13 +53,16 @@ class Diff:
         self.mode = params['mode']
         self.number_of_trails = params["numberoftrails"]
         self.eps = 1e-3
+        self.solution_parser = None
+        self.catalog = TrailCatalog(params["catalog"]) if params.get("catalog") != None else None
+        self.model_hash = None
+        self.trail_pool_file_name = params.get("trailpool")
+        self.validate = params.get("validate", False)
+        self.validator = None
 
-        self.permute_nibbles = [2, 0, 3, 1, 6, 4, 7, 5]
         self.lp_file_name = f"lblock_nr_{self.nrounds}.lp"
         self.result_file_name = f"result_nr_{self.nrounds}.txt"
 
-        self.milp_variables = []
-
         """
         a0, a1, a2, a3 (a0: msb of input difference)
         b0, b1, b2, b3 (b0: msb of output difference)
@@ -368,17 +382,6 @@ class Diff:
                                     "- a0 - a1 + a2 + b0 - b1 - b2 - b3 >= -4",
                                     "- a1 - a2 + b0 - b1 - b3 + p0 >= -3"]
 
-    @staticmethod
-    def ordered_set(seq):
-        """
-        This method eliminates duplicated elements in a given list,
-        and returns a list in which each elements appears only once
-        """
-
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if not (x in seen or seen_add(x))]
-
     @staticmethod
     def flatten_state(s):
         state_bits = [s[i][j] for i in range(len(s)) for j in range(len(s[0]))]
@@ -393,220 +396,23 @@ class Diff:
                 state[i] = ((int(str_hex[nibble], base=16) >> i) & 0x1)
         return state
 
-    def swap(self, state):
-        """
-        Swap two halves of the state array
-        """
-
-        temp = [0]*16
-        for i in range(8):
-            temp[i] = state[8 + i]
-            temp[8 + i] = state[i]
-        return temp
-
-    def apply_permutation(self, half_state):
-        """
-        Apply the permute nibble operation on a half state array
-        """
-
-        output = [0]*8
-        for i in range(8):
-            output[self.permute_nibbles[i]] = half_state[i]
-        return output
-
     def generate_round_x_variables(self, rn):
         """
         Generate the input variables of rn'th round
         """
 
         x = [[f"x_{rn}_{nibble}_{bit}" for bit in range(4)] for nibble in range(16)]
-        self.milp_variables.extend(self.flatten_state(x))
         return x
 
-    def generate_round_y_variables(self, rn):
-        """
-        Generate the variables corresponding to the
-        output of S-boxes in rn'th round
-        """
-
-        y = [[f"y_{rn}_{nibble}_{bit}" for bit in range(4)] for nibble in range(8)]
-        self.milp_variables.extend(self.flatten_state(y))
-        return y
-
-    def generate_round_pr_variables(self, rn):
-        """
-        Generate the variables encoding the probability of S-boxes
-        """
-
-        pr = [[f"pr_{rn}_{nibble}_{bit}" for bit in range(3)] for nibble in range(8)]
-        self.milp_variables.extend(self.flatten_state(pr))
-        return pr
-
-    def constraints_by_equality(self, a, b):
-        """
-        Generate constraints for equality
-        a = b
-        """
-        constraint = f"{a} - {b} = 0\n"
-        return constraint
-
-    def constraint_by_nibble_equality(self, a, b):
-        """
-        Generate constraints corresponding
-        to equality of two nibbles
-        """
-
-        constraints = ""
-        for bit in range(4):
-            constraints += f"{a[bit]} - {b[bit]} = 0\n"
-        return constraints
-
-    def constraints_by_xor(self, a, b, c):
-        """
-        a + b = c
-        model:
-        - a - b - c >= -2
-          a + b - c >= 0
-          a - b + c >= 0
-        - a + b + c >= 0
-        """
-
-        constraints = f"- {a} - {b} - {c} >= -2\n"
-        constraints += f"{a} + {b} - {c} >= 0\n"
-        constraints += f"{a} - {b} + {c} >= 0\n"
-        constraints += f"- {a} + {b} + {c} >= 0\n"
-        return constraints
-
-    def constraints_by_nibble_xor(self, a, b, c):
-        """
-        Generate constraints for XOR of nibbles
-        a + b -> c
-        """
-
-        constraints = ""
-        for bit in range(4):
-            constraints += self.constraints_by_xor(a[bit], b[bit], c[bit])
-        return constraints
-
-    def constraints_by_sbox(self, sbn, di, do, pr):
-        """
-        Generate constraints modeling the DDT of S-box
-
-        :param int sbn: S-box number in [0, ..., 7]
-        :param str[4] di: input difference
-        :param str[4] do: output difference
-        :param str[3] pr: probability of (di --> do) such that
-                          hamming_weight(pr) = -log2(pr(di --> do))
-        :return constraints encoding the DDT of S-box:
-        :rtype str:
-        """
-
-        constraints = ""
-        for ineq in self.sbox_inequalities[sbn]:
-            temp = ineq
-            for i in range(4):
-                temp = temp.replace(f"a{i}", di[i])
-            for i in range(4):
-                temp = temp.replace(f"b{i}", do[i])
-            for i in range(3):
-                temp = temp.replace(f"p{i}", pr[i])
-            constraints += temp + "\n"
-        return constraints
-
-    def generate_objective_function(self):
-        """
-        Generate the objective function of MILP model
-        The objective is minimizing the summation of variables
-        which encode the weight (or probability exponent) the
-        differential trail
-        """
-
-        objective_function = "minimize\n"
-        weight = []
-        for r in range(self.nrounds):
-            weight += self.flatten_state(self.generate_round_pr_variables(rn=r))
-        weight = " + ".join(weight)
-        objective_function += weight + "\n"
-        return objective_function
-
-    def generate_constraints(self):
-        """
-        Generate the constraints describing the propagation
-        of differential trails through a reduced-round LBlock
-        """
-
-        constraints = "subject to\n"
-        for rn in range(self.nrounds):
-            x_in = self.generate_round_x_variables(rn)
-            pr = self.generate_round_pr_variables(rn)
-            y = self.generate_round_y_variables(rn)
-            x_out = self.generate_round_x_variables(rn + 1)
-            x_middle = self.swap(x_out)
-            py = self.apply_permutation(y)
-            for n in range(8):
-                constraints += self.constraint_by_nibble_equality(x_in[n], x_middle[n])
-                constraints += self.constraints_by_sbox(sbn=(7 - n), di=x_in[n], do=y[n], pr=pr[n])
-                constraints += self.constraints_by_nibble_xor(py[n], x_in[8 + (n + 2)%8], x_middle[8 + n])
-        return constraints
-
-    def declare_binary_vars(self):
-        """
-        Declare binary variables of MILP model
-        """
-
-        self.milp_variables = self.ordered_set(self.milp_variables)
-        constraints = "Binary\n"
-        constraints += "\n".join(self.milp_variables) + "\n"
-        return constraints
-
-    def exclude_trivial_trail(self):
-        """
-        Exclude all-zero solution from the solution space
-        """
-
-        input_diff = self.flatten_state(self.generate_round_x_variables(0))
-        input_diff = " + ".join(input_diff)
-        constraint = f"{input_diff} >= 1\n"
-        return constraint
-
-    def declare_fixed_variables(self):
-        lp_contents = ""
-        for cond in self.fixed_variables.items():
-            var = cond[0]
-            val = cond[1]
-            var = var.split('_')
-            if len(var) == 2:
-                assert(var[0] == "x")
-                state_vars = self.generate_round_x_variables(var[1])
-                state_vars = self.flatten_state(state_vars)
-                state_values = list(bin(int(val, 16))[2:].zfill(64))
-                for i in range(64):
-                    lp_contents += f"{state_vars[i]} = {state_values[i]}\n"
-            elif len(var) == 3:
-                assert(var[0] == "x")
-                state_vars = [f"x_{var[1]}_{var[2]}_{bit}" for bit in range(4)]
-                state_values = list(bin(int(val, 16))[2:].zfill(4))
-                for i in range(4):
-                    lp_contents += f"{state_vars[i]} = {state_values[i]}\n"
-            elif len(var) == 4:
-                assert(var[0] == "x")
-                lp_contents += f"{cond[0]} = {cond[1]}\n"
-            else:
-                pass
-        return lp_contents
-
     def make_model(self):
         """
         Build the MILP model to find the best differential trail
         """
 
-        lp_contents = "\\ Differential attack on {} rounds of LBlock\n".format(self.nrounds)
-        lp_contents += self.generate_objective_function()
-        lp_contents += self.generate_constraints()
-        lp_contents += self.exclude_trivial_trail()
-        lp_contents += self.declare_fixed_variables()
-        lp_contents += self.declare_binary_vars()
-        lp_contents += "end"
+        sbox_encodings = [SboxEncoding(inequalities, nweights=3) for inequalities in self.sbox_inequalities]
+        self.spec = lblock_spec(sbox_encodings)
+        lp_contents = ModelCompiler(self.spec).differential(self.nrounds, self.fixed_variables)
+        self.model_hash = hashlib.sha256((lp_contents + f"\\ startweight: {self.start_weight}").encode()).hexdigest()
         with open(self.lp_file_name, "w") as lp_file:
             lp_file.write(lp_contents)
 
@@ -630,6 +436,11 @@ class Diff:
 
     def solve(self):
         output = None
+        if self.mode == 0 and self.catalog != None:
+            output = self.find_characteristic_in_catalog()
+            if output != None:
+                os.remove(self.lp_file_name)
+                return output
         self.milp_model = read(self.lp_file_name)
         os.remove(self.lp_file_name)
         if self.mode == 0:
@@ -643,22 +454,49 @@ class Diff:
             print('Enter a number in [0, 1, 2], for the mode parameter please!')
         return output
 
-    def parse_solver_output(self):
+    def find_characteristic_in_catalog(self):
+        """
+        Look up the solution of the same model (same LP file and start weight) in the catalog of trails
+        """
+
+        trail = self.catalog.solution(self.model_hash)
+        if trail == None:
+            return None
+        self.total_weight = trail.total_weight
+        diff_trail = trail.to_dict()
+        print(f"\nThe probability of the best differential characteristic: 2^-({self.total_weight}) (found in {self.catalog.file_name})")
+        print("\nDifferential trail:\n")
+        self.print_trail(diff_trail=diff_trail)
+        return diff_trail
+
+    def index_solution_variables(self):
+        """
+        Index the variables of the solved model once, and the positions of the
+        state and probability variables in the values of a solution
+        """
+
+        self.solution_parser = SolutionParser(self.milp_model)
+        self.x_positions = self.solution_parser.positions([self.flatten_state(self.generate_round_x_variables(r)) for r in range(self.nrounds + 1)])
+        self.pr_positions = self.solution_parser.positions([[f"pr_{r}_{nibble}_{bit}" for nibble in range(8) for bit in range(3)]
+                                                            for r in range(self.nrounds)])
+
+    def parse_solver_output(self, solution_number=None):
         """
         Extract the differential characteristic from the solver output
+
+        :param solution_number int: solution of the pool (default: the current value of the SolutionNumber parameter)
         """
 
-        get_bit_value = lambda t: str(int(self.milp_model.getVarByName(t).Xn))
+        if self.solution_parser == None or self.solution_parser.milp_model is not self.milp_model:
+            self.index_solution_variables()
+        self.solution_parser.load(solution_number)
+        x_values = self.solution_parser.hex_strings(self.x_positions)
+        round_probabilities = self.solution_parser.get(self.pr_positions).sum(axis=1)
         characteristic = dict()
         for r in range(self.nrounds + 1):
-            x = self.flatten_state(self.generate_round_x_variables(r))
-            x_value = hex(int("0b" + "".join(list(map(lambda t: str(int(self.milp_model.getVarByName(t).Xn)), x))), 2))[2:].zfill(16)
-            characteristic[f"x_{r}"] = x_value
+            characteristic[f"x_{r}"] = str(x_values[r])
         for r in range(self.nrounds):
-            round_probability = 0
-            for nibble in range(8):
-                round_probability += sum([int(self.milp_model.getVarByName(f"pr_{r}_{nibble}_{bit}").Xn) for bit in range(3)])
-            characteristic[f"pr_{r}"] = f"-{round_probability}"
+            characteristic[f"pr_{r}"] = f"-{round_probabilities[r]}"
         characteristic["total_weight"] = "%0.02f" % self.total_weight
         characteristic["nrounds"] = self.nrounds
         return characteristic
@@ -716,6 +554,11 @@ class Diff:
             print("\nDifferential trail:\n")
             diff_trail = self.parse_solver_output()
             self.print_trail(diff_trail=diff_trail)
+            if self.catalog != None:
+                self.catalog.insert_solution(self.spec.name, self.model_hash, diff_trail, optimal=self.milp_model.Status == GRB.OPTIMAL,
+                                             source="find_characteristic", cell_size=self.spec.cell_size)
+            if self.validate:
+                self.check_trail(diff_trail)
         # Gurobi syntax: m.Status == 3 represents the model is infeasible. (GRB.Status.INFEASIBLE)
         elif self.milp_model.Status == GRB.INFEASIBLE:
             print("The model is infeasible!")
@@ -750,10 +593,18 @@ class Diff:
                     self.total_weight = self.milp_model.PoolObjVal
                     diff_trail = self.parse_solver_output()
                     self.print_trail(diff_trail=diff_trail)
+                    if self.catalog != None:
+                        self.catalog.insert(self.spec.name, [diff_trail], source="find_multiple_characteristics", cell_size=self.spec.cell_size)
+                    if self.validate:
+                        self.check_trail(diff_trail)
                 elif (self.milp_model.Status == GRB.TIME_LIMIT or self.milp_model.Status == GRB.INTERRUPTED):
                     self.total_weight = self.milp_model.PoolObjVal
                     diff_trail = self.parse_solver_output()
                     self.print_trail(diff_trail=diff_trail)
+                    if self.catalog != None:
+                        self.catalog.insert(self.spec.name, [diff_trail], source="find_multiple_characteristics", cell_size=self.spec.cell_size)
+                    if self.validate:
+                        self.check_trail(diff_trail)
                     break
                 else:
                     break
@@ -776,6 +627,82 @@ class Diff:
         elapsed_time = time.time() - time_start
         print("Total time to find %s differential trails: %0.02f" % (number_of_trails, elapsed_time))
 
+    def open_trail_pool(self):
+        """
+        Open the trail pool file to which the enumerated trails are appended (see trailpool.py)
+
+        :rtype: TrailPoolWriter
+        :return: None if no trail pool was requested
+        """
+
+        if self.trail_pool_file_name == None:
+            return None
+        nwords = self.spec.ncells*self.spec.cell_size//64
+        return TrailPoolWriter(self.trail_pool_file_name, self.nrounds, nwords, self.spec.cell_size, self.spec.name)
+
+    def solution_states(self, solution_numbers=None):
+        """
+        :param solution_numbers list: solutions of the pool (default: the best solution)
+        :rtype: numpy.ndarray
+        :return: packed states of the trails (see trail.py), shape (len(solution_numbers), nrounds + 1, nwords)
+        """
+
+        if self.solution_parser == None or self.solution_parser.milp_model is not self.milp_model:
+            self.index_solution_variables()
+        if solution_numbers == None:
+            values = self.solution_parser.load(0)[None]
+        else:
+            values = self.solution_parser.load_pool(solution_numbers)
+        return self.solution_parser.words(self.x_positions, values)
+
+    def process_solution_pool(self, weight, trail_pool=None, chunk_size=4096):
+        """
+        Append all solutions of the pool to the trail pool and/or validate them, chunk_size solutions at a time
+
+        :param weight float: weight of the solutions
+        :param trail_pool TrailPoolWriter: output of open_trail_pool()
+        """
+
+        number_of_solutions = self.milp_model.SolCount
+        for start in range(0, number_of_solutions, chunk_size):
+            states = self.solution_states(range(start, min(start + chunk_size, number_of_solutions)))
+            if trail_pool != None:
+                trail_pool.append(states, weight)
+            if self.validate:
+                self.check_trails(states, weight)
+
+    def check_trails(self, states, weights):
+        """
+        Check trails found by the solver against the DDTs and the wiring of the cipher (see validator.py)
+
+        :param states numpy.ndarray: packed states of the trails, shape (ntrails, nrounds + 1, nwords)
+        :param weights numpy.ndarray|float: weights reported by the model, of each trail or of each round of each trail
+        :rtype: bool
+        :return: True if all trails are valid
+        """
+
+        if self.validator == None:
+            self.validator = TrailValidator(self.spec)
+        result = self.validator.validate(states, weights)
+        invalid = result.invalid()
+        for n in invalid[:10]:
+            weights = result.reported_weights[n] if result.reported_weights is not None else None
+            errors = self.validator.errors(states[n], weights, result.tolerance)
+            print(f"Invalid trail: {'; '.join(errors[:5])}{' ...' if len(errors) > 5 else ''}")
+        if len(invalid) != 0:
+            print(f"{len(invalid)} of {len(result)} trails are invalid!")
+        return len(invalid) == 0
+
+    def check_trail(self, diff_trail):
+        """
+        :param diff_trail dict: output of parse_solver_output()
+        :rtype: bool
+        :return: True if the trail is valid
+        """
+
+        trail = Trail.from_dict(diff_trail, self.spec.cell_size)
+        return self.check_trails(trail.states[None], trail.weights[None])
+
     def compute_differential_effect(self):
         """
         Compute the differential effect for a given input/output differences
@@ -811,6 +738,7 @@ class Diff:
             self.milp_model.addConstr(obj >= self.start_weight, 'start_weight_constraint')
         time_start = time.time()
         self.milp_model.optimize()
+        trail_pool = self.open_trail_pool()
         current_probability = 0
         if (self.milp_model.Status == GRB.OPTIMAL):
             self.total_weight = self.milp_model.objVal
@@ -826,6 +754,8 @@ class Diff:
                 self.milp_model.update()
                 self.milp_model.optimize()
                 diff_prob += math.pow(2, -self.total_weight) * self.milp_model.SolCount
+                if trail_pool != None or self.validate:
+                    self.process_solution_pool(self.total_weight, trail_pool)
                 print(f"Current weight: {self.total_weight}")
                 print(f"Number of trails: {self.milp_model.SolCount}")
                 current_probability = math.log(diff_prob, 2)
@@ -841,6 +771,9 @@ class Diff:
             print("The model is infeasible!")
         else:
             print("Unknown Error!")
+        if trail_pool != None:
+            trail_pool.close()
+            print(f"{trail_pool.count} trails written to {trail_pool.file_name}")
         return current_probability
 
     def compute_differential_effect_classic_method(self):
@@ -858,6 +791,7 @@ class Diff:
             self.milp_model.addConstr(obj >= self.start_weight, 'start_weight_constraint')
         time_start = time.time()
         self.milp_model.optimize()
+        trail_pool = self.open_trail_pool()
         # self.milp_model.Params.Quad = 1
         sol_dict = dict()
         if (self.milp_model.Status == GRB.OPTIMAL):
@@ -867,6 +801,12 @@ class Diff:
             while (self.milp_model.Status == GRB.OPTIMAL and self.total_weight <= self.end_weight):
                 self.total_weight = self.milp_model.objVal
                 diff_prob += math.pow(2, -self.total_weight)
+                if trail_pool != None or self.validate:
+                    states = self.solution_states()
+                    if trail_pool != None:
+                        trail_pool.append(states, self.total_weight)
+                    if self.validate:
+                        self.check_trails(states, self.total_weight)
                 total_weight_st = 'ntrails_%0.2f' % self.total_weight
                 sol_dict[total_weight_st] = sol_dict.get(total_weight_st, 0) + 1
                 print('Current weight: %s' % str(self.total_weight))
@@ -880,6 +820,9 @@ class Diff:
             print('The model is infeasible!')
         else:
             print('Unknown Error!')
+        if trail_pool != None:
+            trail_pool.close()
+            print(f"{trail_pool.count} trails written to {trail_pool.file_name}")
 
 def loadparameters(args):
         """
@@ -892,7 +835,10 @@ def loadparameters(args):
                   "endweight" : 128,
                   "timelimit" : 3600,
                   "numberoftrails" : 1,
-                  "fixedVariables" : {}}
+                  "fixedVariables" : {},
+                  "catalog" : None,
+                  "trailpool" : None,
+                  "validate" : False}
 
         # Check if there is an input file specified
         if args.inputfile:
@@ -925,6 +871,15 @@ def loadparameters(args):
         if args.numberoftrails:
             params["numberoftrails"] = args.numberoftrails[0]
 
+        if args.catalog:
+            params["catalog"] = args.catalog[0]
+
+        if args.trailpool:
+            params["trailpool"] = args.trailpool[0]
+
+        if args.validate:
+            params["validate"] = True
+
         return params
 
 def main():
@@ -954,6 +909,12 @@ def main():
                                                      "read the parameters.")
     parser.add_argument('--numberoftrails', nargs=1, type=int,
                         help="Number of trails.")
+    parser.add_argument('--catalog', nargs=1, type=str,
+                        help="SQLite catalog of trails to look up and store the trails.")
+    parser.add_argument('--trailpool', nargs=1, type=str,
+                        help="File to which all trails enumerated in mode 2 are appended (see feistel/trailpool.py).")
+    parser.add_argument('--validate', action='store_true',
+                        help="Check the trails found by the solver against the DDTs of the S-boxes (see feistel/validator.py).")
 
     # Parse command line arguments and construct parameter list.
     args = parser.parse_args()
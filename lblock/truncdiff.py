@@ -8,7 +8,11 @@ with minimum number of active S-boxes for LBlock block cipher.
 from statistics import mode
 import time
 import os
-from gurobipy import *
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "feistel"))
+from ciphers import lblock_spec
+from modelcompiler import ModelCompiler
+from truncateddp import TruncatedDP
 
 class WordLBlock:
     """
@@ -29,39 +33,8 @@ class WordLBlock:
 
     def __init__(self, nrounds=1) -> None:
         WordLBlock.count += 1
-        self.xor_counter = 0
-        self.dummy_var = "d"
         self.nrounds = nrounds
-        self.milp_variables = []
         self.lp_file_name = f"lblock_{nrounds}r.lp"
-        self.permute_nibbles = [2, 0, 3, 1, 6, 4, 7, 5]
-
-    @staticmethod
-    def ordered_set(seq):
-        """
-        This method eliminates duplicated elements in a given list,
-        and returns a list in which each elements appears only once
-        """
-
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if not (x in seen or seen_add(x))]
-
-    def swap(self, state):
-        temp = [0]*16
-        for i in range(8):
-            temp[i] = state[8 + i]
-            temp[8 + i] = state[i]
-        return temp
-
-    def apply_permutation(self, half_state):
-        """
-        Apply the permute nibble operation on a half state array
-        """
-        output = [0]*8
-        for i in range(8):
-            output[self.permute_nibbles[i]] = half_state[i]
-        return output
 
     def generate_round_x_variables(self, rn, ul="u"):
         """
@@ -72,107 +45,18 @@ class WordLBlock:
         """
 
         x = [f"x{ul}_{rn}_{nibble}" for nibble in range(16)]
-        self.milp_variables.extend(x)
         return x
 
-    def constraint_by_trunc_xor(self, a, b, c, model=2):
-        """
-        operation:
-        (a, b) |----> c = a + b
-        model 1:
-        a + b + c >= 2 d
-        d >= a
-        d >= b
-        d >= c
-        model 2:
-        a + b - c >= 0
-        a - b + c >= 0
-        - a + b + c >= 0
-        """
-
-        constraints = ""
-        if model == 1:
-            d = f"{self.dummy_var}_{self.xor_counter}"
-            self.milp_variables.append(d)
-            constraints += f"{a} + {b} + {c} -  2 {d} >= 0\n"
-            constraints += f"{d} - {a} >= 0\n"
-            constraints += f"{d} - {b} >= 0\n"
-            constraints += f"{d} - {c} >= 0\n"
-            self.xor_counter += 1
-        elif model == 2:
-            constraints += f"{a} + {b} - {c} >= 0\n"
-            constraints += f"{a} - {b} + {c} >= 0\n"
-            constraints += f"- {a} + {b} + {c} >= 0\n"
-        return constraints
-
-    def constraints_by_equality(self, a, b):
-        """
-        a = b
-        """
-
-        constraint = f"{a} - {b} = 0\n"
-        return constraint
-
-    def generate_constraints(self, ul="u"):
-        """
-        Generate the constraints of MILP model
-        """
-
-        constraints = ""
-        for rn in range(self.nrounds):
-            x_in = self.generate_round_x_variables(rn, ul)
-            x_out = self.generate_round_x_variables(rn + 1, ul)
-            x_middle = self.swap(x_out)
-            sbo = self.apply_permutation(x_in[0:8])
-            for n in range(8):
-                constraints += self.constraints_by_equality(x_in[n], x_middle[n])
-                constraints += self.constraint_by_trunc_xor(sbo[n], x_in[8 + (n + 2)%8], x_middle[8 + n])
-        return constraints
-
-    def declare_binary_vars(self):
-        """
-        Declare binary variables of MILP model
-        """
-
-        self.milp_variables = self.ordered_set(self.milp_variables)
-        constraints = "Binary\n"
-        constraints += "\n".join(self.milp_variables) + "\n"
-        return constraints
-
-    def generate_objective_function(self):
-        """
-        Generate the objective function of MILP model
-        """
-
-        sbox_inputs = []
-        for r in range(self.nrounds):
-            round_input = self.generate_round_x_variables(r)
-            sbox_inputs.extend([round_input[i] for i in range(8)])
-        objective = " + ".join(sbox_inputs) + "\n"
-        return objective
-
-    def exclude_trivial_solution(self, ul="u"):
-        """
-        Exclude all-zero solution from the solutions space
-        """
-        x_0 = self.generate_round_x_variables(0, ul)
-        constraint = " + ".join(x_0) + " >= 1\n"
-        return constraint
-
     def make_model(self):
         """
         Generate the MILP model describing propagation of a truncated differential
         trail through LBlock block cipher
         """
 
-        lp_contents = f"\\ Truncated differential trail for {self.nrounds} rounds of LBlock\n"
-        lp_contents = "minimize\n"
-        lp_contents += self.generate_objective_function()
-        lp_contents += "subject to\n"
-        lp_contents += self.generate_constraints()
-        lp_contents += self.exclude_trivial_solution()
-        lp_contents += self.declare_binary_vars()
-        lp_contents += "End"
+        spec = lblock_spec()
+        # the exact minimum numbers of active S-boxes over fewer rounds speed up the solver
+        bounds = TruncatedDP(spec).table(self.nrounds)
+        lp_contents = ModelCompiler(spec).truncated_differential(self.nrounds, bounds)
         with open(self.lp_file_name, "w") as lp_file:
             lp_file.write(lp_contents)
 
@@ -181,6 +65,8 @@ class WordLBlock:
         Solve the constructed model minimizing the number of active S-boxes
         """
 
+        from gurobipy import read, GRB
+
         self.make_model()
         milp_model = read(self.lp_file_name)
         os.remove(self.lp_file_name)
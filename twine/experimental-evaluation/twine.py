@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Table-driven implementation of TWINE in NumPy
+It follows the reference implementation in twine.c
+"""
+
+import sys
+import numpy as np
+
+class Twine:
+    """
+    A state is a uint64 whose i'th nibble from the left is the i'th nibble
+    of the state in twine.c, i.e., int(hex_str, 16) for the differences
+    given in boomerang.h. A round is computed by 4 lookups (one per 16-bit
+    chunk of the state) into tables fusing the S-box and the nibble
+    permutation; the round key is folded into the indexes.
+    """
+
+    S = [0x0c, 0x00, 0x0f, 0x0a, 0x02, 0x0b, 0x09, 0x05, 0x08, 0x03, 0x0d, 0x07, 0x01, 0x0e, 0x06, 0x04]
+    Pi = [0x05, 0x00, 0x01, 0x04, 0x07, 0x0c, 0x03, 0x08, 0x0d, 0x06, 0x09, 0x02, 0x0f, 0x0a, 0x0b, 0x0e]
+    CON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x03, 0x06, 0x0c, 0x18, 0x30, 0x23, 0x05, 0x0a, 0x14, 0x28, 0x13, 0x26,
+           0x0f, 0x1e, 0x3c, 0x3b, 0x35, 0x29, 0x11, 0x22, 0x07, 0x0e, 0x1c, 0x38, 0x33, 0x25, 0x09, 0x12, 0x24]
+
+    def __init__(self, ksize=80):
+        assert(ksize in [80, 128])
+        self.ksize = ksize
+        self.sbox = np.array(self.S, dtype=np.uint8)
+        # chunk j is the j'th uint16 of a state in memory
+        self.shifts = [np.uint64(16*j if sys.byteorder == "little" else 16*(3 - j)) for j in range(4)]
+        self.enc_tables = self.build_tables(self.round_nibbles)
+        self.dec_tables = self.build_tables(self.inv_round_nibbles)
+
+    @staticmethod
+    def pack(nibbles):
+        """
+        Convert an array of shape (N, 16) of nibbles into an array of N states
+        """
+
+        nibbles = np.asarray(nibbles, dtype=np.uint64)
+        shifts = np.arange(60, -4, -4, dtype=np.uint64)
+        return np.bitwise_xor.reduce(nibbles << shifts, axis=1)
+
+    @staticmethod
+    def unpack(states):
+        """
+        Convert an array of N states into an array of shape (N, 16) of nibbles
+        """
+
+        shifts = np.arange(60, -4, -4, dtype=np.uint64)
+        return ((np.asarray(states, dtype=np.uint64)[:, None] >> shifts) & np.uint64(0xf)).astype(np.uint8)
+
+    @staticmethod
+    def hexstr_to_state(hex_str):
+        return np.uint64(int(hex_str, 16))
+
+    def round_nibbles(self, x, k):
+        """
+        One round of encryption on an array of shape (N, 16) of nibbles (OneRound in twine.c)
+        """
+
+        x = x.copy()
+        x[:, 1::2] ^= self.sbox[x[:, 0::2] ^ np.asarray(k, dtype=np.uint8)]
+        y = np.empty_like(x)
+        y[:, self.Pi] = x
+        return y
+
+    def inv_round_nibbles(self, x, k):
+        """
+        One round of decryption on an array of shape (N, 16) of nibbles (OneRound_Inv in twine.c)
+        """
+
+        t = x[:, self.Pi]
+        t[:, 1::2] ^= self.sbox[t[:, 0::2] ^ np.asarray(k, dtype=np.uint8)]
+        return t
+
+    def enc_key_mask(self, k):
+        # the round key is added to the S-box inputs x[2i]
+        nibbles = np.zeros((1, 16), dtype=np.uint8)
+        nibbles[0, 0::2] = k
+        return nibbles
+
+    def dec_key_mask(self, k):
+        # the round key is added to the S-box inputs t[2i] = x[Pi[2i]]
+        nibbles = np.zeros((1, 16), dtype=np.uint8)
+        nibbles[0, self.Pi[0::2]] = k
+        return nibbles
+
+    def build_tables(self, round_function):
+        """
+        Tabulate a round without key: round(x) = tables[0][chunk_0(x)] + ... + tables[3][chunk_3(x)]
+        """
+
+        zero_key = [0]*8
+        constant = self.pack(round_function(np.zeros((1, 16), dtype=np.uint8), zero_key))[0]
+        values = np.arange(2**16, dtype=np.uint64)
+        tables = np.empty((4, 2**16), dtype=np.uint64)
+        for j in range(4):
+            states = self.unpack(values << self.shifts[j])
+            tables[j] = self.pack(round_function(states, zero_key))
+            if j > 0:
+                tables[j] ^= constant
+        return tables
+
+    def round_constants(self, round_function, key_mask, subkeys):
+        """
+        For each round key k compute (m, c) such that round_k(x) = round_0(x + m) + c
+        """
+
+        zero = np.zeros((1, 16), dtype=np.uint8)
+        constants = []
+        for k in subkeys:
+            m = key_mask(k)
+            c = self.pack(round_function(zero, k))[0] ^ self.pack(round_function(m, [0]*8))[0]
+            constants.append((self.pack(m)[0], c))
+        return constants
+
+    def key_schedule(self, key, nrounds):
+        """
+        Generate the round keys (KeySch in twine.c)
+
+        :param key list: master key as a list of 16-bit words (5 words for 80-bit and 8 words for 128-bit keys)
+        :param nrounds int: number of rounds
+        :rtype: list
+        :return: list of round keys, each one a list of 8 nibbles
+        """
+
+        KeyR = [(key[i//4] >> (4*(i & 0x03))) & 0x0f for i in range(self.ksize//4)]
+        output = []
+        for i in range(nrounds):
+            if self.ksize == 80:
+                output.append([KeyR[t] for t in [1, 3, 4, 6, 13, 14, 15, 16]])
+                KeyR[1] ^= self.S[KeyR[0]]
+                KeyR[4] ^= self.S[KeyR[16]]
+            else:
+                output.append([KeyR[t] for t in [2, 3, 12, 15, 17, 18, 28, 31]])
+                KeyR[1] ^= self.S[KeyR[0]]
+                KeyR[4] ^= self.S[KeyR[16]]
+                KeyR[23] ^= self.S[KeyR[30]]
+            # the last round key is taken, CON has only 35 entries for the 36 rounds
+            if i == nrounds - 1:
+                break
+            KeyR[7] ^= self.CON[i] >> 3
+            KeyR[19] ^= self.CON[i] & 0x07
+            KeyR[0:4] = KeyR[1:4] + KeyR[0:1]
+            KeyR = KeyR[4:] + KeyR[0:4]
+        return output
+
+    def apply_rounds(self, states, tables, constants):
+        states = np.ascontiguousarray(states, dtype=np.uint64)
+        for m, c in constants:
+            y = (states ^ m).view(np.uint16).reshape(-1, 4)
+            states = np.full(y.shape[0], c, dtype=np.uint64)
+            for j in range(4):
+                states ^= tables[j][y[:, j]]
+        return states
+
+    def enc(self, states, subkeys):
+        """
+        Encrypt an array of states with the given round keys (Encrypt in twine.c)
+        """
+
+        constants = self.round_constants(self.round_nibbles, self.enc_key_mask, subkeys)
+        return self.apply_rounds(states, self.enc_tables, constants)
+
+    def dec(self, states, subkeys):
+        """
+        Decrypt an array of states with the given round keys (Decrypt in twine.c)
+        """
+
+        constants = self.round_constants(self.inv_round_nibbles, self.dec_key_mask, subkeys[::-1])
+        return self.apply_rounds(states, self.dec_tables, constants)
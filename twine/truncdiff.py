@@ -8,7 +8,11 @@ with minimum number of active S-boxes for TWINE block cipher.
 from statistics import mode
 import time
 import os
-from gurobipy import *
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "feistel"))
+from ciphers import twine_spec
+from modelcompiler import ModelCompiler
+from truncateddp import TruncatedDP
 
 class WordTwine:
     """
@@ -29,29 +33,8 @@ class WordTwine:
 
     def __init__(self, nrounds=1) -> None:
         WordTwine.count += 1
-        self.xor_counter = 0
-        self.dummy_var = "d"
         self.nrounds = nrounds
-        self.milp_variables = []
         self.lp_file_name = f"twine_{nrounds}r.lp"
-        self.permute_nibbles = [0x5, 0x0, 0x1, 0x4, 0x7, 0xc, 0x3, 0x8, 0xd, 0x6, 0x9, 0x2, 0xf, 0xa, 0xb, 0xe]
-
-    @staticmethod
-    def ordered_set(seq):
-        """
-        This method eliminates duplicated elements in a given list,
-        and returns a list in which each elements appears only once
-        """
-
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if not (x in seen or seen_add(x))]
-
-    def inv_permute_nibbles(self, state):
-        temp = [0]*16
-        for i in range(16):
-            temp[i] = state[self.permute_nibbles[i]]
-        return temp
 
     def generate_round_x_variables(self, rn, ul="u"):
         """
@@ -62,106 +45,18 @@ class WordTwine:
         """
 
         x = [f"x{ul}_{rn}_{nibble}" for nibble in range(16)]
-        self.milp_variables.extend(x)
         return x
 
-    def constraint_by_trunc_xor(self, a, b, c, model=2):
-        """
-        operation:
-        (a, b) |----> c = a + b
-        model 1:
-        a + b + c >= 2 d
-        d >= a
-        d >= b
-        d >= c
-        model 2:
-        a + b - c >= 0
-        a - b + c >= 0
-        - a + b + c >= 0
-        """
-
-        constraints = ""
-        if model == 1:
-            d = f"{self.dummy_var}_{self.xor_counter}"
-            self.milp_variables.append(d)
-            constraints += f"{a} + {b} + {c} -  2 {d} >= 0\n"
-            constraints += f"{d} - {a} >= 0\n"
-            constraints += f"{d} - {b} >= 0\n"
-            constraints += f"{d} - {c} >= 0\n"
-            self.xor_counter += 1
-        elif model == 2:
-            constraints += f"{a} + {b} - {c} >= 0\n"
-            constraints += f"{a} - {b} + {c} >= 0\n"
-            constraints += f"- {a} + {b} + {c} >= 0\n"
-        return constraints
-
-    def constraints_by_equality(self, a, b):
-        """
-        a = b
-        """
-
-        constraint = f"{a} - {b} = 0\n"
-        return constraint
-
-    def generate_constraints(self, ul="u"):
-        """
-        Generate the constraints of MILP model
-        """
-
-        constraints = ""
-        for rn in range(self.nrounds):
-            x_in = self.generate_round_x_variables(rn, ul)
-            x_out = self.generate_round_x_variables(rn + 1, ul)
-            x_middle = self.inv_permute_nibbles(x_out)
-            for nibble in range(8):
-                constraints += self.constraints_by_equality(x_in[2*nibble], x_middle[2*nibble])
-                constraints += self.constraint_by_trunc_xor(x_in[2*nibble], x_in[2*nibble + 1], x_middle[2*nibble + 1])
-        return constraints
-
-    def declare_binary_vars(self):
-        """
-        Declare binary variables of MILP model
-        """
-
-        self.milp_variables = self.ordered_set(self.milp_variables)
-        constraints = "Binary\n"
-        constraints += "\n".join(self.milp_variables) + "\n"
-        return constraints
-
-    def generate_objective_function(self):
-        """
-        Generate the objective function of MILP model
-        """
-
-        sbox_inputs = []
-        for r in range(self.nrounds):
-            round_input = self.generate_round_x_variables(r)
-            sbox_inputs.extend([round_input[2*i] for i in range(8)])
-        objective = " + ".join(sbox_inputs) + "\n"
-        return objective
-
-    def exclude_trivial_solution(self, ul="u"):
-        """
-        Exclude all-zero solution from the solutions space
-        """
-        x_0 = self.generate_round_x_variables(0, ul)
-        constraint = " + ".join(x_0) + " >= 1\n"
-        return constraint
-
     def make_model(self):
         """
         Generate the MILP model describing propagation of a truncated differential
         trail through TWINE block cipher
         """
 
-        lp_contents = f"\\ Truncated differential trail for {self.nrounds} rounds of TWINE\n"
-        lp_contents = "minimize\n"
-        lp_contents += self.generate_objective_function()
-        lp_contents += "subject to\n"
-        lp_contents += self.generate_constraints()
-        lp_contents += self.exclude_trivial_solution()
-        lp_contents += self.declare_binary_vars()
-        lp_contents += "End"
+        spec = twine_spec()
+        # the exact minimum numbers of active S-boxes over fewer rounds speed up the solver
+        bounds = TruncatedDP(spec).table(self.nrounds)
+        lp_contents = ModelCompiler(spec).truncated_differential(self.nrounds, bounds)
         with open(self.lp_file_name, "w") as lp_file:
             lp_file.write(lp_contents)
 
@@ -170,6 +65,8 @@ class WordTwine:
         Solve the constructed model minimizing the number of active S-boxes
         """
 
+        from gurobipy import read, GRB
+
         self.make_model()
         milp_model = read(self.lp_file_name)
         os.remove(self.lp_file_name)
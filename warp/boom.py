@@ -8,8 +8,11 @@ Author: Hosein Hadipour
 from argparse import ArgumentParser, RawTextHelpFormatter
 from truncboom import TruncatedBoomerang
 from diff import Diff
-from plotdistinguisher import *
+from trail import Trail
+import json
 import time
+import os
+import sys
 
 def main():
 
@@ -67,15 +70,29 @@ def main():
                         help="time limit in seconds")
     parser.add_argument('-ns', '--numofsols', type=int,
                         help="number of solutions (currently disabled)")
+    parser.add_argument('-np', '--no-plot', dest='noplot', action='store_true',
+                        help="do not generate bmd.tex and bmd.svg (render them later from the saved artifact)")
+    parser.add_argument('-a', '--artifact', type=str,
+                        help="json file to save the discovered distinguisher (default: bmd_r0_rm_r1.json)")
+    parser.add_argument('-c', '--catalog', type=str,
+                        help="SQLite catalog of differential trails, to reuse the trails found by earlier runs")
+    parser.add_argument('-sw', '--switch', action='store_true',
+                        help="compute the probability of the boomerang switch based on the FBCT framework\n"
+                             "(may require a lot of memory and time, see theoretical-evaluation/switch.py)")
 
     # Parse command line arguments and construct parameter list.
     args = parser.parse_args()
     params = loadparameters(args)
     r0, rm, r1 = params["r0"], params["rm"], params["r1"]
     w0, wm, w1 = params["w0"], params["wm"], params["w1"]
+    noplot = params["noplot"]
+    artifact_file_name = params["artifact"]
+    catalog_file_name = params["catalog"]
+    compute_switch = params["switch"]
+    if artifact_file_name == None:
+        artifact_file_name = f"bmd_{r0}_{rm}_{r1}.json"
 
     assert(rm > 0)
-    tex_content = tex_init()
     start_time = time.time()
     ##############################################################################################
     ##############################################################################################
@@ -97,16 +114,18 @@ def main():
                   "endweight" : 128,
                   "timelimit" : time_limit,
                   "numberoftrails" : 1,
+                  "catalog" : catalog_file_name,
                   "fixedVariables" : {}}
         bin_of_0xa = ["1", "0", "1", "0"]
+        upper_activity = Trail.from_dict(upper_trail).activity()
         for nibble in range(32):
-            if upper_trail[f"x_0"][nibble] == "0":
+            if not upper_activity[0][nibble]:
                 for bit in range(4):
                     params["fixedVariables"][f"x_{0}_{nibble}_{bit}"] = "0"
-            if upper_trail[f"x_{bm.r0}"][nibble] == "0":
+            if not upper_activity[bm.r0][nibble]:
                 for bit in range(4):
                     params["fixedVariables"][f"x_{bm.r0}_{nibble}_{bit}"] = "0"
-            if upper_trail[f"x_{bm.r0}"][nibble] == "1":
+            if upper_activity[bm.r0][nibble]:
                 for bit in range(4):
                     params["fixedVariables"][f"x_{bm.r0}_{nibble}_{bit}"] = bin_of_0xa[bit]
         diff = Diff(params)
@@ -128,15 +147,17 @@ def main():
                   "endweight" : 128,
                   "timelimit" : time_limit,
                   "numberoftrails" : 1,
+                  "catalog" : catalog_file_name,
                   "fixedVariables" : {}}
+        lower_activity = Trail.from_dict(lower_trail).activity()
         for nibble in range(32):
-            if lower_trail[f"x_{bm.rm}"][nibble] == "0":
+            if not lower_activity[bm.rm][nibble]:
                 for bit in range(4):
                     params["fixedVariables"][f"x_{0}_{nibble}_{bit}"] = "0"
-            if lower_trail[f"x_{bm.rm}"][nibble] == "1":
+            if lower_activity[bm.rm][nibble]:
                 for bit in range(4):
                     params["fixedVariables"][f"x_{0}_{nibble}_{bit}"] = bin_of_0xa[bit]
-            if lower_trail[f"x_{bm.R1}"][nibble] == "0":
+            if not lower_activity[bm.R1][nibble]:
                 for bit in range(4):
                     params["fixedVariables"][f"x_{bm.r1}_{nibble}_{bit}"] = "0"
         diff = Diff(params)
@@ -171,46 +192,52 @@ def main():
     if diff_effect_lower != 0:
         print("differential effect of the lower trail: 2^(%0.02f)" % diff_effect_lower)
         total_weight += diff_effect_lower*2
-    upper_bound =  total_weight + (-1.4)*mactive_sboxes
-    lower_bound = total_weight + (-2)*mactive_sboxes
+    # compute the probability of the boomerang switch in Em based on the FBCT framework
+    switch_pr = None
+    if compute_switch:
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "theoretical-evaluation"))
+        from switch import BoomerangSwitch
+        dp = diff_upper_trail[f"x_{r0}"] if diff_upper_trail != None else None
+        dc = diff_lower_trail["x_0"] if diff_lower_trail != None else None
+        try:
+            switch_pr = BoomerangSwitch().compute_switch(upper_trail, middle_part, lower_trail, dp, dc)
+        except MemoryError as error:
+            print(f"The FBCT framework could not be applied: {error}")
     print("Total probability = p^2*q^2*r = 2^({:.2f}) x 2^({:.2f}) x r".format(diff_effect_upper*2, diff_effect_lower*2))
-    print("2^({:.2f}) <= Total probability <= 2^({:.2f})".format(lower_bound, upper_bound))
-    print("To compute the accurate value of total probability, r should be evaluated experimentally or using the (F)BCT framework")
+    if switch_pr == '-inf':
+        print("r = 0 (FBCT framework)")
+    elif switch_pr != None:
+        print("r = 2^({:.2f}) (FBCT framework)".format(switch_pr))
+        print("Total probability = 2^({:.2f})".format(total_weight + switch_pr))
+    else:
+        upper_bound =  total_weight + (-1.4)*mactive_sboxes
+        lower_bound = total_weight + (-2)*mactive_sboxes
+        print("2^({:.2f}) <= Total probability <= 2^({:.2f})".format(lower_bound, upper_bound))
+        print("To compute the accurate value of total probability, r should be evaluated experimentally")
 
     ##############################################################################################
     ##############################################################################################
+    # save the discovered distinguisher, so that it can be plotted later
+    bmd = {"r0" : r0, "rm" : rm, "r1" : r1,
+           "w0" : w0, "wm" : wm, "w1" : w1,
+           "upper_trail" : upper_trail,
+           "middle_part" : middle_part,
+           "lower_trail" : lower_trail,
+           "diff_upper_trail" : diff_upper_trail,
+           "diff_lower_trail" : diff_lower_trail,
+           "diff_effect_upper" : diff_effect_upper,
+           "diff_effect_lower" : diff_effect_lower,
+           "switch_pr" : switch_pr}
+    with open(artifact_file_name, "w") as artifact_file:
+        json.dump(bmd, artifact_file)
     # plot distinguisher
-    if diff_upper_trail != None:
-        active_input_bits = diff.flatten_state([[4*i + j for j in range(4)] for i in range(32) if diff_upper_trail["x_0"][i] != "0"])
-        tex_content += tikz_mark_input_bits(active_input_bits, color="red")
-        tex_content += tex_diff_trail(trail=diff_upper_trail, markpattern="markupperpath", direction="->")
-    else:
-        active_input_bits = []
-        for i in range(32):
-            if upper_trail[f"x_{0}"][i] != "0":
-                active_input_bits.extend([j for j in range(4*i, 4*(i + 1))])
-        tex_content += tikz_mark_input_bits(active_input_bits, color="red")
-
-    tex_content += tex_middle(upper_trail=upper_trail, midd_trail=middle_part, lower_trail=lower_trail, r0=r0, rm=rm, r1=r1)
-
-    # tex_content += tex_diff_trail(trail=diff_lower_trail, markpattern="marklowerpath", direction="<-")
-    if diff_lower_trail != None:
-        tex_content += tex_diff_lower_trail(trail=diff_lower_trail, \
-                                            upper_crossing_difference=[str(i) for i in range(32) if upper_trail[f"x_{r0 + rm}"][i] != "0"],\
-                                            markpattern="marklowerpath",\
-                                            direction="<-")
-        active_output_bits = diff.flatten_state([[4*i + j for j in range(4)] for i in range(32) if diff_lower_trail[f"x_{r1}"][i] != "0"])
-        tex_content += tikz_mark_output_bits(active_output_bits, color="blue")
-    else:
-        active_output_bits = []
-        for i in range(32):
-            if lower_trail[f"x_{rm + r1}"][i] != "0":
-                active_output_bits.extend([j for j in range(4*i, 4*(i + 1))])
-        tex_content += tikz_mark_output_bits(active_output_bits, color="blue")
-
-    tex_content += tex_fin(r0 + rm + r1)
-    with open("bmd.tex", "w") as texfile:
-        texfile.write(tex_content)
+    if not noplot:
+        from plotdistinguisher import tex_distinguisher
+        with open("bmd.tex", "w") as texfile:
+            texfile.write(tex_distinguisher(bmd))
+        from svgdistinguisher import svg_distinguisher
+        with open("bmd.svg", "w") as svg_file:
+            svg_distinguisher(bmd, svg_file)
     # print the elapsed time
     print("Elapsed time: %0.02f seconds" % elapsed_time)
 
@@ -228,7 +255,11 @@ def loadparameters(args):
             "wm" : 1,
             "w1" : 2,
             "timelimit" : 1200,
-            "numofsols" : 1}
+            "numofsols" : 1,
+            "noplot" : False,
+            "artifact" : None,
+            "catalog" : None,
+            "switch" : False}
 
     # Check if there is an input file specified
     if args.inputfile:
@@ -271,6 +302,18 @@ def loadparameters(args):
     if args.numofsols != None:
         params["numofsols"] = args.numofsols
 
+    if args.noplot:
+        params["noplot"] = True
+
+    if args.artifact != None:
+        params["artifact"] = args.artifact
+
+    if args.catalog != None:
+        params["catalog"] = args.catalog
+
+    if args.switch:
+        params["switch"] = True
+
     return params
 
 if __name__ == "__main__":
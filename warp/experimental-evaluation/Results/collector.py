@@ -1,23 +1,26 @@
+import os
 import sys
 from math import log2
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from aggregate import Aggregator
+
 if __name__ == "__main__":
     assert(len(sys.argv) > 1)
     nr = sys.argv[1]
     ntasks = int(sys.argv[2])
-    total_num_of_boomerangs = 0
-    num_of_returned_boomerangs = 0
-    for i in range(ntasks):
-        with open(f"result_{nr}_{i}.txt") as fl:
-            result = fl.readlines()
-            total_num_of_boomerangs += 2**int(result[-2].split(" = ")[1].split("^")[1])
-            num_of_returned_boomerangs += int(result[-1].split(" = ")[1][:-1])
-    if num_of_returned_boomerangs != 0:
-        avg_pr_log2 = log2(num_of_returned_boomerangs) - log2(total_num_of_boomerangs)
-    else:
-        avg_pr_log2 = "-inf"
+    file_names = [f"result_{nr}_{i}.txt" for i in range(ntasks)]
+    missing = [file_name for file_name in file_names if not os.path.exists(file_name)]
+    groups = Aggregator().aggregate([file_name for file_name in file_names if file_name not in missing])
+    total_num_of_boomerangs = sum(group.queries for group in groups.values())
+    num_of_returned_boomerangs = sum(group.returned for group in groups.values())
+    incomplete = sum(group.incomplete for group in groups.values())
+    if len(missing) + incomplete > 0:
+        print("Skipped %d missing and %d incomplete result files" % (len(missing), incomplete))
     print("Total number of returned boomerangs: %d" % num_of_returned_boomerangs)
+    if total_num_of_boomerangs == 0:
+        sys.exit(1)
     print("Total number of queries: 2^(%0.02f)" % log2(total_num_of_boomerangs))
     if num_of_returned_boomerangs != 0:
-        print("Average probability: 2^(%.02f)" % avg_pr_log2)
+        print("Average probability: 2^(%.02f)" % (log2(num_of_returned_boomerangs) - log2(total_num_of_boomerangs)))
     else:
-        print("Average probability: 2^(-inf)")
\ No newline at end of file
+        print("Average probability: 2^(-inf)")
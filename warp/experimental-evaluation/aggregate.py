@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Aggregate the results of boomerang experiments
+
+The following inputs are supported and may be mixed:
+    - result files written by boomerang.c/boomerang.py (result_<nrounds>_<taskid>.txt) of any cipher,
+    - json-lines stores written by runner.py,
+    - per-key results as written by middle_verification.cpp/middle_verification.py.
+Incomplete inputs (e.g., the result file of a task which is still running) are
+skipped, and the counts are merged exactly in integer arithmetic. With a cache
+file, unchanged files are not parsed again and stores are only read from the
+position where the previous run stopped, so that the aggregation can be rerun
+every few seconds on a running campaign.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import glob
+import json
+import math
+import os
+import re
+import time
+import numpy as np
+from confidence import log2_interval, dispersion_test
+
+class Group:
+    """
+    Results of one distinguisher, i.e., of one (cipher, number of rounds, input difference, output difference)
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.queries = 0
+        self.returned = 0
+        # (queries, returned) under each key if known, and of each task (result file)
+        self.keys = []
+        self.tasks = []
+        self.incomplete = 0
+
+    def add(self, kind, queries, returned):
+        self.queries += queries
+        self.returned += returned
+        if kind == "incomplete":
+            self.incomplete += 1
+        elif kind == "key":
+            self.keys.append((queries, returned))
+        else:
+            self.tasks.append((queries, returned))
+
+    @staticmethod
+    def spread(samples):
+        """
+        Spread of the probability over keys/tasks
+
+        :param samples list: list of (queries, returned)
+        :rtype: dict
+        :return: quantiles of log2(p) over the samples with at least one returned boomerang and the index of dispersion
+        """
+
+        queries = np.array([q for q, _ in samples], dtype=np.float64)
+        returned = np.array([r for _, r in samples], dtype=np.float64)
+        result = {"count": len(samples), "zero": int(np.count_nonzero(returned == 0))}
+        positive = returned > 0
+        if np.any(positive):
+            log2_p = np.log2(returned[positive]/queries[positive])
+            result["quantiles"] = dict(zip(["min", "q25", "median", "q75", "max"],
+                                           np.quantile(log2_p, [0, 0.25, 0.5, 0.75, 1]).tolist()))
+        p = returned.sum()/queries.sum()
+        if len(samples) > 1 and 0 < p < 1:
+            # ratio of the observed variance to the binomial variance (about 1 if p does not depend on the key)
+            result["dispersion"], result["p_value"] = dispersion_test(queries, returned)
+        return result
+
+    def summary(self, confidence=0.95, method="wilson"):
+        summary = {"label": self.label, "queries": self.queries, "returned": self.returned, "incomplete": self.incomplete}
+        if self.queries > 0:
+            summary["log2_p"] = math.log2(self.returned) - math.log2(self.queries) if self.returned > 0 else -math.inf
+            summary["interval"] = list(log2_interval(self.returned, self.queries, confidence, method))
+        if len(self.keys) > 0:
+            summary["keys"] = self.spread(self.keys)
+        if len(self.tasks) > 0:
+            summary["tasks"] = self.spread(self.tasks)
+        return summary
+
+class Aggregator:
+    """
+    Ingest result files and stores incrementally
+    """
+
+    result_patterns = {"nrounds_cipher": re.compile(r"Boomerang distinguisher for (\d+) rounds of (\S+)"),
+                       "dp": re.compile(r"Input difference:\s*(\S+)"),
+                       "dc": re.compile(r"Output difference:\s*(\S+)"),
+                       "thrown": re.compile(r"Number of boomerangs thrown = 2\^\(?([-+\d.]+)\)?"),
+                       "returned": re.compile(r"Number of boomerangs returned = (\d+)")}
+    key_pattern = re.compile(r"^key:\s*([0-9a-fA-F]+):.*\((\d+)/(\d+)\)\s*$")
+
+    def __init__(self, cache=None):
+        """
+        :param cache str: json file keeping the parsed records of each input file between runs
+        """
+
+        self.cache = cache
+        # file name -> {"mtime", "size", "offset", "records"}
+        self.files = {}
+        if cache != None and os.path.exists(cache):
+            with open(cache, "r") as cache_file:
+                self.files = json.load(cache_file)
+
+    def save_cache(self):
+        if self.cache == None:
+            return
+        temp_file_name = f"{self.cache}.{os.getpid()}.tmp"
+        with open(temp_file_name, "w") as cache_file:
+            json.dump(self.files, cache_file)
+        os.replace(temp_file_name, self.cache)
+
+    @staticmethod
+    def expand(paths):
+        """
+        Expand directories and glob patterns into the list of input files
+        """
+
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                for pattern in ["result_*.txt", "*.jsonl", "middle_verification*.txt"]:
+                    files.extend(sorted(glob.glob(os.path.join(path, pattern))))
+            elif os.path.exists(path):
+                files.append(path)
+            else:
+                files.extend(sorted(glob.glob(path)))
+        return files
+
+    @staticmethod
+    def label(cipher, nrounds, dp, dc):
+        return f"{cipher} {nrounds} rounds: {dp} -> {dc}"
+
+    def parse_result_file(self, file_name):
+        """
+        :rtype: list
+        :return: list of records [label, kind, queries, returned, unit], where unit is None if it is not identified
+        """
+
+        with open(file_name, "r") as result_file:
+            content = result_file.read()
+        fields = {name: pattern.search(content) for name, pattern in self.result_patterns.items()}
+        if fields["nrounds_cipher"] != None:
+            nrounds, cipher = fields["nrounds_cipher"].groups()
+        else:
+            nrounds, cipher = "?", "?"
+        dp = fields["dp"].group(1) if fields["dp"] != None else "?"
+        dc = fields["dc"].group(1) if fields["dc"] != None else "?"
+        label = self.label(cipher, nrounds, dp, dc)
+        if fields["thrown"] == None or fields["returned"] == None:
+            return [[label, "incomplete", 0, 0, None]]
+        queries = int(round(2**float(fields["thrown"].group(1))))
+        returned = int(fields["returned"].group(1))
+        return [[label, "task", queries, returned, None]]
+
+    def parse_key_lines(self, file_name, lines):
+        records = []
+        for line in lines:
+            match = self.key_pattern.match(line.strip())
+            if match != None:
+                records.append([file_name, "key", int(match.group(3)), int(match.group(2)), None])
+        return records
+
+    def parse_store_lines(self, file_name, lines):
+        records = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+                label = self.label(record.get("cipher", "?"), record["nrounds"], record["dp"], record["dc"])
+                unit = f"{record.get('seed')}/{record.get('task')}/{record.get('unit')}"
+                records.append([label, "key", int(record["queries"]), int(record["returned"]), unit])
+            except (json.JSONDecodeError, KeyError, TypeError):
+                records.append([file_name, "incomplete", 0, 0, None])
+        return records
+
+    def ingest(self, file_name):
+        """
+        Parse a file unless it is unchanged since the last run
+        """
+
+        stat = os.stat(file_name)
+        entry = self.files.get(file_name)
+        if entry != None and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            return
+        is_store = file_name.endswith(".jsonl")
+        if is_store and entry != None and entry["size"] <= stat.st_size:
+            # stores only grow, so continue from the last complete line
+            offset, records = entry["offset"], entry["records"]
+        else:
+            offset, records = 0, []
+        with open(file_name, "rb") as input_file:
+            input_file.seek(offset)
+            data = input_file.read()
+        if is_store:
+            # a trailing line without newline is still being written
+            complete = data[0:data.rfind(b"\n") + 1]
+            records = records + self.parse_store_lines(file_name, complete.decode().splitlines())
+            offset += len(complete)
+        elif self.key_pattern.match(data.decode(errors="replace").lstrip().split("\n")[0]) != None or \
+             os.path.basename(file_name).startswith("middle_verification"):
+            records = self.parse_key_lines(file_name, data.decode(errors="replace").splitlines())
+        else:
+            records = self.parse_result_file(file_name)
+        self.files[file_name] = {"mtime": stat.st_mtime, "size": stat.st_size, "offset": offset, "records": records}
+
+    def aggregate(self, paths):
+        """
+        :param paths list: files, directories or glob patterns
+        :rtype: dict
+        :return: label -> Group
+        """
+
+        files = self.expand(paths)
+        for file_name in files:
+            try:
+                self.ingest(file_name)
+            except (OSError, UnicodeDecodeError):
+                # e.g., a file removed or being written in the meantime
+                continue
+        self.save_cache()
+        groups = {}
+        # a unit of runner.py stored twice (e.g., by two concurrent runs) is only counted once
+        units = set()
+        for file_name in files:
+            entry = self.files.get(file_name)
+            if entry == None:
+                continue
+            for label, kind, queries, returned, unit in entry["records"]:
+                if unit != None:
+                    if (label, unit) in units:
+                        continue
+                    units.add((label, unit))
+                if label not in groups:
+                    groups[label] = Group(label)
+                groups[label].add(kind, queries, returned)
+        return groups
+
+def print_summary(summary, confidence):
+    print(summary["label"])
+    if summary["incomplete"] > 0:
+        print(f"  Incomplete results skipped: {summary['incomplete']}")
+    if summary["queries"] == 0:
+        return
+    print("  Returned: %d out of 2^(%0.2f) queries" % (summary["returned"], math.log2(summary["queries"])))
+    lower, upper = summary["interval"]
+    print("  Probability: 2^(%0.4f) \t %g%% CI: [2^(%0.4f), 2^(%0.4f)]" % (summary["log2_p"], 100*confidence, lower, upper))
+    for kind in ["keys", "tasks"]:
+        if kind not in summary:
+            continue
+        spread = summary[kind]
+        line = f"  {kind.capitalize()}: {spread['count']} ({spread['zero']} without returned boomerangs)"
+        if "quantiles" in spread:
+            quantiles = spread["quantiles"]
+            line += "; log2(p) min/q25/median/q75/max: %0.2f/%0.2f/%0.2f/%0.2f/%0.2f" % \
+                    (quantiles["min"], quantiles["q25"], quantiles["median"], quantiles["q75"], quantiles["max"])
+        if "dispersion" in spread:
+            line += "; dispersion: %0.2f (p-value %0.2g)" % (spread["dispersion"], spread["p_value"])
+        print(line)
+
+def main():
+    parser = ArgumentParser(description="This tool aggregates the results of boomerang experiments\n"
+                                        "Example:\n"
+                                        "python3 aggregate.py Results\n"
+                                        "python3 aggregate.py runs.jsonl 'result_15_*.txt' -c .aggregate_cache.json -w 5",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('paths', nargs='*', default=["."],
+                        help="result files, stores of runner.py, per-key results, directories or glob patterns")
+    parser.add_argument('-c', '--cache', type=str,
+                        help="json file keeping the parsed results between runs")
+    parser.add_argument('-w', '--watch', type=float,
+                        help="repeat the aggregation every given number of seconds")
+    parser.add_argument('-cl', '--confidence', type=float, default=0.95,
+                        help="confidence level of the intervals")
+    parser.add_argument('-cm', '--method', type=str, default="wilson", choices=["wilson", "clopper-pearson"],
+                        help="method to compute the confidence intervals")
+    parser.add_argument('-j', '--json', action='store_true',
+                        help="print the summaries in json format")
+    args = parser.parse_args()
+
+    aggregator = Aggregator(args.cache)
+    while True:
+        groups = aggregator.aggregate(args.paths)
+        summaries = [group.summary(args.confidence, args.method) for group in groups.values()]
+        if args.json:
+            print(json.dumps(summaries, indent=4))
+        else:
+            for summary in summaries:
+                print_summary(summary, args.confidence)
+        if args.watch == None:
+            break
+        print("-"*27)
+        time.sleep(args.watch)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Experimental evaluation of boomerang distinguishers for WARP using the
+bitsliced implementation in warp.py. In contrast to boomerang.c, the
+input/output differences and the number of queries are given at runtime,
+e.g., taken from the json file saved by boom.py.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import json
+import math
+import os
+import time
+import numpy as np
+from warp import BitslicedWarp, popcount
+
+class BoomerangExperiment:
+    """
+    Throw boomerangs for WARP in batches of 64*nwords quartets
+    """
+
+    def __init__(self, nrounds, dp, dc, seed=None):
+        """
+        :param nrounds int: number of rounds
+        :param dp str: input difference as a hexadecimal string of 32 nibbles
+        :param dc str: output difference as a hexadecimal string of 32 nibbles
+        :param seed int: seed of the PRNG (default: random)
+        """
+
+        self.nrounds = nrounds
+        self.dp_str = dp
+        self.dc_str = dc
+        self.cipher = BitslicedWarp()
+        self.dp = self.cipher.masks(self.cipher.hexstr_to_nibbles(dp))
+        self.dc = self.cipher.masks(self.cipher.hexstr_to_nibbles(dc))
+        if seed == None:
+            seed = int.from_bytes(os.urandom(4), "little")
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def random_key(self):
+        return self.rng.integers(0, 16, size=32).tolist()
+
+    def failed_lanes(self, k, nwords):
+        """
+        Throw 64*nwords boomerangs under the key k
+
+        :param k list: key as a list of 32 nibbles, or an array of shape (nwords, 32) with one key per word
+        :rtype: numpy.ndarray
+        :return: words of shape (nwords,) whose set bits mark the boomerangs which did not return
+        """
+
+        p1 = self.rng.integers(0, 2**64, size=(32, 4, nwords), dtype=np.uint64, endpoint=False)
+        p2 = p1 ^ self.dp
+        c1 = self.cipher.enc(p1, k, self.nrounds)
+        c2 = self.cipher.enc(p2, k, self.nrounds)
+        p3 = self.cipher.dec(c1 ^ self.dc, k, self.nrounds)
+        p4 = self.cipher.dec(c2 ^ self.dc, k, self.nrounds)
+        # a lane fails if any bit of p3 + p4 differs from dp
+        return np.bitwise_or.reduce((p3 ^ p4 ^ self.dp).reshape(128, nwords), axis=0)
+
+    def boomerang(self, k, nwords):
+        """
+        Throw 64*nwords boomerangs under the key k
+
+        :rtype: int
+        :return: number of returned boomerangs
+        """
+
+        return 64*nwords - popcount(self.failed_lanes(k, nwords))
+
+    def pairs(self, k, nwords):
+        """
+        Encrypt 64*nwords pairs with input difference dp under the key k
+
+        :rtype: int
+        :return: number of pairs whose output difference is dc
+        """
+
+        p1 = self.rng.integers(0, 2**64, size=(32, 4, nwords), dtype=np.uint64, endpoint=False)
+        c1 = self.cipher.enc(p1, k, self.nrounds)
+        c2 = self.cipher.enc(p1 ^ self.dp, k, self.nrounds)
+        failed = np.bitwise_or.reduce((c1 ^ c2 ^ self.dc).reshape(128, nwords), axis=0)
+        return 64*nwords - popcount(failed)
+
+    def send_boomerangs(self, deg1, deg2, batch=20):
+        """
+        Throw 2^deg2 boomerangs under each of 2^deg1 random keys
+
+        :param deg1 int: log2 of the number of keys
+        :param deg2 int: log2 of the number of boomerangs per key
+        :param batch int: log2 of the maximum number of boomerangs thrown in one call
+        :rtype: int
+        :return: number of returned boomerangs
+        """
+
+        return self.run(self.boomerang, deg1, deg2, batch)
+
+    def send_pairs(self, deg1, deg2, batch=20):
+        """
+        Encrypt 2^deg2 pairs under each of 2^deg1 random keys to evaluate the differential dp -> dc
+
+        :rtype: int
+        :return: number of right pairs
+        """
+
+        return self.run(self.pairs, deg1, deg2, batch)
+
+    def run(self, query, deg1, deg2, batch=20):
+        """
+        :param query function: BoomerangExperiment.boomerang or BoomerangExperiment.pairs
+        """
+
+        assert(deg2 >= 6)
+        nwords_per_key = 2**(deg2 - 6)
+        nwords_per_batch = 2**(max(batch, 6) - 6)
+        num = 0
+        for _ in range(2**deg1):
+            k = self.random_key()
+            remaining = nwords_per_key
+            while remaining > 0:
+                nwords = min(remaining, nwords_per_batch)
+                num += query(k, nwords)
+                remaining -= nwords
+        return num
+
+    def write_result(self, file_name, number_of_queries_log2, num):
+        """
+        Write the result in the same format as boomerang.c
+        """
+
+        if num != 0:
+            avg_pr = number_of_queries_log2 - math.log(num, 2)
+        else:
+            avg_pr = math.inf
+        with open(file_name, "w") as result_file:
+            result_file.write("Initial seed 0x%08X\n" % self.seed)
+            result_file.write(f"Boomerang distinguisher for {self.nrounds} rounds of WARP\n")
+            result_file.write(f"Input difference: \t {self.dp_str}\n")
+            result_file.write(f"Output difference: \t {self.dc_str}\n")
+            result_file.write("Average probability = 2^(-%0.4f)\n" % avg_pr)
+            # with full precision, as the number of experiments is not always a power of two
+            result_file.write(f"Number of boomerangs thrown = 2^({number_of_queries_log2!r})\n")
+            result_file.write(f"Number of boomerangs returned = {num}\n")
+
+def differences_from_artifact(artifact_file_name, middle=False):
+    """
+    Extract the number of rounds and input/output differences of a
+    distinguisher saved by boom.py
+
+    :param artifact_file_name str: json file saved by boom.py
+    :param middle bool: only take the middle part Em into account
+    :rtype: tuple
+    :return: (nrounds, dp, dc)
+    """
+
+    with open(artifact_file_name, "r") as artifact_file:
+        bmd = json.load(artifact_file)
+    r0, rm, r1 = bmd["r0"], bmd["rm"], bmd["r1"]
+    pattern = lambda truncated: "".join(["a" if t == "1" else "0" for t in truncated])
+    if middle:
+        nrounds = rm
+        if bmd["diff_upper_trail"] != None:
+            dp = bmd["diff_upper_trail"][f"x_{r0}"]
+        else:
+            dp = pattern(bmd["upper_trail"][f"x_{r0}"])
+        if bmd["diff_lower_trail"] != None:
+            dc = bmd["diff_lower_trail"]["x_0"]
+        else:
+            dc = pattern(bmd["lower_trail"][f"x_{rm}"])
+    else:
+        nrounds = r0 + rm + r1
+        if bmd["diff_upper_trail"] != None:
+            dp = bmd["diff_upper_trail"]["x_0"]
+        else:
+            dp = pattern(bmd["upper_trail"]["x_0"])
+        if bmd["diff_lower_trail"] != None:
+            dc = bmd["diff_lower_trail"][f"x_{r1}"]
+        else:
+            dc = pattern(bmd["lower_trail"][f"x_{rm + r1}"])
+    return nrounds, dp, dc
+
+def main():
+    parser = ArgumentParser(description="This tool evaluates the probability of a boomerang distinguisher or a differential for WARP experimentally\n"
+                                        "Example:\n"
+                                        "python3 boomerang.py -r 10 -dp 0a000000000000000000000000000000 -dc 0000a000000000000000000000000000 -d1 4 -d2 20\n"
+                                        "python3 boomerang.py -r 6 -dp 00000000aaaaaaaa0a00aa00000a000a -dc a0000000000000000000000000000000 --differential -d1 2 -d2 27\n"
+                                        "python3 boomerang.py -a ../bmd_2_10_2.json --middle -d1 4 -d2 20",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('-a', '--artifact', type=str,
+                        help="json file saved by boom.py to take the differences and number of rounds from")
+    parser.add_argument('-m', '--middle', action='store_true',
+                        help="only evaluate the middle part Em of the distinguisher given by --artifact")
+    parser.add_argument('-r', '--nrounds', type=int,
+                        help="number of rounds")
+    parser.add_argument('-dp', '--dp', type=str,
+                        help="input difference")
+    parser.add_argument('-dc', '--dc', type=str,
+                        help="output difference")
+    parser.add_argument('-df', '--differential', action='store_true',
+                        help="evaluate the differential dp -> dc instead of the boomerang distinguisher")
+    parser.add_argument('-d1', '--deg1', type=int, default=4,
+                        help="log2 of the number of random keys per experiment")
+    parser.add_argument('-d2', '--deg2', type=int, default=20,
+                        help="log2 of the number of boomerangs per key (at least 6)")
+    parser.add_argument('-ne', '--experiments', type=int, default=1,
+                        help="number of independent experiments")
+    parser.add_argument('-b', '--batch', type=int, default=20,
+                        help="log2 of the number of boomerangs thrown at once")
+    parser.add_argument('-s', '--seed', type=int,
+                        help="seed of the PRNG")
+    parser.add_argument('-t', '--taskid', type=int, default=0,
+                        help="task id used in the name of the result file result_<nrounds>_<taskid>.txt")
+    args = parser.parse_args()
+
+    nrounds, dp, dc = args.nrounds, args.dp, args.dc
+    if args.artifact != None:
+        nrounds, dp, dc = differences_from_artifact(args.artifact, args.middle)
+        nrounds = args.nrounds if args.nrounds != None else nrounds
+        dp = args.dp if args.dp != None else dp
+        dc = args.dc if args.dc != None else dc
+    if nrounds == None or dp == None or dc == None:
+        parser.error("either an artifact or the number of rounds, dp and dc should be given")
+
+    experiment = BoomerangExperiment(nrounds, dp, dc, args.seed)
+    print("[+] PRNG initialized to 0x%08X" % experiment.seed)
+    print(f"#Rounds: {nrounds} rounds")
+    print(f"Input difference: \t {dp}")
+    print(f"Output difference: \t {dc}")
+    number_of_queries_log2 = math.log(args.experiments, 2) + args.deg1 + args.deg2
+    print("#Total Queries = (#Experiments) * (#Keys) * (#Queries per key) = %d * 2^%d * 2^%d = 2^(%f)" % (args.experiments, args.deg1, args.deg2, number_of_queries_log2))
+    start_time = time.time()
+    num = 0
+    for _ in range(args.experiments):
+        if args.differential:
+            num += experiment.send_pairs(args.deg1, args.deg2, args.batch)
+        else:
+            num += experiment.send_boomerangs(args.deg1, args.deg2, args.batch)
+    elapsed_time = time.time() - start_time
+    print("time on wall: %0.4f" % elapsed_time)
+    print(f"Number of {'right pairs' if args.differential else 'returned boomerangs'}: {num}")
+    if num != 0:
+        print("Average probability = 2^(-%0.4f)" % (number_of_queries_log2 - math.log(num, 2)))
+    else:
+        print("Average probability = 2^(-inf)")
+    if not args.differential:
+        experiment.write_result(f"result_{nrounds}_{args.taskid}.txt", number_of_queries_log2, num)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Confidence intervals for the probability of returned boomerangs (binomial proportions)
+"""
+
+import math
+from statistics import NormalDist
+import numpy as np
+
+def wilson_interval(k, n, confidence=0.95):
+    """
+    Wilson score interval
+
+    :param k int: number of successes
+    :param n int: number of trials
+    :param confidence float: confidence level
+    :rtype: tuple
+    :return: (lower bound, upper bound) of the probability
+    """
+
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(1 - (1 - confidence)/2)
+    p = k/n
+    denominator = 1 + z**2/n
+    center = (p + z**2/(2*n))/denominator
+    margin = z*math.sqrt(p*(1 - p)/n + z**2/(4*n**2))/denominator
+    lower = max(0.0, center - margin) if k > 0 else 0.0
+    upper = min(1.0, center + margin) if k < n else 1.0
+    return lower, upper
+
+def log_binomial_coefficient(n, k):
+    """
+    log(C(n, k)), where lgamma(n + 1) - lgamma(n - k + 1) is computed by Stirling's series
+    for large n - k, since the difference of the two lgamma values of order 10^14 for
+    n = 2^40 would lose about 0.01
+    """
+
+    m = n - k
+    if m < 1e6:
+        return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(m + 1)
+    return k*math.log(n) - (m + 0.5)*math.log1p(-k/n) - k + 1/(12*n) - 1/(12*m) - math.lgamma(k + 1)
+
+def binomial_log_cdf(k, n, log_p):
+    """
+    Natural logarithm of Pr[X <= k] for X ~ Binomial(n, p), summed in log space,
+    so that it remains accurate for n = 2^40 and tiny p
+    """
+
+    log_q = math.log1p(-math.exp(log_p)) if log_p < -1e-12 else -math.inf
+    if log_q == -math.inf:
+        return 0.0 if k >= n else -math.inf
+    # terms further than 50 standard deviations from the largest one are negligible, which
+    # bounds the number of terms by the standard deviation instead of k
+    mode = min(k, n*math.exp(log_p))
+    start = int(max(0, mode - 50*math.sqrt(mode + 1) - 100))
+    end = int(min(k, mode + 50*math.sqrt(mode + 1) + 100))
+    i = np.arange(start, end + 1, dtype=np.float64)
+    # log(C(n, i)) by the recurrence C(n, i) = C(n, i - 1)*(n - i + 1)/i
+    log_binomial = log_binomial_coefficient(n, start)
+    log_binomial += np.concatenate([[0.0], np.cumsum(np.log((n - i[1:] + 1)/i[1:]))])
+    log_terms = log_binomial + i*log_p + (n - i)*log_q
+    m = np.max(log_terms)
+    return float(m + math.log(np.sum(np.exp(log_terms - m))))
+
+def solve_log_p(f, target, iterations=60):
+    """
+    Find log(p) in [log(2^-80), 0] where the decreasing function f(log_p) equals target by bisection
+    """
+
+    lo, hi = -80*math.log(2), 0.0
+    for _ in range(iterations):
+        mid = (lo + hi)/2
+        if f(mid) > target:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi)/2
+
+def clopper_pearson_interval(k, n, confidence=0.95):
+    """
+    Clopper-Pearson (exact) interval
+
+    :param k int: number of successes
+    :param n int: number of trials
+    :param confidence float: confidence level
+    :rtype: tuple
+    :return: (lower bound, upper bound) of the probability
+    """
+
+    if n == 0:
+        return 0.0, 1.0
+    alpha = 1 - confidence
+    log_target = math.log(alpha/2)
+    if k == 0:
+        lower = 0.0
+    else:
+        # Pr[X >= k] = alpha/2, i.e., Pr[X <= k - 1] = 1 - alpha/2
+        lower = math.exp(solve_log_p(lambda log_p: binomial_log_cdf(k - 1, n, log_p), math.log1p(-alpha/2)))
+    if k == n:
+        upper = 1.0
+    else:
+        upper = math.exp(solve_log_p(lambda log_p: binomial_log_cdf(k, n, log_p), log_target))
+    return lower, upper
+
+def interval(k, n, confidence=0.95, method="wilson"):
+    """
+    :param method str: wilson or clopper-pearson
+    """
+
+    if method == "wilson":
+        return wilson_interval(k, n, confidence)
+    elif method == "clopper-pearson":
+        return clopper_pearson_interval(k, n, confidence)
+    raise ValueError(f"unknown method {method}")
+
+def log2_interval(k, n, confidence=0.95, method="wilson"):
+    """
+    Confidence interval of log2(p)
+
+    :rtype: tuple
+    :return: (lower bound, upper bound), where the lower bound is -inf if it is 0
+    """
+
+    lower, upper = interval(k, n, confidence, method)
+    return (math.log2(lower) if lower > 0 else -math.inf), (math.log2(upper) if upper > 0 else -math.inf)
+
+def regularized_upper_gamma(a, x, iterations=100000, eps=1e-15):
+    """
+    Q(a, x) = Gamma(a, x)/Gamma(a), by its series for x < a + 1 and by its continued fraction otherwise
+    """
+
+    if x <= 0:
+        return 1.0
+    log_prefactor = a*math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        # P(a, x) = x^a e^-x / Gamma(a + 1) * sum_n x^n / ((a + 1)...(a + n))
+        term = total = 1/a
+        for n in range(1, iterations):
+            term *= x/(a + n)
+            total += term
+            if term < total*eps:
+                break
+        return max(0.0, 1 - math.exp(log_prefactor + math.log(total)))
+    # modified Lentz's method
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1/tiny
+    d = 1/b
+    h = d
+    for n in range(1, iterations):
+        an = -n*(n - a)
+        b += 2
+        d = an*d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an/c
+        c = tiny if abs(c) < tiny else c
+        d = 1/d
+        delta = d*c
+        h *= delta
+        if abs(delta - 1) < eps:
+            break
+    return math.exp(log_prefactor + math.log(h))
+
+def chi2_sf(x, df):
+    """
+    Pr[X >= x] for X following the chi-squared distribution with df degrees of freedom
+    """
+
+    return regularized_upper_gamma(df/2, x/2)
+
+def dispersion_test(queries, returned):
+    """
+    Chi-squared test of the hypothesis that the probability does not depend on the key
+
+    :param queries list: number of boomerangs thrown under each key
+    :param returned list: number of boomerangs returned under each key
+    :rtype: tuple
+    :return: (index of dispersion, p-value), where the index of dispersion is about 1 under the hypothesis
+    """
+
+    queries = np.asarray(queries, dtype=np.float64)
+    returned = np.asarray(returned, dtype=np.float64)
+    p = returned.sum()/queries.sum()
+    if len(queries) < 2 or p <= 0 or p >= 1:
+        return 1.0, 1.0
+    expected = queries*p
+    chi2 = float(np.sum((returned - expected)**2/(expected*(1 - p))))
+    df = len(queries) - 1
+    return chi2/df, chi2_sf(chi2, df)
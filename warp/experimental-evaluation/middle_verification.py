@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Per-key verification of the middle part of boomerang distinguishers for WARP
+
+In contrast to middle_verification.cpp, which handles one key at a time,
+the keys of a wave are evaluated together: each word of the bitsliced state
+carries its own key, so that one batch covers many keys. Besides the
+per-key results (in the format of middle_verification.cpp) the distribution
+of the probability over the keys is reported, and after each wave the
+hypothesis that the probability does not depend on the key is tested.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import math
+import time
+import numpy as np
+from boomerang import BoomerangExperiment, differences_from_artifact
+from confidence import dispersion_test
+from warp import popcount_words
+
+class MiddleVerification(BoomerangExperiment):
+    """
+    Throw boomerangs under many keys at once and keep the number of returned boomerangs of each key
+    """
+
+    def __init__(self, nrounds, dp, dc, seed=None):
+        super().__init__(nrounds, dp, dc, seed)
+        self.keys = np.zeros((0, 32), dtype=np.uint8)
+        self.queries = np.zeros(0, dtype=np.int64)
+        self.returned = np.zeros(0, dtype=np.int64)
+
+    def wave(self, nkeys, deg, batch=20):
+        """
+        Throw 2^deg boomerangs under each of nkeys new random keys
+
+        :param nkeys int: number of keys
+        :param deg int: log2 of the number of boomerangs per key
+        :param batch int: log2 of the maximum number of boomerangs thrown in one call
+        :rtype: numpy.ndarray
+        :return: number of returned boomerangs under each key
+        """
+
+        assert(deg >= 6)
+        keys = self.rng.integers(0, 16, size=(nkeys, 32), dtype=np.uint8)
+        nwords_per_key = 2**(deg - 6)
+        nwords_per_batch = 2**(max(batch, 6) - 6)
+        total_words = nkeys*nwords_per_key
+        returned = np.zeros(nkeys, dtype=np.int64)
+        for start in range(0, total_words, nwords_per_batch):
+            nwords = min(nwords_per_batch, total_words - start)
+            # word w of the whole wave belongs to key w // nwords_per_key
+            owner = np.arange(start, start + nwords)//nwords_per_key
+            failed = self.failed_lanes(keys[owner], nwords)
+            returned += np.bincount(owner, weights=64 - popcount_words(failed), minlength=nkeys).astype(np.int64)
+        self.keys = np.concatenate([self.keys, keys])
+        self.queries = np.concatenate([self.queries, np.full(nkeys, 2**deg, dtype=np.int64)])
+        self.returned = np.concatenate([self.returned, returned])
+        return returned
+
+    def key_dependence(self):
+        """
+        :rtype: tuple
+        :return: (index of dispersion, p-value) of the hypothesis that the probability does not depend on the key
+        """
+
+        return dispersion_test(self.queries, self.returned)
+
+    def distribution(self, weak_threshold=None, quantiles=(0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)):
+        """
+        Distribution of the probability over the keys evaluated so far
+
+        :param weak_threshold float: log2 of the probability from which a key is considered weak (default: twice the overall probability)
+        :param quantiles tuple: quantiles of log2(p) to compute
+        :rtype: dict
+        :return: overall log2(p), quantiles of log2(p) over the keys with a returned boomerang, fraction of weak keys and of keys without returned boomerangs
+        """
+
+        total_returned, total_queries = int(self.returned.sum()), int(self.queries.sum())
+        overall = math.log2(total_returned) - math.log2(total_queries) if total_returned > 0 else -math.inf
+        if weak_threshold == None:
+            weak_threshold = overall + 1
+        positive = self.returned > 0
+        log2_p = np.log2(self.returned[positive]/self.queries[positive])
+        result = {"overall": overall, "weak_threshold": weak_threshold,
+                  "weak": float(np.mean(log2_p >= weak_threshold)*np.mean(positive)) if np.any(positive) else 0.0,
+                  "zero": float(np.mean(~positive))}
+        if np.any(positive):
+            result["quantiles"] = dict(zip(quantiles, np.quantile(log2_p, quantiles).tolist()))
+        return result
+
+    def histogram(self, bin_width=0.5, width=50):
+        """
+        Text histogram of log2(p) over the keys with at least one returned boomerang
+
+        :rtype: list
+        :return: lines of the histogram
+        """
+
+        positive = self.returned > 0
+        lines = []
+        if not np.all(positive):
+            lines.append("%16s | %6d" % ("p = 0", np.count_nonzero(~positive)))
+        if not np.any(positive):
+            return lines
+        log2_p = np.log2(self.returned[positive]/self.queries[positive])
+        lo = math.floor(log2_p.min()/bin_width)*bin_width
+        hi = math.floor(log2_p.max()/bin_width)*bin_width + bin_width
+        counts, edges = np.histogram(log2_p, bins=np.arange(lo, hi + bin_width/2, bin_width))
+        for count, left, right in zip(counts, edges[:-1], edges[1:]):
+            bar = "#"*int(math.ceil(width*count/counts.max()))
+            lines.append("[%6.2f, %6.2f) | %6d %s" % (left, right, count, bar))
+        return lines
+
+    def write_keys(self, file_name, first=0):
+        """
+        Append the results of the keys from index first in the format of middle_verification.cpp
+        """
+
+        with open(file_name, "a") as output_file:
+            for key, queries, returned in zip(self.keys[first:], self.queries[first:], self.returned[first:]):
+                log2_p = math.log2(returned/queries) if returned > 0 else -math.inf
+                key_str = "".join(["%01x" % t for t in key])
+                output_file.write(f"key: {key_str}: 2^{log2_p:.3f} ({returned}/{queries})\n")
+
+def main():
+    parser = ArgumentParser(description="This tool evaluates the probability of the middle part of a boomerang distinguisher for WARP under many keys\n"
+                                        "Example:\n"
+                                        "python3 middle_verification.py -r 10 -dp 0000000000000000000000000000000a -dc 00000000000000000a00000000000000 -k 8 -t 14\n"
+                                        "python3 middle_verification.py -a ../bmd_2_10_2.json -k 10 -t 14 -o middle_verification.txt",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('-a', '--artifact', type=str,
+                        help="json file saved by boom.py to take the middle part from")
+    parser.add_argument('-r', '--nrounds', type=int,
+                        help="number of rounds")
+    parser.add_argument('-dp', '--dp', type=str,
+                        help="input difference")
+    parser.add_argument('-dc', '--dc', type=str,
+                        help="output difference")
+    parser.add_argument('-k', '--keys', type=int, default=8,
+                        help="log2 of the number of keys")
+    parser.add_argument('-t', '--trials', type=int, default=14,
+                        help="log2 of the number of boomerangs per key (at least 6)")
+    parser.add_argument('-wv', '--wave', type=int, default=5,
+                        help="log2 of the number of keys evaluated before each test of key dependence")
+    parser.add_argument('-al', '--alpha', type=float, default=1e-3,
+                        help="significance level of the test of key dependence")
+    parser.add_argument('-x', '--stop', action='store_true',
+                        help="stop as soon as the probability turns out to depend on the key")
+    parser.add_argument('-wk', '--weak', type=float,
+                        help="log2 of the probability from which a key is counted as weak (default: twice the overall probability)")
+    parser.add_argument('-bw', '--bin-width', type=float, default=0.5,
+                        help="width of the bins of the histogram of log2(p)")
+    parser.add_argument('-b', '--batch', type=int, default=20,
+                        help="log2 of the number of boomerangs thrown at once")
+    parser.add_argument('-s', '--seed', type=int,
+                        help="seed of the PRNG")
+    parser.add_argument('-o', '--output', type=str,
+                        help="file to append the result of each key to")
+    args = parser.parse_args()
+
+    nrounds, dp, dc = args.nrounds, args.dp, args.dc
+    if args.artifact != None:
+        nrounds, dp, dc = differences_from_artifact(args.artifact, middle=True)
+        nrounds = args.nrounds if args.nrounds != None else nrounds
+        dp = args.dp if args.dp != None else dp
+        dc = args.dc if args.dc != None else dc
+    if nrounds == None or dp == None or dc == None:
+        parser.error("either an artifact or the number of rounds, dp and dc should be given")
+
+    verification = MiddleVerification(nrounds, dp, dc, args.seed)
+    print("[+] PRNG initialized to 0x%08X" % verification.seed)
+    print("analyzing 2^%.1f queries * 2^%.1f keys of the following boomerang for %d rounds" % (args.trials, args.keys, nrounds))
+    print(dp)
+    print(dc)
+    start_time = time.time()
+    nkeys = 2**args.keys
+    wave_size = 2**min(args.wave, args.keys)
+    while len(verification.returned) < nkeys:
+        first = len(verification.returned)
+        verification.wave(min(wave_size, nkeys - first), args.trials, args.batch)
+        if args.output != None:
+            verification.write_keys(args.output, first)
+        dispersion, p_value = verification.key_dependence()
+        print("%d keys, %d returned boomerangs, dispersion %0.2f, p-value %0.2g, time on wall %0.2f" %
+              (len(verification.returned), verification.returned.sum(), dispersion, p_value, time.time() - start_time))
+        if p_value < args.alpha:
+            print(f"[!] the probability depends on the key (p-value {p_value:0.2g} < {args.alpha})")
+            if args.stop:
+                break
+    distribution = verification.distribution(args.weak)
+    print("overall: 2^%.3f (%d/%d)" % (distribution["overall"], verification.returned.sum(), verification.queries.sum()))
+    if "quantiles" in distribution:
+        print("quantiles of log2(p): " + ", ".join(["%g%%: %.3f" % (100*q, v) for q, v in distribution["quantiles"].items()]))
+    print("keys without returned boomerangs: %0.2f%%" % (100*distribution["zero"]))
+    print("weak keys (p >= 2^%.3f): %0.2f%%" % (distribution["weak_threshold"], 100*distribution["weak"]))
+    print("\n".join(verification.histogram(args.bin_width)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Run the boomerang experiments of boomerang.py on a local process pool
+
+This replaces the SLURM workflow of jobfile.sh: instead of one task per
+core writing its own result file, the experiment is split into units of
+2^deg2 queries under one random key. Each unit has its own deterministic
+seed derived from the seed of the campaign, the units are distributed over
+all cores, and the number of returned boomerangs of each unit is appended
+to a single results store (a json-lines file) as soon as it is available.
+Optionally, the campaign stops as soon as the confidence interval of the
+probability is narrow enough (sequential stopping) or the budget is exhausted.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import itertools
+import json
+import math
+import os
+import time
+import numpy as np
+from boomerang import BoomerangExperiment, differences_from_artifact
+from confidence import log2_interval
+
+def throw_boomerangs(nrounds, dp, dc, seed, deg2, batch):
+    """
+    Throw 2^deg2 boomerangs under one random key (executed by the worker processes)
+    """
+
+    return BoomerangExperiment(nrounds, dp, dc, seed).send_boomerangs(0, deg2, batch)
+
+class SequentialStopping:
+    """
+    Stop a campaign once the confidence interval of log2(p) is narrower than
+    the requested precision, or the number of queries reaches the budget
+    """
+
+    def __init__(self, precision=None, budget=None, confidence=0.95, method="wilson"):
+        """
+        :param precision float: maximum width of the confidence interval of log2(p)
+        :param budget float: log2 of the maximum number of queries
+        :param confidence float: confidence level
+        :param method str: wilson or clopper-pearson
+        """
+
+        self.precision = precision
+        self.budget = budget
+        self.confidence = confidence
+        self.method = method
+        self.reason = None
+
+    def __call__(self, runner):
+        if self.precision != None and runner.returned > 0:
+            lower, upper = log2_interval(runner.returned, runner.queries, self.confidence, self.method)
+            if upper - lower <= self.precision:
+                self.reason = "precision reached"
+                return True
+        if self.budget != None and runner.queries >= 2**self.budget:
+            self.reason = "budget exhausted"
+            return True
+        return False
+
+class ExperimentRunner:
+    """
+    Distribute the units of a boomerang experiment over a local process pool
+    """
+
+    def __init__(self, nrounds, dp, dc, deg2, seed=None, store="runs.jsonl", nprocs=None, batch=20,
+                 confidence=0.95, method="wilson", progress=None):
+        """
+        :param nrounds int: number of rounds
+        :param dp str: input difference as a hexadecimal string of 32 nibbles
+        :param dc str: output difference as a hexadecimal string of 32 nibbles
+        :param deg2 int: log2 of the number of boomerangs per unit (i.e., per key)
+        :param seed int: seed of the campaign (default: random)
+        :param store str: json-lines file collecting the results of all units
+        :param nprocs int: number of worker processes (default: number of cores)
+        :param batch int: log2 of the number of boomerangs thrown at once by a worker
+        :param confidence float: confidence level of the reported intervals
+        :param method str: wilson or clopper-pearson
+        :param progress str: json file which is rewritten with the intermediate estimate at each report
+        """
+
+        if seed == None:
+            seed = int.from_bytes(os.urandom(4), "little")
+        self.campaign = {"cipher": "WARP", "nrounds": nrounds, "dp": dp, "dc": dc, "seed": seed, "deg2": deg2}
+        self.nrounds = nrounds
+        self.dp = dp
+        self.dc = dc
+        self.deg2 = deg2
+        self.seed = seed
+        self.store = store
+        self.nprocs = nprocs if nprocs != None else os.cpu_count()
+        self.batch = batch
+        self.confidence = confidence
+        self.method = method
+        self.progress = progress
+        self.queries = 0
+        self.returned = 0
+        self.per_task = {}
+
+    def task_seed(self, task):
+        return int(np.random.SeedSequence(self.seed, spawn_key=(task,)).generate_state(1)[0])
+
+    def unit_seed(self, task, unit):
+        """
+        Seed of the unit-th key of a task, which does not depend on the scheduling of the units
+        """
+
+        return int(np.random.SeedSequence(self.seed, spawn_key=(task, unit)).generate_state(1)[0])
+
+    def load_store(self):
+        """
+        Read the units of this campaign which are already in the store, so that an interrupted campaign can be resumed
+
+        :rtype: set
+        :return: set of (task, unit) pairs already done
+        """
+
+        done = set()
+        if not os.path.exists(self.store):
+            return done
+        with open(self.store, "r") as store_file:
+            for line in store_file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # the last line of an interrupted run
+                    continue
+                if all(record.get(key) == value for key, value in self.campaign.items()):
+                    unit = (record["task"], record["unit"])
+                    if unit not in done:
+                        done.add(unit)
+                        self.add(record)
+        return done
+
+    def add(self, record):
+        self.queries += record["queries"]
+        self.returned += record["returned"]
+        queries, returned = self.per_task.get(record["task"], (0, 0))
+        self.per_task[record["task"]] = (queries + record["queries"], returned + record["returned"])
+
+    def estimate(self):
+        """
+        :rtype: tuple
+        :return: (log2 of the estimated probability, lower bound, upper bound of its confidence interval)
+        """
+
+        log2_p = math.log2(self.returned/self.queries) if self.returned != 0 else -math.inf
+        lower, upper = log2_interval(self.returned, self.queries, self.confidence, self.method)
+        return log2_p, lower, upper
+
+    def report(self):
+        log2_p, lower, upper = self.estimate()
+        print("Queries: 2^(%0.2f) \t Returned: %d \t Probability: 2^(%0.4f) \t %g%% CI: [2^(%0.4f), 2^(%0.4f)]" %
+              (math.log2(max(self.queries, 1)), self.returned, log2_p, 100*self.confidence, lower, upper))
+        if self.progress != None:
+            progress = dict(self.campaign, queries=self.queries, returned=self.returned, log2_p=log2_p,
+                            interval=[lower, upper], confidence=self.confidence, method=self.method, time=time.time())
+            temp_file_name = f"{self.progress}.{os.getpid()}.tmp"
+            with open(temp_file_name, "w") as progress_file:
+                # -inf is written as -Infinity, which json.load accepts
+                json.dump(progress, progress_file)
+            os.replace(temp_file_name, self.progress)
+
+    def run(self, units, report_interval=10, stop=None):
+        """
+        Execute the given units and append their results to the store
+
+        :param units iterable: (task, unit) pairs
+        :param report_interval float: seconds between two reports of the aggregated result
+        :param stop function: called with the runner after each finished unit; no new units are started once it returns True
+        :rtype: tuple
+        :return: (number of queries, number of returned boomerangs) of the campaign, including former runs
+        """
+
+        done = self.load_store()
+        pending = (unit for unit in units if unit not in done)
+        stopped = stop != None and stop(self)
+        last_report = time.time()
+        with ProcessPoolExecutor(max_workers=self.nprocs) as executor, open(self.store, "a") as store_file:
+            in_flight = {}
+            while True:
+                # keep every worker busy without materializing all units
+                while not stopped and len(in_flight) < 2*self.nprocs:
+                    unit = next(pending, None)
+                    if unit == None:
+                        break
+                    future = executor.submit(throw_boomerangs, self.nrounds, self.dp, self.dc, self.unit_seed(*unit), self.deg2, self.batch)
+                    in_flight[future] = unit
+                if len(in_flight) == 0:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task, unit = in_flight.pop(future)
+                    record = dict(self.campaign, task=task, unit=unit, queries=2**self.deg2, returned=future.result())
+                    store_file.write(json.dumps(record) + "\n")
+                    store_file.flush()
+                    self.add(record)
+                    stopped = stopped or (stop != None and stop(self))
+                if time.time() - last_report >= report_interval:
+                    self.report()
+                    last_report = time.time()
+        return self.queries, self.returned
+
+    def write_result_files(self, directory="."):
+        """
+        Write the result of each task into result_<nrounds>_<task>.txt in the same format as boomerang.c
+        """
+
+        for task, (queries, returned) in sorted(self.per_task.items()):
+            experiment = BoomerangExperiment(self.nrounds, self.dp, self.dc, self.task_seed(task))
+            experiment.write_result(os.path.join(directory, f"result_{self.nrounds}_{task}.txt"), math.log(queries, 2), returned)
+
+def main():
+    parser = ArgumentParser(description="This tool runs a boomerang experiment for WARP on all cores of the local machine\n"
+                                        "Example:\n"
+                                        "python3 runner.py -r 10 -dp 0a000000000000000000000000000000 -dc 0000a000000000000000000000000000 -nt 64 -d1 4 -d2 20\n"
+                                        "python3 runner.py -a ../bmd_2_10_2.json --middle -nt 64 -d1 4 -d2 20 -s 1 -o runs.jsonl",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('-a', '--artifact', type=str,
+                        help="json file saved by boom.py to take the differences and number of rounds from")
+    parser.add_argument('-m', '--middle', action='store_true',
+                        help="only evaluate the middle part Em of the distinguisher given by --artifact")
+    parser.add_argument('-r', '--nrounds', type=int,
+                        help="number of rounds")
+    parser.add_argument('-dp', '--dp', type=str,
+                        help="input difference")
+    parser.add_argument('-dc', '--dc', type=str,
+                        help="output difference")
+    parser.add_argument('-nt', '--ntasks', type=int,
+                        help="number of tasks (default: number of processes)")
+    parser.add_argument('-d1', '--deg1', type=int, default=4,
+                        help="log2 of the number of random keys per task")
+    parser.add_argument('-d2', '--deg2', type=int, default=20,
+                        help="log2 of the number of boomerangs per key (at least 6)")
+    parser.add_argument('-p', '--processes', type=int,
+                        help="number of worker processes (default: number of cores)")
+    parser.add_argument('-b', '--batch', type=int, default=20,
+                        help="log2 of the number of boomerangs thrown at once")
+    parser.add_argument('-s', '--seed', type=int,
+                        help="seed of the campaign; rerunning with the same seed and store resumes the campaign")
+    parser.add_argument('-o', '--store', type=str, default="runs.jsonl",
+                        help="json-lines file collecting the results")
+    parser.add_argument('-i', '--report-interval', type=float, default=10,
+                        help="seconds between two reports of the aggregated result")
+    parser.add_argument('-w', '--result-files', action='store_true',
+                        help="also write result_<nrounds>_<task>.txt for each task in the same format as boomerang.c")
+    parser.add_argument('-pr', '--precision', type=float,
+                        help="stop once the confidence interval of log2(p) is narrower than this value")
+    parser.add_argument('-B', '--budget', type=float,
+                        help="stop once 2^budget boomerangs are thrown")
+    parser.add_argument('-cl', '--confidence', type=float, default=0.95,
+                        help="confidence level of the intervals")
+    parser.add_argument('-cm', '--method', type=str, default="wilson", choices=["wilson", "clopper-pearson"],
+                        help="method to compute the confidence intervals")
+    parser.add_argument('-pf', '--progress', type=str,
+                        help="json file rewritten with the intermediate estimate at each report")
+    args = parser.parse_args()
+
+    nrounds, dp, dc = args.nrounds, args.dp, args.dc
+    if args.artifact != None:
+        nrounds, dp, dc = differences_from_artifact(args.artifact, args.middle)
+        nrounds = args.nrounds if args.nrounds != None else nrounds
+        dp = args.dp if args.dp != None else dp
+        dc = args.dc if args.dc != None else dc
+    if nrounds == None or dp == None or dc == None:
+        parser.error("either an artifact or the number of rounds, dp and dc should be given")
+
+    if args.precision != None and args.ntasks == None and args.budget == None:
+        parser.error("a budget or the number of tasks should be given together with the precision")
+    runner = ExperimentRunner(nrounds, dp, dc, args.deg2, args.seed, args.store, args.processes, args.batch,
+                              args.confidence, args.method, args.progress)
+    stop = None
+    if args.precision != None or args.budget != None:
+        stop = SequentialStopping(args.precision, args.budget, args.confidence, args.method)
+    print("[+] Campaign seed 0x%08X" % runner.seed)
+    print(f"#Rounds: {nrounds} rounds")
+    print(f"Input difference: \t {dp}")
+    print(f"Output difference: \t {dc}")
+    if args.precision != None and args.ntasks == None:
+        print("#Queries until the %g%% confidence interval of log2(p) is narrower than %g or 2^%g queries" % (100*args.confidence, args.precision, args.budget))
+        # unbounded sequence of tasks, each one including 2^deg1 keys
+        units = ((index >> args.deg1, index & (2**args.deg1 - 1)) for index in itertools.count())
+    else:
+        ntasks = args.ntasks if args.ntasks != None else runner.nprocs
+        print("#Total Queries = (#Tasks) * (#Keys per task) * (#Queries per key) = %d * 2^%d * 2^%d = 2^(%f)" % (ntasks, args.deg1, args.deg2, math.log(ntasks, 2) + args.deg1 + args.deg2))
+        units = ((task, unit) for task in range(ntasks) for unit in range(2**args.deg1))
+    print(f"#Processes: {runner.nprocs}")
+    start_time = time.time()
+    runner.run(units, args.report_interval, stop)
+    print("time on wall: %0.4f" % (time.time() - start_time))
+    if stop != None and stop.reason != None:
+        print(f"Stopped: {stop.reason}")
+    runner.report()
+    if args.result_files:
+        runner.write_result_files()
+
+if __name__ == "__main__":
+    main()
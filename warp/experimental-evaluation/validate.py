@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Cross-validation of the probabilities predicted by boom.py with experiments
+
+Given the json file saved by boom.py, the following parts of the
+distinguisher are evaluated experimentally and compared with their
+predicted probabilities:
+    - E0: the differential x_0 -> x_r0 of the upper trail, predicted by its differential effect p,
+    - Em: the boomerang over the middle part, predicted by the FBCT framework (r),
+    - E1: the differential x_0 -> x_r1 of the lower trail, predicted by its differential effect q,
+    - E: optionally the whole distinguisher, predicted by p^2*q^2*r.
+The number of queries of each experiment is derived from its predicted
+probability, such that a fixed number of right pairs/quartets is expected.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import json
+import math
+import time
+import numpy as np
+from boomerang import BoomerangExperiment
+from confidence import log2_interval
+
+class Validation:
+    """
+    Derive the experiments from a distinguisher saved by boom.py, run them and compare the results with the predictions
+    """
+
+    def __init__(self, artifact_file_name, seed=0, expected=64, deg1=4, budget=34, batch=20):
+        """
+        :param artifact_file_name str: json file saved by boom.py
+        :param seed int: seed from which the seeds of the experiments are derived
+        :param expected int: number of right pairs/quartets expected in each experiment
+        :param deg1 int: log2 of the number of random keys of each experiment
+        :param budget int: log2 of the maximum number of queries of each experiment
+        :param batch int: log2 of the number of queries made at once
+        """
+
+        with open(artifact_file_name, "r") as artifact_file:
+            self.bmd = json.load(artifact_file)
+        self.seed = seed
+        self.expected = expected
+        self.deg1 = deg1
+        self.budget = budget
+        self.batch = batch
+
+    def stages(self, full=False):
+        """
+        :param full bool: also include the whole distinguisher
+        :rtype: list
+        :return: list of dict(name, kind, nrounds, dp, dc, predicted), where predicted is the range (lower, upper) of log2 of the predicted probability
+        """
+
+        bmd = self.bmd
+        r0, rm, r1 = bmd["r0"], bmd["rm"], bmd["r1"]
+        upper, lower = bmd["diff_upper_trail"], bmd["diff_lower_trail"]
+        stages = []
+        if r0 != 0 and upper != None:
+            p = bmd["diff_effect_upper"]
+            stages.append(dict(name="E0", kind="differential", nrounds=r0, dp=upper["x_0"], dc=upper[f"x_{r0}"], predicted=(p, p)))
+        if upper != None and lower != None:
+            switch_pr = bmd.get("switch_pr")
+            if switch_pr == "-inf":
+                r = (-math.inf, -math.inf)
+            elif switch_pr != None:
+                r = (switch_pr, switch_pr)
+            else:
+                # bounds used by boom.py if the FBCT framework could not be applied
+                active_sboxes = bmd["middle_part"]["as"]
+                r = (-2*active_sboxes, -1.4*active_sboxes)
+            stages.append(dict(name="Em", kind="boomerang", nrounds=rm, dp=upper[f"x_{r0}"], dc=lower["x_0"], predicted=r))
+        if r1 != 0 and lower != None:
+            q = bmd["diff_effect_lower"]
+            stages.append(dict(name="E1", kind="differential", nrounds=r1, dp=lower["x_0"], dc=lower[f"x_{r1}"], predicted=(q, q)))
+        if full and upper != None and lower != None:
+            weight = 2*bmd["diff_effect_upper"] + 2*bmd["diff_effect_lower"]
+            stages.append(dict(name="E", kind="boomerang", nrounds=r0 + rm + r1, dp=upper["x_0"], dc=lower[f"x_{r1}"],
+                               predicted=(weight + r[0], weight + r[1])))
+        return stages
+
+    def size(self, predicted):
+        """
+        Number of queries such that about self.expected right pairs/quartets are expected
+        for the smallest predicted probability, limited by the budget
+
+        :rtype: tuple
+        :return: (deg1, deg2, capped), i.e., 2^deg2 queries under each of 2^deg1 keys
+        """
+
+        if predicted[0] == -math.inf:
+            deg = self.budget
+        else:
+            deg = math.ceil(math.log2(self.expected) - predicted[0])
+        capped = deg > self.budget
+        deg = min(deg, self.budget)
+        deg1 = min(self.deg1, max(0, deg - 6))
+        return deg1, max(6, deg - deg1), capped
+
+    def run(self, stage, index=0):
+        """
+        Run the experiment of a stage
+
+        :rtype: dict
+        :return: the stage extended by the number of queries, the measured log2 probability and its confidence interval
+        """
+
+        deg1, deg2, capped = self.size(stage["predicted"])
+        seed = int(np.random.SeedSequence(self.seed, spawn_key=(index,)).generate_state(1)[0])
+        experiment = BoomerangExperiment(stage["nrounds"], stage["dp"], stage["dc"], seed)
+        start_time = time.time()
+        if stage["kind"] == "differential":
+            num = experiment.send_pairs(deg1, deg2, self.batch)
+        else:
+            num = experiment.send_boomerangs(deg1, deg2, self.batch)
+        queries = 2**(deg1 + deg2)
+        measured = math.log2(num) - deg1 - deg2 if num != 0 else -math.inf
+        interval = log2_interval(num, queries)
+        lower, upper = stage["predicted"]
+        # the prediction is consistent if it overlaps the confidence interval
+        consistent = lower <= interval[1] and interval[0] <= upper
+        if measured < lower:
+            delta = measured - lower
+        elif measured > upper:
+            delta = measured - upper
+        else:
+            delta = 0.0
+        return dict(stage, queries_log2=deg1 + deg2, capped=capped, seed=seed, returned=num, measured=measured,
+                    interval=list(interval), delta=delta, consistent=consistent, time=time.time() - start_time)
+
+def format_range(lower, upper):
+    if lower == upper:
+        return "2^(%0.2f)" % lower
+    return "[2^(%0.2f), 2^(%0.2f)]" % (lower, upper)
+
+def main():
+    parser = ArgumentParser(description="This tool compares the probabilities predicted for a boomerang distinguisher for WARP with experiments\n"
+                                        "Example:\n"
+                                        "python3 validate.py ../bmd_2_10_2.json\n"
+                                        "python3 validate.py ../bmd_2_10_2.json -e 256 -B 36 --full -o validation.json",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('artifact', type=str,
+                        help="json file saved by boom.py")
+    parser.add_argument('-e', '--expected', type=int, default=64,
+                        help="number of right pairs/quartets expected in each experiment")
+    parser.add_argument('-d1', '--deg1', type=int, default=4,
+                        help="log2 of the number of random keys per experiment")
+    parser.add_argument('-B', '--budget', type=int, default=34,
+                        help="log2 of the maximum number of queries per experiment")
+    parser.add_argument('-f', '--full', action='store_true',
+                        help="also evaluate the whole distinguisher")
+    parser.add_argument('-b', '--batch', type=int, default=20,
+                        help="log2 of the number of queries made at once")
+    parser.add_argument('-s', '--seed', type=int, default=0,
+                        help="seed of the PRNG")
+    parser.add_argument('-o', '--output', type=str,
+                        help="json file to save the results of the experiments")
+    args = parser.parse_args()
+
+    validation = Validation(args.artifact, args.seed, args.expected, args.deg1, args.budget, args.batch)
+    results = []
+    for index, stage in enumerate(validation.stages(args.full)):
+        result = validation.run(stage, index)
+        results.append(result)
+        print(f"{result['name']}: {result['kind']} for {result['nrounds']} rounds: {result['dp']} -> {result['dc']}")
+        print("\tpredicted: %s" % format_range(*result["predicted"]))
+        print("\tmeasured:  2^(%0.2f) (%d/2^%d%s) \t 95%% CI: [2^(%0.2f), 2^(%0.2f)]" %
+              (result["measured"], result["returned"], result["queries_log2"], ", capped by the budget" if result["capped"] else "",
+               result["interval"][0], result["interval"][1]))
+        print("\tdelta:     %0.2f \t %s \t time on wall: %0.2f" %
+              (result["delta"], "consistent" if result["consistent"] else "MISMATCH", result["time"]))
+    if args.output != None:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=4)
+    if not all(result["consistent"] for result in results):
+        print("[!] some measurements do not match their predictions")
+
+if __name__ == "__main__":
+    main()
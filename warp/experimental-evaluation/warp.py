@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Bitsliced implementation of WARP in NumPy
+It follows the (modified) reference implementation in warp.c
+"""
+
+import numpy as np
+
+class BitslicedWarp:
+    """
+    The state is kept in an array of shape (32, 4, nwords) and dtype uint64,
+    where state[i, j, w] holds the j'th bit (j = 0: lsb) of nibble i for the
+    64 independent plaintexts packed into word w. The S-box is evaluated
+    using its algebraic normal form on all 16 S-boxes of a round at once.
+    """
+
+    sbox = [0xc, 0xa, 0xd, 0x3, 0xe, 0xb, 0xf, 0x7, 0x8, 0x9, 0x1, 0x5, 0x0, 0x2, 0x4, 0x6]
+    perm = [31, 6, 29, 14, 1, 12, 21, 8, 27, 2, 3, 0, 25, 4, 23, 10,
+            15, 22, 13, 30, 17, 28, 5, 24, 11, 18, 19, 16, 9, 20, 7, 26]
+    RC0 = [0x0, 0x0, 0x1, 0x3, 0x7, 0xf, 0xf, 0xf, 0xe, 0xd, 0xa, 0x5, 0xa, 0x5, 0xb, 0x6, 0xc, 0x9, 0x3, 0x6, 0xd,
+           0xb, 0x7, 0xe, 0xd, 0xb, 0x6, 0xd, 0xa, 0x4, 0x9, 0x2, 0x4, 0x9, 0x3, 0x7, 0xe, 0xc, 0x8, 0x1, 0x2]
+    RC1 = [0x4, 0xc, 0xc, 0xc, 0xc, 0xc, 0x8, 0x4, 0x8, 0x4, 0x8, 0x4, 0xc, 0x8, 0x0, 0x4, 0xc, 0x8, 0x4, 0xc, 0xc,
+           0x8, 0x4, 0xc, 0x8, 0x4, 0x8, 0x0, 0x4, 0x8, 0x0, 0x4, 0xc, 0xc, 0x8, 0x0, 0x0, 0x4, 0x8, 0x4, 0xc]
+
+    def __init__(self):
+        self.inv_perm = [0]*32
+        for j in range(32):
+            self.inv_perm[self.perm[j]] = j
+        self.anf = self.sbox_anf(self.sbox)
+
+    @staticmethod
+    def sbox_anf(S):
+        """
+        Compute the algebraic normal form of each output bit of the S-box
+
+        :rtype: list
+        :return: anf[j] is the list of monomials (as bit masks of input bits) of the j'th output bit
+        """
+
+        anf = []
+        for j in range(4):
+            coefficients = [(S[x] >> j) & 1 for x in range(16)]
+            # Moebius transform
+            for i in range(4):
+                for x in range(16):
+                    if x & (1 << i):
+                        coefficients[x] ^= coefficients[x ^ (1 << i)]
+            anf.append([u for u in range(16) if coefficients[u] == 1])
+        return anf
+
+    @staticmethod
+    def masks(nibbles):
+        """
+        Convert a list of n nibbles into bitsliced constants of shape (n, 4, 1),
+        or an array of shape (nwords, n) into constants of shape (n, 4, nwords)
+        holding the nibbles of row w in word w
+        """
+
+        nibbles = np.asarray(nibbles, dtype=np.uint64)
+        if nibbles.ndim == 1:
+            nibbles = nibbles[None, :]
+        bits = (nibbles.T[:, None, :] >> np.arange(4, dtype=np.uint64)[None, :, None]) & np.uint64(1)
+        return np.uint64(0) - bits
+
+    @staticmethod
+    def hexstr_to_nibbles(hex_str):
+        return [int(t, 16) for t in hex_str]
+
+    def sbox_layer(self, x):
+        """
+        Apply the S-box to a bitsliced array of shape (n, 4, nwords)
+        """
+
+        monomials = [np.full(x.shape[0:1] + x.shape[2:], np.uint64(0xffffffffffffffff))]
+        for u in range(1, 16):
+            i = u.bit_length() - 1
+            monomials.append(monomials[u ^ (1 << i)] & x[:, i])
+        y = np.empty_like(x)
+        for j in range(4):
+            y[:, j] = monomials[self.anf[j][0]]
+            for u in self.anf[j][1:]:
+                y[:, j] ^= monomials[u]
+        return y
+
+    def round_keys(self, k):
+        """
+        :param k list: master key as a list of 32 nibbles, or an array of shape (nwords, 32) with one key per word
+        :rtype: numpy.ndarray
+        :return: bitsliced round keys of shape (2, 16, 4, 1), or (2, 16, 4, nwords) for one key per word
+        """
+
+        k_mask = self.masks(k)
+        return np.stack([k_mask[0:16], k_mask[16:32]])
+
+    def enc(self, state, k, R):
+        """
+        Encrypt a bitsliced state for R rounds
+
+        :param state numpy.ndarray: bitsliced plaintexts of shape (32, 4, nwords)
+        :param k list: master key as a list of 32 nibbles, or an array of shape (nwords, 32) with one key per word
+        :param R int: number of rounds
+        :rtype: numpy.ndarray
+        :return: bitsliced ciphertexts
+        """
+
+        rk = self.round_keys(k)
+        rc0, rc1 = self.masks(self.RC0[0:R]), self.masks(self.RC1[0:R])
+        state = state.copy()
+        for r in range(R):
+            state[1::2] ^= self.sbox_layer(state[0::2]) ^ rk[r % 2]
+            state[1] ^= rc0[r]
+            state[3] ^= rc1[r]
+            state = state[self.inv_perm]
+        return state
+
+    def dec(self, state, k, R):
+        """
+        Decrypt a bitsliced state for R rounds
+
+        :param state numpy.ndarray: bitsliced ciphertexts of shape (32, 4, nwords)
+        :param k list: master key as a list of 32 nibbles, or an array of shape (nwords, 32) with one key per word
+        :param R int: number of rounds
+        :rtype: numpy.ndarray
+        :return: bitsliced plaintexts
+        """
+
+        rk = self.round_keys(k)
+        rc0, rc1 = self.masks(self.RC0[0:R]), self.masks(self.RC1[0:R])
+        state = state.copy()
+        for r in range(R - 1, -1, -1):
+            state = state[self.perm]
+            state[1] ^= rc0[r]
+            state[3] ^= rc1[r]
+            state[1::2] ^= self.sbox_layer(state[0::2]) ^ rk[r % 2]
+        return state
+
+    @staticmethod
+    def pack(nibbles):
+        """
+        Convert an array of shape (N, 32) of nibbles (N a multiple of 64) into a bitsliced state
+        """
+
+        nibbles = np.asarray(nibbles, dtype=np.uint8)
+        bits = (nibbles.T[:, None, :] >> np.arange(4, dtype=np.uint8)[None, :, None]) & 1
+        packed = np.packbits(bits, axis=-1, bitorder="little")
+        return np.ascontiguousarray(packed).view("<u8").astype(np.uint64)
+
+    @staticmethod
+    def unpack(state):
+        """
+        Convert a bitsliced state into an array of shape (N, 32) of nibbles
+        """
+
+        packed = np.ascontiguousarray(state.astype("<u8")).view(np.uint8)
+        bits = np.unpackbits(packed, axis=-1, bitorder="little")
+        nibbles = (bits << np.arange(4, dtype=np.uint8)[None, :, None]).sum(axis=1, dtype=np.uint8)
+        return nibbles.T
+
+def popcount(words):
+    """
+    Count the number of one bits in an array of uint64 words
+    """
+
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(np.ascontiguousarray(words).view(np.uint8)).sum())
+
+def popcount_words(words):
+    """
+    Count the number of one bits in each word of a one-dimensional array of uint64 words
+    """
+
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).astype(np.int64)
+    bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8)).reshape(-1, 64)
+    return bits.sum(axis=1, dtype=np.int64)
@@ -1,5 +1,11 @@
 #!/usr/bin/env python3
 
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "feistel"))
+from trail import Trail
+import texrenderer
+
 pi = [31, 6, 29, 14, 1, 12, 21, 8, 27, 2, 3, 0, 25, 4, 23, 10, 15, 22, 13, 30, 17, 28, 5, 24, 11, 18, 19, 16, 9, 20, 7, 26]
 
 def tex_init(options=""):
@@ -37,9 +43,10 @@ def tikz_mark_output_bits(bits, color="blue"):
 def tex_diff_trail(trail, markpattern, direction="->"):
     tex_content = ""
     nrounds  = trail["nrounds"]
+    active = Trail.from_dict(trail).activity()
     for r in range(nrounds):
         tex_content += r"\warproundwokey{%s" + "\n"
-        active__input_branches = [n for n in range(32) if trail[f"x_{r}"][n] != "0"]
+        active__input_branches = [n for n in range(32) if active[r][n]]
         active_even_branches = [n for n in active__input_branches if n%2 == 0]
         active_odd_branches = [n for n in active__input_branches if n%2 != 0]
         tex_content += r"\markevenbranches{" + \
@@ -48,7 +55,7 @@ def tex_diff_trail(trail, markpattern, direction="->"):
         tex_content += r"\markoddbranchbeforexor{" + \
                         ",".join([f"{n}" for n in active_odd_branches]) + \
                         r"}{" + markpattern + r"}" + "\n"
-        active_after_xor = [n for n in range(32) if trail[f"x_{r+1}"][pi[n]] != "0" and n%2 == 1]
+        active_after_xor = [n for n in range(32) if active[r+1][pi[n]] and n%2 == 1]
         tex_content += r"\markoddbranchafterxor{" + \
                        ",".join([f"{n}/{pi[n]}" for n in active_after_xor]) + \
                        r"}{" + markpattern + r"}{" + direction + r"}" + "\n"
@@ -58,9 +65,10 @@ def tex_diff_trail(trail, markpattern, direction="->"):
 def tex_diff_lower_trail(trail, upper_crossing_difference, markpattern, direction="->"):
     tex_content = ""
     nrounds  = trail["nrounds"]
+    active = Trail.from_dict(trail).activity()
     for r in range(nrounds):
         tex_content += r"\warproundwokey{%s" + "\n"
-        active__input_branches = [n for n in range(32) if trail[f"x_{r}"][n] != "0"]
+        active__input_branches = [n for n in range(32) if active[r][n]]
         active_even_branches = [n for n in active__input_branches if n%2 == 0]
         active_odd_branches = [n for n in active__input_branches if n%2 != 0]
         if r == 0:
@@ -73,24 +81,26 @@ def tex_diff_lower_trail(trail, upper_crossing_difference, markpattern, directio
         tex_content += r"\markoddbranchbeforexor{" + \
                         ",".join([f"{n}" for n in active_odd_branches]) + \
                         r"}{" + markpattern + r"}" + "\n"
-        active_after_xor = [n for n in range(32) if trail[f"x_{r+1}"][pi[n]] != "0" and n%2 == 1]
+        active_after_xor = [n for n in range(32) if active[r+1][pi[n]] and n%2 == 1]
         tex_content += r"\markoddbranchafterxor{" + \
                        ",".join([f"{n}/{pi[n]}" for n in active_after_xor]) + \
                        r"}{" + markpattern + r"}{" + direction + r"}" + "\n"
         if r == nrounds - 1:
             tex_content += r"\markoutputdiff{" + \
-                           ",".join([str(i) for i in range(32) if trail[f"x_{nrounds}"][i] != "0"]) + \
+                           ",".join([str(i) for i in range(32) if active[nrounds][i]]) + \
                            "}\n"
         tex_content += "}\n"
     return tex_content
 
 def tex_middle(upper_trail, midd_trail, lower_trail, r0, rm, r1):
     tex_content = ""
+    upper_active = Trail.from_dict(upper_trail).activity()
+    lower_active = Trail.from_dict(lower_trail).activity()
     for r in range(rm):
         ur = r + r0
         tex_content += r"\warproundwokey{%s" + "\n"
-        active_branches_upper = [n for n in range(32) if upper_trail[f"x_{ur}"][n] != "0"]
-        active_branches_lower = [n for n in range(32) if lower_trail[f"x_{r}"][n] != "0"]
+        active_branches_upper = [n for n in range(32) if upper_active[ur][n]]
+        active_branches_lower = [n for n in range(32) if lower_active[r][n]]
         active_even_branches_upper = [n for n in active_branches_upper if n%2 == 0]
         active_even_branches_lower = [n for n in active_branches_lower if n%2 == 0]
         active_odd_branches_upper = [n for n in active_branches_upper if n%2 != 0]
@@ -101,7 +111,7 @@ def tex_middle(upper_trail, midd_trail, lower_trail, r0, rm, r1):
         tex_content += r"\markoddbranchbeforexor{" + \
                         ",".join([f"{n}" for n in active_odd_branches_upper]) + \
                         r"}{markmidupperpath}" + "\n"
-        active_after_xor = [n for n in range(32) if upper_trail[f"x_{ur+1}"][pi[n]] != "0" and n%2 == 1]
+        active_after_xor = [n for n in range(32) if upper_active[ur+1][pi[n]] and n%2 == 1]
         tex_content += r"\markoddbranchafterxor{" + \
                        ",".join([f"{n}/{pi[n]}" for n in active_after_xor]) + \
                        r"}{markmidupperpath}{->}" + "\n"
@@ -112,7 +122,7 @@ def tex_middle(upper_trail, midd_trail, lower_trail, r0, rm, r1):
         tex_content += r"\markoddbranchbeforexor{" + \
                         ",".join([f"{n}" for n in active_odd_branches_lower]) + \
                         r"}{markmidlowerpath}" + "\n"
-        active_after_xor = [n for n in range(32) if lower_trail[f"x_{r+1}"][pi[n]] != "0" and n%2 == 1]
+        active_after_xor = [n for n in range(32) if lower_active[r+1][pi[n]] and n%2 == 1]
         tex_content += r"\markoddbranchafterxor{" + \
                        ",".join([f"{n}/{pi[n]}" for n in active_after_xor]) + \
                        r"}{markmidlowerpath}{<-}" + "\n"
@@ -121,12 +131,12 @@ def tex_middle(upper_trail, midd_trail, lower_trail, r0, rm, r1):
                        "}\n"
         if r1 == 0 and r == rm - 1:
             tex_content += r"""	\foreach \z in {""" + \
-            ",".join([str(i) for i in range(32) if lower_trail[f"x_{rm + r1}"][i] != "0"]) + \
+            ",".join([str(i) for i in range(32) if lower_active[rm + r1][i]]) + \
             r"""} {""" + "\n" + \
             r"""\node[blue,fill,fill opacity=.2, below] at (\z,{-\diffusion_length - 0.6}) {\phantom{$X_{\!00}$}};""" + \
 	         "}\n" + \
             r"""	\foreach \z in {""" + \
-            ",".join([str(i) for i in range(32) if upper_trail[f"x_{r0 + rm}"][i] != "0"]) + \
+            ",".join([str(i) for i in range(32) if upper_active[r0 + rm][i]]) + \
             r"""} {""" + "\n" + \
             r"""\node[red,fill,fill opacity=.2, below] at (\z,{-\diffusion_length - 0.6}) {\phantom{$X_{\!00}$}};""" + \
 	         "}\n" + \
@@ -142,3 +152,16 @@ def tex_fin(rounds):
              r"\end{figure}" + "\n" + \
              r"\end{document}" + "\n"
     return tex_content
+
+def tex_distinguisher(bmd):
+    """
+    Generate the tex file representing a boomerang distinguisher (see feistel/texrenderer.py)
+
+    :param bmd dict: distinguisher saved by boom.py (see the json artifacts)
+    :rtype: str
+    """
+
+    return texrenderer.tex_distinguisher(bmd, sys.modules[__name__])
+
+if __name__ == "__main__":
+    texrenderer.main(tex_distinguisher)
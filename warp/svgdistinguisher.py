@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+Render boomerang distinguishers of WARP saved by boom.py as SVG files (see feistel/svgrenderer.py)
+"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "feistel"))
+from svgrenderer import SVGRenderer, main
+
+# 32 cells (nibbles) of 1 character each in the trails, and the cells at the input of the S-boxes
+RENDERER = SVGRenderer("WARP", ncells=32, cell_chars=1, sbox_cells=[2*i for i in range(16)])
+
+def svg_distinguisher(bmd, svg_file):
+    """
+    Write the SVG figure of a boomerang distinguisher of WARP
+
+    :param bmd dict: distinguisher saved by boom.py (see the json artifacts)
+    :param svg_file file: opened output file
+    """
+
+    RENDERER.render(bmd, svg_file)
+
+if __name__ == "__main__":
+    main(RENDERER)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+This module analyzes the S-boxes of all ciphers targeted in this project
+(differential, boomerang and Feistel boomerang properties) in parallel.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import contextlib
+import io
+import json
+from multiprocessing import Pool
+import numpy as np
+from fbct import FBCTFramework
+
+project_sboxes = {
+    "WARP": [12, 10, 13, 3, 14, 11, 15, 7, 8, 9, 1, 5, 0, 2, 4, 6],
+    "LBlock S0": [14, 9, 15, 0, 13, 4, 10, 11, 1, 2, 8, 3, 7, 6, 12, 5],
+    "LBlock S1": [4, 11, 14, 9, 15, 13, 0, 10, 7, 12, 5, 6, 2, 8, 1, 3],
+    "LBlock S2": [1, 14, 7, 12, 15, 13, 0, 6, 11, 5, 9, 3, 2, 4, 8, 10],
+    "LBlock S3": [7, 6, 8, 11, 0, 15, 3, 14, 9, 10, 12, 13, 5, 2, 4, 1],
+    "LBlock S4": [14, 5, 15, 0, 7, 2, 12, 13, 1, 8, 4, 9, 11, 10, 6, 3],
+    "LBlock S5": [2, 13, 11, 12, 15, 14, 0, 9, 7, 10, 6, 3, 1, 8, 4, 5],
+    "LBlock S6": [11, 9, 4, 14, 0, 15, 10, 13, 6, 12, 5, 7, 3, 8, 1, 2],
+    "LBlock S7": [13, 10, 15, 0, 14, 4, 9, 11, 2, 1, 8, 3, 7, 5, 12, 6],
+    "CLEFIA S0": [87, 73, 209, 198, 47, 51, 116, 251, 149, 109, 130, 234, 14, 176, 168, 28, 40, 208, 75, 146, 92, 238, 133, 177, 196, 10, 118, 61, 99, 249, 23, 175, 191, 161, 25, 101, 247, 122, 50, 32, 6, 206, 228, 131, 157, 91, 76, 216, 66, 93, 46, 232, 212, 155, 15, 19, 60, 137, 103, 192, 113, 170, 182, 245, 164, 190, 253, 140, 18, 0, 151, 218, 120, 225, 207, 107, 57, 67, 85, 38, 48, 152, 204, 221, 235, 84, 179, 143, 78, 22, 250, 34, 165, 119, 9, 97, 214, 42, 83, 55, 69, 193, 108, 174, 239, 112, 8, 153, 139, 29, 242, 180, 233, 199, 159, 74, 49, 37, 254, 124, 211, 162, 189, 86, 20, 136, 96, 11, 205, 226, 52, 80, 158, 220, 17, 5, 43, 183, 169, 72, 255, 102, 138, 115, 3, 117, 134, 241, 106, 167, 64, 194, 185, 44, 219, 31, 88, 148, 62, 237, 252, 27, 160, 4, 184, 141, 230, 89, 98, 147, 53, 126, 202, 33, 223, 71, 21, 243, 186, 127, 166, 105, 200, 77, 135, 59, 156, 1, 224, 222, 36, 82, 123, 12, 104, 30, 128, 178, 90, 231, 173, 213, 35, 244, 70, 63, 145, 201, 110, 132, 114, 187, 13, 24, 217, 150, 240, 95, 65, 172, 39, 197, 227, 58, 129, 111, 7, 163, 121, 246, 45, 56, 26, 68, 94, 181, 210, 236, 203, 144, 154, 54, 229, 41, 195, 79, 171, 100, 81, 248, 16, 215, 188, 2, 125, 142],
+    "CLEFIA S1": [108, 218, 195, 233, 78, 157, 10, 61, 184, 54, 180, 56, 19, 52, 12, 217, 191, 116, 148, 143, 183, 156, 229, 220, 158, 7, 73, 79, 152, 44, 176, 147, 18, 235, 205, 179, 146, 231, 65, 96, 227, 33, 39, 59, 230, 25, 210, 14, 145, 17, 199, 63, 42, 142, 161, 188, 43, 200, 197, 15, 91, 243, 135, 139, 251, 245, 222, 32, 198, 167, 132, 206, 216, 101, 81, 201, 164, 239, 67, 83, 37, 93, 155, 49, 232, 62, 13, 215, 128, 255, 105, 138, 186, 11, 115, 92, 110, 84, 21, 98, 246, 53, 48, 82, 163, 22, 211, 40, 50, 250, 170, 94, 207, 234, 237, 120, 51, 88, 9, 123, 99, 192, 193, 70, 30, 223, 169, 153, 85, 4, 196, 134, 57, 119, 130, 236, 64, 24, 144, 151, 89, 221, 131, 31, 154, 55, 6, 36, 100, 124, 165, 86, 72, 8, 133, 208, 97, 38, 202, 111, 126, 106, 182, 113, 160, 112, 5, 209, 69, 140, 35, 28, 240, 238, 137, 173, 122, 75, 194, 47, 219, 90, 77, 118, 103, 23, 45, 244, 203, 177, 74, 168, 181, 34, 71, 58, 213, 16, 76, 114, 204, 0, 249, 224, 253, 226, 254, 174, 248, 95, 171, 241, 27, 66, 129, 214, 190, 68, 41, 166, 87, 185, 175, 242, 212, 117, 102, 187, 104, 159, 80, 2, 1, 60, 127, 141, 26, 136, 189, 172, 247, 228, 121, 150, 162, 252, 109, 178, 107, 3, 225, 46, 125, 20, 149, 29],
+    "TWINE": [12, 0, 15, 10, 2, 11, 9, 5, 8, 3, 13, 7, 1, 14, 6, 4]
+}
+
+def analyze_sbox(name, S, cachedir=None):
+    """
+    Compute the properties of an S-box, and save its tables in the table cache
+
+    :param name str: name of S-box
+    :param S list: S-box
+    :param cachedir str: directory of the table cache
+    :rtype: dict
+    :return: properties of S-box
+    """
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        sb = FBCTFramework(S, cachedir)
+    bct = sb.get_bct()
+    sb.get_fbdt()
+    good_ios, list_of_worths = sb.get_good_ios()
+    properties = {"name": name,
+                  "size": sb.size,
+                  "differential_uniformity": int(sb.ddt[1:, :].max()),
+                  "ddt_nonzero": int(np.count_nonzero(sb.ddt[1:, 1:])),
+                  "boomerang_uniformity": int(bct[1:, 1:].max()),
+                  "fbct_uniformity": sb.get_fbct_uniformity(),
+                  "fbct_nonzero": int(np.count_nonzero(sb.fbct[1:, 1:])),
+                  "good_ios": good_ios,
+                  "max_worth": max(list_of_worths[1:]),
+                  "sbox_hash": sb.tables.key}
+    return properties
+
+def print_report(report):
+    header = ["S-box", "DU", "#DDT>0", "BU", "FBU", "#FBCT>0", "good input/output differences"]
+    rows = []
+    for properties in report:
+        good_ios = properties["good_ios"]
+        if isinstance(good_ios, list):
+            good_ios = ", ".join(good_ios)
+        rows.append([properties["name"],
+                     str(properties["differential_uniformity"]),
+                     str(properties["ddt_nonzero"]),
+                     str(properties["boomerang_uniformity"]),
+                     str(properties["fbct_uniformity"]),
+                     str(properties["fbct_nonzero"]),
+                     good_ios])
+    widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header) - 1)]
+    line = lambda row: "  ".join([row[i].ljust(widths[i]) for i in range(len(widths))] + [row[-1]])
+    print(line(header))
+    print("-"*len(line(header)))
+    for row in rows:
+        print(line(row))
+    print("DU: differential uniformity, BU: boomerang uniformity, FBU: Feistel boomerang uniformity")
+
+def main():
+    parser = ArgumentParser(description="This tool analyzes all S-boxes of this project in parallel\n"
+                                        "Example:\n"
+                                        "python3 analyzesboxes.py -p 4 -o sboxes.json",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('-p', '--processes', type=int, default=None,
+                        help="number of worker processes (default: number of CPUs)")
+    parser.add_argument('-s', '--sboxes', type=str, nargs='+', default=list(project_sboxes.keys()),
+                        help="names of S-boxes to be analyzed (default: all)")
+    parser.add_argument('-c', '--cachedir', type=str, default=None,
+                        help="directory of the table cache")
+    parser.add_argument('-o', '--output', type=str, default=None,
+                        help="json file to save the report")
+    args = parser.parse_args()
+
+    tasks = [(name, project_sboxes[name], args.cachedir) for name in args.sboxes]
+    with Pool(args.processes) as pool:
+        report = pool.starmap(analyze_sbox, tasks)
+    print_report(report)
+    if args.output != None:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=4)
+
+if __name__ == "__main__":
+    main()
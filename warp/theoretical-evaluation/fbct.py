@@ -5,70 +5,123 @@ Author: Hosein Hadipour
 """
 
 import math
+import numpy as np
+from sboxtables import SboxTables
 
 class FBCTFramework:
-    def __init__(self, S):
+    def __init__(self, S, cachedir=None):
         self.size = len(S)
+        self.S = S
         print(f"S-box:\t{S}")
-        self.ddt = self.gen_ddt(S)
-        self.fbct = self.gen_fbct(S)
+        self.tables = SboxTables(S, cachedir)
+        self.ddt = self.tables.load("ddt", lambda: self.gen_ddt(S))
+        self.fbct = self.tables.load("fbct", lambda: self.gen_fbct(S))
+
+    def table_dtype(self):
+        """
+        The smallest unsigned integer type holding the entries of
+        DDT, BCT, FBCT and FBDT (each entry is at most self.size)
+        """
+
+        return np.min_scalar_type(self.size)
+
+    def sbox_array(self, S):
+        """
+        Convert the S-box to a compact NumPy array
+        """
+
+        return np.asarray(S, dtype=np.min_scalar_type(self.size - 1))
 
     def gen_ddt(self, S):
-        ddt = []
-        for i in range(self.size):
-            ddt.append( [0 for j in range(self.size)] )
-        for inDiff in range(self.size):
-            for x in range(self.size):
-                ddt[inDiff][S[x]^S[x^inDiff]] += 1
+        S = self.sbox_array(S)
+        x = np.arange(self.size, dtype=S.dtype)
+        inDiff = x[:, None]
+        outDiff = S[x] ^ S[x ^ inDiff]
+        indices = inDiff.astype(np.int64)*self.size + outDiff
+        ddt = np.bincount(indices.ravel(), minlength=self.size**2)
+        ddt = ddt.reshape(self.size, self.size).astype(self.table_dtype())
         # print2Dlist(ddt)
         return ddt
 
     def gen_bct(self, S, Sinv):
-        bct = []
-        for i in range(self.size):
-            bct.append( [0 for j in range(self.size)] )
-        for inDiff in range(self.size):
-            for outDiff in range(self.size):
-                for x in range(self.size):
-                    y1 = S[x]
-                    y2 = S[x^inDiff]
-                    x3 = Sinv[y1^outDiff]
-                    x4 = Sinv[y2^outDiff]
-                    if x3^x4 == inDiff:
-                        bct[inDiff][outDiff] += 1
+        S = self.sbox_array(S)
+        Sinv = self.sbox_array(Sinv)
+        x = np.arange(self.size, dtype=S.dtype)
+        # axes: (inDiff, outDiff, x)
+        inDiff = x[:, None, None]
+        outDiff = x[None, :, None]
+        y1 = S[x][None, None, :]
+        y2 = S[x[None, :] ^ x[:, None]][:, None, :]
+        x3 = Sinv[y1 ^ outDiff]
+        x4 = Sinv[y2 ^ outDiff]
+        bct = np.count_nonzero((x3 ^ x4) == inDiff, axis=2).astype(self.table_dtype())
         # print2Dlist(bct)
         return bct
 
+    def fbct_condition(self, S):
+        """
+        Evaluate S(x) + S(x + di) + S(x + do) + S(x + di + do) = 0 for all
+        (di, do, x) at once
+
+        :param S list: S-box
+        :rtype: tuple
+        :return: S-box as an array and a boolean array with axes (di, do, x)
+        """
+
+        S = self.sbox_array(S)
+        x = np.arange(self.size, dtype=S.dtype)
+        x_di = x[None, :] ^ x[:, None]
+        t12 = S[x][None, :] ^ S[x_di]
+        # t1 + t2 + t3 + t4 = (S(x) + S(x + di)) + (S(x + do) + S(x + do + di))
+        condition = t12[:, None, :] == t12[:, x_di].transpose(0, 2, 1)
+        return S, condition
+
     def gen_fbct(self, S):
         """
         Compute the Feistel boomerang connectivity table
         """
 
-        fbct = [[0 for i in range(self.size)] for j in range(self.size)]
-        for di in range(self.size):
-            for do in range(self.size):
-                for x in range(self.size):
-                    t1 = S[x]
-                    t2 = S[x ^ di]
-                    t3 = S[x ^ do]
-                    t4 = S[x ^ di ^ do]
-                    if t1 ^ t2 ^ t3 ^ t4 == 0:
-                        fbct[di][do] += 1
+        _, condition = self.fbct_condition(S)
+        fbct = np.count_nonzero(condition, axis=2).astype(self.table_dtype())
         # print2Dlist(fbct)
         return fbct
 
+    def get_bct(self):
+        """
+        Load the boomerang connectivity table of S-box
+        """
+
+        Sinv = [0]*self.size
+        for x in range(self.size):
+            Sinv[self.S[x]] = x
+        return self.tables.load("bct", lambda: self.gen_bct(self.S, Sinv))
+
+    def get_fbdt(self):
+        """
+        Load the Feistel boomerang difference table of S-box
+        """
+
+        return self.tables.load("fbdt", lambda: self.gen_fbdt(self.S))
+
+    def get_nonzero(self, name):
+        """
+        Load the indexes of nonzero entries of ddt, bct, fbct or fbdt
+        """
+
+        compute = {"ddt": lambda: self.ddt,
+                   "fbct": lambda: self.fbct,
+                   "bct": self.get_bct,
+                   "fbdt": self.get_fbdt}
+        return self.tables.load_nonzero(name, compute[name])
+
     def get_fbct_uniformity(self):
         """
         Compute the Feistel boomerang uniformity of S-box
         """
 
-        funiformity = 0
-        for di in range(1, self.size):
-            for do in range(1, self.size):
-                if di != do:
-                    tmp = self.fbct[di][do]
-                    if funiformity < tmp:
-                        funiformity = tmp
+        fbct = np.array(self.fbct[1:, 1:])
+        np.fill_diagonal(fbct, 0)
+        funiformity = int(fbct.max(initial=0))
         return funiformity
 
     def get_good_ios(self):
@@ -76,10 +129,7 @@ class FBCTFramework:
         Find those input/output differences working better for boomerang attack
         """
 
-        list_of_worths = [0]*self.size
-        for dx in range(self.size):
-            for dy in range(self.size):
-                list_of_worths[dx] += self.fbct[dx][dy]
+        list_of_worths = self.fbct.sum(axis=1, dtype=np.int64).tolist()
         mx = max(list_of_worths[1:])
         good_ios = ["{:02x}".format(i) for i in range(0, self.size) if list_of_worths[i] == mx]
         if len(good_ios) == (self.size - 1):
@@ -92,68 +142,73 @@ class FBCTFramework:
         Compute the Feistel boomerang difference table
         """
 
-        fbdt = [[[0 for _ in range(self.size)] for _ in range(self.size)] for _ in range(self.size)]
-        for di in range(self.size):
-            for do in range(self.size):
-                for x in range(self.size):
-                    y1 = S[x]
-                    y2 = S[x ^ di]
-                    y3 = S[x ^ do]
-                    y4 = S[x ^ di ^ do]
-                    delta = y1 ^ y2
-                    if y1 ^ y2 ^ y3 ^ y4 == 0:
-                        fbdt[di][delta][do] += 1
+        S, condition = self.fbct_condition(S)
+        di, do, x = np.nonzero(condition)
+        delta = S[x] ^ S[x ^ di]
+        indices = (di*self.size + delta)*self.size + do
+        fbdt = np.bincount(indices, minlength=self.size**3)
+        fbdt = fbdt.reshape(self.size, self.size, self.size).astype(self.table_dtype())
         return fbdt
 
 
+    def accumulator_dtype(self):
+        """
+        The dtype used for contractions: exact int64 as long as the sum over
+        all characteristics of the switch (at most size^10) fits into it,
+        float64 otherwise (e.g., for 8-bit S-boxes)
+        """
+
+        if self.size**10 < 2**63:
+            return np.int64
+        return np.float64
+
+    def contract(self, subscripts, *operands):
+        """
+        Contract the given tables using an optimized contraction order
+
+        :param subscripts str: einsum subscripts
+        :param operands list: tables to be contracted
+        :rtype: numpy.ndarray
+        :return: the contracted tensor
+        """
+
+        dtype = self.accumulator_dtype()
+        operands = [np.asarray(op, dtype=dtype) for op in operands]
+        return np.einsum(subscripts, *operands, optimize=True)
+
     def compute_F(self):
-        self.F = [[0 for _ in range(self.size)] for _ in range(self.size)]
-        for a_3_6 in range(self.size):
-            for b_12_4 in range(self.size):
-                for b_3_6 in range(self.size):
-                    self.F[a_3_6][b_12_4] += self.fbct[a_3_6][b_3_6] * self.ddt[b_12_4][b_3_6]
+        # F[a_3_6, b_12_4] = sum_{b_3_6} FBCT[a_3_6, b_3_6] * DDT[b_12_4, b_3_6]
+        self.F = self.contract("ac,bc->ab", self.fbct, self.ddt)
 
     def compute_G(self):
-        self.G = [[[0 for _ in range(self.size)] for _ in range(self.size)] for _ in range(self.size)]
-        for a_3_6 in range(self.size):
-            for a_6_20 in range(self.size):
-                for b_7_28 in range(self.size):
-                    for a_7_28 in range(self.size):
-                        self.G[a_3_6][a_6_20][b_7_28] += self.fbct[a_7_28][b_7_28] * self.ddt[a_3_6][a_6_20] * self.ddt[a_6_20][a_7_28]
+        # G[a_3_6, a_6_20, b_7_28] = sum_{a_7_28} FBCT[a_7_28, b_7_28] * DDT[a_3_6, a_6_20] * DDT[a_6_20, a_7_28]
+        self.G = self.contract("ax,xw,wy->axy", self.ddt, self.ddt, self.fbct)
 
     def compute_H(self):
-        self.H = [[0 for _ in range(self.size)] for _ in range(self.size)]
-        for b_10_19 in range(self.size):
-            for b_7_28 in range(self.size):
-                for b_8_8 in range(self.size):
-                    self.H[b_10_19][b_7_28] += self.ddt[b_10_19][b_8_8] * self.ddt[b_8_8][b_7_28]
+        # H[b_10_19, b_7_28] = sum_{b_8_8} DDT[b_10_19, b_8_8] * DDT[b_8_8, b_7_28]
+        self.H = self.contract("zv,vy->zy", self.ddt, self.ddt)
 
     def compute_I(self):
-        self.I = [[[0 for _ in range(self.size)] for _ in range(self.size)] for _ in range(self.size)]
-        for a_6_20 in range(self.size):
-            for b_10_19 in range(self.size):
-                for b_12_4 in range(self.size):
-                    for a_9_24 in range(self.size):
-                        for a_10_18 in range(self.size):
-                            self.I[a_6_20][b_10_19][b_12_4] += self.ddt[a_6_20][a_9_24] * self.ddt[a_9_24][a_10_18] * self.fbdt[b_12_4][b_10_19][a_10_18]
+        # I[a_6_20, b_10_19, b_12_4] = sum_{a_9_24, a_10_18} DDT[a_6_20, a_9_24] * DDT[a_9_24, a_10_18] * FBDT[b_12_4, b_10_19, a_10_18]
+        self.I = self.contract("xu,ut,bzt->xzb", self.ddt, self.ddt, self.fbdt)
 
     def compute_boomerang_switch(self, a_3_6, b_12_4):
         """
         Compute the boomerang switch for our 14-round sandwich distinguisher for WARP
-        """
 
-        self.fbdt = self.gen_fbdt(S)
-        self.compute_F()
-        self.compute_G()
-        self.compute_H()
-        self.compute_I()
+        The sum of F*G*H*I over (a_6_20, b_7_28, b_10_19) is evaluated as a single
+        tensor contraction over the tables with a_3_6 and b_12_4 fixed, so
+        the full tensors G and I are never materialized
+        """
 
-        output = 0
-        for a_6_20 in range(self.size):
-            for b_7_28 in range(self.size):
-                for b_10_19 in range(self.size):
-                    output += self.F[a_3_6][b_12_4] * self.G[a_3_6][a_6_20][b_7_28] * self.H[b_10_19][b_7_28] * self.I[a_6_20][b_10_19][b_12_4]
-        denominator_log2 = 4*10
+        self.fbdt = self.get_fbdt()
+        output = self.contract("c,c,x,xw,wy,zv,vy,xu,ut,zt->",
+                               self.fbct[a_3_6], self.ddt[b_12_4],
+                               self.ddt[a_3_6], self.ddt, self.fbct,
+                               self.ddt, self.ddt,
+                               self.ddt, self.ddt, self.fbdt[b_12_4])
+        output = output.item()
+        denominator_log2 = int(math.log(self.size, 2))*10
         print(f"pr = {output}/2^-{(denominator_log2)}")
         if output != 0:
             return (math.log(output, 2) - (denominator_log2))
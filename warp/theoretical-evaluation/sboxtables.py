@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Date: Oct 19, 2026
+Persistent store for the connectivity tables of S-boxes (DDT, BCT, FBCT, FBDT, ...)
+"""
+
+import hashlib
+import os
+import numpy as np
+
+class SboxTables:
+    """
+    Each table is computed once per S-box and saved as a .npy file in
+    cachedir/<hash of S-box>/<name>.npy. Later, the tables are opened as
+    read-only memory maps, so that several processes share the same pages.
+    """
+
+    default_cachedir = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sboxtables")
+
+    def __init__(self, S, cachedir=None):
+        """
+        :param S list: S-box
+        :param cachedir str: directory keeping the tables (default: .sboxtables next to this module)
+        """
+
+        if cachedir == None:
+            cachedir = os.environ.get("SBOXTABLES_CACHEDIR", SboxTables.default_cachedir)
+        self.S = np.asarray(S, dtype=np.int64)
+        self.key = self.sbox_hash(S)
+        self.directory = os.path.join(cachedir, self.key)
+        os.makedirs(self.directory, exist_ok=True)
+        sbox_file = os.path.join(self.directory, "sbox.npy")
+        if not os.path.exists(sbox_file):
+            self.save(sbox_file, self.S)
+        elif not np.array_equal(np.load(sbox_file), self.S):
+            raise ValueError(f"{self.directory} belongs to another S-box")
+
+    @staticmethod
+    def sbox_hash(S):
+        """
+        Key of the S-box in the cache directory
+        """
+
+        return hashlib.sha256(np.asarray(S, dtype=np.int64).tobytes()).hexdigest()[0:16]
+
+    @staticmethod
+    def save(file_name, table):
+        """
+        Write the table atomically, so that concurrent processes never read a partial file
+        """
+
+        temp_file_name = f"{file_name}.{os.getpid()}.tmp"
+        with open(temp_file_name, "wb") as temp_file:
+            np.save(temp_file, table)
+        os.replace(temp_file_name, file_name)
+
+    def path(self, name):
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def load(self, name, compute):
+        """
+        Load a table, and compute and save it if it does not exist yet
+
+        :param name str: name of the table, e.g., ddt
+        :param compute function: function computing the table
+        :rtype: numpy.memmap
+        :return: the table as a read-only memory map
+        """
+
+        file_name = self.path(name)
+        if not os.path.exists(file_name):
+            self.save(file_name, np.asarray(compute()))
+        return np.load(file_name, mmap_mode="r")
+
+    def load_nonzero(self, name, compute):
+        """
+        Load the indexes of the nonzero entries of a table (one row per entry)
+        """
+
+        return self.load(f"{name}_nonzero", lambda: np.argwhere(self.load(name, compute)))
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+
+"""
+Date: Oct 19, 2026
+This module computes the probability of the boomerang switch (r) in the
+middle part of a boomerang distinguisher for WARP based on the FBCT framework.
+In contrast to FBCTFramework.compute_boomerang_switch, which is written for
+the 10-round middle part of our 14-round distinguisher, the network of
+DDT/FBCT tensors is generated automatically from the truncated middle part
+discovered by TruncatedBoomerang, and contracted in a cost-optimized order.
+"""
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+import json
+import math
+import numpy as np
+from fbct import FBCTFramework
+
+class BoomerangSwitch(FBCTFramework):
+    """
+    Build and contract the tensor network describing the boomerang switch
+    in the middle part of a boomerang distinguisher for WARP
+
+    Each (possibly) active nibble of the upper and lower trails in Em is a
+    wire carrying a difference. The S-boxes which are only active in the
+    upper (lower) trail are represented by the DDT, and the common active
+    S-boxes by the tensors
+        A[x, ui, uo] = [S(x) + S(x + ui) = uo],
+        B[x, li, lo] = [S(x) + S(x + li) = lo],
+        C[x, ui, li] = [S(x) + S(x + ui) + S(x + li) + S(x + ui + li) = 0],
+    sharing the S-box input x. All tensors are normalized, i.e., divided by
+    the size of S-box, so that the contraction directly gives r.
+    """
+
+    def __init__(self, S=None, cachedir=None):
+        if S == None:
+            S = [0xc, 0xa, 0xd, 0x3, 0xe, 0xb, 0xf, 0x7, 0x8, 0x9, 0x1, 0x5, 0x0, 0x2, 0x4, 0x6]
+        super().__init__(S, cachedir)
+        self.permute_nibbles = [31, 6, 29, 14, 1, 12, 21, 8, 27, 2, 3, 0, 25, 4, 23, 10,
+                                15, 22, 13, 30, 17, 28, 5, 24, 11, 18, 19, 16, 9, 20, 7, 26]
+        # maximum number of entries of the intermediate tensors
+        self.max_entries = 2**27
+        self.sbox_tensors()
+
+    def sbox_tensors(self):
+        """
+        Generate the normalized DDT and the tensors A, B, C
+        """
+
+        _, condition = self.fbct_condition(self.S)
+        x = np.arange(self.size)
+        out = np.asarray(self.S)[x[:, None] ^ x[None, :]] ^ np.asarray(self.S)[:, None]
+        # transition[x, i, o] = [S(x) + S(x + i) = o]
+        transition = np.zeros((self.size, self.size, self.size))
+        transition[x[:, None], x[None, :], out] = 1
+        self.ddt_tensor = self.ddt / self.size
+        self.transition_tensor = transition
+        # condition has the axes (di, do, x)
+        self.fbct_tensor = condition.transpose(2, 0, 1) / self.size
+
+    def new_wire(self):
+        self.wires += 1
+        return self.wires - 1
+
+    def find(self, wire):
+        while self.parent.get(wire, wire) != wire:
+            wire = self.parent[wire]
+        return wire
+
+    def add_tensor(self, tensor, wires):
+        self.tensors.append((tensor, list(wires)))
+
+    def fix_to_zero(self, wire):
+        zero = np.zeros(self.size)
+        zero[0] = 1
+        self.add_tensor(zero, [wire])
+
+    def connect(self, a, b):
+        """
+        Model a = b, where inactive wires are denoted by None
+        """
+
+        if a == None and b == None:
+            return
+        if a == None or b == None:
+            self.fix_to_zero(a if b == None else b)
+            return
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[a] = b
+
+    def xor(self, a, b, c):
+        """
+        Model c = a + b, where inactive wires are denoted by None
+        """
+
+        active = [w for w in [a, b, c] if w != None]
+        if len(active) == 3:
+            x = np.arange(self.size)
+            xor_tensor = np.zeros((self.size, self.size, self.size))
+            xor_tensor[x[:, None], x[None, :], x[:, None] ^ x[None, :]] = 1
+            self.add_tensor(xor_tensor, [a, b, c])
+        elif len(active) == 2:
+            self.connect(*active)
+        elif len(active) == 1:
+            self.fix_to_zero(active[0])
+
+    def fix_difference(self, wires, difference):
+        """
+        Fix the differences of the given wires according to a hexadecimal string
+        """
+
+        for nibble, wire in enumerate(wires):
+            value = int(difference[nibble], 16)
+            if wire == None:
+                if value != 0:
+                    raise ValueError(f"nibble {nibble} of {difference} is not active in the truncated trail")
+                continue
+            one_hot = np.zeros(self.size)
+            one_hot[value] = 1
+            self.add_tensor(one_hot, [wire])
+
+    def build_network(self, upper_trail, middle_part, lower_trail, dp=None, dc=None):
+        """
+        Generate the tensor network of the middle part
+
+        :param upper_trail dict: upper truncated trail returned by TruncatedBoomerang.parse_solver_output
+        :param middle_part dict: middle part returned by TruncatedBoomerang.parse_solver_output
+        :param lower_trail dict: lower truncated trail returned by TruncatedBoomerang.parse_solver_output
+        :param dp str: input difference of Em (default: 0xa in the active nibbles)
+        :param dc str: output difference of Em (default: 0xa in the active nibbles)
+        """
+
+        rm = len([key for key in middle_part.keys() if key.startswith("s_")])
+        r0 = len([key for key in upper_trail.keys() if key.startswith("x_")]) - 1 - rm
+        self.rm = rm
+        self.wires = 0
+        self.parent = dict()
+        self.tensors = []
+        self.number_of_sboxes = 0
+        new_state = lambda pattern: [self.new_wire() if t == "1" else None for t in pattern]
+        upper = [new_state(upper_trail[f"x_{r0 + r}"]) for r in range(rm + 1)]
+        lower = [new_state(lower_trail[f"x_{r}"]) for r in range(rm + 1)]
+        for r in range(rm):
+            common = middle_part[f"s_{r}"].split("*")
+            for i in range(16):
+                u, l = upper[r][2*i], lower[r][2*i]
+                if (common[i] == "1") != (u != None and l != None):
+                    raise ValueError(f"middle part does not match the truncated trails in round {r}")
+                # the left nibble is copied
+                self.connect(u, upper[r + 1][self.permute_nibbles[2*i]])
+                self.connect(l, lower[r + 1][self.permute_nibbles[2*i]])
+                # the output of S-box is added to the right nibble
+                uo = self.new_wire() if u != None else None
+                lo = self.new_wire() if l != None else None
+                if u != None and l != None:
+                    x = self.new_wire()
+                    self.add_tensor(self.transition_tensor, [x, u, uo])
+                    self.add_tensor(self.transition_tensor, [x, l, lo])
+                    self.add_tensor(self.fbct_tensor, [x, u, l])
+                elif u != None:
+                    self.add_tensor(self.ddt_tensor, [u, uo])
+                elif l != None:
+                    self.add_tensor(self.ddt_tensor, [l, lo])
+                if u != None or l != None:
+                    self.number_of_sboxes += 1
+                self.xor(upper[r][2*i + 1], uo, upper[r + 1][self.permute_nibbles[2*i + 1]])
+                self.xor(lower[r][2*i + 1], lo, lower[r + 1][self.permute_nibbles[2*i + 1]])
+        default = lambda state: "".join(["a" if w != None else "0" for w in state])
+        self.fix_difference(upper[0], dp if dp != None else default(upper[0]))
+        self.fix_difference(lower[rm], dc if dc != None else default(lower[rm]))
+
+    def contract_network(self):
+        """
+        Contract the tensor network by eliminating the wires one by one
+
+        The wires used by a single tensor are summed out, and the tensors
+        becoming constant are replaced by scalars. Since the (normalized) DDT
+        of a bijective S-box and the XOR are stochastic in each argument,
+        this removes the S-boxes whose outputs do not affect the boomerang.
+        Then, the wire with the smallest number of neighbouring wires is
+        eliminated by contracting the tensors it connects (min-degree order).
+
+        :rtype: float
+        :return: the value of the fully contracted network
+        """
+
+        tensors = dict()
+        count = dict()
+        for t, (tensor, wires) in enumerate(self.tensors):
+            tensors[t] = (tensor, [self.find(w) for w in wires])
+            for w in set(tensors[t][1]):
+                count[w] = count.get(w, 0) + 1
+        self.scalar = 1.0
+
+        def einsum(operands, output):
+            letters = dict()
+            args = []
+            for tensor, wires in operands:
+                args.extend([tensor, [letters.setdefault(w, len(letters)) for w in wires]])
+            args.append([letters[w] for w in output])
+            return np.einsum(*args, optimize=True)
+
+        def simplify(t):
+            # sum out the wires used only by tensor t and drop t if it becomes a constant
+            tensor, wires = tensors[t]
+            output = [w for w in dict.fromkeys(wires) if count[w] > 1]
+            if output != wires:
+                tensor = einsum([(tensor, wires)], output)
+            if tensor.size == 1 or np.all(tensor == tensor.flat[0]):
+                self.scalar *= float(tensor.flat[0])
+                del tensors[t]
+                changed = []
+                for w in set(output):
+                    count[w] -= 1
+                    if count[w] == 1:
+                        changed.extend([s for s, (_, ws) in tensors.items() if w in ws])
+                return changed
+            tensors[t] = (tensor, output)
+            return []
+
+        def simplify_all(queue):
+            while queue != []:
+                t = queue.pop()
+                if t in tensors:
+                    queue.extend(simplify(t))
+
+        simplify_all(list(tensors.keys()))
+        while len(tensors) > 0:
+            neighbours = dict()
+            for t, (_, wires) in tensors.items():
+                for w in wires:
+                    neighbours.setdefault(w, set()).update(wires)
+            w = min(neighbours.keys(), key=lambda w: len(neighbours[w]))
+            bucket = [t for t, (_, wires) in tensors.items() if w in wires]
+            # contract the tensors connected by w pairwise, keeping the intermediate tensors small
+            while len(bucket) > 1:
+                best = None
+                for i in range(len(bucket)):
+                    for j in range(i + 1, len(bucket)):
+                        wires1, wires2 = tensors[bucket[i]][1], tensors[bucket[j]][1]
+                        shared = set(wires1) & set(wires2)
+                        output = [v for v in dict.fromkeys(wires1 + wires2) if not (v in shared and count[v] == 2)]
+                        if best == None or len(output) < len(best[2]):
+                            best = (bucket[i], bucket[j], output, shared)
+                t1, t2, output, shared = best
+                bucket.remove(t1)
+                bucket.remove(t2)
+                if self.size**len(output) > self.max_entries:
+                    raise MemoryError(f"contracting the middle part requires a tensor with {self.size}^{len(output)} entries")
+                tensor = einsum([tensors.pop(t1), tensors.pop(t2)], output)
+                for v in shared:
+                    count[v] -= 1
+                tensors[t1] = (tensor, output)
+                bucket.append(t1)
+            simplify_all(bucket)
+        return self.scalar
+
+    def compute_switch(self, upper_trail, middle_part, lower_trail, dp=None, dc=None):
+        """
+        Compute the probability of the boomerang switch
+
+        :rtype: float
+        :return: log2 of r, or '-inf' if r = 0
+        :raises MemoryError: if the contraction requires a tensor with more than max_entries entries
+        """
+
+        self.build_network(upper_trail, middle_part, lower_trail, dp, dc)
+        r = self.contract_network()
+        if r > 0:
+            return math.log(r, 2)
+        else:
+            return '-inf'
+
+    def derive_truncated_trails(self, dp, dc, rm):
+        """
+        Derive the truncated trails of the middle part from the input and
+        output differences of Em, in the same format as TruncatedBoomerang.parse_solver_output
+        """
+
+        active = lambda state: ["1" if int(t, 16) != 0 else "0" for t in state]
+        upper = [active(dp)]
+        for r in range(rm):
+            middle = [upper[r][i] if i % 2 == 0 else
+                      str(int(upper[r][i - 1] == "1" or upper[r][i] == "1")) for i in range(32)]
+            x_out = ["0"]*32
+            for i in range(32):
+                x_out[self.permute_nibbles[i]] = middle[i]
+            upper.append(x_out)
+        lower = [active(dc)]
+        for r in range(rm):
+            x_out = lower[0]
+            middle = [x_out[self.permute_nibbles[i]] for i in range(32)]
+            x_in = [middle[i] if i % 2 == 0 else
+                    str(int(middle[i - 1] == "1" or middle[i] == "1")) for i in range(32)]
+            lower.insert(0, x_in)
+        upper_trail = {f"x_{r}": "".join(upper[r]) for r in range(rm + 1)}
+        lower_trail = {f"x_{r}": "".join(lower[r]) for r in range(rm + 1)}
+        middle_part = dict()
+        for r in range(rm):
+            s = [str(int(upper[r][2*i] == "1" and lower[r][2*i] == "1")) for i in range(16)]
+            middle_part[f"s_{r}"] = "*".join(s) + "*"
+        middle_part["as"] = sum([middle_part[f"s_{r}"].count("1") for r in range(rm)])
+        return upper_trail, middle_part, lower_trail
+
+def main():
+    parser = ArgumentParser(description="This tool computes the probability of the boomerang switch in the middle part\n"
+                                        "of a boomerang distinguisher for WARP based on the FBCT framework\n"
+                                        "Example:\n"
+                                        "python3 switch.py -dp 0a000000000000000000000000000000 -dc 0000a000000000000000000000000000 -rm 10\n"
+                                        "python3 switch.py -a ../bmd_2_10_2.json",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('-a', '--artifact', type=str,
+                        help="json file saved by boom.py")
+    parser.add_argument('-dp', '--dp', type=str,
+                        help="input difference of Em")
+    parser.add_argument('-dc', '--dc', type=str,
+                        help="output difference of Em")
+    parser.add_argument('-rm', '--rm', type=int,
+                        help="number of rounds covered by Em")
+    args = parser.parse_args()
+
+    bs = BoomerangSwitch()
+    if args.artifact != None:
+        with open(args.artifact, "r") as artifact_file:
+            bmd = json.load(artifact_file)
+        upper_trail, middle_part, lower_trail = bmd["upper_trail"], bmd["middle_part"], bmd["lower_trail"]
+        dp, dc = args.dp, args.dc
+        if dp == None and bmd["diff_upper_trail"] != None:
+            dp = bmd["diff_upper_trail"][f"x_{bmd['r0']}"]
+        if dc == None and bmd["diff_lower_trail"] != None:
+            dc = bmd["diff_lower_trail"]["x_0"]
+    else:
+        if args.dp == None or args.dc == None or args.rm == None:
+            parser.error("either an artifact or dp, dc and rm should be given")
+        dp, dc = args.dp, args.dc
+        upper_trail, middle_part, lower_trail = bs.derive_truncated_trails(dp, dc, args.rm)
+    r_log2 = bs.compute_switch(upper_trail, middle_part, lower_trail, dp, dc)
+    print(f"Number of common active S-boxes: {middle_part['as']}")
+    print(f"Number of active S-boxes in Em: {bs.number_of_sboxes}")
+    print(f"r = 2^{r_log2}")
+
+if __name__ == "__main__":
+    main()
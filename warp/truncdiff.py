@@ -11,6 +11,11 @@ from statistics import mode
 import time
 import os
 from gurobipy import *
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "feistel"))
+from ciphers import warp_spec
+from modelcompiler import ModelCompiler
+from truncatedfrontier import TruncatedFrontier
 
 class Wordwarp:
     """
@@ -31,30 +36,8 @@ class Wordwarp:
 
     def __init__(self, nrounds=1) -> None:
         Wordwarp.count += 1
-        self.xor_counter = 0
-        self.dummy_var = "d"
         self.nrounds = nrounds
-        self.milp_variables = []
         self.lp_file_name = f"warp_{nrounds}r.lp"
-        self.permute_nibbles = [31, 6, 29, 14, 1, 12, 21, 8, 27, 2, 3, 0, 25, 4, 23, 10,
-                                15, 22, 13, 30, 17, 28, 5, 24, 11, 18, 19, 16, 9, 20, 7, 26]
-
-    @staticmethod
-    def ordered_set(seq):
-        """
-        This method eliminates duplicated elements in a given list,
-        and returns a list in which each elements appears only once
-        """
-
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if not (x in seen or seen_add(x))]
-
-    def inv_permute_nibbles(self, state):
-        temp = [0]*32
-        for i in range(32):
-            temp[i] = state[self.permute_nibbles[i]]
-        return temp
 
     def generate_round_x_variables(self, rn, ul="u"):
         """
@@ -65,105 +48,18 @@ class Wordwarp:
         """
 
         x = [f"x{ul}_{rn}_{nibble}" for nibble in range(32)]
-        self.milp_variables.extend(x)
         return x
 
-    def constraint_by_trunc_xor(self, a, b, c, model=2):
-        """
-        operation:
-        (a, b) |----> c = a + b
-        model 1:
-        a + b + c >= 2 d
-        d >= a
-        d >= b
-        d >= c
-        model 2:
-        a + b - c >= 0
-        a - b + c >= 0
-        - a + b + c >= 0
-        """
-
-        constraints = ""
-        if model == 1:
-            d = f"{self.dummy_var}_{self.xor_counter}"
-            self.milp_variables.append(d)
-            constraints += f"{a} + {b} + {c} -  2 {d} >= 0\n"
-            constraints += f"{d} - {a} >= 0\n"
-            constraints += f"{d} - {b} >= 0\n"
-            constraints += f"{d} - {c} >= 0\n"
-            self.xor_counter += 1
-        elif model == 2:
-            constraints += f"{a} + {b} - {c} >= 0\n"
-            constraints += f"{a} - {b} + {c} >= 0\n"
-            constraints += f"- {a} + {b} + {c} >= 0\n"
-        return constraints
-
-    def constraints_by_equality(self, a, b):
-        """
-        a = b
-        """
-        constraint = f"{a} - {b} = 0\n"
-        return constraint
-
-    def generate_constraints(self, ul="u"):
-        """
-        Generate the constraints of MILP model
-        """
-
-        constraints = ""
-        for rn in range(self.nrounds):
-            x_in = self.generate_round_x_variables(rn, ul)
-            x_out = self.generate_round_x_variables(rn + 1, ul)
-            x_middle = self.inv_permute_nibbles(x_out)
-            for nibble in range(16):
-                constraints += self.constraints_by_equality(x_in[2*nibble], x_middle[2*nibble])
-                constraints += self.constraint_by_trunc_xor(x_in[2*nibble], x_in[2*nibble + 1], x_middle[2*nibble + 1])
-        return constraints
-
-    def declare_binary_vars(self):
-        """
-        Declare binary variables of MILP model
-        """
-
-        self.milp_variables = self.ordered_set(self.milp_variables)
-        constraints = "Binary\n"
-        constraints += "\n".join(self.milp_variables) + "\n"
-        return constraints
-
-    def generate_objective_function(self):
-        """
-        Generate the objective function of MILP model
-        """
-
-        sbox_inputs = []
-        for r in range(self.nrounds):
-            round_input = self.generate_round_x_variables(r)
-            sbox_inputs.extend([round_input[2*i] for i in range(16)])
-        objective = " + ".join(sbox_inputs) + "\n"
-        return objective
-
-    def exclude_trivial_solution(self, ul="u"):
-        """
-        Exclude all-zero solution from the solutions space
-        """
-        x_0 = self.generate_round_x_variables(0, ul)
-        constraint = " + ".join(x_0) + " >= 1\n"
-        return constraint
-
     def make_model(self):
         """
         Generate the MILP model describing propagation of a truncated differential
         trail through WARP block cipher
         """
 
-        lp_contents = f"\\ Truncated differential trail for {self.nrounds} rounds of WARP\n"
-        lp_contents = "minimize\n"
-        lp_contents += self.generate_objective_function()
-        lp_contents += "subject to\n"
-        lp_contents += self.generate_constraints()
-        lp_contents += self.exclude_trivial_solution()
-        lp_contents += self.declare_binary_vars()
-        lp_contents += "End"
+        spec = warp_spec()
+        # the exact minimum numbers of active S-boxes over up to 10 rounds take less than a second
+        bounds = TruncatedFrontier(spec).table(min(self.nrounds, 10))
+        lp_contents = ModelCompiler(spec).truncated_differential(self.nrounds, bounds)
         with open(self.lp_file_name, "w") as lp_file:
             lp_file.write(lp_contents)
 
@@ -186,6 +82,23 @@ class Wordwarp:
         objective_value = objective_function.getValue()
         print(f"Number of active S-boxes: {objective_value}")
 
+    def search_truncated_differential_trail(self):
+        """
+        Find a truncated differential trail with the minimum number of active S-boxes
+        without the solver (see truncatedfrontier.py)
+        """
+
+        start_time = time.time()
+        frontier = TruncatedFrontier(warp_spec())
+        objective_value, patterns = frontier.search(self.nrounds)
+        elapsed_time = time.time() - start_time
+        trail = frontier.trail(patterns)
+        print(f"Number of active S-boxes: {objective_value}")
+        for name, state in trail.items():
+            print(f"{name}: {state}")
+        print("Total time to find the trail: %0.02f seconds" % elapsed_time)
+        return trail
+
 if __name__ == "__main__":
     nrounds = 13
     warp_upper = Wordwarp(nrounds=nrounds)